@@ -0,0 +1,4 @@
+"""Benchmarks of the wrapper against a local InsumerAPI stub server.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,331 @@
+"""Throughput and latency of the wrapper, per scenario and usage mode.
+
+Each scenario calls one endpoint (or family of endpoints) ``requests``
+times against a :class:`~benchmarks.stub.StubServer`:
+
+- ``sync``: one call after another from a single thread
+- ``threaded``: ``concurrency`` threads sharing one wrapper
+- ``async``: ``concurrency`` coroutines in flight on one event loop
+
+Results are a JSON document (see :func:`run_benchmarks`) that
+:func:`compare` can check against an earlier run.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from benchmarks.stub import StubServer
+from langchain_insumer import InsumerAPIWrapper
+
+SCHEMA_VERSION = 1
+MODES = ("sync", "threaded", "async")
+KEY = "insr_live_" + "0" * 40
+WALLET = "0x" + "ab" * 20
+CONDITIONS = [
+    {"type": "token_balance", "contractAddress": "native", "chainId": 1, "threshold": "1"},
+    {"type": "token_balance", "contractAddress": "native", "chainId": 8453, "threshold": "1"},
+]
+BATCH = [{"wallet": "0x" + f"{i:02x}" * 20} for i in range(10)]
+
+Call = Callable[[InsumerAPIWrapper], Any]
+AsyncCall = Callable[[InsumerAPIWrapper], Awaitable[Any]]
+
+# Scenario name -> (sync call, async call).
+SCENARIOS: dict[str, tuple[Call, AsyncCall]] = {
+    "attest": (
+        lambda api: api.attest(conditions=CONDITIONS, wallet=WALLET),
+        lambda api: api.aattest(conditions=CONDITIONS, wallet=WALLET),
+    ),
+    "trust": (
+        lambda api: api.wallet_trust(wallet=WALLET),
+        lambda api: api.awallet_trust(wallet=WALLET),
+    ),
+    "batch_trust": (
+        lambda api: api.batch_wallet_trust(BATCH),
+        lambda api: api.abatch_wallet_trust(BATCH),
+    ),
+    "tokens": (lambda api: api.list_tokens(), lambda api: api.alist_tokens()),
+    "merchants": (lambda api: api.list_merchants(), lambda api: api.alist_merchants()),
+    "templates": (
+        lambda api: api.get_compliance_templates(),
+        lambda api: api.aget_compliance_templates(),
+    ),
+}
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank ``q``-th percentile (0..100) of ``values``, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(-(-q * len(ordered) // 100)), 1)
+    return ordered[rank - 1]
+
+
+def _timed(call: Call, api: InsumerAPIWrapper) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        call(api)
+    except Exception:
+        return time.perf_counter() - started, False
+    return time.perf_counter() - started, True
+
+
+async def _atimed(call: AsyncCall, api: InsumerAPIWrapper) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        await call(api)
+    except Exception:
+        return time.perf_counter() - started, False
+    return time.perf_counter() - started, True
+
+
+def _run_sync(call: Call, api: InsumerAPIWrapper, requests: int, concurrency: int) -> list:
+    return [_timed(call, api) for _ in range(requests)]
+
+
+def _run_threaded(call: Call, api: InsumerAPIWrapper, requests: int, concurrency: int) -> list:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda _: _timed(call, api), range(requests)))
+
+
+def _run_async(call: AsyncCall, api: InsumerAPIWrapper, requests: int, concurrency: int) -> list:
+    async def run() -> list:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> tuple[float, bool]:
+            async with semaphore:
+                return await _atimed(call, api)
+
+        await _atimed(call, api)  # warm-up: open the loop's client
+        try:
+            return list(await asyncio.gather(*(one() for _ in range(requests))))
+        finally:
+            await api.aclose()
+
+    return asyncio.run(run())
+
+
+def _summarize(
+    scenario: str, mode: str, timings: list, seconds: float, concurrency: int, hits: int
+) -> dict[str, Any]:
+    latencies = [t * 1000 for t, ok in timings if ok]
+    completed = len(latencies)
+    return {
+        "scenario": scenario,
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(timings),
+        "errors": len(timings) - completed,
+        "server_requests": hits,
+        "seconds": round(seconds, 6),
+        "throughput": round(completed / seconds, 3) if seconds else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / completed, 3) if completed else None,
+            "p50": _rounded(percentile(latencies, 50)),
+            "p99": _rounded(percentile(latencies, 99)),
+            "max": _rounded(max(latencies, default=None)),
+        },
+    }
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+def _version() -> Optional[str]:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        return None
+    try:
+        return version("langchain-insumer")
+    except PackageNotFoundError:
+        return None
+
+
+def run_benchmarks(
+    scenarios: Sequence[str] = tuple(SCENARIOS),
+    modes: Sequence[str] = MODES,
+    requests: int = 200,
+    concurrency: int = 8,
+    latency: float = 0.02,
+    jitter: float = 0.005,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    max_retries: int = 0,
+    seed: Optional[int] = 0,
+) -> dict[str, Any]:
+    """Run every scenario in every mode against a fresh stub server.
+
+    Latency percentiles and throughput count successful calls only; calls
+    that raised are counted as ``errors``. Each run gets a fresh wrapper
+    with keep-alive pools sized to ``concurrency``, caching off, and
+    singleflight off, so every call reaches the stub, plus one warm-up call.
+
+    Args:
+        scenarios: Names from :data:`SCENARIOS`.
+        modes: Any of ``"sync"``, ``"threaded"`` and ``"async"``.
+        requests: Timed calls per scenario and mode.
+        concurrency: Calls in flight in the threaded and async modes.
+        latency: Stub server response delay in seconds.
+        jitter: Stub server delay spread in seconds.
+        error_rate: Share of stub responses that are errors.
+        error_status: HTTP status of injected errors.
+        max_retries: The wrapper's ``max_retries``.
+        seed: Seed for the stub's jitter and error draws.
+
+    Returns:
+        Dict with ``schema``, ``environment``, ``config`` and ``results``, a
+        list with one entry per scenario and mode holding ``requests``,
+        ``errors``, ``server_requests`` (requests the stub received,
+        warm-up and retries included), ``seconds``, ``throughput``
+        (successful calls per second) and ``latency_ms`` (``mean``,
+        ``p50``, ``p99``, ``max``).
+    """
+    unknown = [s for s in scenarios if s not in SCENARIOS] + [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"Unknown scenarios or modes: {unknown}")
+    config = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "latency": latency,
+        "jitter": jitter,
+        "error_rate": error_rate,
+        "error_status": error_status,
+        "max_retries": max_retries,
+        "seed": seed,
+    }
+    results = []
+    with StubServer(latency, jitter, error_rate, error_status, seed) as stub:
+        for scenario in scenarios:
+            call, acall = SCENARIOS[scenario]
+            for mode in modes:
+                width = 1 if mode == "sync" else concurrency
+                api = InsumerAPIWrapper(
+                    api_key=KEY,
+                    base_url=stub.base_url,
+                    max_retries=max_retries,
+                    retry_backoff=0.01,
+                    pool_maxsize=width,
+                    async_max_connections=width,
+                    singleflight_endpoints=[],
+                )
+                before = sum(stub.counts().values())
+                try:
+                    if mode == "async":
+                        started = time.perf_counter()
+                        timings = _run_async(acall, api, requests, width)
+                    else:
+                        _timed(call, api)
+                        runner = _run_sync if mode == "sync" else _run_threaded
+                        started = time.perf_counter()
+                        timings = runner(call, api, requests, width)
+                    seconds = time.perf_counter() - started
+                finally:
+                    api.close()
+                hits = sum(stub.counts().values()) - before
+                results.append(_summarize(scenario, mode, timings, seconds, width, hits))
+    return {
+        "schema": SCHEMA_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "langchain_insumer": _version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "config": config,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.1) -> list[str]:
+    """List the regressions of ``current`` against ``baseline``.
+
+    A scenario and mode present in both regresses if its throughput fell,
+    or its p50 or p99 latency rose, by more than ``tolerance`` (a share).
+
+    Returns:
+        One line per regression; empty if there are none.
+    """
+    before = {(r["scenario"], r["mode"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        old = before.get((result["scenario"], result["mode"]))
+        if old is None:
+            continue
+        name = f"{result['scenario']}/{result['mode']}"
+        if old["throughput"] and (result["throughput"] or 0) < old["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {old['throughput']:.1f} -> {result['throughput'] or 0:.1f}/s"
+            )
+        for key in ("p50", "p99"):
+            was, now = old["latency_ms"][key], result["latency_ms"][key]
+            if was and now and now > was * (1 + tolerance):
+                regressions.append(f"{name}: {key} {was:.1f} -> {now:.1f} ms")
+    return regressions
+
+
+def _table(report: dict) -> str:
+    lines = [f"{'scenario':<12} {'mode':<9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}"]
+    for r in report["results"]:
+        latency = r["latency_ms"]
+        lines.append(
+            f"{r['scenario']:<12} {r['mode']:<9} {r['throughput'] or 0:>9.1f} "
+            f"{latency['p50'] or 0:>8.1f} {latency['p99'] or 0:>8.1f} {r['errors']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the wrapper against a local stub."
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated")
+    parser.add_argument("--requests", type=int, default=200, help="timed calls per run")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=20.0, help="stub delay in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="stub delay spread in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSON results file, or - for stdout")
+    parser.add_argument("--baseline", help="earlier JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        scenarios=[s for s in args.scenarios.split(",") if s],
+        modes=[m for m in args.modes.split(",") if m],
+        requests=args.requests,
+        concurrency=args.concurrency,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        max_retries=args.max_retries,
+        seed=args.seed,
+    )
+    document = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(document)
+    else:
+        with open(args.output, "w") as f:
+            f.write(document + "\n")
+    print(_table(report), file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,225 @@
+"""Local HTTP stand-in for the InsumerAPI endpoints the benchmarks call.
+
+Responses have the shape of the real API's. Every request is delayed by
+``latency`` plus up to ``jitter`` seconds either way, and a share
+``error_rate`` of them is answered with ``error_status`` instead.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+CREDITS = 10_000
+
+
+def _meta(charged: int = 0) -> dict:
+    meta: dict[str, Any] = {"version": "1.0", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+    if charged:
+        meta.update(creditsCharged=charged, creditsRemaining=CREDITS)
+    return meta
+
+
+def _expiry() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 1800))
+
+
+def _attest(body: dict) -> dict:
+    conditions = body.get("conditions") or []
+    results = [
+        {"condition": i, "label": c.get("label", ""), "met": True, "chainId": c.get("chainId")}
+        for i, c in enumerate(conditions)
+    ]
+    attestation = {
+        "id": "ATST-BENCH",
+        "pass": True,
+        "results": results,
+        "passCount": len(results),
+        "failCount": 0,
+        "attestedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "expiresAt": _expiry(),
+    }
+    data = {"attestation": attestation, "sig": "0" * 88, "kid": "insumer-attest-v1"}
+    return {"ok": True, "data": data, "meta": _meta(2 if body.get("proof") == "merkle" else 1)}
+
+
+def _profile(wallet: str) -> dict:
+    checks = {"passCount": 20, "failCount": 1, "total": 21}
+    return {
+        "id": "TRST-BENCH",
+        "wallet": wallet,
+        "dimensions": {"stablecoins": checks, "governance": checks, "nfts": checks},
+        "summary": {"totalChecks": 63, "totalPassed": 60, "dimensionsWithActivity": 3},
+        "profiledAt": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "expiresAt": _expiry(),
+    }
+
+
+def _trust(body: dict) -> dict:
+    data = {"trust": _profile(body.get("wallet", "")), "sig": "0" * 88, "kid": "insumer-attest-v1"}
+    return {"ok": True, "data": data, "meta": _meta(3)}
+
+
+def _trust_batch(body: dict) -> dict:
+    wallets = body.get("wallets") or []
+    results = [{"trust": _profile(w.get("wallet", "")), "sig": "0" * 88} for w in wallets]
+    summary = {"requested": len(wallets), "succeeded": len(wallets), "failed": 0}
+    return {
+        "ok": True,
+        "data": {"results": results, "summary": summary},
+        "meta": _meta(3 * len(wallets)),
+    }
+
+
+def _tokens(body: dict) -> dict:
+    tokens = [
+        {"symbol": f"TKN{i}", "chainId": 1 + i % 8, "contractAddress": f"0x{i:040x}"}
+        for i in range(40)
+    ]
+    return {"ok": True, "data": tokens, "meta": _meta()}
+
+
+def _merchants(body: dict) -> dict:
+    merchants = [
+        {"id": f"m_{i}", "name": f"Merchant {i}", "verified": i % 2 == 0, "tokens": []}
+        for i in range(50)
+    ]
+    return {"ok": True, "data": {"merchants": merchants, "total": 50}, "meta": _meta()}
+
+
+def _templates(body: dict) -> dict:
+    templates = {
+        "coinbase_verified_account": {"provider": "Coinbase", "chainId": 8453, "chainName": "Base"},
+        "gitcoin_passport_score": {"provider": "Gitcoin", "chainId": 10, "chainName": "Optimism"},
+    }
+    return {"ok": True, "data": {"templates": templates}, "meta": _meta()}
+
+
+ROUTES: dict[str, Callable[[dict], dict]] = {
+    "POST /attest": _attest,
+    "POST /trust": _trust,
+    "POST /trust/batch": _trust_batch,
+    "GET /tokens": _tokens,
+    "GET /merchants": _merchants,
+    "GET /compliance/templates": _templates,
+}
+
+
+class StubServer:
+    """Threaded HTTP server answering the benchmarked InsumerAPI routes.
+
+    Use as a context manager; :attr:`base_url` is the wrapper's ``base_url``.
+
+    Args:
+        latency: Seconds every response is held back. Default 0.02.
+        jitter: Up to this many seconds are added to or taken from
+            ``latency``, uniformly. Default 0.
+        error_rate: Share of requests (0..1) answered with ``error_status``.
+            Default 0.
+        error_status: HTTP status of injected errors. Default 503.
+        seed: Seed for the jitter and error draws, for repeatable runs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.02,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("StubServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            return max(delay, 0.0), self._random.random() < self.error_rate
+
+    def _count(self, route: str) -> None:
+        with self._lock:
+            self._counts[route] = self._counts.get(route, 0) + 1
+
+    def counts(self) -> dict[str, int]:
+        """Requests received per route, e.g. ``{"POST /attest": 200}``."""
+        with self._lock:
+            return dict(self._counts)
+
+    def start(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this the
+            # client's delayed ACK adds ~40 ms to every kept-alive response.
+            disable_nagle_algorithm = True
+
+            def _handle(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                route = f"{method} {urlsplit(self.path).path}"
+                stub._count(route)
+                delay, fail = stub._draw()
+                if delay:
+                    time.sleep(delay)
+                handler = ROUTES.get(route)
+                if handler is None:
+                    status, body = 404, {"ok": False, "error": {"code": "not_found"}}
+                elif fail:
+                    status, body = stub.error_status, {"ok": False, "error": {"code": "injected"}}
+                else:
+                    status, body = 200, handler(json.loads(raw) if raw else {})
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="insumer-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,35 +1,68 @@
-"""LangChain integration for The Insumer Model On-Chain Verification API."""
-
-from langchain_insumer.tools.acp_discount import InsumerAcpDiscountTool
-from langchain_insumer.tools.attest import InsumerAttestTool
-from langchain_insumer.tools.batch_wallet_trust import InsumerBatchWalletTrustTool
-from langchain_insumer.tools.compliance_templates import InsumerComplianceTemplatesTool
-from langchain_insumer.tools.buy_credits import InsumerBuyCreditsTool
-from langchain_insumer.tools.buy_key import InsumerBuyKeyTool
-from langchain_insumer.tools.buy_merchant_credits import InsumerBuyMerchantCreditsTool
-from langchain_insumer.tools.check_discount import InsumerCheckDiscountTool
-from langchain_insumer.tools.configure_nfts import InsumerConfigureNftsTool
-from langchain_insumer.tools.configure_settings import InsumerConfigureSettingsTool
-from langchain_insumer.tools.configure_tokens import InsumerConfigureTokensTool
-from langchain_insumer.tools.confirm_payment import InsumerConfirmPaymentTool
-from langchain_insumer.tools.create_merchant import InsumerCreateMerchantTool
-from langchain_insumer.tools.credits import InsumerCreditsTool
-from langchain_insumer.tools.get_merchant import InsumerGetMerchantTool
-from langchain_insumer.tools.jwks import InsumerJwksTool
-from langchain_insumer.tools.list_merchants import InsumerListMerchantsTool
-from langchain_insumer.tools.list_tokens import InsumerListTokensTool
-from langchain_insumer.tools.merchant_status import InsumerMerchantStatusTool
-from langchain_insumer.tools.publish_directory import InsumerPublishDirectoryTool
-from langchain_insumer.tools.request_domain_verification import InsumerRequestDomainVerificationTool
-from langchain_insumer.tools.ucp_discount import InsumerUcpDiscountTool
-from langchain_insumer.tools.validate_code import InsumerValidateCodeTool
-from langchain_insumer.tools.verify import InsumerVerifyTool
-from langchain_insumer.tools.verify_domain import InsumerVerifyDomainTool
-from langchain_insumer.tools.wallet_trust import InsumerWalletTrustTool
-from langchain_insumer.wrapper import InsumerAPIWrapper
+"""LangChain integration for The Insumer Model On-Chain Verification API.
+
+Public names are imported on first access (PEP 562): ``import
+langchain_insumer`` loads neither the HTTP stack nor any tool until one is
+used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from langchain_insumer.tools import _TOOL_MODULES
+
+if TYPE_CHECKING:
+    from langchain_insumer.exceptions import (
+        InsumerAPIError,
+        InsumerBudgetExceededError,
+        InsumerRateLimitError,
+        InsumerValidationError,
+    )
+    from langchain_insumer.tools.acp_discount import InsumerAcpDiscountTool
+    from langchain_insumer.tools.attest import InsumerAttestTool
+    from langchain_insumer.tools.batch_wallet_trust import InsumerBatchWalletTrustTool
+    from langchain_insumer.tools.compliance_templates import InsumerComplianceTemplatesTool
+    from langchain_insumer.tools.buy_credits import InsumerBuyCreditsTool
+    from langchain_insumer.tools.buy_key import InsumerBuyKeyTool
+    from langchain_insumer.tools.buy_merchant_credits import InsumerBuyMerchantCreditsTool
+    from langchain_insumer.tools.check_discount import InsumerCheckDiscountTool
+    from langchain_insumer.tools.configure_nfts import InsumerConfigureNftsTool
+    from langchain_insumer.tools.configure_settings import InsumerConfigureSettingsTool
+    from langchain_insumer.tools.configure_tokens import InsumerConfigureTokensTool
+    from langchain_insumer.tools.confirm_payment import InsumerConfirmPaymentTool
+    from langchain_insumer.tools.create_merchant import InsumerCreateMerchantTool
+    from langchain_insumer.tools.credits import InsumerCreditsTool
+    from langchain_insumer.tools.get_merchant import InsumerGetMerchantTool
+    from langchain_insumer.tools.jwks import InsumerJwksTool
+    from langchain_insumer.tools.list_merchants import InsumerListMerchantsTool
+    from langchain_insumer.tools.list_tokens import InsumerListTokensTool
+    from langchain_insumer.tools.merchant_status import InsumerMerchantStatusTool
+    from langchain_insumer.tools.publish_directory import InsumerPublishDirectoryTool
+    from langchain_insumer.tools.request_domain_verification import InsumerRequestDomainVerificationTool
+    from langchain_insumer.tools.ucp_discount import InsumerUcpDiscountTool
+    from langchain_insumer.tools.validate_code import InsumerValidateCodeTool
+    from langchain_insumer.tools.verify import InsumerVerifyTool
+    from langchain_insumer.tools.verify_domain import InsumerVerifyDomainTool
+    from langchain_insumer.tools.wallet_trust import InsumerWalletTrustTool
+    from langchain_insumer.toolkit import InsumerToolkit
+    from langchain_insumer.wrapper import InsumerAPIWrapper
+
+_MODULES = {
+    "InsumerAPIError": "langchain_insumer.exceptions",
+    "InsumerBudgetExceededError": "langchain_insumer.exceptions",
+    "InsumerRateLimitError": "langchain_insumer.exceptions",
+    "InsumerValidationError": "langchain_insumer.exceptions",
+    "InsumerAPIWrapper": "langchain_insumer.wrapper",
+    "InsumerToolkit": "langchain_insumer.toolkit",
+    **{name: f"langchain_insumer.tools.{module}" for name, module in _TOOL_MODULES.items()},
+}
 
 __all__ = [
+    "InsumerAPIError",
     "InsumerAPIWrapper",
+    "InsumerBudgetExceededError",
+    "InsumerRateLimitError",
+    "InsumerToolkit",
+    "InsumerValidationError",
     "InsumerAcpDiscountTool",
     "InsumerAttestTool",
     "InsumerBatchWalletTrustTool",
@@ -57,3 +90,16 @@ __all__ = [
     "InsumerVerifyDomainTool",
     "InsumerWalletTrustTool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,259 @@
+"""Pluggable storage for caches shared across wrappers and processes.
+
+An ``InsumerAPIWrapper`` created with ``cache_backend=...`` writes the JWKS,
+the token registry, merchant profiles and unexpired attestations through to
+the backend, and reads them back when its in-memory caches are cold. With
+:class:`SQLiteBackend`, every worker process on a host shares one file and a
+restarted worker starts warm.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+
+class CacheBackend(ABC):
+    """Interface for a namespaced key-value store with optional expiry.
+
+    Values are JSON-serializable. ``expires_at`` is a Unix timestamp; expired
+    entries are never returned. Implementations must be thread-safe and
+    bound their own size.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the stored value, or None if absent or expired."""
+
+    @abstractmethod
+    def set(
+        self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """Store ``value`` until ``expires_at`` (forever if None)."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove one entry, if present."""
+
+    @abstractmethod
+    def items(self, namespace: str) -> list[tuple[str, Any, Optional[float]]]:
+        """Return ``(key, value, expires_at)`` for every unexpired entry in ``namespace``."""
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove every entry, or every entry in ``namespace``."""
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """In-process :class:`CacheBackend`, LRU-bounded to ``max_entries``.
+
+    Useful to share caches between wrappers in one process, and in tests.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[tuple[str, str], tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._data[(namespace, key)]
+                return None
+            self._data.move_to_end((namespace, key))
+            return entry[0]
+
+    def set(
+        self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            self._data[(namespace, key)] = (value, expires_at)
+            self._data.move_to_end((namespace, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def items(self, namespace: str) -> list[tuple[str, Any, Optional[float]]]:
+        now = time.time()
+        with self._lock:
+            return [
+                (key, value, expires_at)
+                for (ns, key), (value, expires_at) in self._data.items()
+                if ns == namespace and (expires_at is None or expires_at > now)
+            ]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._data.clear()
+            else:
+                for entry in [k for k in self._data if k[0] == namespace]:
+                    del self._data[entry]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at);
+"""
+
+
+class SQLiteBackend(CacheBackend):
+    """:class:`CacheBackend` in a SQLite file shared by every process on the host.
+
+    The database runs in WAL mode, so readers in one process never block on
+    a writer in another. Each thread gets its own connection. A read records
+    when the entry was last read at most once per ``touch_interval``
+    seconds, so most reads write nothing. The table is counted only once
+    this process's writes since the last count could have filled it; when
+    it has grown past ``max_entries``, expired entries are purged first and
+    then the least recently read ones, down to 90% of ``max_entries``.
+
+    Args:
+        path: Database file; created if missing.
+        max_entries: Maximum stored entries across all namespaces.
+        busy_timeout: Seconds to wait for another process's write lock.
+        touch_interval: Resolution in seconds of the recency used for
+            eviction. Default 60.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        max_entries: int = 10000,
+        busy_timeout: float = 5.0,
+        touch_interval: float = 60.0,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Writes this process may make before the table could be full.
+        self._headroom = 0
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row[1] is not None and row[1] <= now:
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                (namespace, key, now),
+            )
+            return None
+        if now - row[2] >= self.touch_interval:
+            conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+        return json.loads(row[0])
+
+    def set(
+        self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, separators=(",", ":")), expires_at, now),
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        with self._lock:
+            self._headroom -= 1
+            if self._headroom >= 0:
+                return
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_entries:
+            count -= conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+            # Evict below the limit so the next count is a batch of writes away.
+            keep = self.max_entries - self.max_entries // 10
+            if count > keep:
+                conn.execute(
+                    "DELETE FROM cache WHERE rowid IN"
+                    " (SELECT rowid FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (count - keep,),
+                )
+                count = keep
+        with self._lock:
+            self._headroom = self.max_entries - count
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+
+    def items(self, namespace: str) -> list[tuple[str, Any, Optional[float]]]:
+        rows = self._conn().execute(
+            "SELECT key, value, expires_at FROM cache"
+            " WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)"
+            " ORDER BY accessed_at",
+            (namespace, time.time()),
+        ).fetchall()
+        return [(key, json.loads(value), expires_at) for key, value, expires_at in rows]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            self._conn().execute("DELETE FROM cache")
+        else:
+            self._conn().execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+    def __len__(self) -> int:
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close every connection opened by this backend."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,214 @@
+"""Coalesce concurrent ``wallet_trust`` calls into ``/trust/batch`` requests."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+def _split_batch_response(resp: dict, size: int) -> list[dict]:
+    """Turn one /trust/batch response into ``size`` /trust-shaped responses."""
+    if not resp.get("ok"):
+        return [resp] * size
+    data = resp.get("data", resp)
+    results = data.get("results", [])
+    meta = resp.get("meta") or {}
+    entries = [
+        results[i] if i < len(results) else {
+            "error": {"code": "missing_result", "message": "No result returned for wallet"}
+        }
+        for i in range(size)
+    ]
+    charged = meta.get("creditsCharged")
+    succeeded = sum(1 for e in entries if not e.get("error"))
+    # Whole credits per wallet that add up to the batch's; the first
+    # success takes the remainder and failed wallets cost nothing.
+    share, remainder = divmod(charged, succeeded) if charged is not None and succeeded else (0, 0)
+    out: list[dict] = []
+    for entry in entries:
+        wallet_meta = dict(meta)
+        if entry.get("error"):
+            if charged is not None:
+                wallet_meta["creditsCharged"] = 0
+            out.append({"ok": False, "error": entry["error"], "meta": wallet_meta})
+            continue
+        if charged is not None:
+            wallet_meta["creditsCharged"] = share + remainder
+            remainder = 0
+        out.append({"ok": True, "data": entry.get("data", entry), "meta": wallet_meta})
+    return out
+
+
+class _Pending:
+    __slots__ = ("body", "event", "result", "error")
+
+    def __init__(self, body: dict) -> None:
+        self.body = body
+        self.event = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class TrustCoalescer:
+    """Collect ``/trust`` requests for a short window and send them as one batch.
+
+    The first caller to arrive for a given ``proof`` setting opens a batch
+    and waits ``window`` seconds; callers arriving meanwhile join it. The
+    batch is sent when the window closes or when it reaches ``max_batch``
+    wallets, whichever is first, and each caller gets back a ``/trust``
+    shaped response for its own wallet. A batch of one is sent to ``/trust``
+    directly. No extra threads are used: the opening caller does the waiting.
+
+    Args:
+        send_single: Sends one ``/trust`` body (``wallet`` + chain wallets + proof).
+        send_batch: Sends a list of wallet dicts to ``/trust/batch`` with ``proof``.
+        window: Seconds to hold a batch open.
+        max_batch: Maximum wallets per batch.
+    """
+
+    def __init__(
+        self,
+        send_single: Callable[[dict], dict],
+        send_batch: Callable[[list[dict], Optional[str]], dict],
+        window: float,
+        max_batch: int = 10,
+    ) -> None:
+        self.send_single = send_single
+        self.send_batch = send_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open: dict[Optional[str], list[_Pending]] = {}
+
+    def submit(self, body: dict, proof: Optional[str] = None) -> dict:
+        """Queue a ``/trust`` body and block until its result is available."""
+        item = _Pending(body)
+        with self._lock:
+            batch = self._open.get(proof)
+            leader = batch is None
+            if leader:
+                batch = self._open[proof] = []
+            batch.append(item)
+            full = len(batch) >= self.max_batch
+            if full:
+                del self._open[proof]
+        if full:
+            self._flush(batch, proof)
+        elif leader:
+            time.sleep(self.window)
+            with self._lock:
+                mine = self._open.get(proof) is batch
+                if mine:
+                    del self._open[proof]
+            if mine:
+                self._flush(batch, proof)
+        item.event.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result  # type: ignore[return-value]
+
+    def _flush(self, batch: list[_Pending], proof: Optional[str]) -> None:
+        try:
+            if len(batch) == 1:
+                body = dict(batch[0].body)
+                if proof:
+                    body["proof"] = proof
+                results = [self.send_single(body)]
+            else:
+                resp = self.send_batch([p.body for p in batch], proof)
+                results = _split_batch_response(resp, len(batch))
+            for item, result in zip(batch, results):
+                item.result = result
+        except BaseException as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.event.set()
+
+
+class AsyncTrustCoalescer:
+    """Event-loop counterpart of :class:`TrustCoalescer`.
+
+    Batches are kept per running loop, so one coalescer can be shared by
+    wrappers used from several loops.
+    """
+
+    def __init__(
+        self,
+        send_single: Callable[[dict], Awaitable[dict]],
+        send_batch: Callable[[list[dict], Optional[str]], Awaitable[dict]],
+        window: float,
+        max_batch: int = 10,
+    ) -> None:
+        self.send_single = send_single
+        self.send_batch = send_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._open: dict[Any, list[tuple[dict, asyncio.Future]]] = {}
+        # Flushes running as tasks, referenced until they finish.
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(
+        self, batch: list[tuple[dict, asyncio.Future]], proof: Optional[str]
+    ) -> asyncio.Task:
+        """Send ``batch`` in a task of its own, so one cancelled caller cannot strand the rest."""
+        task = asyncio.get_running_loop().create_task(self._flush(batch, proof))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def submit(self, body: dict, proof: Optional[str] = None) -> dict:
+        """Queue a ``/trust`` body and wait for its result."""
+        loop = asyncio.get_running_loop()
+        key = (loop, proof)
+        future = loop.create_future()
+        batch = self._open.get(key)
+        leader = batch is None
+        if leader:
+            batch = self._open[key] = []
+        batch.append((body, future))
+        if len(batch) >= self.max_batch:
+            del self._open[key]
+            await asyncio.shield(self._spawn(batch, proof))
+        elif leader:
+            try:
+                await asyncio.sleep(self.window)
+            except asyncio.CancelledError:
+                # Nothing was sent yet: close the batch and send it for the
+                # callers that joined it.
+                if self._open.get(key) is batch:
+                    del self._open[key]
+                    followers = [b for b in batch if b[1] is not future]
+                    if followers:
+                        self._spawn(followers, proof)
+                future.cancel()
+                raise
+            if self._open.get(key) is batch:
+                del self._open[key]
+                await asyncio.shield(self._spawn(batch, proof))
+        return await future
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future]], proof: Optional[str]) -> None:
+        try:
+            if len(batch) == 1:
+                body = dict(batch[0][0])
+                if proof:
+                    body["proof"] = proof
+                results = [await self.send_single(body)]
+            else:
+                resp = await self.send_batch([b for b, _ in batch], proof)
+                results = _split_batch_response(resp, len(batch))
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except BaseException as e:
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
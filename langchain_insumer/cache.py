@@ -0,0 +1,215 @@
+"""In-memory caches used by the API wrapper."""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts."""
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ExpiringLRUCache:
+    """Thread-safe LRU cache whose entries expire at an absolute wall-clock time.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used entry is
+            evicted when full.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if time.time() >= expires_at:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        """Store ``value`` until the Unix timestamp ``expires_at``."""
+        if expires_at <= time.time() or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return ``hits``, ``misses``, ``evictions`` and current ``size``."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+            }
+
+
+class StaleWhileRevalidateCache:
+    """LRU cache that serves stale entries while refreshing them in the background.
+
+    Each lookup passes a ``soft_ttl`` and a ``hard_ttl``. An entry younger
+    than ``soft_ttl`` is returned as is. An entry between the two TTLs is
+    returned immediately and a refresh is started in the background (one per
+    key at a time, on a small thread pool or, for :meth:`aget`, as a task on
+    the running loop). An entry older than ``hard_ttl``, or a missing one, is
+    fetched before returning. Responses with ``ok: false`` are returned but
+    never stored, and a failed background refresh keeps the stale entry.
+
+    Args:
+        maxsize: Maximum number of entries.
+        max_workers: Threads available for background refreshes.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_workers: int = 2) -> None:
+        self.maxsize = maxsize
+        self.max_workers = max_workers
+        self._data: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _lookup(self, key: str, soft_ttl: float, hard_ttl: float) -> tuple[Optional[Any], bool]:
+        """Return ``(value or None, needs_background_refresh)``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age >= hard_ttl:
+                del self._data[key]
+                self.misses += 1
+                return None, False
+            self._data.move_to_end(key)
+            if age < soft_ttl:
+                self.hits += 1
+                return value, False
+            self.stale_hits += 1
+            if key in self._refreshing:
+                return value, False
+            self._refreshing.add(key)
+            return value, True
+
+    def _store(self, key: str, value: Any) -> None:
+        if isinstance(value, dict) and value.get("ok") is False:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]) -> None:
+        try:
+            self._store(key, fetch())
+            self.refreshes += 1
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _arefresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._store(key, await fetch())
+            self.refreshes += 1
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: str, fetch: Callable[[], Any], soft_ttl: float, hard_ttl: float) -> Any:
+        """Return the value for ``key``, fetching or revalidating it as needed."""
+        value, refresh = self._lookup(key, soft_ttl, hard_ttl)
+        if value is None:
+            value = fetch()
+            self._store(key, value)
+        elif refresh:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="insumer-swr"
+                    )
+                executor = self._executor
+            executor.submit(self._refresh, key, fetch)
+        return value
+
+    async def aget(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], soft_ttl: float, hard_ttl: float
+    ) -> Any:
+        """Async version of :meth:`get`."""
+        value, refresh = self._lookup(key, soft_ttl, hard_ttl)
+        if value is None:
+            value = await fetch()
+            self._store(key, value)
+        elif refresh:
+            # Hold a reference so the task is not garbage collected mid-flight.
+            task = asyncio.get_running_loop().create_task(self._arefresh(key, fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def close(self) -> None:
+        """Stop the background refresh threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return ``hits``, ``stale_hits``, ``misses``, ``refreshes``, ``refresh_errors`` and ``size``."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "size": len(self._data),
+            }
@@ -0,0 +1,399 @@
+"""Client-side credit accounting and budget enforcement.
+
+Costs are predicted from the request before it is sent (see
+:func:`predict_cost`) and settled from the response's ``meta.creditsCharged``,
+so the ledger never needs a ``/credits`` round trip.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Any, Iterator, Optional
+
+from langchain_insumer.exceptions import InsumerAPIError, InsumerBudgetExceededError
+
+# Credits per request as (standard, proof="merkle").
+CREDIT_COSTS: dict[str, tuple[int, int]] = {
+    "POST /attest": (1, 2),
+    "POST /trust": (3, 6),
+    "POST /verify": (1, 1),
+    "POST /acp/discount": (1, 1),
+    "POST /ucp/discount": (1, 1),
+}
+# Credits per wallet in the request's ``wallets`` as (standard, proof="merkle").
+PER_WALLET_CREDIT_COSTS: dict[str, tuple[int, int]] = {
+    "POST /trust/batch": (3, 6),
+}
+
+# Endpoints charged to the credits of the merchant named by ``merchantId``
+# rather than to the API key's.
+MERCHANT_CREDIT_ENDPOINTS = frozenset({"POST /acp/discount", "POST /ucp/discount"})
+# Balance pool of the API key's own credits.
+KEY_POOL = "key"
+
+# Seconds between budget checks while an async call is queued.
+_ASYNC_POLL_INTERVAL = 0.05
+
+_current_tool: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "insumer_credit_tool", default=None
+)
+_current_tag: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "insumer_credit_tag", default=None
+)
+
+
+def predict_cost(endpoint: str, body: Any) -> int:
+    """Credits a request to ``endpoint`` with ``body`` is expected to cost.
+
+    Args:
+        endpoint: Endpoint name, e.g. ``"POST /trust/batch"``.
+        body: JSON request body.
+
+    Returns:
+        Predicted credits; 0 for free endpoints.
+    """
+    merkle = isinstance(body, dict) and body.get("proof") == "merkle"
+    costs = CREDIT_COSTS.get(endpoint)
+    if costs is not None:
+        return costs[merkle]
+    costs = PER_WALLET_CREDIT_COSTS.get(endpoint)
+    if costs is not None and isinstance(body, dict):
+        return costs[merkle] * len(body.get("wallets") or ())
+    return 0
+
+
+def credit_pool(endpoint: str, body: Any) -> str:
+    """Balance pool a request to ``endpoint`` is charged to.
+
+    Returns:
+        ``"merchant:<merchantId>"`` for ACP/UCP discount checks, which spend
+        merchant credits, else :data:`KEY_POOL`.
+    """
+    if endpoint in MERCHANT_CREDIT_ENDPOINTS and isinstance(body, dict) and body.get("merchantId"):
+        return f"merchant:{body['merchantId']}"
+    return KEY_POOL
+
+
+@contextlib.contextmanager
+def credit_tag(tag: str) -> Iterator[None]:
+    """Attribute credits spent inside the block (this thread or task) to ``tag``.
+
+    Example:
+        .. code-block:: python
+
+            with credit_tag("user-42"):
+                agent.invoke({"input": "..."})
+    """
+    token = _current_tag.set(tag)
+    try:
+        yield
+    finally:
+        _current_tag.reset(token)
+
+
+@contextlib.contextmanager
+def tool_scope(name: str, tag: Optional[str] = None) -> Iterator[None]:
+    """Attribute credits spent inside the block to the tool ``name``.
+
+    ``tag``, if given, replaces the caller tag for the block as well.
+    """
+    tool_token = _current_tool.set(name)
+    tag_token = _current_tag.set(tag) if tag is not None else None
+    try:
+        yield
+    finally:
+        if tag_token is not None:
+            _current_tag.reset(tag_token)
+        _current_tool.reset(tool_token)
+
+
+@contextlib.contextmanager
+def unattributed() -> Iterator[None]:
+    """Attribute credits spent inside the block to no tool or tag.
+
+    For a request sent on behalf of several callers, such as a coalesced
+    ``/trust/batch``: each caller then attributes its own share, in its own
+    context, with :meth:`CreditLedger.attribute`.
+    """
+    tool_token = _current_tool.set(None)
+    tag_token = _current_tag.set(None)
+    try:
+        yield
+    finally:
+        _current_tag.reset(tag_token)
+        _current_tool.reset(tool_token)
+
+
+class Reservation:
+    """Credits held for one request until it is settled."""
+
+    __slots__ = ("endpoint", "cost", "tool", "tag", "pool")
+
+    def __init__(
+        self,
+        endpoint: str,
+        cost: int,
+        tool: Optional[str],
+        tag: Optional[str],
+        pool: str = KEY_POOL,
+    ) -> None:
+        self.endpoint = endpoint
+        self.cost = cost
+        self.tool = tool
+        self.tag = tag
+        self.pool = pool
+
+
+def _charged(body: Any) -> Optional[int]:
+    meta = body.get("meta") if isinstance(body, dict) else None
+    if isinstance(meta, dict) and isinstance(meta.get("creditsCharged"), int):
+        return meta["creditsCharged"]
+    return None
+
+
+def _charged_or_predicted(body: Any, cost: int) -> int:
+    charged = _charged(body)
+    if charged is None:
+        ok = isinstance(body, dict) and body.get("ok") is not False
+        charged = cost if ok else 0
+    return charged
+
+
+def _remaining(body: Any) -> Optional[int]:
+    meta = body.get("meta") if isinstance(body, dict) else None
+    if isinstance(meta, dict) and isinstance(meta.get("creditsRemaining"), int):
+        return meta["creditsRemaining"]
+    return None
+
+
+class CreditLedger:
+    """Thread-safe record of credits spent, with an optional budget.
+
+    Before a credit-charging request is sent, its predicted cost is
+    reserved. The request is refused, raising
+    :class:`~langchain_insumer.exceptions.InsumerBudgetExceededError`, if the
+    reservation would take spending past ``budget`` or past the last known
+    balance of the pool it is charged to (``meta.creditsRemaining`` of an
+    earlier response from that pool; see :func:`credit_pool`). The API key
+    and each merchant have a pool of their own. With
+    ``wait`` set, the call is queued instead, for up to ``wait`` seconds,
+    until in-flight requests settle for less than predicted or, with
+    ``window`` set, earlier spending ages out of the window.
+
+    When the response arrives, the reservation is replaced by
+    ``meta.creditsCharged``. ``rpc_failure`` and other error responses
+    therefore cost nothing, and a partially failed batch costs only its
+    successes. A request that got no response may still have been charged,
+    so it is counted at its predicted cost.
+
+    Spending is broken down per endpoint, per tool (when called through an
+    Insumer tool) and per caller tag (see :func:`credit_tag`). One ledger
+    can be shared by several wrappers.
+
+    Args:
+        budget: Maximum credits to spend, or None for no limit.
+        window: Apply ``budget`` to a rolling window of this many seconds
+            (e.g. 3600 for credits per hour) instead of the ledger's lifetime.
+        wait: Seconds to queue a call that does not fit before refusing it.
+            Default 0: refuse at once.
+    """
+
+    def __init__(
+        self, budget: Optional[int] = None, window: Optional[float] = None, wait: float = 0.0
+    ) -> None:
+        self.budget = budget
+        self.window = window
+        self.wait = wait
+        self._cond = threading.Condition()
+        self._spent = 0
+        self._reserved = 0
+        self._refused = 0
+        # Last ``meta.creditsRemaining`` and in-flight reservations per pool.
+        self._balances: dict[str, int] = {}
+        self._pool_reserved: dict[str, int] = {}
+        # (settled_at, credits) still inside ``window``.
+        self._recent: deque[tuple[float, int]] = deque()
+        self._recent_total = 0
+        self._by_endpoint: dict[str, dict[str, int]] = {}
+        self._by_tool: dict[str, dict[str, int]] = {}
+        self._by_tag: dict[str, dict[str, int]] = {}
+
+    def _expire(self, now: float) -> None:
+        if self.window is None:
+            return
+        cutoff = now - self.window
+        while self._recent and self._recent[0][0] <= cutoff:
+            self._recent_total -= self._recent.popleft()[1]
+
+    def _window_spent(self) -> int:
+        return self._spent if self.window is None else self._recent_total
+
+    def _shortfall(self, cost: int, pool: str) -> Optional[tuple[str, int]]:
+        """Why ``cost`` does not fit now, and the credits that are available."""
+        if self.budget is not None:
+            available = self.budget - self._window_spent() - self._reserved
+            if cost > available:
+                return "budget", available
+        balance = self._balances.get(pool)
+        if balance is not None:
+            available = balance - self._pool_reserved.get(pool, 0)
+            if cost > available:
+                return "balance", available
+        return None
+
+    def _next_expiry(self, now: float) -> Optional[float]:
+        if self.window is None or not self._recent:
+            return None
+        return self._recent[0][0] + self.window - now
+
+    def _try_reserve(self, cost: int, pool: str) -> Optional[tuple[str, int]]:
+        self._expire(time.monotonic())
+        shortfall = self._shortfall(cost, pool)
+        if shortfall is None:
+            self._reserved += cost
+            self._pool_reserved[pool] = self._pool_reserved.get(pool, 0) + cost
+        return shortfall
+
+    def _refuse(
+        self, endpoint: str, cost: int, shortfall: tuple[str, int]
+    ) -> InsumerBudgetExceededError:
+        self._refused += 1
+        reason, available = shortfall
+        return InsumerBudgetExceededError(endpoint, cost, max(available, 0), reason)
+
+    def reserve(self, endpoint: str, cost: int, pool: str = KEY_POOL) -> Reservation:
+        """Hold ``cost`` credits of ``pool`` for a request, queueing up to ``wait`` seconds.
+
+        Raises:
+            InsumerBudgetExceededError: If the credits are not available in time.
+        """
+        deadline = time.monotonic() + self.wait
+        with self._cond:
+            while True:
+                shortfall = self._try_reserve(cost, pool)
+                if shortfall is None:
+                    break
+                now = time.monotonic()
+                if now >= deadline:
+                    raise self._refuse(endpoint, cost, shortfall)
+                timeout = deadline - now
+                expiry = self._next_expiry(now)
+                self._cond.wait(timeout if expiry is None else min(timeout, expiry))
+        return Reservation(endpoint, cost, _current_tool.get(), _current_tag.get(), pool)
+
+    async def areserve(self, endpoint: str, cost: int, pool: str = KEY_POOL) -> Reservation:
+        """Coroutine counterpart of :meth:`reserve` that never blocks the loop."""
+        deadline = time.monotonic() + self.wait
+        while True:
+            with self._cond:
+                shortfall = self._try_reserve(cost, pool)
+                if shortfall is None:
+                    return Reservation(
+                        endpoint, cost, _current_tool.get(), _current_tag.get(), pool
+                    )
+                now = time.monotonic()
+                if now >= deadline:
+                    raise self._refuse(endpoint, cost, shortfall)
+            await asyncio.sleep(min(deadline - now, _ASYNC_POLL_INTERVAL))
+
+    def settle(self, reservation: Reservation, body: Any, track_balance: bool = True) -> int:
+        """Replace a reservation with what the response says was charged.
+
+        ``meta.creditsRemaining`` becomes the balance of the reservation's
+        pool. ``track_balance=False`` ignores it, for responses from keys
+        other than the one the ledger's balance is for.
+
+        Returns:
+            Credits recorded: ``meta.creditsCharged``, else the prediction
+            for a successful response and 0 for an error response.
+        """
+        charged = _charged_or_predicted(body, reservation.cost)
+        self._record(reservation, charged, _remaining(body) if track_balance else None)
+        return charged
+
+    def attribute(self, body: Any, cost: int) -> int:
+        """Attribute one caller's share of an :func:`unattributed` request.
+
+        The share, the ``meta.creditsCharged`` of ``body`` (else ``cost`` for
+        a successful response and 0 for an error response), is counted for
+        the current tool and tag. Totals are unchanged: the request itself
+        was already settled.
+
+        Returns:
+            Credits attributed.
+        """
+        charged = _charged_or_predicted(body, cost)
+        with self._cond:
+            self._tally(_current_tool.get(), _current_tag.get(), charged)
+        return charged
+
+    def settle_error(self, reservation: Reservation, error: BaseException) -> int:
+        """Settle a reservation whose request raised ``error``."""
+        if isinstance(error, InsumerAPIError):
+            return self.settle(reservation, error.body)
+        # No response: the request may have been processed and charged.
+        self._record(reservation, reservation.cost, None)
+        return reservation.cost
+
+    def _record(self, reservation: Reservation, charged: int, balance: Optional[int]) -> None:
+        with self._cond:
+            self._reserved -= reservation.cost
+            self._pool_reserved[reservation.pool] -= reservation.cost
+            self._spent += charged
+            if self.window is not None and charged:
+                self._recent.append((time.monotonic(), charged))
+                self._recent_total += charged
+            if balance is not None:
+                self._balances[reservation.pool] = balance
+            self._tally(reservation.tool, reservation.tag, charged, reservation.endpoint)
+            self._cond.notify_all()
+
+    def _tally(
+        self,
+        tool: Optional[str],
+        tag: Optional[str],
+        charged: int,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        for table, key in (
+            (self._by_endpoint, endpoint),
+            (self._by_tool, tool),
+            (self._by_tag, tag),
+        ):
+            if key is not None:
+                entry = table.setdefault(key, {"calls": 0, "credits": 0})
+                entry["calls"] += 1
+                entry["credits"] += charged
+
+    def stats(self) -> dict:
+        """Return spending totals and breakdowns.
+
+        Returns:
+            Dict with ``spent`` (lifetime), ``window_spent``, ``reserved``
+            (held by requests in flight), ``budget``, ``available`` (None
+            without a budget), ``balance`` (the API key's last
+            ``meta.creditsRemaining``), ``balances`` (the same per pool,
+            merchant pools included), ``refused``, and ``by_endpoint``/``by_tool``/``by_tag``
+            tables of ``calls`` and ``credits``.
+        """
+        with self._cond:
+            self._expire(time.monotonic())
+            window_spent = self._window_spent()
+            return {
+                "spent": self._spent,
+                "window_spent": window_spent,
+                "reserved": self._reserved,
+                "budget": self.budget,
+                "available": (
+                    None if self.budget is None else self.budget - window_spent - self._reserved
+                ),
+                "balance": self._balances.get(KEY_POOL),
+                "balances": dict(self._balances),
+                "refused": self._refused,
+                "by_endpoint": {k: dict(v) for k, v in self._by_endpoint.items()},
+                "by_tool": {k: dict(v) for k, v in self._by_tool.items()},
+                "by_tag": {k: dict(v) for k, v in self._by_tag.items()},
+            }
@@ -0,0 +1,365 @@
+"""Prefetching pagination and an in-memory snapshot of the merchant directory."""
+
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
+
+from langchain_insumer.exceptions import InsumerAPIError
+from langchain_insumer.registry import BackgroundRefresh
+
+# Server-side cap on merchants per /merchants page.
+MERCHANTS_MAX_PAGE = 200
+
+
+def _merchant_entries(resp: dict) -> list[dict]:
+    """The merchants on one ``/merchants`` page (a list, or ``{"merchants": [...]}``)."""
+    data = resp.get("data", resp)
+    if isinstance(data, dict):
+        data = data.get("merchants", [])
+    return [entry for entry in data or [] if isinstance(entry, dict)]
+
+
+def _total(resp: dict) -> Optional[int]:
+    """Directory size if the page reports it."""
+    for source in (resp.get("data"), resp.get("meta")):
+        if isinstance(source, dict) and isinstance(source.get("total"), int):
+            return source["total"]
+    return None
+
+
+def _check_page(resp: dict) -> dict:
+    if resp.get("ok") is False:
+        raise InsumerAPIError(200, resp, "GET /merchants")
+    return resp
+
+
+def merchant_id(merchant: dict) -> Optional[str]:
+    return merchant.get("id") or merchant.get("merchantId")
+
+
+def merchant_tokens(merchant: dict) -> set[str]:
+    """Upper-case symbols of every token a merchant accepts."""
+    found: list[Any] = []
+    for key in ("tokens", "acceptedTokens", "partnerTokens"):
+        value = merchant.get(key)
+        if isinstance(value, list):
+            found.extend(value)
+    if merchant.get("ownToken"):
+        found.append(merchant["ownToken"])
+    symbols = set()
+    for token in found:
+        symbol = token.get("symbol") if isinstance(token, dict) else token
+        if isinstance(symbol, str) and symbol:
+            symbols.add(symbol.upper())
+    return symbols
+
+
+def merchant_verified(merchant: dict) -> bool:
+    return bool(merchant.get("verified", merchant.get("domainVerified", False)))
+
+
+def iter_pages(
+    fetch_page: Callable[[int], dict], page_size: int, prefetch: int
+) -> Iterator[dict]:
+    """Yield every entry of a paginated listing, fetching pages ahead concurrently.
+
+    ``prefetch`` pages are kept in flight on a thread pool; entries are
+    yielded in directory order. Iteration ends at the first short page (or
+    at the reported ``total``), and pages fetched past the end are dropped.
+    """
+    prefetch = max(prefetch, 1)
+    pool = ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        pending = deque(pool.submit(fetch_page, i * page_size) for i in range(prefetch))
+        next_offset = prefetch * page_size
+        total: Optional[int] = None
+        while pending:
+            resp = _check_page(pending.popleft().result())
+            entries = _merchant_entries(resp)
+            yield from entries
+            total = total if total is not None else _total(resp)
+            if len(entries) < page_size:
+                return
+            if total is None or next_offset < total:
+                pending.append(pool.submit(fetch_page, next_offset))
+                next_offset += page_size
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[dict]], page_size: int, prefetch: int
+) -> AsyncIterator[dict]:
+    """Async version of :func:`iter_pages`; in-flight pages are tasks on the running loop."""
+    prefetch = max(prefetch, 1)
+    pending = deque(
+        asyncio.ensure_future(fetch_page(i * page_size)) for i in range(prefetch)
+    )
+    next_offset = prefetch * page_size
+    total: Optional[int] = None
+    try:
+        while pending:
+            resp = _check_page(await pending.popleft())
+            entries = _merchant_entries(resp)
+            for entry in entries:
+                yield entry
+            total = total if total is not None else _total(resp)
+            if len(entries) < page_size:
+                return
+            if total is None or next_offset < total:
+                pending.append(asyncio.ensure_future(fetch_page(next_offset)))
+                next_offset += page_size
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class MerchantDirectory(BackgroundRefresh):
+    """Local snapshot of the public merchant directory.
+
+    Merchants are indexed by id, by accepted token symbol and by verified
+    flag, so filtered listings are answered from memory. :meth:`refresh`
+    walks the directory with a prefetching iterator and applies only what
+    changed: new and modified listings are re-indexed, vanished merchants are
+    dropped, and the full profile cached by :meth:`get_merchant` for a
+    merchant is discarded only when its listing changed or is absent from
+    the new walk. Loads are serialized across threads and event loops: an
+    async load walks the directory without blocking its loop, then applies
+    the walk under the same lock as sync loads.
+
+    Args:
+        iter_all: Returns an iterator over every merchant listing.
+        fetch_profile: Fetches one merchant's full ``/merchants/{id}`` response.
+        aiter_all: Async counterpart of ``iter_all``.
+        afetch_profile: Async counterpart of ``fetch_profile``.
+        refresh_interval: Seconds between background refreshes.
+        on_change: Called with a merchant id when its listing changes or
+            disappears, e.g. to drop copies of its profile kept elsewhere.
+    """
+
+    _thread_name = "insumer-merchant-directory"
+
+    def __init__(
+        self,
+        iter_all: Callable[[], Iterator[dict]],
+        fetch_profile: Callable[[str], dict],
+        aiter_all: Optional[Callable[[], AsyncIterator[dict]]] = None,
+        afetch_profile: Optional[Callable[[str], Awaitable[dict]]] = None,
+        refresh_interval: float = 600.0,
+        on_change: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        super().__init__(refresh_interval)
+        self.on_change = on_change
+        self.iter_all = iter_all
+        self.fetch_profile = fetch_profile
+        self.aiter_all = aiter_all
+        self.afetch_profile = afetch_profile
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._aload_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._merchants: dict[str, dict] = {}
+        self._by_token: dict[str, set[str]] = {}
+        self._by_verified: dict[bool, set[str]] = {True: set(), False: set()}
+        self._profiles: dict[str, dict] = {}
+        self.loaded_at: Optional[float] = None
+        self.refreshes = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def _unindex(self, mid: str) -> None:
+        old = self._merchants.pop(mid)
+        for symbol in merchant_tokens(old):
+            ids = self._by_token.get(symbol)
+            if ids is not None:
+                ids.discard(mid)
+                if not ids:
+                    del self._by_token[symbol]
+        self._by_verified[merchant_verified(old)].discard(mid)
+        self._profiles.pop(mid, None)
+
+    def _index(self, mid: str, merchant: dict) -> None:
+        self._merchants[mid] = merchant
+        for symbol in merchant_tokens(merchant):
+            self._by_token.setdefault(symbol, set()).add(mid)
+        self._by_verified[merchant_verified(merchant)].add(mid)
+
+    def _upsert(self, merchant: dict, changes: dict[str, int]) -> Optional[str]:
+        mid = merchant_id(merchant)
+        if mid is None:
+            return None
+        with self._lock:
+            old = self._merchants.get(mid)
+            if old == merchant:
+                changes["unchanged"] += 1
+                # Re-insert to keep directory order.
+                self._merchants[mid] = self._merchants.pop(mid)
+                return mid
+            if old is not None:
+                self._unindex(mid)
+                changes["updated"] += 1
+            else:
+                changes["added"] += 1
+            self._index(mid, merchant)
+        if old is not None:
+            self._changed([mid])
+        return mid
+
+    def _finish(self, seen: set[str], changes: dict[str, int]) -> dict[str, int]:
+        with self._lock:
+            removed = [m for m in self._merchants if m not in seen]
+            for mid in removed:
+                self._unindex(mid)
+            changes["removed"] += len(removed)
+            # Profiles fetched for ids the listing never had.
+            orphans = [m for m in self._profiles if m not in seen]
+            for mid in orphans:
+                del self._profiles[mid]
+            self.loaded_at = time.time()
+            self.refreshes += 1
+        self._changed(removed + orphans)
+        return changes
+
+    def _changed(self, ids: list[str]) -> None:
+        # Called outside self._lock: on_change may do backend I/O.
+        if self.on_change is not None:
+            for mid in ids:
+                self.on_change(mid)
+
+    def _apply(self, merchants: Iterable[dict]) -> dict[str, int]:
+        with self._load_lock:
+            changes = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            seen = {mid for mid in (self._upsert(m, changes) for m in merchants) if mid}
+            return self._finish(seen, changes)
+
+    def load(self) -> dict[str, int]:
+        """Walk the directory and apply changes since the last load.
+
+        Returns:
+            Counts of merchants ``added``, ``updated``, ``removed`` and ``unchanged``.
+        """
+        with self._load_lock:
+            return self._apply(self.iter_all())
+
+    refresh = load
+
+    def _aload_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._aload_locks.get(loop)
+        if lock is None:
+            lock = self._aload_locks[loop] = asyncio.Lock()
+        return lock
+
+    async def aload(self) -> dict[str, int]:
+        """Async version of :meth:`load`."""
+        async with self._aload_lock():
+            return await self._aload()
+
+    async def _aload(self) -> dict[str, int]:
+        loop = asyncio.get_running_loop()
+        if self.aiter_all is None:
+            return await loop.run_in_executor(None, self.load)
+        merchants = [merchant async for merchant in self.aiter_all()]
+        # Applied under the same lock as sync loads, taken off the event loop.
+        return await loop.run_in_executor(None, self._apply, merchants)
+
+    def _ensure_loaded(self) -> None:
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load()
+
+    async def _aensure_loaded(self) -> None:
+        if not self.loaded:
+            async with self._aload_lock():
+                if not self.loaded:
+                    await self._aload()
+
+    def get(self, merchant_id: str) -> Optional[dict]:
+        """The directory listing for a merchant, or None."""
+        self._ensure_loaded()
+        return self._merchants.get(merchant_id)
+
+    def query(self, token: Optional[str] = None, verified: Optional[bool] = None) -> list[dict]:
+        """Merchants accepting ``token`` and/or with the given verified flag, in directory order."""
+        self._ensure_loaded()
+        with self._lock:
+            ids: Optional[set[str]] = None
+            if token:
+                ids = set(self._by_token.get(token.upper(), ()))
+            if verified is not None:
+                flagged = self._by_verified[bool(verified)]
+                ids = set(flagged) if ids is None else ids & flagged
+            if ids is None:
+                return list(self._merchants.values())
+            return [m for mid, m in self._merchants.items() if mid in ids]
+
+    def list_merchants(
+        self,
+        token: Optional[str] = None,
+        verified: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> dict:
+        """Answer a ``list_merchants`` call from the snapshot."""
+        matches = self.query(token, verified)
+        return {
+            "ok": True,
+            "data": matches[offset:offset + limit],
+            "meta": {"total": len(matches), "limit": limit, "offset": offset},
+        }
+
+    def _cached_profile(self, merchant_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._profiles.get(merchant_id)
+
+    def _store_profile(self, merchant_id: str, resp: dict) -> dict:
+        if resp.get("ok"):
+            with self._lock:
+                self._profiles[merchant_id] = resp
+        return resp
+
+    def get_merchant(self, merchant_id: str) -> dict:
+        """Full ``/merchants/{id}`` response, fetched once and kept until the listing changes."""
+        # The listing must be known for a later change to invalidate the profile.
+        self._ensure_loaded()
+        cached = self._cached_profile(merchant_id)
+        if cached is not None:
+            return cached
+        return self._store_profile(merchant_id, self.fetch_profile(merchant_id))
+
+    async def aget_merchant(self, merchant_id: str) -> dict:
+        """Async version of :meth:`get_merchant`."""
+        await self._aensure_loaded()
+        cached = self._cached_profile(merchant_id)
+        if cached is not None:
+            return cached
+        if self.afetch_profile is None:
+            resp = await asyncio.get_running_loop().run_in_executor(
+                None, self.fetch_profile, merchant_id
+            )
+        else:
+            resp = await self.afetch_profile(merchant_id)
+        return self._store_profile(merchant_id, resp)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._merchants)
+
+    def stats(self) -> dict:
+        """Return ``merchants``, cached ``profiles``, ``loaded_at``, ``refreshes`` and ``refresh_errors``."""
+        with self._lock:
+            return {
+                "merchants": len(self._merchants),
+                "profiles": len(self._profiles),
+                "loaded_at": self.loaded_at,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+            }
@@ -0,0 +1,100 @@
+"""Exceptions raised by the API wrapper."""
+
+from typing import Any, Optional
+
+import requests
+
+
+class InsumerAPIError(requests.HTTPError):
+    """An HTTP error response from InsumerAPI, with its body preserved.
+
+    Subclasses ``requests.HTTPError``, so existing ``except`` clauses keep
+    working; unlike a bare ``raise_for_status()`` the decoded error body is
+    kept on the exception.
+
+    Attributes:
+        status_code: HTTP status of the response.
+        body: Decoded JSON body, or the raw text if it was not JSON.
+        code: ``error.code`` from the body, if present.
+        endpoint: Endpoint the request was sent to, e.g. ``"POST /attest"``.
+        response: The ``requests`` or ``httpx`` response object.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        body: Any,
+        endpoint: Optional[str] = None,
+        response: Any = None,
+    ) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.endpoint = endpoint
+        error = body.get("error") if isinstance(body, dict) else None
+        self.code: Optional[str] = error.get("code") if isinstance(error, dict) else None
+        api_message = error.get("message") if isinstance(error, dict) else None
+        detail = api_message or self.code or (body if isinstance(body, str) else "")
+        message = f"{status_code} error from {endpoint or 'InsumerAPI'}: {detail}"
+        super().__init__(message.rstrip(": "))
+        # Set directly: requests would probe it for a ``requests.Request``,
+        # which an ``httpx.Response`` from the async path does not carry.
+        self.response = response
+
+
+class InsumerValidationError(ValueError):
+    """A request rejected locally, before it was sent, because it is malformed.
+
+    Attributes:
+        errors: One message per problem, prefixed with the offending field,
+            e.g. ``"conditions[2]: threshold must be a decimal string ..."``.
+    """
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = list(errors)
+        super().__init__("Invalid request: " + "; ".join(self.errors))
+
+
+class InsumerBudgetExceededError(RuntimeError):
+    """A request refused locally because it would exceed the credit budget.
+
+    Raised by :class:`~langchain_insumer.credits.CreditLedger` before the
+    request is sent, so nothing was charged.
+
+    Attributes:
+        endpoint: Endpoint of the refused request, e.g. ``"POST /trust"``.
+        cost: Credits the request was predicted to cost.
+        available: Credits that were available for it.
+        reason: ``"budget"`` (the configured budget) or ``"balance"`` (the
+            key's last known ``creditsRemaining``).
+    """
+
+    def __init__(self, endpoint: str, cost: int, available: int, reason: str = "budget") -> None:
+        self.endpoint = endpoint
+        self.cost = cost
+        self.available = available
+        self.reason = reason
+        super().__init__(
+            f"{endpoint} needs {cost} credit(s) but only {available} are available ({reason})"
+        )
+
+
+class InsumerRateLimitError(RuntimeError):
+    """A request refused locally because the rate limiter could not admit it in time.
+
+    Raised by :class:`~langchain_insumer.ratelimit.RateLimiter` before the
+    request is sent.
+
+    Attributes:
+        endpoint: Endpoint of the refused request, e.g. ``"GET /credits"``.
+        endpoint_class: ``"read"`` or ``"write"``.
+        retry_after: Seconds until the limiter would have a token for it.
+    """
+
+    def __init__(self, endpoint: str, endpoint_class: str, retry_after: float) -> None:
+        self.endpoint = endpoint
+        self.endpoint_class = endpoint_class
+        self.retry_after = retry_after
+        super().__init__(
+            f"{endpoint} is over the client-side {endpoint_class} rate limit; "
+            f"next slot in {retry_after:.1f}s"
+        )
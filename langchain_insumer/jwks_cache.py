@@ -0,0 +1,209 @@
+"""In-process JWKS cache indexed by ``kid``."""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Mapping, Optional
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _ttl_from_headers(headers: Mapping[str, str], default: float) -> float:
+    """Seconds a response may be cached for, per ``Cache-Control``/``Age``."""
+    cache_control = headers.get("Cache-Control") or headers.get("cache-control") or ""
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return default
+    age = headers.get("Age") or headers.get("age") or 0
+    try:
+        age = float(age)
+    except ValueError:
+        age = 0.0
+    return max(float(match.group(1)) - age, 0.0)
+
+
+def _keys_of(document: dict) -> list[dict]:
+    doc = document.get("data") if isinstance(document.get("data"), dict) else document
+    return list(doc.get("keys", []))
+
+
+class JwksCache:
+    """Caches the InsumerAPI JWKS and indexes its keys by ``kid``.
+
+    The document returned by :meth:`get_jwks` is reused for as long as the
+    response's ``Cache-Control: max-age`` allows (``default_ttl`` when the
+    header is absent). A key looked up by ``kid`` with :meth:`get_key` is
+    served from the index without checking the TTL, since a ``kid`` always
+    names the same key; only an unknown ``kid`` (i.e. a key rotation)
+    triggers a refetch. Every fetched document replaces the index, so a
+    ``kid`` the issuer has withdrawn stops resolving once the document is
+    refetched. Concurrent refetches are collapsed into one request, and an
+    unknown ``kid`` is not refetched more often than ``min_refresh_interval``.
+
+    Args:
+        fetch: Returns ``(jwks_document, response_headers)``.
+        afetch: Async counterpart of ``fetch``.
+        default_ttl: Document TTL in seconds when the response has no
+            ``Cache-Control`` header.
+        min_refresh_interval: Minimum seconds between refetches caused by
+            unknown ``kid`` values.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], tuple[dict, Mapping[str, str]]],
+        afetch: Optional[Callable[[], Awaitable[tuple[dict, Mapping[str, str]]]]] = None,
+        default_ttl: float = 300.0,
+        min_refresh_interval: float = 30.0,
+    ) -> None:
+        self.fetch = fetch
+        self.afetch = afetch
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._document: Optional[dict] = None
+        self._keys: dict[str, dict] = {}
+        self._expires = 0.0
+        self._fetched_at = float("-inf")
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._pending: dict[asyncio.AbstractEventLoop, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def stats(self) -> dict:
+        """Return ``hits``, ``misses``, ``refreshes`` and the cached ``kids``."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "kids": sorted(self._keys),
+            }
+
+    def _store(self, document: dict, headers: Mapping[str, str]) -> None:
+        self.seed(document, _ttl_from_headers(headers, self.default_ttl))
+
+    def seed(self, document: dict, ttl: float) -> None:
+        """Install a JWKS document fetched elsewhere, valid for ``ttl`` seconds."""
+        with self._lock:
+            self._document = document
+            self._keys = {jwk["kid"]: jwk for jwk in _keys_of(document) if jwk.get("kid")}
+            now = time.monotonic()
+            self._fetched_at = now
+            self._expires = now + ttl
+            self._generation += 1
+            self.refreshes += 1
+
+    def _lookup_document(self) -> tuple[Optional[dict], int]:
+        """Return ``(document or None, generation)``."""
+        with self._lock:
+            if self._document is not None and time.monotonic() < self._expires:
+                self.hits += 1
+                return self._document, self._generation
+            self.misses += 1
+            return None, self._generation
+
+    def _lookup_key(self, kid: str) -> tuple[Optional[dict], bool, int]:
+        """Return ``(key, may_refresh, generation)`` for ``kid``."""
+        with self._lock:
+            jwk = self._keys.get(kid)
+            if jwk is not None:
+                self.hits += 1
+                return jwk, False, self._generation
+            self.misses += 1
+            may_refresh = time.monotonic() - self._fetched_at >= self.min_refresh_interval
+            return None, may_refresh, self._generation
+
+    def _refresh(self, seen: int) -> None:
+        # Single flight: whoever holds the lock fetches; callers that missed
+        # the same generation and queued behind it reuse its result.
+        with self._refresh_lock:
+            if self._generation != seen:
+                return
+            document, headers = self.fetch()
+            self._store(document, headers)
+
+    async def _arefresh(self, seen: int) -> None:
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(loop)
+        if pending is not None:
+            try:
+                # Shielded, so a cancelled waiter does not cancel the shared fetch.
+                await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The fetching task was cancelled; fetch on this one's behalf.
+                await self._arefresh(seen)
+            return
+        if self._generation != seen:
+            return
+        future = self._pending[loop] = loop.create_future()
+        try:
+            fetch = self.afetch
+            if fetch is None:
+                document, headers = await loop.run_in_executor(None, self.fetch)
+            else:
+                document, headers = await fetch()
+            self._store(document, headers)
+            future.set_result(None)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters re-raise it; mark retrieved so it is not logged as unhandled.
+                future.exception()
+            raise
+        finally:
+            del self._pending[loop]
+
+    def get_jwks(self) -> dict:
+        """Return the JWKS document, refetching it once its TTL has passed."""
+        document, seen = self._lookup_document()
+        if document is None:
+            self._refresh(seen)
+            document = self._document
+        return document  # type: ignore[return-value]
+
+    async def aget_jwks(self) -> dict:
+        """Async version of :meth:`get_jwks`."""
+        document, seen = self._lookup_document()
+        if document is None:
+            await self._arefresh(seen)
+            document = self._document
+        return document  # type: ignore[return-value]
+
+    def get_key(self, kid: str) -> Optional[dict]:
+        """Return the JWK for ``kid``, refetching the JWKS only if it is unknown."""
+        jwk, may_refresh, seen = self._lookup_key(kid)
+        if jwk is None and may_refresh:
+            self._refresh(seen)
+            jwk = self._keys.get(kid)
+        return jwk
+
+    async def aget_key(self, kid: str) -> Optional[dict]:
+        """Async version of :meth:`get_key`."""
+        jwk, may_refresh, seen = self._lookup_key(kid)
+        if jwk is None and may_refresh:
+            await self._arefresh(seen)
+            jwk = self._keys.get(kid)
+        return jwk
+
+    def keys(self) -> dict[str, dict]:
+        """Return a copy of the ``kid`` -> JWK index."""
+        with self._lock:
+            return dict(self._keys)
+
+    def clear(self) -> None:
+        """Drop the cached document and keys."""
+        with self._lock:
+            self._document = None
+            self._keys.clear()
+            self._expires = 0.0
+            self._fetched_at = float("-inf")
@@ -0,0 +1,259 @@
+"""Spread requests over several API keys by their remaining quota and credits."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+from langchain_insumer.exceptions import InsumerBudgetExceededError, InsumerRateLimitError
+from langchain_insumer.ratelimit import READ, WRITE, RateLimiter
+from langchain_insumer.retry import parse_retry_after
+
+# Seconds a key rests after a 429 that carries no Retry-After.
+DEFAULT_COOLDOWN = 60.0
+# Seconds before a key that ran out of credits is tried for writes again.
+DEFAULT_RECHECK = 300.0
+
+
+def mask_key(key: str) -> str:
+    """Shorten a key for display: ``insr_live_1a2b…9f0e``."""
+    return f"{key[:14]}…{key[-4:]}" if len(key) > 18 else key
+
+
+def _meta(body: Any) -> dict:
+    meta = body.get("meta") if isinstance(body, dict) else None
+    return meta if isinstance(meta, dict) else {}
+
+
+def _out_of_credits(status: Optional[int], body: Any) -> bool:
+    if status == 402:
+        return True
+    error = body.get("error") if isinstance(body, dict) else None
+    code = error.get("code") if isinstance(error, dict) else None
+    return isinstance(code, str) and "credit" in code
+
+
+class _KeyState:
+    __slots__ = (
+        "key", "limiter", "credits", "cooldown_until", "recheck_at",
+        "requests", "credits_spent", "rate_limited", "out_of_credits",
+    )
+
+    def __init__(self, key: str, limiter: Optional[RateLimiter]) -> None:
+        self.key = key
+        self.limiter = limiter
+        # Last meta.creditsRemaining seen; None until a response reports it.
+        self.credits: Optional[int] = None
+        self.cooldown_until = 0.0
+        # When an out-of-credits key's balance is next treated as unknown; 0 if funded.
+        self.recheck_at = 0.0
+        self.requests = 0
+        self.credits_spent = 0
+        self.rate_limited = 0
+        self.out_of_credits = 0
+
+    def read_level(self) -> float:
+        if self.limiter is None:
+            return float("inf")
+        return self.limiter.stats()[READ]["level"]
+
+
+class KeyPool:
+    """Several API keys used as one, each request going to the best key.
+
+    Free reads go to the key with the most read quota left in its
+    :class:`~langchain_insumer.ratelimit.RateLimiter` (with ``tier`` set);
+    credit-charging writes go to the key with the most credits left, as
+    last reported by ``meta.creditsRemaining``. Keys not yet heard from
+    count as full, so each is tried. Ties go to the key that has served
+    the fewest requests.
+
+    A key that answers ``429`` rests for its ``Retry-After`` (or
+    ``cooldown``) seconds and a key that reports running out of credits
+    (HTTP 402 or an error code mentioning credits) takes no more writes
+    until a later response shows credits again, :meth:`reset_credits` is
+    called (the wrapper does so after ``buy_credits()``), or ``recheck``
+    seconds pass; in all cases the wrapper sends the request again on the
+    next best key at once.
+
+    Args:
+        keys: API keys (``insr_live_...``).
+        tier: Key tier for per-key rate limiters, or None for none.
+        cooldown: Rest after a ``429`` without ``Retry-After``. Default 60.
+        recheck: Seconds after which a key that ran out of credits is
+            tried for writes again, in case it was topped up elsewhere.
+            Default 300.
+        wait: Longest a request may queue for a key before
+            :class:`~langchain_insumer.exceptions.InsumerRateLimitError`.
+            Default 30.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        tier: Optional[str] = None,
+        cooldown: float = DEFAULT_COOLDOWN,
+        wait: float = 30.0,
+        recheck: float = DEFAULT_RECHECK,
+    ) -> None:
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        if len(set(keys)) != len(keys):
+            raise ValueError("KeyPool keys must be distinct")
+        self.cooldown = cooldown
+        self.wait = wait
+        self.recheck = recheck
+        self._lock = threading.Lock()
+        self._states = {
+            key: _KeyState(key, RateLimiter(tier, wait=wait) if tier else None) for key in keys
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self._states)
+
+    def _pick(self, endpoint: str, cost: int) -> tuple[Optional[_KeyState], float]:
+        """The best usable key, or None and the seconds until one rests enough."""
+        now = time.monotonic()
+        for state in self._states.values():
+            if state.recheck_at and state.recheck_at <= now:
+                state.credits, state.recheck_at = None, 0.0
+        ready = [s for s in self._states.values() if s.cooldown_until <= now]
+        if cost:
+            funded = [s for s in ready if s.credits is None or s.credits >= cost]
+            if not funded and ready:
+                best = max((s.credits or 0) for s in ready)
+                raise InsumerBudgetExceededError(endpoint, cost, best, "balance")
+            ready = funded
+        if not ready:
+            return None, min(s.cooldown_until for s in self._states.values()) - now
+
+        def score(state: _KeyState) -> tuple:
+            credits = float("inf") if state.credits is None else state.credits
+            if cost:
+                return (credits, state.read_level(), -state.requests)
+            return (state.read_level(), -state.requests)
+
+        state = max(ready, key=score)
+        state.requests += 1
+        return state, 0.0
+
+    def _choose(self, endpoint: str, cost: int) -> tuple[Optional[_KeyState], float]:
+        with self._lock:
+            return self._pick(endpoint, cost)
+
+    def acquire(self, endpoint: str, cost: int = 0) -> str:
+        """Pick the key for a request and wait for its rate limiter.
+
+        Args:
+            endpoint: Endpoint name, e.g. ``"POST /attest"``.
+            cost: Predicted credits; 0 for a free read.
+
+        Raises:
+            InsumerRateLimitError: If every key is resting or out of quota
+                for longer than ``wait``.
+            InsumerBudgetExceededError: If no key has the credits left.
+        """
+        deadline = time.monotonic() + self.wait
+        while True:
+            state, rest = self._choose(endpoint, cost)
+            if state is not None:
+                break
+            if time.monotonic() + rest > deadline:
+                raise InsumerRateLimitError(endpoint, WRITE if cost else READ, rest)
+            time.sleep(rest)
+        if state.limiter is not None:
+            state.limiter.acquire(WRITE if cost else READ, endpoint)
+        return state.key
+
+    async def aacquire(self, endpoint: str, cost: int = 0) -> str:
+        """Coroutine counterpart of :meth:`acquire`."""
+        deadline = time.monotonic() + self.wait
+        while True:
+            state, rest = self._choose(endpoint, cost)
+            if state is not None:
+                break
+            if time.monotonic() + rest > deadline:
+                raise InsumerRateLimitError(endpoint, WRITE if cost else READ, rest)
+            await asyncio.sleep(rest)
+        if state.limiter is not None:
+            await state.limiter.aacquire(WRITE if cost else READ, endpoint)
+        return state.key
+
+    def record(self, key: str, status: Optional[int], body: Any, headers: Any) -> bool:
+        """Learn from a response sent with ``key``.
+
+        Args:
+            key: Key the request was sent with.
+            status: HTTP status, or None for a 2xx.
+            body: Decoded response body.
+            headers: Response headers.
+
+        Returns:
+            True if the key was rate limited or out of credits, so the
+            request should be sent again with another key.
+        """
+        meta = _meta(body)
+        with self._lock:
+            state = self._states[key]
+            if isinstance(meta.get("creditsRemaining"), int):
+                state.credits = meta["creditsRemaining"]
+                if state.credits > 0:
+                    state.recheck_at = 0.0
+            if isinstance(meta.get("creditsCharged"), int):
+                state.credits_spent += meta["creditsCharged"]
+            if status == 429:
+                state.rate_limited += 1
+                rest = parse_retry_after(headers.get("Retry-After"))
+                state.cooldown_until = time.monotonic() + (
+                    self.cooldown if rest is None else rest
+                )
+                if state.limiter is not None:
+                    state.limiter.drain(READ)
+                return True
+            if _out_of_credits(status, body):
+                state.out_of_credits += 1
+                state.credits = 0
+                state.recheck_at = time.monotonic() + self.recheck
+                return True
+        return False
+
+    def reset_credits(self, key: Optional[str] = None) -> None:
+        """Forget that ``key`` (every key if None) ran out of credits.
+
+        Its balance counts as unknown again, so the next write may go to it.
+        """
+        with self._lock:
+            states = self._states.values() if key is None else [self._states[key]]
+            for state in states:
+                if state.recheck_at:
+                    state.credits, state.recheck_at = None, 0.0
+
+    def stats(self) -> dict:
+        """Return per-key utilization.
+
+        Returns:
+            Dict keyed by masked key, each with ``requests``, ``share`` (of
+            all requests), ``credits_remaining`` (last reported),
+            ``credits_spent``, ``rate_limited`` and ``out_of_credits``
+            counts, ``resting`` seconds left, and with ``tier`` set,
+            ``read_fill`` (share of the read bucket still available).
+        """
+        now = time.monotonic()
+        with self._lock:
+            total = sum(s.requests for s in self._states.values())
+            out: dict[str, dict[str, Any]] = {}
+            for state in self._states.values():
+                entry: dict[str, Any] = {
+                    "requests": state.requests,
+                    "share": state.requests / total if total else 0.0,
+                    "credits_remaining": state.credits,
+                    "credits_spent": state.credits_spent,
+                    "rate_limited": state.rate_limited,
+                    "out_of_credits": state.out_of_credits,
+                    "resting": max(state.cooldown_until - now, 0.0),
+                }
+                if state.limiter is not None:
+                    entry["read_fill"] = state.limiter.stats()[READ]["fill"]
+                out[mask_key(state.key)] = entry
+        return out
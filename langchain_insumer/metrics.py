@@ -0,0 +1,255 @@
+"""Per-endpoint request metrics with a Prometheus text-format exporter."""
+
+import bisect
+import threading
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds (le) in seconds for the phase histograms.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Upper bounds (le) in bytes for the payload size histograms.
+SIZE_BUCKETS: tuple[float, ...] = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+PHASES = ("connect", "server", "decode")
+DIRECTIONS = ("request", "response")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense. Not locked itself."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile as the upper bound of its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class _EndpointMetrics:
+    __slots__ = ("responses", "phases", "sizes")
+
+    def __init__(self, latency_buckets: Sequence[float], size_buckets: Sequence[float]) -> None:
+        # (status, code) -> count
+        self.responses: dict[tuple[str, str], int] = {}
+        self.phases = {phase: Histogram(latency_buckets) for phase in PHASES}
+        self.sizes = {direction: Histogram(size_buckets) for direction in DIRECTIONS}
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint request counters and latency histograms.
+
+    Every HTTP attempt (retries included) is recorded once under its endpoint
+    name (``"POST /attest"``) with:
+
+    * its outcome: HTTP ``status`` and the API's ``error.code`` (e.g.
+      ``rpc_failure``, which arrives with a 200), or status ``"error"`` and
+      the exception class name when no response was received;
+    * ``connect`` time opening a TCP+TLS connection (0 on a reused one),
+      ``server`` time from the connection being ready to the full response
+      having arrived, and ``decode`` time parsing the JSON body;
+    * request and response body sizes in bytes.
+
+    One instance can be shared by several wrappers.
+
+    Args:
+        latency_buckets: Histogram bounds in seconds.
+        size_buckets: Histogram bounds in bytes.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._latency_buckets = tuple(latency_buckets)
+        self._size_buckets = tuple(size_buckets)
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(
+                self._latency_buckets, self._size_buckets
+            )
+        return metrics
+
+    def observe(
+        self,
+        endpoint: str,
+        status: str,
+        code: str = "",
+        connect: float = 0.0,
+        server: float = 0.0,
+        decode: Optional[float] = None,
+        request_bytes: int = 0,
+        response_bytes: Optional[int] = None,
+    ) -> None:
+        """Record one HTTP attempt.
+
+        ``decode`` and ``response_bytes`` are None when no response arrived.
+        """
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            key = (status, code)
+            metrics.responses[key] = metrics.responses.get(key, 0) + 1
+            metrics.phases["connect"].observe(connect)
+            metrics.phases["server"].observe(server)
+            if decode is not None:
+                metrics.phases["decode"].observe(decode)
+            metrics.sizes["request"].observe(request_bytes)
+            if response_bytes is not None:
+                metrics.sizes["response"].observe(response_bytes)
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def stats(self) -> dict:
+        """Return per-endpoint counts and latency percentiles.
+
+        Returns:
+            Dict keyed by endpoint, each with ``requests``, ``statuses``
+            (count per status), ``errors`` (count per error code), and per
+            phase ``count``, ``mean``, ``p50`` and ``p99`` seconds (bucket
+            upper bounds), plus ``request_bytes``/``response_bytes`` totals.
+        """
+        out: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                statuses: dict[str, int] = {}
+                errors: dict[str, int] = {}
+                for (status, code), n in metrics.responses.items():
+                    statuses[status] = statuses.get(status, 0) + n
+                    if code:
+                        errors[code] = errors.get(code, 0) + n
+                entry: dict[str, Any] = {
+                    "requests": sum(statuses.values()),
+                    "statuses": statuses,
+                    "errors": errors,
+                }
+                for phase, hist in metrics.phases.items():
+                    entry[phase] = {
+                        "count": hist.count,
+                        "mean": hist.sum / hist.count if hist.count else None,
+                        "p50": hist.quantile(0.5),
+                        "p99": hist.quantile(0.99),
+                    }
+                entry["request_bytes"] = int(metrics.sizes["request"].sum)
+                entry["response_bytes"] = int(metrics.sizes["response"].sum)
+                out[endpoint] = entry
+        return out
+
+    def render_prometheus(self, prefix: str = "insumer") -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Emits ``<prefix>_requests_total{endpoint,status,code}``,
+        ``<prefix>_request_phase_seconds{endpoint,phase}`` and
+        ``<prefix>_payload_bytes{endpoint,direction}``.
+        """
+        requests_name = f"{prefix}_requests_total"
+        phase_name = f"{prefix}_request_phase_seconds"
+        size_name = f"{prefix}_payload_bytes"
+        lines = [
+            f"# HELP {requests_name} HTTP attempts by endpoint, status and API error code.",
+            f"# TYPE {requests_name} counter",
+        ]
+        phase_lines = [
+            f"# HELP {phase_name} Time spent per request phase (connect, server, decode).",
+            f"# TYPE {phase_name} histogram",
+        ]
+        size_lines = [
+            f"# HELP {size_name} Request and response body sizes.",
+            f"# TYPE {size_name} histogram",
+        ]
+        with self._lock:
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                ep = _label(endpoint)
+                for (status, code), n in sorted(metrics.responses.items()):
+                    lines.append(
+                        f'{requests_name}{{endpoint="{ep}",status="{_label(status)}",'
+                        f'code="{_label(code)}"}} {n}'
+                    )
+                for phase, hist in metrics.phases.items():
+                    _histogram_lines(phase_lines, phase_name, f'endpoint="{ep}",phase="{phase}"', hist)
+                for direction, hist in metrics.sizes.items():
+                    _histogram_lines(
+                        size_lines, size_name, f'endpoint="{ep}",direction="{direction}"', hist
+                    )
+        return "\n".join(lines + phase_lines + size_lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _histogram_lines(lines: list[str], name: str, labels: str, hist: Histogram) -> None:
+    cumulative = 0
+    for bound, n in zip(hist.bounds, hist.counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+    lines.append(f"{name}_sum{{{labels}}} {_number(hist.sum)}")
+    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+def serve_prometheus(
+    metrics: RequestMetrics, port: int = 9464, addr: str = "127.0.0.1", prefix: str = "insumer"
+) -> "ThreadingHTTPServer":
+    """Serve ``metrics`` at ``http://addr:port/metrics`` from a daemon thread.
+
+    For processes without ``prometheus_client``; with it, expose
+    :meth:`RequestMetrics.render_prometheus` from your own handler instead.
+    Call ``shutdown()`` on the returned server to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            payload = metrics.render_prometheus(prefix).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, name="insumer-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,149 @@
+"""Token-budgeted renderings of API responses for tool output.
+
+Tools hand their result to the model as text. ``"full"`` is the whole
+envelope, pretty-printed. ``"compact"`` drops what the model cannot use —
+signatures, Merkle proofs, condition hashes, block references, split-request
+parts — and minifies the rest. ``"summary"`` keeps only the verdict: pass/fail,
+counts, ids and expiry. Nothing is lost: in the reduced modes the tool returns
+the untouched response as its artifact.
+"""
+
+import json
+from typing import Any
+
+OUTPUT_MODES = ("full", "compact", "summary")
+
+# Keys that carry evidence for machines (signatures, proofs, hashes) rather
+# than facts for the model.
+HEAVY_KEYS = frozenset(
+    {
+        "sig",
+        "proof",
+        "parts",
+        "conditionHash",
+        "evaluatedCondition",
+        "blockNumber",
+        "blockTimestamp",
+        "blockHash",
+        "ledgerIndex",
+        "ledgerHash",
+        "accountProof",
+        "storageProof",
+    }
+)
+
+_META_KEYS = ("creditsCharged", "creditsRemaining")
+_COUNT_KEYS = ("passCount", "failCount", "total", "totalChecks", "totalPassed", "totalFailed")
+
+
+# Dropped only beside a dropped ``sig``: without the signature the key id is
+# noise, but elsewhere (a JWKS document) it is what identifies a key.
+_SIGNATURE_KEYS = HEAVY_KEYS | {"kid"}
+
+
+def _strip(value: Any) -> Any:
+    if isinstance(value, dict):
+        heavy = _SIGNATURE_KEYS if "sig" in value else HEAVY_KEYS
+        return {k: _strip(v) for k, v in value.items() if k not in heavy}
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+    return value
+
+
+def _envelope(result: dict, data: Any) -> dict:
+    out: dict[str, Any] = {"ok": result.get("ok", True), "data": data}
+    meta = result.get("meta")
+    if isinstance(meta, dict):
+        kept = {k: meta[k] for k in _META_KEYS if k in meta}
+        if kept:
+            out["meta"] = kept
+    return out
+
+
+def _error(result: dict) -> dict:
+    error = result.get("error")
+    if isinstance(error, dict):
+        error = {k: error[k] for k in ("code", "message") if k in error} or error
+    return {"ok": False, "error": error}
+
+
+def compact(result: dict) -> dict:
+    """``result`` without signatures, proofs, hashes or block references."""
+    if result.get("ok") is False:
+        return _error(result)
+    if "data" not in result:
+        # Not an API envelope, e.g. the JWKS document.
+        return _strip(result)
+    return _envelope(result, _strip(result.get("data")))
+
+
+def _summarize_attestation(att: dict) -> dict:
+    out = {k: att[k] for k in ("id", "ids", "pass", "passCount", "failCount", "expiresAt") if k in att}
+    results = att.get("results")
+    if isinstance(results, list):
+        out["failed"] = [
+            r.get("label", r.get("condition")) for r in results if isinstance(r, dict) and not r.get("met")
+        ]
+    return out
+
+
+def _summarize_trust(trust: dict) -> dict:
+    out = {k: trust[k] for k in ("id", "wallet", "summary", "expiresAt") if k in trust}
+    dimensions = trust.get("dimensions")
+    if isinstance(dimensions, dict):
+        out["dimensions"] = {
+            name: {k: dim[k] for k in _COUNT_KEYS if k in dim}
+            for name, dim in dimensions.items()
+            if isinstance(dim, dict)
+        }
+    return out
+
+
+def _summarize_data(data: Any) -> Any:
+    if not isinstance(data, dict):
+        return _strip(data)
+    if isinstance(data.get("attestation"), dict):
+        return {"attestation": _summarize_attestation(data["attestation"])}
+    if isinstance(data.get("trust"), dict):
+        return {"trust": _summarize_trust(data["trust"])}
+    results = data.get("results")
+    if isinstance(results, list) and any(isinstance(r, dict) and "trust" in r for r in results):
+        out: dict[str, Any] = {
+            "results": [
+                _summarize_trust(r["trust"])
+                if isinstance(r, dict) and isinstance(r.get("trust"), dict)
+                else _strip(r)
+                for r in results
+            ]
+        }
+        if "summary" in data:
+            out["summary"] = data["summary"]
+        return out
+    return _strip(data)
+
+
+def summarize(result: dict) -> dict:
+    """Only the verdict of ``result``: pass/fail, counts, ids and expiry.
+
+    Attestations keep ``id``, ``pass``, counts, ``expiresAt`` and the labels of
+    failed conditions; trust profiles keep ``id``, ``wallet``, ``summary``,
+    ``expiresAt`` and per-dimension counts. Other responses are compacted.
+    """
+    if result.get("ok") is False:
+        return _error(result)
+    if "data" not in result:
+        return _strip(result)
+    return _envelope(result, _summarize_data(result.get("data")))
+
+
+def render(result: Any, mode: str = "full") -> str:
+    """Serialize ``result`` for the model in one of :data:`OUTPUT_MODES`."""
+    if mode == "full" or not isinstance(result, dict):
+        return json.dumps(result, indent=2)
+    if mode == "compact":
+        projected = compact(result)
+    elif mode == "summary":
+        projected = summarize(result)
+    else:
+        raise ValueError(f"output mode must be one of {OUTPUT_MODES}, got {mode!r}")
+    return json.dumps(projected, separators=(",", ":"))
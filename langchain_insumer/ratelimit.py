@@ -0,0 +1,204 @@
+"""Client-side token-bucket rate limiting aligned with the key tiers' daily quotas."""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_insumer.credits import predict_cost
+from langchain_insumer.exceptions import InsumerRateLimitError
+
+# Authenticated requests per day by key tier.
+TIER_DAILY_LIMITS: dict[str, int] = {
+    "free": 100,
+    "pro": 10_000,
+    "enterprise": 100_000,
+}
+
+# Endpoint classes: free reads, and writes that charge credits or change
+# merchant settings.
+READ = "read"
+WRITE = "write"
+
+# Default bucket capacity: this many seconds of a class's quota, but at
+# least MIN_BURST tokens.
+BURST_WINDOW = 60.0
+MIN_BURST = 10
+
+_DAY = 86400.0
+
+
+def endpoint_class(endpoint: str, body: Any) -> str:
+    """``"write"`` for credit-charging and ``PUT`` endpoints, ``"read"`` for the rest."""
+    if endpoint.startswith("PUT ") or predict_cost(endpoint, body):
+        return WRITE
+    return READ
+
+
+def _capacity(limit: int, burst: Optional[int]) -> float:
+    if burst is None:
+        burst = max(math.ceil(limit * BURST_WINDOW / _DAY), MIN_BURST)
+    return min(burst, limit)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out waiting times in FIFO order.
+
+    A caller that finds the bucket empty takes its token anyway, driving the
+    level negative, and is told how long to wait for the refill to cover it;
+    later callers queue behind it. Nobody polls.
+
+    Args:
+        capacity: Maximum tokens, i.e. the largest burst.
+        rate: Tokens added per second.
+    """
+
+    def __init__(self, capacity: float, rate: float) -> None:
+        self.capacity = float(capacity)
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Take a token; return seconds to wait for it, or None if over ``max_wait``."""
+        with self._lock:
+            self._refill()
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def drain(self) -> None:
+        """Empty the bucket (the server said the quota is spent)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+    def level(self) -> float:
+        """Tokens available now; negative while callers are queued."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class RateLimiter:
+    """Per-endpoint-class token buckets sized from a tier's daily quota.
+
+    Each class (``"read"`` and ``"write"``, see :func:`endpoint_class`)
+    refills at its daily limit spread over 24 hours and holds at most
+    ``burst`` tokens, so bursts are smoothed rather than spending the whole
+    day's quota at once. A request that finds its bucket empty is queued until
+    a token is due, as long as that is within ``wait`` seconds; otherwise
+    it raises :class:`~langchain_insumer.exceptions.InsumerRateLimitError`
+    without being sent. A ``429`` from the server empties the bucket.
+
+    Only requests carrying the API key are limited; public endpoints do not
+    count against the key's quota.
+
+    Args:
+        tier: ``"free"``, ``"pro"`` or ``"enterprise"``; sets the ``read``
+            and ``write`` limits from :data:`TIER_DAILY_LIMITS`.
+        daily_limits: Per-class overrides, e.g. ``{"write": 500}``. A class
+            set to None is not limited.
+        burst: Bucket capacity. Default: :data:`BURST_WINDOW` seconds of
+            each class's quota, but at least :data:`MIN_BURST` tokens (and
+            never more than the daily limit).
+        wait: Longest time in seconds a request may queue. Default 30.
+    """
+
+    def __init__(
+        self,
+        tier: str = "free",
+        daily_limits: Optional[dict[str, Optional[int]]] = None,
+        burst: Optional[int] = None,
+        wait: float = 30.0,
+    ) -> None:
+        if tier not in TIER_DAILY_LIMITS:
+            raise ValueError(f"Unknown tier {tier!r}; choose from {list(TIER_DAILY_LIMITS)}")
+        limits: dict[str, Optional[int]] = {
+            READ: TIER_DAILY_LIMITS[tier],
+            WRITE: TIER_DAILY_LIMITS[tier],
+        }
+        limits.update(daily_limits or {})
+        self.tier = tier
+        self.wait = wait
+        self.daily_limits = limits
+        self._buckets = {
+            cls: TokenBucket(_capacity(limit, burst), limit / _DAY)
+            for cls, limit in limits.items()
+            if limit
+        }
+        self._lock = threading.Lock()
+        self._counts = {cls: {"requests": 0, "queued": 0, "rejected": 0} for cls in self._buckets}
+
+    def _reserve(self, cls: str, endpoint: str) -> float:
+        bucket = self._buckets[cls]
+        wait = bucket.reserve(self.wait)
+        with self._lock:
+            counts = self._counts[cls]
+            if wait is None:
+                counts["rejected"] += 1
+            else:
+                counts["requests"] += 1
+                if wait:
+                    counts["queued"] += 1
+        if wait is None:
+            needed = (1 - bucket.level()) / bucket.rate
+            raise InsumerRateLimitError(endpoint, cls, needed)
+        return wait
+
+    def acquire(self, cls: str, endpoint: str) -> None:
+        """Block until a request of class ``cls`` may be sent.
+
+        Raises:
+            InsumerRateLimitError: If that would take longer than ``wait``.
+        """
+        if cls in self._buckets:
+            wait = self._reserve(cls, endpoint)
+            if wait:
+                time.sleep(wait)
+
+    async def aacquire(self, cls: str, endpoint: str) -> None:
+        """Coroutine counterpart of :meth:`acquire`."""
+        if cls in self._buckets:
+            wait = self._reserve(cls, endpoint)
+            if wait:
+                await asyncio.sleep(wait)
+
+    def drain(self, cls: str) -> None:
+        """Empty the bucket of ``cls`` after the server rejected a request."""
+        bucket = self._buckets.get(cls)
+        if bucket is not None:
+            bucket.drain()
+
+    def stats(self) -> dict:
+        """Return the fill level and counters of every limited class.
+
+        Returns:
+            Dict keyed by class, each with ``level`` (tokens available now,
+            negative while requests are queued), ``capacity``,
+            ``daily_limit``, ``fill`` (``level / capacity``, clamped to
+            0..1), and counts of ``requests`` let through, how many of them
+            were ``queued``, and how many were ``rejected``.
+        """
+        out: dict[str, dict[str, Any]] = {}
+        for cls, bucket in self._buckets.items():
+            level = bucket.level()
+            with self._lock:
+                counts = dict(self._counts[cls])
+            out[cls] = {
+                "level": level,
+                "capacity": bucket.capacity,
+                "daily_limit": self.daily_limits[cls],
+                "fill": max(0.0, min(level / bucket.capacity, 1.0)),
+                **counts,
+            }
+        return out
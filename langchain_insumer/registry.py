@@ -0,0 +1,243 @@
+"""In-memory token registry built from ``GET /tokens``."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+
+def _entries(resp: dict) -> list[dict]:
+    """The token list from a ``/tokens`` response (a list, or ``{"tokens": [...]}``)."""
+    data = resp.get("data", resp)
+    if isinstance(data, dict):
+        data = data.get("tokens", [])
+    return [entry for entry in data or [] if isinstance(entry, dict)]
+
+
+def _with_entries(resp: dict, entries: list[dict]) -> dict:
+    """Copy of a ``/tokens`` response with its token list replaced."""
+    data = resp.get("data", resp)
+    if isinstance(data, dict):
+        data = {**data, "tokens": entries}
+        if "count" in data:
+            data["count"] = len(entries)
+    else:
+        data = entries
+    return {**resp, "data": data}
+
+
+def chain_key(chain: Any) -> str:
+    """Normalize a chain ID (``1``, ``"1"``, ``"Solana"``) for indexing."""
+    return str(chain).strip().lower()
+
+
+def contract_key(address: str) -> str:
+    """Normalize a contract address; hex addresses are case-insensitive."""
+    address = address.strip()
+    return address.lower() if address[:2].lower() == "0x" else address
+
+
+def _asset_type(entry: dict) -> str:
+    return str(entry.get("type") or entry.get("assetType") or "token").lower()
+
+
+class _Index:
+    """Immutable lookup tables over one registry snapshot."""
+
+    __slots__ = ("response", "entries", "by_chain_symbol", "by_contract", "by_type", "by_chain")
+
+    def __init__(self, response: dict) -> None:
+        self.response = response
+        self.entries = _entries(response)
+        self.by_chain_symbol: dict[tuple[str, str], list[dict]] = {}
+        self.by_contract: dict[str, list[dict]] = {}
+        self.by_type: dict[str, list[dict]] = {}
+        self.by_chain: dict[str, list[dict]] = {}
+        for entry in self.entries:
+            chain = chain_key(entry.get("chainId", entry.get("chain", "")))
+            self.by_chain.setdefault(chain, []).append(entry)
+            if entry.get("symbol"):
+                key = (chain, str(entry["symbol"]).upper())
+                self.by_chain_symbol.setdefault(key, []).append(entry)
+            if entry.get("contractAddress"):
+                key = contract_key(str(entry["contractAddress"]))
+                self.by_contract.setdefault(key, []).append(entry)
+            self.by_type.setdefault(_asset_type(entry), []).append(entry)
+
+
+class BackgroundRefresh(ABC):
+    """Base for in-memory snapshots that reload themselves on a daemon thread.
+
+    Subclasses implement ``load()``; :meth:`start` calls it every
+    ``refresh_interval`` seconds until :meth:`stop`. A failed reload is
+    counted in ``refresh_errors`` and the previous snapshot stays in use.
+    """
+
+    _thread_name = "insumer-refresh"
+
+    def __init__(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_errors = 0
+
+    @abstractmethod
+    def load(self) -> Any:
+        """Fetch and install a fresh snapshot."""
+
+    def start(self) -> None:
+        """Reload every ``refresh_interval`` seconds in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name=self._thread_name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background refreshing."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self._try_refresh()
+
+    def _try_refresh(self) -> None:
+        try:
+            self.load()
+        except Exception:
+            self.refresh_errors += 1
+
+
+class TokenRegistry(BackgroundRefresh):
+    """The full InsumerAPI token registry, indexed in memory.
+
+    The registry is fetched once (lazily, on first lookup, or with
+    :meth:`load`) and indexed by ``(chain, symbol)``, by contract address
+    and by asset type, so lookups are dictionary reads that need no network.
+    :meth:`start` refreshes it on a daemon thread every ``refresh_interval``
+    seconds; a failed refresh keeps serving the previous snapshot.
+
+    Args:
+        fetch: Returns the unfiltered ``/tokens`` response.
+        afetch: Async counterpart of ``fetch``.
+        refresh_interval: Seconds between background refreshes.
+    """
+
+    _thread_name = "insumer-token-registry"
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        afetch: Optional[Callable[[], Awaitable[dict]]] = None,
+        refresh_interval: float = 3600.0,
+    ) -> None:
+        super().__init__(refresh_interval)
+        self.fetch = fetch
+        self.afetch = afetch
+        self._index: Optional[_Index] = None
+        self._load_lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+        self.refreshes = 0
+
+    def load(self, response: Optional[dict] = None) -> None:
+        """Fetch the registry now, or index an already-fetched ``/tokens`` response."""
+        self._store(self.fetch() if response is None else response)
+
+    async def aload(self) -> None:
+        """Async version of :meth:`load`."""
+        self._store(await self.afetch() if self.afetch is not None else self.fetch())
+
+    def _store(self, response: dict) -> None:
+        if not response.get("ok", True):
+            raise ValueError(f"Token registry fetch failed: {response.get('error')}")
+        index = _Index(response)
+        # Swapping one reference keeps readers lock-free and consistent.
+        self._index = index
+        self.loaded_at = time.time()
+        self.refreshes += 1
+
+    def _current(self) -> _Index:
+        index = self._index
+        if index is None:
+            with self._load_lock:
+                if self._index is None:
+                    self.load()
+            index = self._index
+        return index  # type: ignore[return-value]
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def lookup(self, chain: Any, symbol: str) -> list[dict]:
+        """Tokens with ``symbol`` (case-insensitive) on ``chain``."""
+        return list(self._current().by_chain_symbol.get((chain_key(chain), symbol.upper()), []))
+
+    def resolve(self, chain: Any, symbol: str) -> Optional[dict]:
+        """The single token with ``symbol`` on ``chain``, or None if absent or ambiguous."""
+        matches = self._current().by_chain_symbol.get((chain_key(chain), symbol.upper()), [])
+        return matches[0] if len(matches) == 1 else None
+
+    def by_contract(self, address: str, chain: Optional[Any] = None) -> list[dict]:
+        """Tokens registered under a contract address, optionally on one chain."""
+        matches = self._current().by_contract.get(contract_key(address), [])
+        if chain is not None:
+            key = chain_key(chain)
+            matches = [e for e in matches if chain_key(e.get("chainId", e.get("chain", ""))) == key]
+        return list(matches)
+
+    def by_type(self, asset_type: str) -> list[dict]:
+        """Tokens of an asset type (``"token"`` or ``"nft"``)."""
+        return list(self._current().by_type.get(asset_type.lower(), []))
+
+    def query(
+        self,
+        chain: Optional[Any] = None,
+        symbol: Optional[str] = None,
+        asset_type: Optional[str] = None,
+    ) -> list[dict]:
+        """Filter the registry the way ``GET /tokens`` filters its results."""
+        index = self._current()
+        candidates: Iterable[dict]
+        if chain is not None and symbol:
+            candidates = index.by_chain_symbol.get((chain_key(chain), symbol.upper()), [])
+        elif chain is not None:
+            candidates = index.by_chain.get(chain_key(chain), [])
+        elif asset_type:
+            candidates = index.by_type.get(asset_type.lower(), [])
+        else:
+            candidates = index.entries
+        return [
+            entry
+            for entry in candidates
+            if (not symbol or str(entry.get("symbol", "")).upper() == symbol.upper())
+            and (not asset_type or _asset_type(entry) == asset_type.lower())
+        ]
+
+    def list_tokens(
+        self,
+        chain: Optional[Any] = None,
+        symbol: Optional[str] = None,
+        asset_type: Optional[str] = None,
+    ) -> dict:
+        """Answer a ``list_tokens`` call from the index, in the API's response shape."""
+        entries = self.query(chain, symbol, asset_type)
+        return _with_entries(self._current().response, entries)
+
+    def __len__(self) -> int:
+        return len(self._current().entries)
+
+    def stats(self) -> dict:
+        """Return ``tokens`` indexed, ``loaded_at``, ``refreshes`` and ``refresh_errors``."""
+        index = self._index
+        return {
+            "tokens": len(index.entries) if index is not None else 0,
+            "loaded_at": self.loaded_at,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
@@ -0,0 +1,220 @@
+"""Retry policy for transient InsumerAPI failures.
+
+Retried: ``ok: false`` responses with ``error.code == "rpc_failure"`` (the
+API could not reach a chain data source and charged nothing), HTTP 429 and
+5xx, and connection errors. A 5xx from a credit-charging endpoint may come
+after the credits were spent, so it is only retried when the body reports
+``meta.creditsCharged == 0``. Waits use full-jitter exponential backoff and
+honor ``Retry-After``. All wrappers in the process draw retries from one
+:class:`RetryBudget`, so a failing upstream does not turn into a retry
+storm that multiplies load and tail latency.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+# The API asks callers to wait 2-5 seconds before retrying rpc_failure.
+RPC_FAILURE_MIN_DELAY = 2.0
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _charged_nothing(body: Any) -> bool:
+    meta = body.get("meta") if isinstance(body, dict) else None
+    return isinstance(meta, dict) and meta.get("creditsCharged") == 0
+
+
+def response_retry_reason(
+    status_code: Optional[int], body: Any, charging: bool = False
+) -> Optional[str]:
+    """Classify a response: a retry reason, or None if it should not be retried.
+
+    ``status_code`` is None for responses that were successful at the HTTP
+    level; only their body is inspected. ``charging`` marks a request to a
+    credit-charging endpoint, whose 5xx responses are not retried unless
+    the body says nothing was charged.
+    """
+    if status_code is not None:
+        if status_code == 429:
+            return "rate_limited"
+        if status_code in _RETRY_STATUSES and (not charging or _charged_nothing(body)):
+            return "server_error"
+    if isinstance(body, dict) and body.get("ok") is False:
+        error = body.get("error")
+        if isinstance(error, dict) and error.get("code") == "rpc_failure":
+            return "rpc_failure"
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryBudget:
+    """Process-wide limit on retries relative to first attempts.
+
+    Over a sliding ``window`` of seconds, retries may not exceed ``ratio``
+    times the number of first attempts plus ``min_per_second`` per second
+    (so a quiet process can still retry). When the budget is spent, failing
+    calls return or raise their first failure immediately.
+
+    Args:
+        ratio: Retries allowed per first attempt. Default 0.2.
+        min_per_second: Retries always allowed per second. Default 1.
+        window: Length of the sliding window in seconds. Default 10.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, window: int = 10) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._lock = threading.Lock()
+        # One (second, first_attempts, retries) slot per second of the window.
+        self._slots = [[0, 0, 0] for _ in range(window)]
+
+    def _slot(self, now: int) -> list[int]:
+        slot = self._slots[now % self.window]
+        if slot[0] != now:
+            slot[:] = [now, 0, 0]
+        return slot
+
+    def _totals(self, now: int) -> tuple[int, int]:
+        attempts = retries = 0
+        for second, a, r in self._slots:
+            if now - second < self.window:
+                attempts += a
+                retries += r
+        return attempts, retries
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        now = int(time.monotonic())
+        with self._lock:
+            self._slot(now)[1] += 1
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; False if it is spent."""
+        now = int(time.monotonic())
+        with self._lock:
+            attempts, retries = self._totals(now)
+            if retries + 1 > self.ratio * attempts + self.min_per_second * self.window:
+                return False
+            self._slot(now)[2] += 1
+            return True
+
+    def available(self) -> float:
+        """Retries currently left in the budget."""
+        now = int(time.monotonic())
+        with self._lock:
+            attempts, retries = self._totals(now)
+        return max(self.ratio * attempts + self.min_per_second * self.window - retries, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._slots = [[0, 0, 0] for _ in range(self.window)]
+
+
+#: Budget shared by every wrapper in the process.
+RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """Decides whether and when to retry, and counts what happened per endpoint.
+
+    Args:
+        max_retries: Retries after the first attempt. 0 disables retrying.
+        backoff: Base delay in seconds; attempt ``n`` waits up to
+            ``backoff * 2**n``.
+        backoff_max: Cap on the backoff delay. A ``Retry-After`` longer than
+            this is not waited for; the failure is returned instead.
+        budget: Shared :class:`RetryBudget`. Defaults to :data:`RETRY_BUDGET`.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 10.0,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.budget = budget or RETRY_BUDGET
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def _count(self, endpoint: str, key: str, reason: Optional[str] = None) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {
+                    "attempts": 0,
+                    "retries": 0,
+                    "recovered": 0,
+                    "exhausted": 0,
+                    "budget_denied": 0,
+                    "reasons": {},
+                }
+            stats[key] += 1
+            if reason is not None:
+                stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+
+    def on_attempt(self, endpoint: str, attempt: int) -> None:
+        """Record that attempt number ``attempt`` (0 = first) is being sent."""
+        self._count(endpoint, "attempts")
+        if attempt == 0:
+            self.budget.deposit()
+
+    def on_success(self, endpoint: str, attempt: int) -> None:
+        """Record a final answer that needed no further retry."""
+        if attempt > 0:
+            self._count(endpoint, "recovered")
+
+    def delay(
+        self, endpoint: str, attempt: int, reason: str, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a failed ``attempt``, or None to give up."""
+        if attempt >= self.max_retries or (retry_after or 0) > self.backoff_max:
+            self._count(endpoint, "exhausted", reason)
+            return None
+        if not self.budget.withdraw():
+            self._count(endpoint, "budget_denied", reason)
+            return None
+        self._count(endpoint, "retries", reason)
+        wait = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+        if reason == "rpc_failure":
+            wait = max(wait, RPC_FAILURE_MIN_DELAY)
+        return max(wait, retry_after or 0.0)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-endpoint counters.
+
+        Each endpoint (e.g. ``"POST /attest"``) maps to ``attempts`` sent,
+        ``retries`` made, ``recovered`` calls that succeeded after retrying,
+        ``exhausted`` calls that ran out of retries, ``budget_denied`` calls
+        refused a retry by the shared budget, and ``reasons`` (retryable
+        failures by reason).
+        """
+        with self._lock:
+            return {
+                endpoint: {**stats, "reasons": dict(stats["reasons"])}
+                for endpoint, stats in self._stats.items()
+            }
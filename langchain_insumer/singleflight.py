@@ -0,0 +1,121 @@
+"""Share one in-flight request between concurrent identical calls."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def count(self, group: str, shared: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(group, {"calls": 0, "shared": 0})
+            counts["calls"] += 1
+            if shared:
+                counts["shared"] += 1
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {group: dict(counts) for group, counts in self._counts.items()}
+
+
+class SingleFlight:
+    """Run ``fn`` once per key at a time; concurrent callers share its outcome.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key before it finishes block and receive the same result (or
+    exception). Nothing is cached: the next call after completion runs again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._counters = _Counters()
+
+    def do(self, key: str, fn: Callable[[], Any], group: str = "") -> Any:
+        """Return ``fn()``, or the result of an identical call already running.
+
+        ``group`` names the counter bucket (e.g. the endpoint) in :meth:`stats`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self._counters.count(group, shared=not leader)
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``calls`` and ``shared`` (served by another call) per group."""
+        return self._counters.stats()
+
+
+class AsyncSingleFlight:
+    """Event-loop counterpart of :class:`SingleFlight`, keyed per running loop."""
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self._counters = _Counters()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], group: str = "") -> Any:
+        """Async version of :meth:`SingleFlight.do`."""
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        future = self._calls.get(slot)
+        self._counters.count(group, shared=future is not None)
+        while future is not None:
+            try:
+                # Shield so one waiter being cancelled does not cancel the others.
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # The running call's caller was cancelled, not this one: join the
+            # call that replaced it, or run it on this caller's behalf.
+            future = self._calls.get(slot)
+        future = self._calls[slot] = loop.create_future()
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so it is not logged as unhandled.
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[slot]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``calls`` and ``shared`` (served by another call) per group."""
+        return self._counters.stats()
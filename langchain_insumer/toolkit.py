@@ -0,0 +1,128 @@
+"""A LangChain toolkit exposing the Insumer tools by task."""
+
+import importlib
+from typing import Literal, Optional, Sequence
+
+from langchain_core.tools import BaseTool, BaseToolkit
+from pydantic import Field, PrivateAttr
+
+from langchain_insumer.tools import _TOOL_MODULES
+from langchain_insumer.wrapper import InsumerAPIWrapper
+
+# Named groups of tool classes, matching the sections of the README's tool list.
+TOOL_SUBSETS: dict[str, tuple[str, ...]] = {
+    "verification": (
+        "InsumerAttestTool",
+        "InsumerComplianceTemplatesTool",
+        "InsumerWalletTrustTool",
+        "InsumerBatchWalletTrustTool",
+        "InsumerVerifyTool",
+        "InsumerConfirmPaymentTool",
+        "InsumerJwksTool",
+    ),
+    "discovery": (
+        "InsumerListMerchantsTool",
+        "InsumerGetMerchantTool",
+        "InsumerListTokensTool",
+        "InsumerCheckDiscountTool",
+    ),
+    "credits": (
+        "InsumerBuyKeyTool",
+        "InsumerCreditsTool",
+        "InsumerBuyCreditsTool",
+        "InsumerBuyMerchantCreditsTool",
+    ),
+    "merchant-admin": (
+        "InsumerCreateMerchantTool",
+        "InsumerMerchantStatusTool",
+        "InsumerConfigureTokensTool",
+        "InsumerConfigureNftsTool",
+        "InsumerConfigureSettingsTool",
+        "InsumerPublishDirectoryTool",
+        "InsumerRequestDomainVerificationTool",
+        "InsumerVerifyDomainTool",
+    ),
+    "commerce": (
+        "InsumerAcpDiscountTool",
+        "InsumerUcpDiscountTool",
+        "InsumerValidateCodeTool",
+    ),
+}
+
+
+def _tool_class(name: str) -> type:
+    return getattr(importlib.import_module("langchain_insumer.tools"), name)
+
+
+class InsumerToolkit(BaseToolkit):
+    """Insumer tools sharing one :class:`InsumerAPIWrapper`.
+
+    Every tool the toolkit hands out uses the same wrapper, and therefore the
+    same connection pool, caches and retry budget. Tools are imported and
+    constructed only when first requested, then reused, so an agent that
+    needs two tools never builds the other 24.
+
+    Pick what the agent sees with ``subsets``; fewer tools means fewer
+    schemas and descriptions in every prompt.
+
+    Args:
+        api_wrapper: Wrapper shared by all tools.
+        subsets: Names from :data:`TOOL_SUBSETS` (``"verification"``,
+            ``"discovery"``, ``"credits"``, ``"merchant-admin"``,
+            ``"commerce"``) to include. ``None`` includes every tool.
+        output_mode: ``output_mode`` given to every tool. Default
+            ``"compact"``, so agents get short content and the full
+            response as the artifact.
+
+    Example:
+        .. code-block:: python
+
+            toolkit = InsumerToolkit(api_wrapper=api, subsets=["verification"])
+            agent = create_tool_calling_agent(llm, toolkit.get_tools(), prompt)
+    """
+
+    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
+    subsets: Optional[list[str]] = None
+    output_mode: Literal["full", "compact", "summary"] = "compact"
+
+    _tools: dict[str, BaseTool] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: object) -> None:
+        if self.subsets is not None:
+            self._tool_names(self.subsets)
+
+    @staticmethod
+    def _tool_names(subsets: Sequence[str]) -> list[str]:
+        if isinstance(subsets, str):
+            subsets = [subsets]
+        unknown = [s for s in subsets if s not in TOOL_SUBSETS]
+        if unknown:
+            raise ValueError(
+                f"Unknown tool subset(s) {unknown}; choose from {list(TOOL_SUBSETS)}"
+            )
+        names: list[str] = []
+        for subset in subsets:
+            names.extend(n for n in TOOL_SUBSETS[subset] if n not in names)
+        return names
+
+    def _tool(self, class_name: str) -> BaseTool:
+        tool = self._tools.get(class_name)
+        if tool is None:
+            tool = self._tools[class_name] = _tool_class(class_name)(
+                api_wrapper=self.api_wrapper, output_mode=self.output_mode
+            )
+        return tool
+
+    def get_tools(self, subsets: Optional[Sequence[str]] = None) -> list[BaseTool]:
+        """Return the tools of ``subsets``, or of the toolkit's own ``subsets`` if omitted."""
+        if subsets is None:
+            subsets = self.subsets if self.subsets is not None else list(TOOL_SUBSETS)
+        return [self._tool(name) for name in self._tool_names(subsets)]
+
+    def get_tool(self, name: str) -> BaseTool:
+        """Return one tool by its tool name (``"insumer_attest"``) or class name."""
+        for class_name, module in _TOOL_MODULES.items():
+            # Each tool is named after its module: tools/attest.py is "insumer_attest".
+            if name in (class_name, f"insumer_{module}"):
+                return self._tool(class_name)
+        raise ValueError(f"No Insumer tool named {name!r}")
@@ -1,57 +1,81 @@
-"""Insumer Model tools for LangChain agents."""
-
-from langchain_insumer.tools.acp_discount import InsumerAcpDiscountTool
-from langchain_insumer.tools.attest import InsumerAttestTool
-from langchain_insumer.tools.batch_wallet_trust import InsumerBatchWalletTrustTool
-from langchain_insumer.tools.compliance_templates import InsumerComplianceTemplatesTool
-from langchain_insumer.tools.buy_credits import InsumerBuyCreditsTool
-from langchain_insumer.tools.buy_key import InsumerBuyKeyTool
-from langchain_insumer.tools.buy_merchant_credits import InsumerBuyMerchantCreditsTool
-from langchain_insumer.tools.check_discount import InsumerCheckDiscountTool
-from langchain_insumer.tools.configure_nfts import InsumerConfigureNftsTool
-from langchain_insumer.tools.configure_settings import InsumerConfigureSettingsTool
-from langchain_insumer.tools.configure_tokens import InsumerConfigureTokensTool
-from langchain_insumer.tools.confirm_payment import InsumerConfirmPaymentTool
-from langchain_insumer.tools.create_merchant import InsumerCreateMerchantTool
-from langchain_insumer.tools.credits import InsumerCreditsTool
-from langchain_insumer.tools.get_merchant import InsumerGetMerchantTool
-from langchain_insumer.tools.jwks import InsumerJwksTool
-from langchain_insumer.tools.list_merchants import InsumerListMerchantsTool
-from langchain_insumer.tools.list_tokens import InsumerListTokensTool
-from langchain_insumer.tools.merchant_status import InsumerMerchantStatusTool
-from langchain_insumer.tools.publish_directory import InsumerPublishDirectoryTool
-from langchain_insumer.tools.request_domain_verification import InsumerRequestDomainVerificationTool
-from langchain_insumer.tools.ucp_discount import InsumerUcpDiscountTool
-from langchain_insumer.tools.validate_code import InsumerValidateCodeTool
-from langchain_insumer.tools.verify import InsumerVerifyTool
-from langchain_insumer.tools.verify_domain import InsumerVerifyDomainTool
-from langchain_insumer.tools.wallet_trust import InsumerWalletTrustTool
-
-__all__ = [
-    "InsumerAcpDiscountTool",
-    "InsumerAttestTool",
-    "InsumerBatchWalletTrustTool",
-    "InsumerComplianceTemplatesTool",
-    "InsumerBuyCreditsTool",
-    "InsumerBuyKeyTool",
-    "InsumerBuyMerchantCreditsTool",
-    "InsumerCheckDiscountTool",
-    "InsumerConfigureNftsTool",
-    "InsumerConfigureSettingsTool",
-    "InsumerConfigureTokensTool",
-    "InsumerConfirmPaymentTool",
-    "InsumerCreateMerchantTool",
-    "InsumerCreditsTool",
-    "InsumerGetMerchantTool",
-    "InsumerJwksTool",
-    "InsumerListMerchantsTool",
-    "InsumerListTokensTool",
-    "InsumerMerchantStatusTool",
-    "InsumerPublishDirectoryTool",
-    "InsumerRequestDomainVerificationTool",
-    "InsumerUcpDiscountTool",
-    "InsumerValidateCodeTool",
-    "InsumerVerifyTool",
-    "InsumerVerifyDomainTool",
-    "InsumerWalletTrustTool",
-]
+"""Insumer Model tools for LangChain agents.
+
+Tool classes are imported on first access (PEP 562), so a process that uses
+one tool does not build the schemas and classes of the other 25.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from langchain_insumer.tools.acp_discount import InsumerAcpDiscountTool
+    from langchain_insumer.tools.attest import InsumerAttestTool
+    from langchain_insumer.tools.batch_wallet_trust import InsumerBatchWalletTrustTool
+    from langchain_insumer.tools.compliance_templates import InsumerComplianceTemplatesTool
+    from langchain_insumer.tools.buy_credits import InsumerBuyCreditsTool
+    from langchain_insumer.tools.buy_key import InsumerBuyKeyTool
+    from langchain_insumer.tools.buy_merchant_credits import InsumerBuyMerchantCreditsTool
+    from langchain_insumer.tools.check_discount import InsumerCheckDiscountTool
+    from langchain_insumer.tools.configure_nfts import InsumerConfigureNftsTool
+    from langchain_insumer.tools.configure_settings import InsumerConfigureSettingsTool
+    from langchain_insumer.tools.configure_tokens import InsumerConfigureTokensTool
+    from langchain_insumer.tools.confirm_payment import InsumerConfirmPaymentTool
+    from langchain_insumer.tools.create_merchant import InsumerCreateMerchantTool
+    from langchain_insumer.tools.credits import InsumerCreditsTool
+    from langchain_insumer.tools.get_merchant import InsumerGetMerchantTool
+    from langchain_insumer.tools.jwks import InsumerJwksTool
+    from langchain_insumer.tools.list_merchants import InsumerListMerchantsTool
+    from langchain_insumer.tools.list_tokens import InsumerListTokensTool
+    from langchain_insumer.tools.merchant_status import InsumerMerchantStatusTool
+    from langchain_insumer.tools.publish_directory import InsumerPublishDirectoryTool
+    from langchain_insumer.tools.request_domain_verification import InsumerRequestDomainVerificationTool
+    from langchain_insumer.tools.ucp_discount import InsumerUcpDiscountTool
+    from langchain_insumer.tools.validate_code import InsumerValidateCodeTool
+    from langchain_insumer.tools.verify import InsumerVerifyTool
+    from langchain_insumer.tools.verify_domain import InsumerVerifyDomainTool
+    from langchain_insumer.tools.wallet_trust import InsumerWalletTrustTool
+
+# Tool class name -> module in this package that defines it.
+_TOOL_MODULES = {
+    "InsumerAcpDiscountTool": "acp_discount",
+    "InsumerAttestTool": "attest",
+    "InsumerBatchWalletTrustTool": "batch_wallet_trust",
+    "InsumerComplianceTemplatesTool": "compliance_templates",
+    "InsumerBuyCreditsTool": "buy_credits",
+    "InsumerBuyKeyTool": "buy_key",
+    "InsumerBuyMerchantCreditsTool": "buy_merchant_credits",
+    "InsumerCheckDiscountTool": "check_discount",
+    "InsumerConfigureNftsTool": "configure_nfts",
+    "InsumerConfigureSettingsTool": "configure_settings",
+    "InsumerConfigureTokensTool": "configure_tokens",
+    "InsumerConfirmPaymentTool": "confirm_payment",
+    "InsumerCreateMerchantTool": "create_merchant",
+    "InsumerCreditsTool": "credits",
+    "InsumerGetMerchantTool": "get_merchant",
+    "InsumerJwksTool": "jwks",
+    "InsumerListMerchantsTool": "list_merchants",
+    "InsumerListTokensTool": "list_tokens",
+    "InsumerMerchantStatusTool": "merchant_status",
+    "InsumerPublishDirectoryTool": "publish_directory",
+    "InsumerRequestDomainVerificationTool": "request_domain_verification",
+    "InsumerUcpDiscountTool": "ucp_discount",
+    "InsumerValidateCodeTool": "validate_code",
+    "InsumerVerifyTool": "verify",
+    "InsumerVerifyDomainTool": "verify_domain",
+    "InsumerWalletTrustTool": "wallet_trust",
+}
+
+__all__ = list(_TOOL_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _TOOL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
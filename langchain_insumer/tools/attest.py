@@ -3,11 +3,13 @@
 import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class AttestSchema(BaseModel):
@@ -81,7 +83,7 @@ class AttestSchema(BaseModel):
     )
 
 
-class InsumerAttestTool(BaseTool):
+class InsumerAttestTool(InsumerBaseTool):
     """Verify on-chain token balances, NFT ownership, EAS attestations, or Farcaster identity.
 
     Returns only true/false per condition -- never exposes actual balances.
@@ -104,11 +106,6 @@ class InsumerAttestTool(BaseTool):
     )
     args_schema: Type[AttestSchema] = AttestSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         conditions: str,
@@ -122,7 +119,7 @@ class InsumerAttestTool(BaseTool):
         proof: Optional[str] = None,
         format: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Execute the on-chain verification."""
         parsed_conditions: list[dict[str, Any]] = json.loads(conditions)
         result = self.api_wrapper.attest(
@@ -137,4 +134,34 @@ class InsumerAttestTool(BaseTool):
             proof=proof,
             format=format,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        conditions: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        proof: Optional[str] = None,
+        format: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Execute the on-chain verification."""
+        parsed_conditions: list[dict[str, Any]] = json.loads(conditions)
+        result = await self.api_wrapper.aattest(
+            conditions=parsed_conditions,
+            wallet=wallet,
+            solana_wallet=solana_wallet,
+            xrpl_wallet=xrpl_wallet,
+            bitcoin_wallet=bitcoin_wallet,
+            tron_wallet=tron_wallet,
+            stellar_wallet=stellar_wallet,
+            sui_wallet=sui_wallet,
+            proof=proof,
+            format=format,
+        )
+        return self._output(result)
@@ -0,0 +1,70 @@
+"""Base class shared by the Insumer tools."""
+
+from typing import Any, Literal
+
+from langchain_core.tools import BaseTool
+from pydantic import Field
+
+from langchain_insumer.credits import tool_scope
+from langchain_insumer.output import render
+from langchain_insumer.tracing import tool_span, traced_arun, traced_run
+from langchain_insumer.wrapper import InsumerAPIWrapper
+
+# (content for the model, raw response as the ToolMessage artifact)
+ToolOutput = tuple[str, Any]
+
+
+class InsumerBaseTool(BaseTool):
+    """A tool backed by an :class:`InsumerAPIWrapper`.
+
+    Tools use LangChain's ``content_and_artifact`` response format: the
+    wrapper's response dict is attached, as is, as the ``ToolMessage``
+    artifact, and the model receives a string rendered according to
+    ``output_mode``: ``"compact"`` or ``"summary"`` for short, minified,
+    projected JSON (see :mod:`langchain_insumer.output`), or ``"full"`` for
+    the whole response pretty-printed. Tools built by
+    :class:`~langchain_insumer.toolkit.InsumerToolkit` default to
+    ``"compact"``; a tool constructed on its own defaults to ``"full"``, as
+    the tools have always returned it.
+
+    When the wrapper has ``tracing`` on, each invocation is traced as an
+    ``execute_tool <name>`` span containing a ``<name>._run`` (or ``._arun``)
+    span, the wrapper's HTTP spans and an ``insumer.render`` span for the
+    content string (see :mod:`langchain_insumer.tracing`). With a credit
+    ledger, the credits a run spends are attributed to the tool and to the
+    ``credit_tag`` in the run's metadata, if any.
+    """
+
+    response_format: Literal["content", "content_and_artifact"] = "content_and_artifact"
+    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
+    output_mode: Literal["full", "compact", "summary"] = "full"
+
+    def __init__(self, api_wrapper: InsumerAPIWrapper, **kwargs: Any) -> None:
+        super().__init__(api_wrapper=api_wrapper, **kwargs)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_run" in cls.__dict__:
+            cls._run = traced_run(cls.__dict__["_run"])
+        if "_arun" in cls.__dict__:
+            cls._arun = traced_arun(cls.__dict__["_arun"])
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        tag = (kwargs.get("metadata") or {}).get("credit_tag")
+        with tool_span(self), tool_scope(self.name, tag):
+            return super().run(*args, **kwargs)
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        tag = (kwargs.get("metadata") or {}).get("credit_tag")
+        with tool_span(self), tool_scope(self.name, tag):
+            return await super().arun(*args, **kwargs)
+
+    def _output(self, result: Any) -> ToolOutput:
+        """Pair the model-facing rendering of ``result`` with ``result`` itself."""
+        tracer = self.api_wrapper._tracer
+        if tracer is None:
+            return render(result, self.output_mode), result
+        with tracer.start_as_current_span(
+            "insumer.render", attributes={"insumer.output_mode": self.output_mode}
+        ):
+            return render(result, self.output_mode), result
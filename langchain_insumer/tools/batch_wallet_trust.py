@@ -1,13 +1,14 @@
 """Tool for generating batch wallet trust fact profiles."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class BatchWalletTrustSchema(BaseModel):
@@ -33,7 +34,7 @@ class BatchWalletTrustSchema(BaseModel):
     )
 
 
-class InsumerBatchWalletTrustTool(BaseTool):
+class InsumerBatchWalletTrustTool(InsumerBaseTool):
     """Generate wallet trust fact profiles for up to 10 wallets in one request.
 
     Shared block fetches make this 5-8x faster than sequential calls. Each
@@ -52,20 +53,28 @@ class InsumerBatchWalletTrustTool(BaseTool):
     )
     args_schema: Type[BatchWalletTrustSchema] = BatchWalletTrustSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         wallets: list[dict],
         proof: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Generate batch wallet trust fact profiles."""
         result = self.api_wrapper.batch_wallet_trust(
             wallets=wallets,
             proof=proof,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        wallets: list[dict],
+        proof: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Generate batch wallet trust fact profiles."""
+        result = await self.api_wrapper.abatch_wallet_trust(
+            wallets=wallets,
+            proof=proof,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for buying verification credits with USDC, USDT, or BTC."""
 
-import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class BuyCreditsSchema(BaseModel):
@@ -31,7 +32,7 @@ class BuyCreditsSchema(BaseModel):
     )
 
 
-class InsumerBuyCreditsTool(BaseTool):
+class InsumerBuyCreditsTool(InsumerBaseTool):
     """Buy verification credits with USDC, USDT, or BTC.
 
     Rate: 25 credits per $1 ($0.04/credit). Minimum purchase: 5
@@ -46,11 +47,6 @@ class InsumerBuyCreditsTool(BaseTool):
     )
     args_schema: Type[BuyCreditsSchema] = BuyCreditsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         tx_hash: str,
@@ -58,7 +54,7 @@ class InsumerBuyCreditsTool(BaseTool):
         amount: float,
         update_wallet: bool = False,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Buy credits."""
         result = self.api_wrapper.buy_credits(
             tx_hash=tx_hash,
@@ -66,4 +62,21 @@ class InsumerBuyCreditsTool(BaseTool):
             amount=amount,
             update_wallet=update_wallet,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        update_wallet: bool = False,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Buy credits."""
+        result = await self.api_wrapper.abuy_credits(
+            tx_hash=tx_hash,
+            chain_id=chain_id,
+            amount=amount,
+            update_wallet=update_wallet,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for buying a new API key with USDC, USDT, or BTC (no auth required)."""
 
-import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class BuyKeySchema(BaseModel):
@@ -31,7 +32,7 @@ class BuyKeySchema(BaseModel):
     )
 
 
-class InsumerBuyKeyTool(BaseTool):
+class InsumerBuyKeyTool(InsumerBaseTool):
     """Buy a new API key with USDC, USDT, or BTC. No auth required.
 
     Agent-friendly: no email needed. Send USDC, USDT, or BTC to the
@@ -49,11 +50,6 @@ class InsumerBuyKeyTool(BaseTool):
     )
     args_schema: Type[BuyKeySchema] = BuyKeySchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         tx_hash: str,
@@ -61,7 +57,7 @@ class InsumerBuyKeyTool(BaseTool):
         amount: float,
         app_name: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Buy a new API key."""
         result = self.api_wrapper.buy_key(
             tx_hash=tx_hash,
@@ -69,4 +65,21 @@ class InsumerBuyKeyTool(BaseTool):
             amount=amount,
             app_name=app_name,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        app_name: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Buy a new API key."""
+        result = await self.api_wrapper.abuy_key(
+            tx_hash=tx_hash,
+            chain_id=chain_id,
+            amount=amount,
+            app_name=app_name,
+        )
+        return self._output(result)
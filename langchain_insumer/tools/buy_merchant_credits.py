@@ -1,13 +1,14 @@
 """Tool for buying merchant-specific verification credits with USDC, USDT, or BTC."""
 
-import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class BuyMerchantCreditsSchema(BaseModel):
@@ -32,7 +33,7 @@ class BuyMerchantCreditsSchema(BaseModel):
     )
 
 
-class InsumerBuyMerchantCreditsTool(BaseTool):
+class InsumerBuyMerchantCreditsTool(InsumerBaseTool):
     """Buy verification credits for a specific merchant with USDC, USDT, or BTC. Owner only.
 
     Rate: 25 credits per $1 ($0.04/credit). Minimum 5. Merchant credits
@@ -48,11 +49,6 @@ class InsumerBuyMerchantCreditsTool(BaseTool):
     )
     args_schema: Type[BuyMerchantCreditsSchema] = BuyMerchantCreditsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
@@ -61,7 +57,7 @@ class InsumerBuyMerchantCreditsTool(BaseTool):
         amount: float,
         update_wallet: bool = False,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Buy merchant credits."""
         result = self.api_wrapper.buy_merchant_credits(
             merchant_id=id,
@@ -70,4 +66,23 @@ class InsumerBuyMerchantCreditsTool(BaseTool):
             amount=amount,
             update_wallet=update_wallet,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        update_wallet: bool = False,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Buy merchant credits."""
+        result = await self.api_wrapper.abuy_merchant_credits(
+            merchant_id=id,
+            tx_hash=tx_hash,
+            chain_id=chain_id,
+            amount=amount,
+            update_wallet=update_wallet,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for checking wallet discount eligibility at a merchant."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class CheckDiscountSchema(BaseModel):
@@ -44,7 +45,7 @@ class CheckDiscountSchema(BaseModel):
     )
 
 
-class InsumerCheckDiscountTool(BaseTool):
+class InsumerCheckDiscountTool(InsumerBaseTool):
     """Calculate the discount a wallet qualifies for at a specific merchant.
 
     Checks on-chain balances server-side and returns the tier and discount
@@ -60,11 +61,6 @@ class InsumerCheckDiscountTool(BaseTool):
     )
     args_schema: Type[CheckDiscountSchema] = CheckDiscountSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         merchant_id: str,
@@ -76,7 +72,7 @@ class InsumerCheckDiscountTool(BaseTool):
         stellar_wallet: Optional[str] = None,
         sui_wallet: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Check the discount."""
         result = self.api_wrapper.check_discount(
             merchant_id=merchant_id,
@@ -88,4 +84,29 @@ class InsumerCheckDiscountTool(BaseTool):
             stellar_wallet=stellar_wallet,
             sui_wallet=sui_wallet,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Check the discount."""
+        result = await self.api_wrapper.acheck_discount(
+            merchant_id=merchant_id,
+            wallet=wallet,
+            solana_wallet=solana_wallet,
+            xrpl_wallet=xrpl_wallet,
+            bitcoin_wallet=bitcoin_wallet,
+            tron_wallet=tron_wallet,
+            stellar_wallet=stellar_wallet,
+            sui_wallet=sui_wallet,
+        )
+        return self._output(result)
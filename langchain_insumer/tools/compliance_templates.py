@@ -1,13 +1,14 @@
 """Tool for listing available compliance templates."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from pydantic import BaseModel
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ComplianceTemplatesSchema(BaseModel):
@@ -16,7 +17,7 @@ class ComplianceTemplatesSchema(BaseModel):
     pass
 
 
-class InsumerComplianceTemplatesTool(BaseTool):
+class InsumerComplianceTemplatesTool(InsumerBaseTool):
     """List available compliance templates for EAS attestation verification.
 
     Templates provide pre-configured schema IDs, attester addresses, and
@@ -34,15 +35,18 @@ class InsumerComplianceTemplatesTool(BaseTool):
     )
     args_schema: Type[ComplianceTemplatesSchema] = ComplianceTemplatesSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """List compliance templates."""
         result = self.api_wrapper.get_compliance_templates()
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """List compliance templates."""
+        result = await self.api_wrapper.aget_compliance_templates()
+        return self._output(result)
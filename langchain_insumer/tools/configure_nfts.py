@@ -3,11 +3,13 @@
 import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ConfigureNftsSchema(BaseModel):
@@ -24,7 +26,7 @@ class ConfigureNftsSchema(BaseModel):
     )
 
 
-class InsumerConfigureNftsTool(BaseTool):
+class InsumerConfigureNftsTool(InsumerBaseTool):
     """Configure NFT collections that grant discounts at a merchant. Owner only.
 
     Max 4 NFT collections per merchant. Each collection specifies a
@@ -40,21 +42,30 @@ class InsumerConfigureNftsTool(BaseTool):
     )
     args_schema: Type[ConfigureNftsSchema] = ConfigureNftsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
         nft_collections: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Configure NFTs."""
         parsed: list = json.loads(nft_collections)
         result = self.api_wrapper.configure_nfts(
             merchant_id=id,
             nft_collections=parsed,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        nft_collections: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Configure NFTs."""
+        parsed: list = json.loads(nft_collections)
+        result = await self.api_wrapper.aconfigure_nfts(
+            merchant_id=id,
+            nft_collections=parsed,
+        )
+        return self._output(result)
@@ -3,11 +3,13 @@
 import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ConfigureSettingsSchema(BaseModel):
@@ -37,7 +39,7 @@ class ConfigureSettingsSchema(BaseModel):
     )
 
 
-class InsumerConfigureSettingsTool(BaseTool):
+class InsumerConfigureSettingsTool(InsumerBaseTool):
     """Update merchant settings: discount mode, cap, and USDC payments. Owner only.
 
     All fields are optional — only provided fields are updated.
@@ -52,11 +54,6 @@ class InsumerConfigureSettingsTool(BaseTool):
     )
     args_schema: Type[ConfigureSettingsSchema] = ConfigureSettingsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
@@ -64,7 +61,7 @@ class InsumerConfigureSettingsTool(BaseTool):
         discount_cap: Optional[int] = None,
         usdc_payment: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Configure settings."""
         parsed_usdc: Optional[dict] = None
         if usdc_payment is not None:
@@ -75,4 +72,24 @@ class InsumerConfigureSettingsTool(BaseTool):
             discount_cap=discount_cap,
             usdc_payment=parsed_usdc,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        discount_mode: Optional[str] = None,
+        discount_cap: Optional[int] = None,
+        usdc_payment: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Configure settings."""
+        parsed_usdc: Optional[dict] = None
+        if usdc_payment is not None:
+            parsed_usdc = json.loads(usdc_payment)
+        result = await self.api_wrapper.aconfigure_settings(
+            merchant_id=id,
+            discount_mode=discount_mode,
+            discount_cap=discount_cap,
+            usdc_payment=parsed_usdc,
+        )
+        return self._output(result)
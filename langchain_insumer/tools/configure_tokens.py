@@ -3,11 +3,13 @@
 import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ConfigureTokensSchema(BaseModel):
@@ -33,7 +35,7 @@ class ConfigureTokensSchema(BaseModel):
     )
 
 
-class InsumerConfigureTokensTool(BaseTool):
+class InsumerConfigureTokensTool(InsumerBaseTool):
     """Configure token discount tiers for a merchant. Owner only.
 
     Set the merchant's own token and/or partner tokens. Each token defines
@@ -50,18 +52,13 @@ class InsumerConfigureTokensTool(BaseTool):
     )
     args_schema: Type[ConfigureTokensSchema] = ConfigureTokensSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
         own_token: Optional[str] = None,
         partner_tokens: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Configure tokens."""
         parsed_own: Optional[dict] = None
         parsed_partners: Optional[list] = None
@@ -74,4 +71,25 @@ class InsumerConfigureTokensTool(BaseTool):
             own_token=parsed_own,
             partner_tokens=parsed_partners,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        own_token: Optional[str] = None,
+        partner_tokens: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Configure tokens."""
+        parsed_own: Optional[dict] = None
+        parsed_partners: Optional[list] = None
+        if own_token is not None:
+            parsed_own = json.loads(own_token)
+        if partner_tokens is not None:
+            parsed_partners = json.loads(partner_tokens)
+        result = await self.api_wrapper.aconfigure_tokens(
+            merchant_id=id,
+            own_token=parsed_own,
+            partner_tokens=parsed_partners,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for confirming USDC payment for a discount code."""
 
-import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ConfirmPaymentSchema(BaseModel):
@@ -27,7 +28,7 @@ class ConfirmPaymentSchema(BaseModel):
     amount: Any = Field(description="USDC amount sent.")
 
 
-class InsumerConfirmPaymentTool(BaseTool):
+class InsumerConfirmPaymentTool(InsumerBaseTool):
     """Confirm USDC payment for a discount code.
 
     After generating a discount code with ``insumer_verify``, confirm the
@@ -43,11 +44,6 @@ class InsumerConfirmPaymentTool(BaseTool):
     )
     args_schema: Type[ConfirmPaymentSchema] = ConfirmPaymentSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         code: str,
@@ -55,7 +51,7 @@ class InsumerConfirmPaymentTool(BaseTool):
         chain_id: Any,
         amount: Any,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Confirm payment."""
         result = self.api_wrapper.confirm_payment(
             code=code,
@@ -63,4 +59,21 @@ class InsumerConfirmPaymentTool(BaseTool):
             chain_id=chain_id,
             amount=amount,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        code: str,
+        tx_hash: str,
+        chain_id: Any,
+        amount: Any,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Confirm payment."""
+        result = await self.api_wrapper.aconfirm_payment(
+            code=code,
+            tx_hash=tx_hash,
+            chain_id=chain_id,
+            amount=amount,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for creating a new merchant."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class CreateMerchantSchema(BaseModel):
@@ -31,7 +32,7 @@ class CreateMerchantSchema(BaseModel):
     )
 
 
-class InsumerCreateMerchantTool(BaseTool):
+class InsumerCreateMerchantTool(InsumerBaseTool):
     """Create a new merchant on InsumerAPI.
 
     Each new merchant receives 100 free verification credits. Maximum 10
@@ -49,22 +50,32 @@ class InsumerCreateMerchantTool(BaseTool):
     )
     args_schema: Type[CreateMerchantSchema] = CreateMerchantSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         company_name: str,
         company_id: str,
         location: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Create merchant."""
         result = self.api_wrapper.create_merchant(
             company_name=company_name,
             company_id=company_id,
             location=location,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        company_name: str,
+        company_id: str,
+        location: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Create merchant."""
+        result = await self.api_wrapper.acreate_merchant(
+            company_name=company_name,
+            company_id=company_id,
+            location=location,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for checking verification credit balance."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from pydantic import BaseModel
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class CreditsSchema(BaseModel):
@@ -16,7 +17,7 @@ class CreditsSchema(BaseModel):
     pass
 
 
-class InsumerCreditsTool(BaseTool):
+class InsumerCreditsTool(InsumerBaseTool):
     """Check the verification credit balance for the current API key."""
 
     name: str = "insumer_credits"
@@ -26,15 +27,18 @@ class InsumerCreditsTool(BaseTool):
     )
     args_schema: Type[CreditsSchema] = CreditsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Check credits."""
         result = self.api_wrapper.get_credits()
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Check credits."""
+        result = await self.api_wrapper.aget_credits()
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for getting a merchant's public profile."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class GetMerchantSchema(BaseModel):
@@ -16,11 +17,12 @@ class GetMerchantSchema(BaseModel):
     id: str = Field(description="Merchant ID to look up.")
 
 
-class InsumerGetMerchantTool(BaseTool):
+class InsumerGetMerchantTool(InsumerBaseTool):
     """Get the full public profile of a merchant.
 
     Returns token tiers, NFT collections, discount mode, verification
-    status, and location. No credits consumed.
+    status, and location. No credits consumed. Served from a local cache
+    when the wrapper is created with ``merchant_directory=True``.
     """
 
     name: str = "insumer_get_merchant"
@@ -31,16 +33,20 @@ class InsumerGetMerchantTool(BaseTool):
     )
     args_schema: Type[GetMerchantSchema] = GetMerchantSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Get merchant profile."""
         result = self.api_wrapper.get_merchant(merchant_id=id)
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Get merchant profile."""
+        result = await self.api_wrapper.aget_merchant(merchant_id=id)
+        return self._output(result)
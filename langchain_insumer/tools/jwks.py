@@ -1,13 +1,14 @@
 """Tool for fetching the InsumerAPI JWKS (public signing key)."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from pydantic import BaseModel
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class JwksSchema(BaseModel):
@@ -16,7 +17,7 @@ class JwksSchema(BaseModel):
     pass
 
 
-class InsumerJwksTool(BaseTool):
+class InsumerJwksTool(InsumerBaseTool):
     """Fetch the JWKS containing InsumerAPI's ECDSA P-256 public signing key.
 
     The kid field in attestation responses identifies which key signed the
@@ -33,15 +34,18 @@ class InsumerJwksTool(BaseTool):
     )
     args_schema: Type[JwksSchema] = JwksSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Fetch the JWKS document."""
         result = self.api_wrapper.get_jwks()
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Fetch the JWKS document."""
+        result = await self.api_wrapper.aget_jwks()
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for listing merchants in the public directory."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ListMerchantsSchema(BaseModel):
@@ -32,8 +33,12 @@ class ListMerchantsSchema(BaseModel):
     )
 
 
-class InsumerListMerchantsTool(BaseTool):
-    """Browse merchants that offer token-gated discounts."""
+class InsumerListMerchantsTool(InsumerBaseTool):
+    """Browse merchants that offer token-gated discounts.
+
+    Answered from memory when the wrapper is created with
+    ``merchant_directory=True``.
+    """
 
     name: str = "insumer_list_merchants"
     description: str = (
@@ -44,11 +49,6 @@ class InsumerListMerchantsTool(BaseTool):
     )
     args_schema: Type[ListMerchantsSchema] = ListMerchantsSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         token: Optional[str] = None,
@@ -56,7 +56,7 @@ class InsumerListMerchantsTool(BaseTool):
         limit: int = 50,
         offset: int = 0,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """List merchants."""
         result = self.api_wrapper.list_merchants(
             token=token,
@@ -64,4 +64,21 @@ class InsumerListMerchantsTool(BaseTool):
             limit=limit,
             offset=offset,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        token: Optional[str] = None,
+        verified: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """List merchants."""
+        result = await self.api_wrapper.alist_merchants(
+            token=token,
+            verified=verified,
+            limit=limit,
+            offset=offset,
+        )
+        return self._output(result)
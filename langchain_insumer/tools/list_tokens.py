@@ -1,13 +1,14 @@
 """Tool for listing registered tokens and NFT collections."""
 
-import json
 from typing import Any, Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ListTokensSchema(BaseModel):
@@ -27,8 +28,12 @@ class ListTokensSchema(BaseModel):
     )
 
 
-class InsumerListTokensTool(BaseTool):
-    """List tokens and NFT collections registered with merchants."""
+class InsumerListTokensTool(InsumerBaseTool):
+    """List tokens and NFT collections registered with merchants.
+
+    Answered from memory when the wrapper is created with
+    ``token_registry=True``.
+    """
 
     name: str = "insumer_list_tokens"
     description: str = (
@@ -38,22 +43,32 @@ class InsumerListTokensTool(BaseTool):
     )
     args_schema: Type[ListTokensSchema] = ListTokensSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         chain: Optional[Any] = None,
         symbol: Optional[str] = None,
         asset_type: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """List tokens."""
         result = self.api_wrapper.list_tokens(
             chain=chain,
             symbol=symbol,
             asset_type=asset_type,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        chain: Optional[Any] = None,
+        symbol: Optional[str] = None,
+        asset_type: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """List tokens."""
+        result = await self.api_wrapper.alist_tokens(
+            chain=chain,
+            symbol=symbol,
+            asset_type=asset_type,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for getting private merchant status."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class MerchantStatusSchema(BaseModel):
@@ -16,7 +17,7 @@ class MerchantStatusSchema(BaseModel):
     id: str = Field(description="Merchant ID to check status for.")
 
 
-class InsumerMerchantStatusTool(BaseTool):
+class InsumerMerchantStatusTool(InsumerBaseTool):
     """Get full private merchant details. Owner only.
 
     Returns credits, token configurations, NFT collections, directory
@@ -31,16 +32,20 @@ class InsumerMerchantStatusTool(BaseTool):
     )
     args_schema: Type[MerchantStatusSchema] = MerchantStatusSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Get merchant status."""
         result = self.api_wrapper.get_merchant_status(merchant_id=id)
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Get merchant status."""
+        result = await self.api_wrapper.aget_merchant_status(merchant_id=id)
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for publishing a merchant to the public directory."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class PublishDirectorySchema(BaseModel):
@@ -16,7 +17,7 @@ class PublishDirectorySchema(BaseModel):
     id: str = Field(description="Merchant ID to publish.")
 
 
-class InsumerPublishDirectoryTool(BaseTool):
+class InsumerPublishDirectoryTool(InsumerBaseTool):
     """Publish or refresh a merchant listing in the public directory. Owner only.
 
     Call this after creating a merchant and configuring tokens/NFTs/settings.
@@ -31,16 +32,20 @@ class InsumerPublishDirectoryTool(BaseTool):
     )
     args_schema: Type[PublishDirectorySchema] = PublishDirectorySchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         id: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Publish to directory."""
         result = self.api_wrapper.publish_directory(merchant_id=id)
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        id: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Publish to directory."""
+        result = await self.api_wrapper.apublish_directory(merchant_id=id)
+        return self._output(result)
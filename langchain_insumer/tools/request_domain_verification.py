@@ -1,13 +1,14 @@
 """Tool for requesting a domain verification token."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class RequestDomainVerificationSchema(BaseModel):
@@ -17,7 +18,7 @@ class RequestDomainVerificationSchema(BaseModel):
     domain: str = Field(description="Domain to verify (e.g. 'example.com').")
 
 
-class InsumerRequestDomainVerificationTool(BaseTool):
+class InsumerRequestDomainVerificationTool(InsumerBaseTool):
     """Request a domain verification token for a merchant.
 
     Returns the token and three verification methods: DNS TXT record,
@@ -35,20 +36,28 @@ class InsumerRequestDomainVerificationTool(BaseTool):
     )
     args_schema: Type[RequestDomainVerificationSchema] = RequestDomainVerificationSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         merchant_id: str,
         domain: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Request domain verification token."""
         result = self.api_wrapper.request_domain_verification(
             merchant_id=merchant_id,
             domain=domain,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        merchant_id: str,
+        domain: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Request domain verification token."""
+        result = await self.api_wrapper.arequest_domain_verification(
+            merchant_id=merchant_id,
+            domain=domain,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for UCP (Universal Commerce Protocol) format discount eligibility checks."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class UcpDiscountSchema(BaseModel):
@@ -51,7 +52,7 @@ class UcpDiscountSchema(BaseModel):
     )
 
 
-class InsumerUcpDiscountTool(BaseTool):
+class InsumerUcpDiscountTool(InsumerBaseTool):
     """Check discount eligibility in UCP (Google Universal Commerce Protocol) format.
 
     Returns title, extension field, and applied array compatible with UCP
@@ -68,11 +69,6 @@ class InsumerUcpDiscountTool(BaseTool):
     )
     args_schema: Type[UcpDiscountSchema] = UcpDiscountSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         merchant_id: str,
@@ -85,7 +81,7 @@ class InsumerUcpDiscountTool(BaseTool):
         sui_wallet: Optional[str] = None,
         items: Optional[list] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Check UCP discount eligibility."""
         result = self.api_wrapper.ucp_discount(
             merchant_id=merchant_id,
@@ -98,4 +94,31 @@ class InsumerUcpDiscountTool(BaseTool):
             sui_wallet=sui_wallet,
             items=items,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        items: Optional[list] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Check UCP discount eligibility."""
+        result = await self.api_wrapper.aucp_discount(
+            merchant_id=merchant_id,
+            wallet=wallet,
+            solana_wallet=solana_wallet,
+            xrpl_wallet=xrpl_wallet,
+            bitcoin_wallet=bitcoin_wallet,
+            tron_wallet=tron_wallet,
+            stellar_wallet=stellar_wallet,
+            sui_wallet=sui_wallet,
+            items=items,
+        )
+        return self._output(result)
@@ -1,13 +1,14 @@
 """Tool for validating INSR-XXXXX discount codes."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class ValidateCodeSchema(BaseModel):
@@ -16,7 +17,7 @@ class ValidateCodeSchema(BaseModel):
     code: str = Field(description="Discount code in INSR-XXXXX format.")
 
 
-class InsumerValidateCodeTool(BaseTool):
+class InsumerValidateCodeTool(InsumerBaseTool):
     """Validate an INSR-XXXXX discount code.
 
     For merchant backends during ACP/UCP checkout to confirm code validity,
@@ -33,16 +34,20 @@ class InsumerValidateCodeTool(BaseTool):
     )
     args_schema: Type[ValidateCodeSchema] = ValidateCodeSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         code: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Validate discount code."""
         result = self.api_wrapper.validate_code(code=code)
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        code: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Validate discount code."""
+        result = await self.api_wrapper.avalidate_code(code=code)
+        return self._output(result)
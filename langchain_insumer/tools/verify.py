@@ -1,13 +1,14 @@
 """Tool for creating signed discount verification codes."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class VerifySchema(BaseModel):
@@ -44,7 +45,7 @@ class VerifySchema(BaseModel):
     )
 
 
-class InsumerVerifyTool(BaseTool):
+class InsumerVerifyTool(InsumerBaseTool):
     """Create a signed discount verification code for a wallet at a merchant.
 
     Returns tier and discount percentage -- never raw balance amounts.
@@ -61,11 +62,6 @@ class InsumerVerifyTool(BaseTool):
     )
     args_schema: Type[VerifySchema] = VerifySchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         merchant_id: str,
@@ -77,7 +73,7 @@ class InsumerVerifyTool(BaseTool):
         stellar_wallet: Optional[str] = None,
         sui_wallet: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Create verification code."""
         result = self.api_wrapper.verify(
             merchant_id=merchant_id,
@@ -89,4 +85,29 @@ class InsumerVerifyTool(BaseTool):
             stellar_wallet=stellar_wallet,
             sui_wallet=sui_wallet,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Create verification code."""
+        result = await self.api_wrapper.averify(
+            merchant_id=merchant_id,
+            wallet=wallet,
+            solana_wallet=solana_wallet,
+            xrpl_wallet=xrpl_wallet,
+            bitcoin_wallet=bitcoin_wallet,
+            tron_wallet=tron_wallet,
+            stellar_wallet=stellar_wallet,
+            sui_wallet=sui_wallet,
+        )
+        return self._output(result)
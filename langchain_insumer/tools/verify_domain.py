@@ -1,13 +1,14 @@
 """Tool for verifying domain ownership."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class VerifyDomainSchema(BaseModel):
@@ -16,7 +17,7 @@ class VerifyDomainSchema(BaseModel):
     merchant_id: str = Field(description="Merchant ID.")
 
 
-class InsumerVerifyDomainTool(BaseTool):
+class InsumerVerifyDomainTool(InsumerBaseTool):
     """Verify domain ownership for a merchant.
 
     Call after placing the verification token (from
@@ -34,16 +35,20 @@ class InsumerVerifyDomainTool(BaseTool):
     )
     args_schema: Type[VerifyDomainSchema] = VerifyDomainSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         merchant_id: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Verify domain ownership."""
         result = self.api_wrapper.verify_domain(merchant_id=merchant_id)
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        merchant_id: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Verify domain ownership."""
+        result = await self.api_wrapper.averify_domain(merchant_id=merchant_id)
+        return self._output(result)
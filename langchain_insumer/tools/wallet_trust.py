@@ -1,13 +1,14 @@
 """Tool for generating wallet trust fact profiles."""
 
-import json
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from pydantic import BaseModel, Field
 
-from langchain_insumer.wrapper import InsumerAPIWrapper
+from langchain_insumer.tools.base import InsumerBaseTool, ToolOutput
 
 
 class WalletTrustSchema(BaseModel):
@@ -50,7 +51,7 @@ class WalletTrustSchema(BaseModel):
     )
 
 
-class InsumerWalletTrustTool(BaseTool):
+class InsumerWalletTrustTool(InsumerBaseTool):
     """Generate a structured, ECDSA-signed wallet trust fact profile.
 
     Checks 38 curated conditions across stablecoins (USDC + USDT on 21 chains),
@@ -77,11 +78,6 @@ class InsumerWalletTrustTool(BaseTool):
     )
     args_schema: Type[WalletTrustSchema] = WalletTrustSchema
 
-    api_wrapper: InsumerAPIWrapper = Field(..., exclude=True)
-
-    def __init__(self, api_wrapper: InsumerAPIWrapper) -> None:
-        super().__init__(api_wrapper=api_wrapper)
-
     def _run(
         self,
         wallet: str,
@@ -93,7 +89,7 @@ class InsumerWalletTrustTool(BaseTool):
         sui_wallet: Optional[str] = None,
         proof: Optional[str] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> str:
+    ) -> ToolOutput:
         """Generate the wallet trust fact profile."""
         result = self.api_wrapper.wallet_trust(
             wallet=wallet,
@@ -105,4 +101,29 @@ class InsumerWalletTrustTool(BaseTool):
             sui_wallet=sui_wallet,
             proof=proof,
         )
-        return json.dumps(result, indent=2)
+        return self._output(result)
+
+    async def _arun(
+        self,
+        wallet: str,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        proof: Optional[str] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> ToolOutput:
+        """Generate the wallet trust fact profile."""
+        result = await self.api_wrapper.awallet_trust(
+            wallet=wallet,
+            solana_wallet=solana_wallet,
+            xrpl_wallet=xrpl_wallet,
+            bitcoin_wallet=bitcoin_wallet,
+            tron_wallet=tron_wallet,
+            stellar_wallet=stellar_wallet,
+            sui_wallet=sui_wallet,
+            proof=proof,
+        )
+        return self._output(result)
@@ -0,0 +1,179 @@
+"""Optional OpenTelemetry spans for wrapper HTTP calls and tool runs.
+
+``opentelemetry-api`` is not a dependency; install it (``pip install
+langchain-insumer[otel]``) and enable tracing with
+``InsumerAPIWrapper(tracing=True)``. Span attributes follow the OpenTelemetry
+HTTP and GenAI semantic conventions where they exist and use the
+``insumer.`` prefix otherwise.
+"""
+
+import contextlib
+import functools
+from typing import Any, Callable, Iterator, Optional
+
+TRACER_NAME = "langchain_insumer"
+
+
+def _otel_trace() -> Any:
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace
+
+
+def get_tracer() -> Any:
+    """Return the ``langchain_insumer`` tracer from the global tracer provider.
+
+    Raises:
+        ImportError: If ``opentelemetry-api`` is not installed.
+    """
+    trace = _otel_trace()
+    if trace is None:
+        raise ImportError(
+            "Tracing requires opentelemetry-api: pip install langchain-insumer[otel]"
+        )
+    return trace.get_tracer(TRACER_NAME)
+
+
+def inject_context(headers: Optional[dict]) -> dict:
+    """Copy ``headers`` and add the current trace context (``traceparent``, ...).
+
+    Without ``opentelemetry-api`` the copy is returned unchanged.
+    """
+    carrier = dict(headers or {})
+    try:
+        from opentelemetry import propagate
+    except ImportError:
+        return carrier
+    propagate.inject(carrier)
+    return carrier
+
+
+def _span_kind(name: str) -> dict:
+    trace = _otel_trace()
+    return {"kind": getattr(trace.SpanKind, name)} if trace is not None else {}
+
+
+def request_attributes(body: Any) -> dict[str, Any]:
+    """Condition count and chain ids of an ``/attest``-style request body."""
+    attributes: dict[str, Any] = {}
+    if not isinstance(body, dict):
+        return attributes
+    conditions = body.get("conditions")
+    if isinstance(conditions, list):
+        attributes["insumer.condition_count"] = len(conditions)
+        chains = {str(c["chainId"]) for c in conditions if isinstance(c, dict) and "chainId" in c}
+        if chains:
+            attributes["insumer.chain_ids"] = sorted(chains)
+    wallets = body.get("wallets")
+    if isinstance(wallets, list):
+        attributes["insumer.wallet_count"] = len(wallets)
+    return attributes
+
+
+def response_attributes(body: Any) -> dict[str, Any]:
+    """Credits charged and API error code of a response body."""
+    attributes: dict[str, Any] = {}
+    if not isinstance(body, dict):
+        return attributes
+    meta = body.get("meta")
+    if isinstance(meta, dict) and meta.get("creditsCharged") is not None:
+        attributes["insumer.credits_charged"] = meta["creditsCharged"]
+    error = body.get("error")
+    if isinstance(error, dict) and error.get("code"):
+        attributes["insumer.error_code"] = str(error["code"])
+    return attributes
+
+
+@contextlib.contextmanager
+def client_span(tracer: Any, method: str, endpoint: str, url: str, body: Any) -> Iterator[Any]:
+    """Span for one logical HTTP call, named like ``"POST /attest"``."""
+    attributes = {
+        "http.request.method": method,
+        "url.full": url,
+        "url.template": endpoint.split(" ", 1)[1],
+        "insumer.endpoint": endpoint,
+        **request_attributes(body),
+    }
+    with tracer.start_as_current_span(
+        endpoint, attributes=attributes, **_span_kind("CLIENT")
+    ) as span:
+        yield span
+
+
+def record_response(span: Any, status_code: int, body: Any, size: int, attempt: int) -> None:
+    """Annotate ``span`` with the latest attempt's response."""
+    span.set_attribute("http.response.status_code", status_code)
+    span.set_attribute("http.response.body.size", size)
+    if attempt:
+        span.set_attribute("http.request.resend_count", attempt)
+    for key, value in response_attributes(body).items():
+        span.set_attribute(key, value)
+
+
+def _tool_attributes(tool: Any) -> dict[str, Any]:
+    return {"gen_ai.operation.name": "execute_tool", "gen_ai.tool.name": tool.name}
+
+
+def _record_output(span: Any, output: Any) -> None:
+    if isinstance(output, tuple) and len(output) == 2:
+        content, artifact = output
+        span.set_attribute("insumer.content_size", len(content))
+        for key, value in response_attributes(artifact).items():
+            span.set_attribute(key, value)
+
+
+def traced_run(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool's ``_run`` in a ``<tool>._run`` span when its wrapper traces."""
+
+    @functools.wraps(run)
+    def _run(self: Any, *args: Any, **kwargs: Any) -> Any:
+        tracer = self.api_wrapper._tracer
+        if tracer is None:
+            return run(self, *args, **kwargs)
+        with tracer.start_as_current_span(
+            f"{self.name}._run", attributes=_tool_attributes(self)
+        ) as span:
+            output = run(self, *args, **kwargs)
+            _record_output(span, output)
+            return output
+
+    return _run
+
+
+def traced_arun(arun: Callable[..., Any]) -> Callable[..., Any]:
+    """Coroutine counterpart of :func:`traced_run` for ``_arun``."""
+
+    @functools.wraps(arun)
+    async def _arun(self: Any, *args: Any, **kwargs: Any) -> Any:
+        tracer = self.api_wrapper._tracer
+        if tracer is None:
+            return await arun(self, *args, **kwargs)
+        with tracer.start_as_current_span(
+            f"{self.name}._arun", attributes=_tool_attributes(self)
+        ) as span:
+            output = await arun(self, *args, **kwargs)
+            _record_output(span, output)
+            return output
+
+    return _arun
+
+
+@contextlib.contextmanager
+def tool_span(tool: Any) -> Iterator[Any]:
+    """``execute_tool <name>`` span around a whole tool invocation, or nothing.
+
+    It covers LangChain's argument parsing and ``args_schema`` validation as
+    well as ``_run``, so the gap between the two spans is that overhead.
+    """
+    tracer = tool.api_wrapper._tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(
+        f"execute_tool {tool.name}",
+        attributes=_tool_attributes(tool),
+        **_span_kind("INTERNAL"),
+    ) as span:
+        yield span
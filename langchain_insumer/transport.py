@@ -0,0 +1,146 @@
+"""Pooled HTTP transport shared by every call made through one API wrapper."""
+
+import sys
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# Path segments that follow these names are identifiers, not endpoint names.
+_ID_SEGMENTS = {"merchants": "{id}", "codes": "{code}"}
+_IDEMPOTENT = {"GET", "HEAD", "PUT", "DELETE"}
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Name an endpoint for metrics, e.g. ``"GET /merchants/{id}/status"``."""
+    segments = path.strip("/").split("/")
+    for i in range(1, len(segments)):
+        placeholder = _ID_SEGMENTS.get(segments[i - 1])
+        if placeholder is not None:
+            segments[i] = placeholder
+    return f"{method} /{'/'.join(segments)}"
+
+
+def is_retryable_error(method: str, error: BaseException) -> bool:
+    """Whether a transport exception from ``requests`` or ``httpx`` may be retried.
+
+    Failures to connect never reached the server and are always safe to
+    retry. Other connection errors and timeouts may have been processed
+    (and charged) already, so they are only retried for idempotent methods.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError) or method in _IDEMPOTENT
+    if isinstance(error, requests.Timeout):
+        return method in _IDEMPOTENT
+    # httpx is only imported by the async path; if it is not loaded, the
+    # error cannot be one of its exceptions.
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        if isinstance(error, httpx.TransportError):
+            return method in _IDEMPOTENT
+    return False
+
+
+class ConnectionStats:
+    """Thread-safe connection-reuse counters for a pooled session.
+
+    ``requests`` counts every request sent through the adapter and
+    ``connections`` counts every TCP (+TLS) connection that was opened.
+    Everything else was served from a kept-alive pooled connection.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.requests = 0
+        self.connections = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def record_connect_time(self, seconds: float) -> None:
+        # requests connects on the calling thread, so the time can be handed
+        # back to that thread's request without any shared state.
+        self._local.connect_time = getattr(self._local, "connect_time", 0.0) + seconds
+
+    def pop_connect_time(self) -> float:
+        """Return and clear the time this thread spent opening connections."""
+        seconds = getattr(self._local, "connect_time", 0.0)
+        self._local.connect_time = 0.0
+        return seconds
+
+    def snapshot(self) -> dict:
+        """Return ``requests``, ``connections`` and ``reused`` counts."""
+        with self._lock:
+            requests, connections = self.requests, self.connections
+        return {
+            "requests": requests,
+            "connections": connections,
+            "reused": max(requests - connections, 0),
+        }
+
+
+def _counting_pool(pool_cls: Any, stats: ConnectionStats) -> Any:
+    """Subclass a urllib3 pool class so each new connection is counted."""
+
+    class CountingConnection(pool_cls.ConnectionCls):
+        def connect(self) -> None:
+            started = time.perf_counter()
+            super().connect()
+            stats.record_connect_time(time.perf_counter() - started)
+            stats.record_connection()
+
+    class CountingPool(pool_cls):
+        ConnectionCls = CountingConnection
+
+    return CountingPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` that records connection reuse in a :class:`ConnectionStats`.
+
+    Args:
+        stats: Counters to update.
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum kept-alive connections per host.
+        pool_block: Block when a host's pool is exhausted instead of opening
+            a throwaway connection, making ``pool_maxsize`` a hard limit.
+    """
+
+    def __init__(
+        self,
+        stats: ConnectionStats,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+    ) -> None:
+        self.stats = stats
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting_pool(cls, self.stats)
+            for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        self.stats.record_request()
+        return super().send(request, **kwargs)
@@ -0,0 +1,516 @@
+"""Offline validation of wallet addresses and attest conditions.
+
+Everything here is pure Python with no network access, so a malformed
+request can be rejected before it costs a round trip (and, for paid
+endpoints, before it counts against the rate limit). Address checks decode
+the full format, including checksums: EIP-55 for mixed-case EVM addresses,
+double-SHA-256 for Base58Check (Bitcoin, XRPL, Tron), BIP-173/350 for
+bech32/bech32m, and CRC16-XModem for Stellar.
+
+The ``is_*_address`` functions return a bool and take a few microseconds
+to a few tens of microseconds. The exception is a mixed-case EVM address,
+whose EIP-55 checksum needs a pure-Python Keccak-256 (a few hundred
+microseconds); checksums are memoized, and all-lowercase or all-uppercase
+addresses carry none to check. :func:`validate_addresses` applies one
+validator over a bulk list.
+"""
+
+import base64
+import hashlib
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from langchain_insumer.exceptions import InsumerValidationError
+
+# -- Keccak-256 (the pre-standard SHA-3 padding Ethereum uses) --------------
+
+_MASK64 = (1 << 64) - 1
+_KECCAK_RC = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+
+
+def _keccak_f(s: list[int]) -> None:
+    """Keccak-f[1600] on a 25-lane state, in place. Unrolled; lanes live in locals."""
+    (a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12,
+     a13, a14, a15, a16, a17, a18, a19, a20, a21, a22, a23, a24) = s
+    m = _MASK64
+    for rc in _KECCAK_RC:
+        # theta
+        c0 = a0 ^ a5 ^ a10 ^ a15 ^ a20
+        c1 = a1 ^ a6 ^ a11 ^ a16 ^ a21
+        c2 = a2 ^ a7 ^ a12 ^ a17 ^ a22
+        c3 = a3 ^ a8 ^ a13 ^ a18 ^ a23
+        c4 = a4 ^ a9 ^ a14 ^ a19 ^ a24
+        d0 = c4 ^ (((c1 << 1) | (c1 >> 63)) & m)
+        d1 = c0 ^ (((c2 << 1) | (c2 >> 63)) & m)
+        d2 = c1 ^ (((c3 << 1) | (c3 >> 63)) & m)
+        d3 = c2 ^ (((c4 << 1) | (c4 >> 63)) & m)
+        d4 = c3 ^ (((c0 << 1) | (c0 >> 63)) & m)
+        a0 ^= d0
+        a1 ^= d1
+        a2 ^= d2
+        a3 ^= d3
+        a4 ^= d4
+        a5 ^= d0
+        a6 ^= d1
+        a7 ^= d2
+        a8 ^= d3
+        a9 ^= d4
+        a10 ^= d0
+        a11 ^= d1
+        a12 ^= d2
+        a13 ^= d3
+        a14 ^= d4
+        a15 ^= d0
+        a16 ^= d1
+        a17 ^= d2
+        a18 ^= d3
+        a19 ^= d4
+        a20 ^= d0
+        a21 ^= d1
+        a22 ^= d2
+        a23 ^= d3
+        a24 ^= d4
+        # rho and pi
+        b0 = a0
+        b10 = ((a1 << 1) | (a1 >> 63)) & m
+        b20 = ((a2 << 62) | (a2 >> 2)) & m
+        b5 = ((a3 << 28) | (a3 >> 36)) & m
+        b15 = ((a4 << 27) | (a4 >> 37)) & m
+        b16 = ((a5 << 36) | (a5 >> 28)) & m
+        b1 = ((a6 << 44) | (a6 >> 20)) & m
+        b11 = ((a7 << 6) | (a7 >> 58)) & m
+        b21 = ((a8 << 55) | (a8 >> 9)) & m
+        b6 = ((a9 << 20) | (a9 >> 44)) & m
+        b7 = ((a10 << 3) | (a10 >> 61)) & m
+        b17 = ((a11 << 10) | (a11 >> 54)) & m
+        b2 = ((a12 << 43) | (a12 >> 21)) & m
+        b12 = ((a13 << 25) | (a13 >> 39)) & m
+        b22 = ((a14 << 39) | (a14 >> 25)) & m
+        b23 = ((a15 << 41) | (a15 >> 23)) & m
+        b8 = ((a16 << 45) | (a16 >> 19)) & m
+        b18 = ((a17 << 15) | (a17 >> 49)) & m
+        b3 = ((a18 << 21) | (a18 >> 43)) & m
+        b13 = ((a19 << 8) | (a19 >> 56)) & m
+        b14 = ((a20 << 18) | (a20 >> 46)) & m
+        b24 = ((a21 << 2) | (a21 >> 62)) & m
+        b9 = ((a22 << 61) | (a22 >> 3)) & m
+        b19 = ((a23 << 56) | (a23 >> 8)) & m
+        b4 = ((a24 << 14) | (a24 >> 50)) & m
+        # chi and iota
+        a0 = b0 ^ (~b1 & b2)
+        a1 = b1 ^ (~b2 & b3)
+        a2 = b2 ^ (~b3 & b4)
+        a3 = b3 ^ (~b4 & b0)
+        a4 = b4 ^ (~b0 & b1)
+        a5 = b5 ^ (~b6 & b7)
+        a6 = b6 ^ (~b7 & b8)
+        a7 = b7 ^ (~b8 & b9)
+        a8 = b8 ^ (~b9 & b5)
+        a9 = b9 ^ (~b5 & b6)
+        a10 = b10 ^ (~b11 & b12)
+        a11 = b11 ^ (~b12 & b13)
+        a12 = b12 ^ (~b13 & b14)
+        a13 = b13 ^ (~b14 & b10)
+        a14 = b14 ^ (~b10 & b11)
+        a15 = b15 ^ (~b16 & b17)
+        a16 = b16 ^ (~b17 & b18)
+        a17 = b17 ^ (~b18 & b19)
+        a18 = b18 ^ (~b19 & b15)
+        a19 = b19 ^ (~b15 & b16)
+        a20 = b20 ^ (~b21 & b22)
+        a21 = b21 ^ (~b22 & b23)
+        a22 = b22 ^ (~b23 & b24)
+        a23 = b23 ^ (~b24 & b20)
+        a24 = b24 ^ (~b20 & b21)
+        a0 ^= rc
+    s[:] = (a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12,
+            a13, a14, a15, a16, a17, a18, a19, a20, a21, a22, a23, a24)
+
+
+def keccak256(data: bytes) -> bytes:
+    """Keccak-256 digest of ``data``, as used by Ethereum (not NIST SHA3-256)."""
+    rate = 136
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % rate))
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for offset in range(0, len(padded), rate):
+        block = padded[offset:offset + rate]
+        for i in range(rate // 8):
+            state[i] ^= int.from_bytes(block[8 * i:8 * i + 8], "little")
+        _keccak_f(state)
+    return b"".join(lane.to_bytes(8, "little") for lane in state[:4])
+
+
+# -- Encodings ----------------------------------------------------------------
+
+_BTC_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_XRPL_ALPHABET = "rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz"
+_BTC_INDEX = {c: i for i, c in enumerate(_BTC_ALPHABET)}
+_XRPL_INDEX = {c: i for i, c in enumerate(_XRPL_ALPHABET)}
+
+
+def _b58decode(text: str, index: dict[str, int]) -> Optional[bytes]:
+    n = 0
+    try:
+        for char in text:
+            n = n * 58 + index[char]
+    except KeyError:
+        return None
+    zero = next(iter(index))
+    pad = len(text) - len(text.lstrip(zero))
+    return b"\x00" * pad + n.to_bytes((n.bit_length() + 7) // 8, "big")
+
+
+def _b58check_version(text: str, index: dict[str, int]) -> Optional[int]:
+    """Version byte of a 25-byte Base58Check payload, or None if malformed."""
+    raw = _b58decode(text, index)
+    if raw is None or len(raw) != 25:
+        return None
+    if hashlib.sha256(hashlib.sha256(raw[:21]).digest()).digest()[:4] != raw[21:]:
+        return None
+    return raw[0]
+
+
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_INDEX = {c: i for i, c in enumerate(_BECH32_CHARSET)}
+_BECH32_GEN = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+_BECH32_CONST = 1
+_BECH32M_CONST = 0x2BC830A3
+
+
+def _bech32_polymod(values: Iterable[int]) -> int:
+    chk = 1
+    for v in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ v
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= _BECH32_GEN[i]
+    return chk
+
+
+def _segwit_program(address: str, hrp: str = "bc") -> Optional[tuple[int, int]]:
+    """``(witness version, program length)`` of a valid segwit address."""
+    if address.lower() != address and address.upper() != address:
+        return None
+    address = address.lower()
+    sep = address.rfind("1")
+    if address[:sep] != hrp or len(address) > 90 or len(address) - sep - 1 < 7:
+        return None
+    try:
+        data = [_BECH32_INDEX[c] for c in address[sep + 1:]]
+    except KeyError:
+        return None
+    expanded = [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+    const = _bech32_polymod(expanded + data)
+    version = data[0]
+    if const != (_BECH32_CONST if version == 0 else _BECH32M_CONST) or version > 16:
+        return None
+    bits = (len(data) - 7) * 5
+    # Leftover padding must be under a byte and all zero.
+    if bits % 8 > 4 or data[-7] & ((1 << (bits % 8)) - 1):
+        return None
+    length = bits // 8
+    if not 2 <= length <= 40 or (version == 0 and length not in (20, 32)):
+        return None
+    return version, length
+
+
+def _crc16_xmodem(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        crc &= 0xFFFF
+    return crc
+
+
+# -- Addresses ----------------------------------------------------------------
+
+_EVM_RE = re.compile(r"0x[0-9a-fA-F]{40}\Z")
+_SUI_RE = re.compile(r"0x[0-9a-fA-F]{64}\Z")
+_SUI_TYPE_RE = re.compile(r"0x[0-9a-fA-F]{1,64}::\w+::\w+")
+_STELLAR_ACCOUNT_VERSION = 6 << 3  # "G"
+
+
+@lru_cache(maxsize=65536)
+def _checksummed(hex_part: str) -> str:
+    digest = keccak256(hex_part.encode()).hex()
+    return "0x" + "".join(
+        c.upper() if c.isalpha() and digest[i] in "89abcdef" else c
+        for i, c in enumerate(hex_part)
+    )
+
+
+def to_checksum_address(address: str) -> str:
+    """EIP-55 mixed-case form of a 0x-prefixed 20-byte hex address."""
+    return _checksummed(address[2:].lower())
+
+
+def is_evm_address(address: str, checksum: bool = True) -> bool:
+    """0x + 40 hex. Mixed-case addresses must carry a valid EIP-55 checksum."""
+    if not isinstance(address, str) or not _EVM_RE.match(address):
+        return False
+    hex_part = address[2:]
+    if not checksum or hex_part.islower() or hex_part.isupper() or hex_part.isdigit():
+        return True
+    return to_checksum_address(address) == address
+
+
+def is_solana_address(address: str) -> bool:
+    """Base58 encoding of a 32-byte public key."""
+    if not isinstance(address, str) or not 32 <= len(address) <= 44:
+        return False
+    raw = _b58decode(address, _BTC_INDEX)
+    return raw is not None and len(raw) == 32
+
+
+def is_xrpl_address(address: str) -> bool:
+    """Classic ``r`` address: XRPL-alphabet Base58Check, account ID version 0."""
+    if not isinstance(address, str) or not 25 <= len(address) <= 35 or address[0] != "r":
+        return False
+    return _b58check_version(address, _XRPL_INDEX) == 0
+
+
+def is_bitcoin_address(address: str) -> bool:
+    """Mainnet P2PKH (``1...``), P2SH (``3...``), bech32 segwit v0 or bech32m taproot."""
+    if not isinstance(address, str) or not 14 <= len(address) <= 90:
+        return False
+    if address[0] in "13":
+        return len(address) <= 35 and _b58check_version(address, _BTC_INDEX) in (0x00, 0x05)
+    return _segwit_program(address) is not None
+
+
+def is_tron_address(address: str) -> bool:
+    """Base58Check ``T`` address with version byte 0x41."""
+    if not isinstance(address, str) or len(address) != 34 or address[0] != "T":
+        return False
+    return _b58check_version(address, _BTC_INDEX) == 0x41
+
+
+def is_stellar_address(address: str) -> bool:
+    """StrKey ``G`` account: base32 of version, 32-byte key and CRC16-XModem."""
+    if not isinstance(address, str) or len(address) != 56 or address[0] != "G":
+        return False
+    try:
+        raw = base64.b32decode(address)
+    except ValueError:
+        return False
+    if raw[0] != _STELLAR_ACCOUNT_VERSION:
+        return False
+    return _crc16_xmodem(raw[:33]) == int.from_bytes(raw[33:], "little")
+
+
+def is_sui_address(address: str) -> bool:
+    """0x + 64 hex characters."""
+    return isinstance(address, str) and _SUI_RE.match(address) is not None
+
+
+ADDRESS_VALIDATORS: dict[str, Callable[[str], bool]] = {
+    "evm": is_evm_address,
+    "solana": is_solana_address,
+    "xrpl": is_xrpl_address,
+    "bitcoin": is_bitcoin_address,
+    "tron": is_tron_address,
+    "stellar": is_stellar_address,
+    "sui": is_sui_address,
+}
+
+# Request field holding a wallet -> chain family of its address.
+WALLET_FIELDS = {
+    "wallet": "evm",
+    "solanaWallet": "solana",
+    "xrplWallet": "xrpl",
+    "bitcoinWallet": "bitcoin",
+    "tronWallet": "tron",
+    "stellarWallet": "stellar",
+    "suiWallet": "sui",
+}
+_FIELD_FOR_CHAIN = {chain: field for field, chain in WALLET_FIELDS.items()}
+
+_CHAIN_LABELS = {
+    "evm": "EVM address (0x + 40 hex, EIP-55 checksum if mixed-case)",
+    "solana": "Solana address (base58, 32 bytes)",
+    "xrpl": "XRPL r-address",
+    "bitcoin": "Bitcoin address (P2PKH, P2SH, bech32 or taproot)",
+    "tron": "Tron T-address",
+    "stellar": "Stellar G-address",
+    "sui": "Sui address (0x + 64 hex)",
+}
+
+
+def chain_family(chain_id: Any) -> Optional[str]:
+    """``"evm"`` for a numeric chain ID, else the lowercase chain name if supported."""
+    if isinstance(chain_id, bool):
+        return None
+    if isinstance(chain_id, int) or (isinstance(chain_id, str) and chain_id.isdigit()):
+        return "evm"
+    if isinstance(chain_id, str) and chain_id.lower() in ADDRESS_VALIDATORS:
+        return chain_id.lower()
+    return None
+
+
+def is_valid_address(chain: Any, address: str) -> bool:
+    """Validate ``address`` for ``chain``: a family name, a chain name or an EVM chain ID."""
+    family = chain if chain in ADDRESS_VALIDATORS else chain_family(chain)
+    if family is None:
+        raise ValueError(f"Unsupported chain {chain!r}")
+    return ADDRESS_VALIDATORS[family](address)
+
+
+def validate_addresses(chain: Any, addresses: Iterable[str]) -> list[bool]:
+    """:func:`is_valid_address` for every address, in order."""
+    family = chain if chain in ADDRESS_VALIDATORS else chain_family(chain)
+    if family is None:
+        raise ValueError(f"Unsupported chain {chain!r}")
+    check = ADDRESS_VALIDATORS[family]
+    return [check(a) for a in addresses]
+
+
+# -- Requests -----------------------------------------------------------------
+
+# Fields each condition type needs, besides ``type``.
+CONDITION_REQUIRED_FIELDS: dict[str, tuple[str, ...]] = {
+    "token_balance": ("contractAddress", "chainId", "threshold"),
+    "nft_ownership": ("contractAddress", "chainId"),
+    "eas_attestation": (),
+    "farcaster_id": (),
+    "ratio_to_amount": ("contractAddress", "chainId", "multiple", "amount"),
+    "ratio_to_supply": ("contractAddress", "chainId", "minFraction"),
+}
+# Quantity fields that must be non-negative decimal strings, e.g. "1000" or "0.5".
+DECIMAL_FIELDS: dict[str, tuple[str, ...]] = {
+    "token_balance": ("threshold",),
+    "ratio_to_amount": ("multiple", "amount"),
+    "ratio_to_supply": ("minFraction",),
+}
+_DECIMAL_RE = re.compile(r"(?:0|[1-9][0-9]*)(?:\.[0-9]+)?\Z")
+
+
+def _contract_error(family: str, contract: Any, ctype: str) -> Optional[str]:
+    if not isinstance(contract, str) or not contract:
+        return "contractAddress must be a non-empty string"
+    if contract == "native":
+        return "ratio_to_supply needs a token contract, not native" if ctype == "ratio_to_supply" else None
+    if family == "sui":
+        return None if _SUI_TYPE_RE.match(contract) else "not a Sui type string (0x...::module::Name)"
+    if family == "bitcoin":
+        return 'bitcoin only supports contractAddress "native"'
+    if not ADDRESS_VALIDATORS[family](contract):
+        return f"not a valid {_CHAIN_LABELS[family]}"
+    return None
+
+
+def condition_errors(condition: Any, wallets: Optional[dict[str, Any]] = None) -> list[str]:
+    """Problems with one condition; empty if it is well-formed.
+
+    With ``wallets`` (the request's wallet fields), a condition on a chain
+    whose wallet is missing is also reported.
+    """
+    if not isinstance(condition, dict):
+        return ["must be an object"]
+    ctype = condition.get("type")
+    if ctype not in CONDITION_REQUIRED_FIELDS:
+        return [f"unknown type {ctype!r}; expected one of {sorted(CONDITION_REQUIRED_FIELDS)}"]
+    errors = [
+        f"{field} is required for {ctype}"
+        for field in CONDITION_REQUIRED_FIELDS[ctype]
+        if condition.get(field) is None
+    ]
+    if ctype == "eas_attestation" and not (condition.get("template") or condition.get("schemaId")):
+        errors.append("eas_attestation needs a template or schemaId")
+    for field in DECIMAL_FIELDS.get(ctype, ()):
+        value = condition.get(field)
+        if value is not None and not (isinstance(value, str) and _DECIMAL_RE.match(value)):
+            errors.append(f'{field} must be a decimal string like "1000" or "0.5", got {value!r}')
+    if ctype == "ratio_to_supply" and isinstance(condition.get("minFraction"), str):
+        try:
+            if not 0 < Decimal(condition["minFraction"]) <= 1:
+                errors.append("minFraction must be in (0, 1]")
+        except InvalidOperation:
+            pass
+    if "chainId" not in condition:
+        return errors
+    family = chain_family(condition["chainId"])
+    if family is None:
+        errors.append(f"unsupported chainId {condition['chainId']!r}")
+        return errors
+    if ctype in ("ratio_to_amount", "ratio_to_supply") and family != "evm":
+        errors.append(f"{ctype} is only available on EVM chains")
+    if "contractAddress" in condition:
+        problem = _contract_error(family, condition["contractAddress"], ctype)
+        if problem:
+            errors.append(f"contractAddress: {problem}")
+    if wallets is not None and not wallets.get(_FIELD_FOR_CHAIN[family]):
+        errors.append(f"chainId {condition['chainId']!r} needs {_FIELD_FOR_CHAIN[family]}")
+    return errors
+
+
+def wallet_errors(fields: dict[str, Any], prefix: str = "") -> list[str]:
+    """Problems with the wallet fields (``wallet``, ``solanaWallet``, ...) in ``fields``."""
+    errors = []
+    for field, family in WALLET_FIELDS.items():
+        value = fields.get(field)
+        if value is not None and not ADDRESS_VALIDATORS[family](value):
+            errors.append(f"{prefix}{field}: not a valid {_CHAIN_LABELS[family]}")
+    return errors
+
+
+def request_errors(
+    body: dict[str, Any],
+    max_conditions: Optional[int] = None,
+    max_wallets: Optional[int] = None,
+) -> list[str]:
+    """Problems with an attest, trust, batch trust, verify or discount request body.
+
+    Checks every wallet field, each entry of ``wallets`` (batch trust) and
+    each of ``conditions`` (attest), and the list limits when given.
+    """
+    errors = wallet_errors(body)
+    wallets = body.get("wallets")
+    if wallets is not None:
+        if not isinstance(wallets, list) or not wallets:
+            errors.append("wallets must be a non-empty list")
+        else:
+            if max_wallets is not None and len(wallets) > max_wallets:
+                errors.append(f"wallets: at most {max_wallets} per request, got {len(wallets)}")
+            for i, entry in enumerate(wallets):
+                if not isinstance(entry, dict) or not entry.get("wallet"):
+                    errors.append(f"wallets[{i}]: wallet is required")
+                else:
+                    errors.extend(wallet_errors(entry, f"wallets[{i}]."))
+    conditions = body.get("conditions")
+    if conditions is not None:
+        if not isinstance(conditions, list) or not conditions:
+            errors.append("conditions must be a non-empty list")
+        else:
+            if max_conditions is not None and len(conditions) > max_conditions:
+                errors.append(f"conditions: at most {max_conditions} per request, got {len(conditions)}")
+            present = {f: body.get(f) for f in WALLET_FIELDS}
+            for i, condition in enumerate(conditions):
+                errors.extend(f"conditions[{i}]: {e}" for e in condition_errors(condition, present))
+    return errors
+
+
+def check_request(
+    body: dict[str, Any],
+    max_conditions: Optional[int] = None,
+    max_wallets: Optional[int] = None,
+) -> dict[str, Any]:
+    """Return ``body`` unchanged, or raise :class:`InsumerValidationError` listing its problems."""
+    errors = request_errors(body, max_conditions, max_wallets)
+    if errors:
+        raise InsumerValidationError(errors)
+    return body
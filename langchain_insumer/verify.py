@@ -0,0 +1,528 @@
+"""Local verification of signed InsumerAPI responses.
+
+Pure-Python counterpart of the ``insumer-verify`` npm package. Checks the
+ECDSA P-256 signature (``sig``) against the key named by ``kid`` in the
+InsumerAPI JWKS, recomputes each result's ``conditionHash``, and checks
+``expiresAt`` and (optionally) block freshness. The signed bytes follow the
+scheme ``kid`` selects, serialized exactly as ``JSON.stringify`` would. No
+third-party crypto dependency is required.
+
+Example:
+    .. code-block:: python
+
+        from langchain_insumer import InsumerAPIWrapper
+        from langchain_insumer.verify import verify_response
+
+        api = InsumerAPIWrapper(api_key="insr_live_...")
+        result = api.attest(wallet="0x...", conditions=[...])
+        # Passing the wrapper resolves ``kid`` through its JWKS cache.
+        check = verify_response(result, api, max_age=120)
+        if not check.valid:
+            print(check.checks, check.errors)
+"""
+
+import base64
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+# NIST P-256 (secp256r1) domain parameters.
+_P = 0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF
+_A = _P - 3
+_B = 0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B
+_N = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+_G = (
+    0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+    0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5,
+)
+
+# Jacobian point (X, Y, Z); None is the point at infinity.
+_Jacobian = Optional[tuple[int, int, int]]
+
+
+def _double(pt: _Jacobian) -> _Jacobian:
+    if pt is None or pt[1] == 0:
+        return None
+    x1, y1, z1 = pt
+    delta = z1 * z1 % _P
+    gamma = y1 * y1 % _P
+    beta = x1 * gamma % _P
+    alpha = 3 * (x1 - delta) * (x1 + delta) % _P
+    x3 = (alpha * alpha - 8 * beta) % _P
+    z3 = ((y1 + z1) * (y1 + z1) - gamma - delta) % _P
+    y3 = (alpha * (4 * beta - x3) - 8 * gamma * gamma) % _P
+    return x3, y3, z3
+
+
+def _add(p1: _Jacobian, p2: _Jacobian) -> _Jacobian:
+    if p1 is None:
+        return p2
+    if p2 is None:
+        return p1
+    x1, y1, z1 = p1
+    x2, y2, z2 = p2
+    z1z1 = z1 * z1 % _P
+    z2z2 = z2 * z2 % _P
+    u1 = x1 * z2z2 % _P
+    u2 = x2 * z1z1 % _P
+    s1 = y1 * z2 * z2z2 % _P
+    s2 = y2 * z1 * z1z1 % _P
+    if u1 == u2:
+        return _double(p1) if s1 == s2 else None
+    h = (u2 - u1) % _P
+    r = (s2 - s1) % _P
+    h2 = h * h % _P
+    h3 = h * h2 % _P
+    u1h2 = u1 * h2 % _P
+    x3 = (r * r - h3 - 2 * u1h2) % _P
+    y3 = (r * (u1h2 - x3) - s1 * h3) % _P
+    z3 = h * z1 * z2 % _P
+    return x3, y3, z3
+
+
+def _to_affine(pt: _Jacobian) -> Optional[tuple[int, int]]:
+    if pt is None:
+        return None
+    x, y, z = pt
+    z_inv = pow(z, -1, _P)
+    z_inv2 = z_inv * z_inv % _P
+    return x * z_inv2 % _P, y * z_inv2 * z_inv % _P
+
+
+def _point_mul(k: int, point: tuple[int, int]) -> Optional[tuple[int, int]]:
+    """Scalar multiplication ``k * point`` in affine coordinates."""
+    acc: _Jacobian = None
+    base: _Jacobian = (point[0], point[1], 1)
+    for bit in bin(k)[2:]:
+        acc = _double(acc)
+        if bit == "1":
+            acc = _add(acc, base)
+    return _to_affine(acc)
+
+
+def _on_curve(point: tuple[int, int]) -> bool:
+    x, y = point
+    return 0 <= x < _P and 0 <= y < _P and (y * y - x * x * x - _A * x - _B) % _P == 0
+
+
+def _verify_digest(public_key: tuple[int, int], digest: bytes, r: int, s: int) -> bool:
+    """ECDSA verification of a SHA-256 ``digest`` using Shamir's trick."""
+    if not (1 <= r < _N and 1 <= s < _N):
+        return False
+    e = int.from_bytes(digest, "big")
+    w = pow(s, -1, _N)
+    u1 = e * w % _N
+    u2 = r * w % _N
+    g: _Jacobian = (_G[0], _G[1], 1)
+    q: _Jacobian = (public_key[0], public_key[1], 1)
+    table = {(1, 0): g, (0, 1): q, (1, 1): _add(g, q)}
+    acc: _Jacobian = None
+    for i in range(max(u1.bit_length(), u2.bit_length()) - 1, -1, -1):
+        acc = _double(acc)
+        bits = ((u1 >> i) & 1, (u2 >> i) & 1)
+        if bits != (0, 0):
+            acc = _add(acc, table[bits])
+    point = _to_affine(acc)
+    return point is not None and point[0] % _N == r
+
+
+def _b64url_int(value: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "big")
+
+
+def _decode_signature(sig: str) -> tuple[int, int]:
+    """Decode a base64 ``r || s`` (P1363) or DER ECDSA signature."""
+    raw = base64.b64decode(sig + "=" * (-len(sig) % 4))
+    if len(raw) == 64:
+        return int.from_bytes(raw[:32], "big"), int.from_bytes(raw[32:], "big")
+    # DER: SEQUENCE { INTEGER r, INTEGER s }
+    if len(raw) < 8 or raw[0] != 0x30:
+        raise ValueError("Unrecognized signature encoding")
+    idx = 2
+    ints = []
+    for _ in range(2):
+        if raw[idx] != 0x02:
+            raise ValueError("Malformed DER signature")
+        length = raw[idx + 1]
+        ints.append(int.from_bytes(raw[idx + 2:idx + 2 + length], "big"))
+        idx += 2 + length
+    return ints[0], ints[1]
+
+
+def load_jwks(jwks: dict) -> dict[str, tuple[int, int]]:
+    """Index the P-256 keys of a JWKS document by ``kid``.
+
+    Args:
+        jwks: JWKS document, either bare (``{"keys": [...]}``) or the API
+            envelope returned by ``InsumerAPIWrapper.get_jwks()``.
+
+    Returns:
+        Mapping of ``kid`` to the public key point ``(x, y)``.
+
+    Raises:
+        ValueError: If a P-256 key is not a valid curve point.
+    """
+    doc = jwks.get("data", jwks) if isinstance(jwks.get("data"), dict) else jwks
+    keys: dict[str, tuple[int, int]] = {}
+    for jwk in doc.get("keys", []):
+        if jwk.get("kty") != "EC" or jwk.get("crv") != "P-256":
+            continue
+        point = (_b64url_int(jwk["x"]), _b64url_int(jwk["y"]))
+        if not _on_curve(point):
+            raise ValueError(f"JWK {jwk.get('kid')!r} is not a valid P-256 point")
+        keys[jwk.get("kid", "")] = point
+    return keys
+
+
+# Signing schemes, selected by ``kid``. v1 signs bare ``JSON.stringify``
+# output; the v2 kids sign a domain tag, a newline and canonical JSON.
+_ATTEST_V1 = "insumer-attest-v1"
+_ATTEST_V2 = "insumer-attest-v2"
+_TRUST_V2 = "insumer-trust-v2"
+_ATTEST_KIDS = frozenset({_ATTEST_V1, _ATTEST_V2})
+_TRUST_KIDS = frozenset({_ATTEST_V1, _TRUST_V2})
+_ESCAPES = {
+    '"': '\\"', "\\": "\\\\", "\b": "\\b", "\f": "\\f", "\n": "\\n", "\r": "\\r", "\t": "\\t"
+}
+
+
+def _js_string(value: str) -> str:
+    out = ['"']
+    for ch in value:
+        code = ord(ch)
+        if ch in _ESCAPES:
+            out.append(_ESCAPES[ch])
+        elif code < 0x20 or 0xD800 <= code <= 0xDFFF:
+            out.append("\\u%04x" % code)
+        else:
+            out.append(ch)
+    out.append('"')
+    return "".join(out)
+
+
+def _js_number(value: Any) -> str:
+    """ECMAScript ``Number::toString``, which ``JSON.stringify`` uses."""
+    if isinstance(value, int) and abs(value) < 2**53:
+        return str(value)
+    value = float(value)
+    if value != value or value in (float("inf"), float("-inf")):
+        return "null"
+    if value == 0:
+        return "0"
+    sign = "-" if value < 0 else ""
+    mantissa, _, exp = repr(abs(value)).partition("e")
+    whole, _, frac = mantissa.partition(".")
+    digits = (whole + frac).lstrip("0")
+    exponent = int(exp or 0) - len(frac) + len(digits) - len(digits.rstrip("0"))
+    digits = digits.rstrip("0")
+    k = len(digits)
+    n = k + exponent  # value == 0.digits * 10**n
+    if k <= n <= 21:
+        return sign + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + digits
+    e = f"{n - 1:+d}"
+    return sign + digits[0] + ("." + digits[1:] if k > 1 else "") + "e" + e
+
+
+def _js_keys(obj: dict) -> list[str]:
+    """``Object.keys`` order: array-index keys ascending, then insertion order."""
+    index = [
+        k for k in obj
+        if k.isascii() and k.isdigit() and (k == "0" or k[0] != "0") and int(k) < 2**32 - 1
+    ]
+    return sorted(index, key=int) + [k for k in obj if k not in index]
+
+
+def _utf16(key: str) -> bytes:
+    # JavaScript sorts strings by UTF-16 code unit, not code point.
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def _stringify(value: Any, allow: Optional[list[str]] = None) -> str:
+    """``JSON.stringify(value)``, or ``JSON.stringify(value, allow)`` with an array replacer."""
+    if value is None or isinstance(value, bool):
+        return {None: "null", True: "true", False: "false"}[value]
+    if isinstance(value, (int, float)):
+        return _js_number(value)
+    if isinstance(value, str):
+        return _js_string(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_stringify(v, allow) for v in value) + "]"
+    keys = _js_keys(value) if allow is None else [k for k in allow if k in value]
+    return "{" + ",".join(_js_string(k) + ":" + _stringify(value[k], allow) for k in keys) + "}"
+
+
+def _canonicalize(value: Any) -> str:
+    """Canonical JSON of the v2 schemes: keys sorted at every level, no whitespace."""
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonicalize(v) for v in value) + "]"
+    if isinstance(value, dict):
+        keys = sorted(_js_keys(value), key=_utf16)
+        return "{" + ",".join(_js_string(k) + ":" + _canonicalize(value[k]) for k in keys) + "}"
+    return _stringify(value)
+
+
+def condition_hash(evaluated_condition: dict, kid: Optional[str] = _ATTEST_V1) -> str:
+    """Recompute a result's ``conditionHash`` from its ``evaluatedCondition``.
+
+    The hash is SHA-256 over the condition's canonical JSON, hex-encoded with
+    a ``0x`` prefix. Under ``insumer-attest-v2`` keys are sorted at every
+    level; otherwise it is ``JSON.stringify(condition, Object.keys(condition).sort())``,
+    the frozen v1 form.
+    """
+    if kid == _ATTEST_V2:
+        canonical = _canonicalize(evaluated_condition)
+    else:
+        keys = sorted(_js_keys(evaluated_condition), key=_utf16)
+        canonical = _stringify(evaluated_condition, keys)
+    return "0x" + hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _signed_payload(data: dict) -> tuple[bytes, dict, frozenset]:
+    """Return the bytes covered by ``sig``, the signed object and the kids that may sign it."""
+    kid = data.get("kid")
+    if "attestation" in data:
+        att = data["attestation"]
+        signed = {
+            "id": att.get("id"),
+            "pass": att.get("pass"),
+            "results": att.get("results"),
+            "attestedAt": att.get("attestedAt"),
+        }
+        if kid == _ATTEST_V2:
+            payload = "insumer.attestation.v2\n" + _canonicalize({"v": 2, **signed})
+        else:
+            payload = _stringify(signed)
+        return payload.encode(), att, _ATTEST_KIDS
+    if "trust" in data:
+        trust = data["trust"]
+        if kid == _TRUST_V2:
+            payload = "insumer.trust.v2\n" + _canonicalize(trust)
+        else:
+            payload = _stringify(trust)
+        return payload.encode(), trust, _TRUST_KIDS
+    raise ValueError("Response has neither an attestation nor a trust profile")
+
+
+def _data_of(response: dict) -> dict:
+    return response.get("data", response) if isinstance(response.get("data"), dict) else response
+
+
+def _kids_of(data: dict) -> list[Optional[str]]:
+    """Signing key ids used by a response, including those of merged parts."""
+    return [data.get("kid")] + [part.get("kid") for part in data.get("parts") or []]
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass
+class VerificationResult:
+    """Outcome of verifying one signed response.
+
+    Attributes:
+        valid: True when every check that ran passed.
+        checks: Per-check outcome: ``signature``, ``conditionHashes``,
+            ``expiry``, ``freshness`` (only when ``max_age`` is set), and
+            ``merge`` (only for merged split attestations).
+        errors: Human-readable reasons for failed checks.
+        id: Attestation or trust profile id, if present.
+        kid: Signing key id from the response.
+    """
+
+    valid: bool
+    checks: dict[str, bool] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    id: Optional[str] = None
+    kid: Optional[str] = None
+
+
+def verify_response(
+    response: dict,
+    jwks: Any,
+    max_age: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> VerificationResult:
+    """Verify a signed attest or trust response.
+
+    Args:
+        response: The full API envelope (``{ok, data: {attestation, sig, kid}, meta}``)
+            or its ``data`` object.
+        jwks: JWKS document (as returned by ``get_jwks()``), a mapping from
+            :func:`load_jwks`, or an ``InsumerAPIWrapper`` whose JWKS cache
+            resolves the response's ``kid``.
+        max_age: If set, fail results whose ``blockTimestamp`` is older than
+            this many seconds.
+        now: Reference time for expiry/freshness. Defaults to the current time.
+
+    A merged response from an ``attest()`` call split into several requests
+    has no ``sig`` of its own; each part under ``data.parts`` is verified and
+    the merged ``results`` are checked against the signed part results.
+
+    Returns:
+        A :class:`VerificationResult`.
+    """
+    data = _data_of(response)
+    keys = _resolve_keys(jwks, _kids_of(data))
+    now = now or datetime.now(timezone.utc)
+    if "parts" in data and "sig" not in data:
+        return _verify_merged(data, keys, max_age, now)
+    result = VerificationResult(valid=False, kid=data.get("kid"))
+
+    try:
+        payload, signed, signers = _signed_payload(data)
+    except ValueError as e:
+        result.errors.append(str(e))
+        return result
+    result.id = signed.get("id")
+
+    kid = data.get("kid")
+    key = keys.get(kid or "")
+    sig_ok = False
+    if key is None:
+        result.errors.append(f"Unknown signing key {kid!r}")
+    elif kid not in signers:
+        artifact = "attestations" if "attestation" in data else "trust profiles"
+        result.errors.append(f"Key {kid!r} does not sign {artifact}")
+    elif not data.get("sig"):
+        result.errors.append("Response is not signed")
+    else:
+        try:
+            r, s = _decode_signature(data["sig"])
+            sig_ok = _verify_digest(key, hashlib.sha256(payload).digest(), r, s)
+        except (ValueError, IndexError):
+            result.errors.append("Malformed signature")
+        if not sig_ok and not result.errors:
+            result.errors.append("Signature does not match")
+    result.checks["signature"] = sig_ok
+
+    hashes_ok = True
+    for i, r in enumerate(signed.get("results") or []):
+        expected = r.get("conditionHash")
+        if expected is None or "evaluatedCondition" not in r:
+            continue
+        if condition_hash(r["evaluatedCondition"], kid) != expected:
+            hashes_ok = False
+            result.errors.append(f"conditionHash mismatch on result {i}")
+    result.checks["conditionHashes"] = hashes_ok
+
+    expires_at = signed.get("expiresAt")
+    expiry_ok = expires_at is None or _parse_time(expires_at) > now
+    if not expiry_ok:
+        result.errors.append(f"Expired at {expires_at}")
+    result.checks["expiry"] = expiry_ok
+
+    if max_age is not None:
+        fresh = True
+        for r in signed.get("results") or []:
+            ts = r.get("blockTimestamp")
+            if ts and (now - _parse_time(ts)).total_seconds() > max_age:
+                fresh = False
+        if not fresh:
+            result.errors.append(f"Block data older than {max_age}s")
+        result.checks["freshness"] = fresh
+
+    result.valid = all(result.checks.values())
+    return result
+
+
+def _verify_merged(
+    data: dict, keys: dict[str, tuple[int, int]], max_age: Optional[float], now: datetime
+) -> VerificationResult:
+    merged = data.get("attestation") or {}
+    result = VerificationResult(valid=False, id=",".join(merged.get("ids") or []))
+    parts = data.get("parts") or []
+    if not parts:
+        result.errors.append("Merged response has no parts")
+        return result
+    expected: list[dict] = []
+    for part in parts:
+        part_result = verify_response(part, keys, max_age, now)
+        for name, ok in part_result.checks.items():
+            result.checks[name] = result.checks.get(name, True) and ok
+        result.errors.extend(f"{part_result.id}: {e}" for e in part_result.errors)
+        offset = part.get("offset", 0)
+        for r in part["attestation"].get("results") or []:
+            expected.append({**r, "condition": r.get("condition", 0) + offset})
+    merge_ok = merged.get("results") == expected and merged.get("pass") == all(
+        part["attestation"].get("pass") for part in parts
+    )
+    if not merge_ok:
+        result.errors.append("Merged results do not match the signed parts")
+    result.checks["merge"] = merge_ok
+    result.valid = all(result.checks.values())
+    return result
+
+
+def _is_key_map(jwks: Any) -> bool:
+    return isinstance(jwks, dict) and all(isinstance(v, tuple) for v in jwks.values()) and bool(jwks)
+
+
+def _resolve_keys(jwks: Any, kids: Iterable[Optional[str]]) -> dict[str, tuple[int, int]]:
+    """Build a ``kid`` -> point map from any supported ``jwks`` argument."""
+    if _is_key_map(jwks):
+        return jwks
+    if hasattr(jwks, "get_signing_key"):
+        found = (jwks.get_signing_key(kid) for kid in set(kids) if kid)
+        return load_jwks({"keys": [jwk for jwk in found if jwk]})
+    return load_jwks(jwks)
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(keys: dict, max_age: Optional[float], now: Optional[datetime]) -> None:
+    _worker_state.update(keys=keys, max_age=max_age, now=now)
+
+
+def _verify_in_worker(response: dict) -> VerificationResult:
+    return verify_response(
+        response, _worker_state["keys"], _worker_state["max_age"], _worker_state["now"]
+    )
+
+
+def verify_many(
+    responses: Iterable[dict],
+    jwks: Any,
+    max_age: Optional[float] = None,
+    now: Optional[datetime] = None,
+    max_workers: Optional[int] = None,
+    chunksize: int = 64,
+) -> list[VerificationResult]:
+    """Verify many responses in parallel across a process pool.
+
+    Signature checks are CPU-bound pure Python, so they are spread over
+    worker processes rather than threads. The key set is sent to each
+    worker once. Small inputs (fewer than ``chunksize`` responses) are
+    verified in-process.
+
+    Args:
+        responses: Responses to verify, as for :func:`verify_response`.
+        jwks: JWKS document, a mapping from :func:`load_jwks`, or an
+            ``InsumerAPIWrapper``. Keys are resolved once, up front.
+        max_age: Optional block freshness limit in seconds.
+        now: Reference time. Defaults to the time of the call, shared by
+            every response so results are consistent.
+        max_workers: Worker processes. Defaults to the CPU count.
+        chunksize: Responses sent to a worker per task.
+
+    Returns:
+        One :class:`VerificationResult` per response, in input order.
+    """
+    responses = list(responses)
+    keys = _resolve_keys(jwks, (kid for r in responses for kid in _kids_of(_data_of(r))))
+    now = now or datetime.now(timezone.utc)
+    if len(responses) < chunksize or max_workers == 1:
+        return [verify_response(r, keys, max_age, now) for r in responses]
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(keys, max_age, now),
+    ) as pool:
+        return list(pool.map(_verify_in_worker, responses, chunksize=chunksize))
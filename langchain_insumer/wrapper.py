@@ -1,12 +1,333 @@
 """API wrapper for The Insumer Model On-Chain Verification API."""
 
-from typing import Any, Optional
+import asyncio
+import contextvars
+import hashlib
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator, Literal, Optional
 
 import requests
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from langchain_insumer.backends import CacheBackend, SQLiteBackend
+from langchain_insumer.batching import AsyncTrustCoalescer, TrustCoalescer
+from langchain_insumer.cache import ExpiringLRUCache, StaleWhileRevalidateCache, cache_key
+from langchain_insumer.credits import (
+    KEY_POOL,
+    CreditLedger,
+    credit_pool,
+    predict_cost,
+    unattributed,
+)
+from langchain_insumer.directory import (
+    MERCHANTS_MAX_PAGE,
+    MerchantDirectory,
+    aiter_pages,
+    iter_pages,
+)
+from langchain_insumer.exceptions import (
+    InsumerAPIError,
+    InsumerBudgetExceededError,
+    InsumerRateLimitError,
+)
+from langchain_insumer.jwks_cache import JwksCache, _keys_of, _ttl_from_headers
+from langchain_insumer.keypool import KeyPool
+from langchain_insumer.metrics import RequestMetrics
+from langchain_insumer.ratelimit import RateLimiter, endpoint_class
+from langchain_insumer.registry import TokenRegistry
+from langchain_insumer.retry import RetryPolicy, parse_retry_after, response_retry_reason
+from langchain_insumer.singleflight import AsyncSingleFlight, SingleFlight
+from langchain_insumer.tracing import client_span, get_tracer, inject_context, record_response
+from langchain_insumer.transport import (
+    ConnectionStats,
+    PooledHTTPAdapter,
+    endpoint_name,
+    is_retryable_error,
+)
+from langchain_insumer.validation import check_request
+
+if TYPE_CHECKING:
+    import httpx
 
 BASE_URL = "https://api.insumermodel.com/v1"
 
+# Server-side cap on wallets per /trust/batch request.
+BATCH_TRUST_MAX_WALLETS = 10
+# Server-side cap on conditions per /attest request.
+ATTEST_MAX_CONDITIONS = 10
+
+# (soft_ttl, hard_ttl) in seconds for the slowly-changing discovery endpoints
+# served by stale_while_revalidate.
+SWR_DEFAULT_TTLS: dict[str, tuple[float, float]] = {
+    "GET /compliance/templates": (3600.0, 86400.0),
+    "GET /tokens": (300.0, 3600.0),
+    "GET /merchants": (60.0, 900.0),
+    "GET /merchants/{id}": (60.0, 900.0),
+}
+
+# Persisted token registry snapshots older than this are not used to warm-start.
+PERSISTED_SNAPSHOT_TTL = 86400.0
+
+# v2 keys require agent-supplied quantities as decimal strings (preserving full
+# precision, no float in signed bytes); v1 keys accept either. Coerce numbers to
+# strings so the request works on any key. Other condition fields are untouched.
+#   token_balance.threshold, ratio_to_amount.multiple/amount, ratio_to_supply.minFraction.
+_STR_FIELDS = {
+    "token_balance": ("threshold",),
+    "ratio_to_amount": ("multiple", "amount"),
+    "ratio_to_supply": ("minFraction",),
+}
+
+
+def _normalize_conditions(conditions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Coerce numeric quantity fields to decimal strings (see ``_STR_FIELDS``)."""
+    norm_conditions: list[dict[str, Any]] = []
+    for c in conditions:
+        if isinstance(c, dict):
+            fields = _STR_FIELDS.get(c.get("type"))
+            if fields:
+                updates = {
+                    f: str(c[f])
+                    for f in fields
+                    if c.get(f) is not None and not isinstance(c[f], str)
+                }
+                if updates:
+                    c = {**c, **updates}
+        norm_conditions.append(c)
+    return norm_conditions
+
+
+def _wallet_fields(
+    wallet: Optional[str],
+    solana_wallet: Optional[str],
+    xrpl_wallet: Optional[str],
+    bitcoin_wallet: Optional[str],
+    tron_wallet: Optional[str],
+    stellar_wallet: Optional[str],
+    sui_wallet: Optional[str],
+) -> dict[str, str]:
+    """Map the per-chain wallet arguments that are set to their API field names."""
+    fields: dict[str, str] = {}
+    for key, value in (
+        ("wallet", wallet),
+        ("solanaWallet", solana_wallet),
+        ("xrplWallet", xrpl_wallet),
+        ("bitcoinWallet", bitcoin_wallet),
+        ("tronWallet", tron_wallet),
+        ("stellarWallet", stellar_wallet),
+        ("suiWallet", sui_wallet),
+    ):
+        if value:
+            fields[key] = value
+    return fields
+
+
+def _attestation_expiry(resp: dict) -> Optional[float]:
+    """Unix timestamp of a successful attest response's ``expiresAt``."""
+    if not isinstance(resp, dict) or not resp.get("ok"):
+        return None
+    expires_at = ((resp.get("data") or {}).get("attestation") or {}).get("expiresAt")
+    if not expires_at:
+        return None
+    try:
+        return datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _from_cache(resp: dict) -> dict:
+    """A cached response as served again: marked ``cached`` and charging nothing.
+
+    The stale ``creditsRemaining`` is dropped along with the original charge.
+    """
+    meta = {k: v for k, v in (resp.get("meta") or {}).items() if k != "creditsRemaining"}
+    return {**resp, "meta": {**meta, "creditsCharged": 0, "cached": True}}
+
+
+def _merchant_params(
+    token: Optional[str], verified: Optional[bool], limit: int, offset: int
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"limit": limit, "offset": offset}
+    if token:
+        params["token"] = token
+    if verified is not None:
+        params["verified"] = str(verified).lower()
+    return params
+
+
+def _split_attest_body(body: dict[str, Any]) -> list[dict[str, Any]]:
+    """Split an /attest body into bodies of at most ATTEST_MAX_CONDITIONS conditions."""
+    conditions = body["conditions"]
+    return [
+        {**body, "conditions": conditions[i:i + ATTEST_MAX_CONDITIONS]}
+        for i in range(0, len(conditions), ATTEST_MAX_CONDITIONS)
+    ]
+
+
+def _merge_attestations(parts: list[dict]) -> dict:
+    """Merge the responses of an attest request split into condition chunks.
+
+    ``parts[i]`` answered conditions ``[i * ATTEST_MAX_CONDITIONS, ...)``.
+    The merged ``attestation.results`` are copies with ``condition``
+    remapped to the caller's original index; each signed part is kept
+    untouched under ``data.parts`` (with its ``offset``) so it can still be
+    verified on its own.
+    """
+    kept: list[dict] = []
+    results: list[dict] = []
+    credits_charged = 0
+    credits_remaining: Optional[int] = None
+    error: Optional[dict] = None
+    for i, resp in enumerate(parts):
+        offset = i * ATTEST_MAX_CONDITIONS
+        meta = resp.get("meta") or {}
+        credits_charged += meta.get("creditsCharged") or 0
+        if meta.get("creditsRemaining") is not None:
+            remaining = meta["creditsRemaining"]
+            credits_remaining = (
+                remaining if credits_remaining is None else min(credits_remaining, remaining)
+            )
+        if not resp.get("ok"):
+            error = error or resp.get("error") or {"code": "attest_failed"}
+            continue
+        data = resp["data"]
+        kept.append({"offset": offset, **data})
+        for r in data["attestation"].get("results", []):
+            results.append({**r, "condition": r.get("condition", 0) + offset})
+    meta_out = {"creditsCharged": credits_charged, "creditsRemaining": credits_remaining}
+    if error is not None:
+        return {"ok": False, "error": error, "data": {"parts": kept}, "meta": meta_out}
+    attestations = [p["attestation"] for p in kept]
+    expiries = [a["expiresAt"] for a in attestations if a.get("expiresAt")]
+    attested = [a["attestedAt"] for a in attestations if a.get("attestedAt")]
+    return {
+        "ok": True,
+        "data": {
+            "attestation": {
+                "ids": [a.get("id") for a in attestations],
+                "pass": all(a.get("pass") for a in attestations),
+                "results": results,
+                "passCount": sum(a.get("passCount", 0) for a in attestations),
+                "failCount": sum(a.get("failCount", 0) for a in attestations),
+                "attestedAt": max(attested) if attested else None,
+                "expiresAt": min(expiries) if expiries else None,
+            },
+            "parts": kept,
+        },
+        "meta": meta_out,
+    }
+
+
+def _error_body(resp: Any) -> Any:
+    """Decode an error response's body, falling back to its text."""
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+
+def _result(endpoint: str, status: Optional[int], body: Any, resp: Any, with_headers: bool) -> Any:
+    """Return a final response body, or raise it as an :class:`InsumerAPIError`."""
+    if status is not None:
+        raise InsumerAPIError(status, body, endpoint, response=resp)
+    if with_headers:
+        return body, resp.headers
+    return body
+
+
+def _keyed(headers: Optional[dict]) -> bool:
+    """Whether a request is made with the API key (and counts against it)."""
+    return bool(headers) and "X-API-Key" in headers
+
+
+def _in_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Run ``fn`` in pool threads with the caller's context variables.
+
+    Keeps the credit tag, the calling tool and the current trace span across
+    a fan-out.
+    """
+    context = contextvars.copy_context()
+    return lambda *args: context.copy().run(fn, *args)
+
+
+def _error_code(body: Any) -> str:
+    """The API's ``error.code`` in a response body, or ``""``."""
+    if isinstance(body, dict):
+        error = body.get("error")
+        if isinstance(error, dict) and error.get("code"):
+            return str(error["code"])
+    return ""
+
+
+def _chunk_error(error: Any) -> dict:
+    """Describe why a whole /trust/batch chunk failed."""
+    if isinstance(error, dict):
+        return error.get("error") or {"code": "batch_failed", "message": "Batch request failed"}
+    if isinstance(error, InsumerAPIError) and isinstance(error.body, dict) and error.body.get("error"):
+        return error.body["error"]
+    # Refused locally, before the chunk was sent.
+    if isinstance(error, InsumerBudgetExceededError):
+        return {"code": "budget_exceeded", "message": str(error)}
+    if isinstance(error, InsumerRateLimitError):
+        return {"code": "rate_limited", "message": str(error), "retryAfter": error.retry_after}
+    return {"code": "request_failed", "message": str(error)}
+
+
+def _merge_batch_trust(chunks: list[list[dict[str, Any]]], responses: list[Any]) -> dict:
+    """Merge per-chunk /trust/batch responses into a single batch response.
+
+    ``responses[i]`` is the API response for ``chunks[i]`` or the exception
+    that request raised. Results keep the caller's wallet order; a chunk that
+    failed as a whole contributes one error entry per wallet in that chunk.
+    """
+    results: list[dict[str, Any]] = []
+    succeeded = failed = credits_charged = 0
+    credits_remaining: Optional[int] = None
+    first_error: Optional[dict] = None
+    for chunk, resp in zip(chunks, responses):
+        if not isinstance(resp, dict) or not resp.get("ok"):
+            error = _chunk_error(resp)
+            first_error = first_error or error
+            results.extend({"wallet": w.get("wallet"), "error": error} for w in chunk)
+            failed += len(chunk)
+            continue
+        data = resp.get("data", resp)
+        chunk_results = data.get("results", [])
+        results.extend(chunk_results)
+        summary = data.get("summary") or {}
+        chunk_failed = summary.get(
+            "failed", sum(1 for r in chunk_results if r.get("error"))
+        )
+        succeeded += summary.get("succeeded", len(chunk_results) - chunk_failed)
+        failed += chunk_failed
+        meta = resp.get("meta") or {}
+        credits_charged += meta.get("creditsCharged") or 0
+        if meta.get("creditsRemaining") is not None:
+            remaining = meta["creditsRemaining"]
+            credits_remaining = (
+                remaining if credits_remaining is None else min(credits_remaining, remaining)
+            )
+    merged: dict[str, Any] = {
+        "ok": succeeded > 0 or first_error is None,
+        "data": {
+            "results": results,
+            "summary": {
+                "requested": sum(len(c) for c in chunks),
+                "succeeded": succeeded,
+                "failed": failed,
+            },
+        },
+        "meta": {"creditsCharged": credits_charged, "creditsRemaining": credits_remaining},
+    }
+    if not merged["ok"]:
+        merged["error"] = first_error
+    return merged
+
 
 class InsumerAPIWrapper(BaseModel):
     """Wrapper around The Insumer Model API.
@@ -16,14 +337,570 @@ class InsumerAPIWrapper(BaseModel):
     Verifies token balances and NFT ownership without exposing actual wallet
     balances.
 
+    All calls go through one pooled keep-alive ``requests.Session`` owned by
+    the wrapper, so tools sharing a wrapper (and threads sharing those tools)
+    reuse TCP+TLS connections instead of opening one per call. Every endpoint
+    also has an ``a``-prefixed coroutine (``aattest``, ``awallet_trust``, ...)
+    backed by a non-blocking ``httpx.AsyncClient``, one per event loop.
+
+    Transient failures (``rpc_failure``, HTTP 429/5xx, connection errors)
+    are retried with jittered exponential backoff, within a retry budget
+    shared by the whole process (see :mod:`langchain_insumer.retry`). A 5xx
+    from a credit-charging call is not retried, since it may already have
+    been charged, unless the API reports that nothing was.
+    Other HTTP errors raise :class:`~langchain_insumer.exceptions.InsumerAPIError`
+    carrying the API's error body.
+
+    Concurrent identical read requests (same method, path, parameters and
+    body) share one in-flight HTTP request; see ``singleflight_endpoints``.
+
     Args:
         api_key: API key in format ``insr_live_`` followed by 40 hex characters.
             Get a free key at https://insumermodel.com/developers/
+            Optional when ``api_keys`` is given.
         timeout: Request timeout in seconds. Default 30.
+        base_url: API base URL. Default ``https://api.insumermodel.com/v1``.
+        pool_connections: Number of per-host connection pools to keep. Default 10.
+        pool_maxsize: Maximum kept-alive connections per host. Default 10.
+        pool_block: Wait for a free connection when a host's pool is exhausted
+            instead of opening an extra, non-pooled one. Default False.
+        keep_alive: Keep connections open between calls. Default True.
+        bulk_max_concurrency: Maximum sub-requests in flight when
+            ``bulk_wallet_trust()`` or an oversized ``attest()`` fans out.
+            Default 4.
+        trust_coalesce_window_ms: Opt-in. When set, concurrent
+            ``wallet_trust()`` calls with the same ``proof`` setting that
+            arrive within this many milliseconds are sent as one
+            ``/trust/batch`` request and split back out per caller. Each
+            call waits up to the window before it is sent. With a credit
+            ledger, each caller's share of the batch is attributed to its
+            own tool and ``credit_tag``. Default None (off).
+        async_max_connections: Maximum concurrent connections for the async
+            client. Default 100.
+        attest_cache_size: Opt-in. Maximum signed ``attest()`` responses to
+            keep, keyed on the normalized request (wallets, conditions,
+            proof, format). A cached response is served until
+            ``attest_cache_margin`` seconds before its ``expiresAt``, saving
+            the round trip and the credit; its ``meta`` then has
+            ``cached: true`` and ``creditsCharged: 0``. Default 0 (off).
+        attest_cache_margin: Seconds before ``expiresAt`` at which a cached
+            attestation stops being served. Default 60.
+        jwks_cache: Cache the JWKS in process, indexed by ``kid``. Default True.
+        jwks_cache_ttl: Seconds to reuse the JWKS document when the response
+            carries no ``Cache-Control`` header. Default 300.
+        max_retries: Retries after the first attempt for transient failures.
+            0 disables retrying. Default 3.
+        retry_backoff: Base backoff in seconds; retry ``n`` waits a random
+            time up to ``retry_backoff * 2**n`` (at least 2 seconds for
+            ``rpc_failure``, and at least ``Retry-After``). Default 0.5.
+        retry_backoff_max: Cap on the backoff. A ``Retry-After`` longer than
+            this is not waited for. Default 10.
+        singleflight_endpoints: Endpoints whose concurrent identical calls
+            share one in-flight request, named like ``"GET /tokens"`` or
+            ``"GET /merchants/{id}"``. Default None: every GET endpoint.
+            Credit-charging POSTs such as ``"POST /attest"`` are only shared
+            when listed here. Pass ``[]`` to disable.
+        token_registry: Opt-in. Answer ``list_tokens()`` from an in-memory
+            :class:`~langchain_insumer.registry.TokenRegistry` loaded once
+            from ``/tokens`` and refreshed in the background. Default False.
+        token_registry_refresh: Seconds between background registry
+            refreshes. Default 3600.
+        merchant_directory: Opt-in. Answer ``list_merchants()`` and
+            ``get_merchant()`` from an in-memory
+            :class:`~langchain_insumer.directory.MerchantDirectory` that is
+            refreshed incrementally in the background. Default False.
+        merchant_directory_refresh: Seconds between background directory
+            refreshes. Default 600.
+        stale_while_revalidate: Opt-in. Cache ``get_compliance_templates()``,
+            ``list_tokens()``, ``list_merchants()`` and ``get_merchant()``
+            responses: within an endpoint's soft TTL they are served from
+            memory; past it the cached response is still returned at once
+            and refreshed in the background; past the hard TTL the call
+            waits for a fresh response. Default False.
+        swr_ttls: Per-endpoint ``(soft_ttl, hard_ttl)`` seconds, keyed like
+            ``"GET /tokens"``, merged over ``SWR_DEFAULT_TTLS``.
+        cache_backend: A :class:`~langchain_insumer.backends.CacheBackend`,
+            or a file path for a :class:`~langchain_insumer.backends.SQLiteBackend`.
+            The JWKS, the token registry, merchant directory profiles and
+            unexpired attestations (with ``attest_cache_size`` set) are
+            written through to it and read back when the in-memory caches
+            are cold, so worker processes on one host share them and a
+            restarted worker starts warm. Default None.
+        validate_inputs: Opt-in. Check wallet addresses (per-chain format
+            and checksum) and condition shape locally before sending
+            ``attest``, ``wallet_trust``, batch/bulk trust, ``verify``,
+            ``check_discount`` and the ACP/UCP calls, raising
+            :class:`~langchain_insumer.exceptions.InsumerValidationError`
+            instead of spending a round trip on a ``400``. Default False.
+        metrics: Opt-in. ``True`` to record per-endpoint request counts,
+            statuses, API error codes and connect/server/decode latency
+            histograms (see :class:`~langchain_insumer.metrics.RequestMetrics`),
+            or a ``RequestMetrics`` to share between wrappers. When off, the
+            request path only checks that it is off. Default False.
+        tracing: Opt-in. ``True`` to create OpenTelemetry spans for every
+            HTTP call (and, through :class:`~langchain_insumer.tools.base.InsumerBaseTool`,
+            every tool run) using the global tracer provider, or a tracer to
+            use instead. The trace context is propagated in the outbound
+            request headers. Needs ``opentelemetry-api``
+            (``pip install langchain-insumer[otel]``). Default False.
+        credit_ledger: Opt-in. ``True``, or a
+            :class:`~langchain_insumer.credits.CreditLedger` to share, to
+            track credits spent per endpoint, tool and caller tag from the
+            responses' ``meta``, and to enforce the ledger's budget before
+            sending. Default False.
+        credit_budget: Shortcut for ``credit_ledger=CreditLedger(budget=...)``:
+            refuse, with :class:`~langchain_insumer.exceptions.InsumerBudgetExceededError`,
+            any call whose predicted cost would take this wrapper's spending
+            past this many credits. Default None.
+        rate_limit_tier: Opt-in. ``"free"``, ``"pro"`` or ``"enterprise"``:
+            pace authenticated requests with a
+            :class:`~langchain_insumer.ratelimit.RateLimiter` for that tier's
+            daily quota, queueing bursts for up to 30 seconds before
+            raising :class:`~langchain_insumer.exceptions.InsumerRateLimitError`.
+            Default None.
+        rate_limiter: A configured ``RateLimiter`` (per-class limits, burst,
+            wait), possibly shared by wrappers using the same key. Takes
+            precedence over ``rate_limit_tier``. Default None.
+        api_keys: Opt-in key pool. Several keys used as one through a
+            :class:`~langchain_insumer.keypool.KeyPool`: each authenticated
+            request goes to the key with the most read quota (reads) or
+            credits (writes) left, and is re-sent at once on another key
+            when its key answers ``429`` or runs out of credits. A key out
+            of credits is tried again after ``buy_credits()`` or five
+            minutes. Each key
+            gets its own limiter for ``rate_limit_tier``; ``rate_limiter``
+            is not used. The ledger, if any, does not track the API key
+            balance, since each key has its own. Default None.
     """
 
-    api_key: str = Field(description="Insumer API key (insr_live_...)")
+    api_key: str = Field(default="", description="Insumer API key (insr_live_...)")
     timeout: int = Field(default=30, description="Request timeout in seconds")
+    base_url: str = Field(default=BASE_URL, description="API base URL")
+    pool_connections: int = Field(default=10, description="Number of per-host connection pools")
+    pool_maxsize: int = Field(default=10, description="Maximum kept-alive connections per host")
+    pool_block: bool = Field(default=False, description="Block when a host pool is exhausted")
+    keep_alive: bool = Field(default=True, description="Reuse connections between calls")
+    bulk_max_concurrency: int = Field(
+        default=4, description="Maximum concurrent sub-requests when a call fans out"
+    )
+    trust_coalesce_window_ms: Optional[float] = Field(
+        default=None, description="Coalesce concurrent wallet_trust calls within this window"
+    )
+    async_max_connections: int = Field(
+        default=100, description="Maximum concurrent connections for async calls"
+    )
+    attest_cache_size: int = Field(
+        default=0, description="Maximum cached attestations (0 disables the cache)"
+    )
+    attest_cache_margin: float = Field(
+        default=60.0, description="Stop serving a cached attestation this many seconds before expiresAt"
+    )
+    jwks_cache: bool = Field(default=True, description="Cache the JWKS indexed by kid")
+    jwks_cache_ttl: float = Field(
+        default=300.0, description="JWKS TTL in seconds when no Cache-Control is sent"
+    )
+    max_retries: int = Field(default=3, description="Retries for transient failures")
+    retry_backoff: float = Field(default=0.5, description="Base retry backoff in seconds")
+    retry_backoff_max: float = Field(default=10.0, description="Maximum retry backoff in seconds")
+    singleflight_endpoints: Optional[list[str]] = Field(
+        default=None, description="Endpoints whose identical concurrent calls share one request"
+    )
+    token_registry: bool = Field(default=False, description="Serve list_tokens from a local index")
+    token_registry_refresh: float = Field(
+        default=3600.0, description="Seconds between token registry refreshes"
+    )
+    merchant_directory: bool = Field(
+        default=False, description="Serve merchant listings and profiles from a local snapshot"
+    )
+    merchant_directory_refresh: float = Field(
+        default=600.0, description="Seconds between merchant directory refreshes"
+    )
+    stale_while_revalidate: bool = Field(
+        default=False, description="Serve discovery endpoints stale while refreshing them"
+    )
+    swr_ttls: Optional[dict[str, tuple[float, float]]] = Field(
+        default=None, description="Per-endpoint (soft_ttl, hard_ttl) overrides in seconds"
+    )
+    cache_backend: Optional[Any] = Field(
+        default=None, exclude=True, description="Shared cache backend or SQLite file path"
+    )
+    validate_inputs: bool = Field(
+        default=False, description="Reject malformed addresses and conditions before sending"
+    )
+    metrics: Any = Field(
+        default=False, exclude=True, description="Record request metrics, or a shared RequestMetrics"
+    )
+    tracing: Any = Field(
+        default=False, exclude=True, description="Create OpenTelemetry spans, or the tracer to use"
+    )
+    credit_ledger: Any = Field(
+        default=False, exclude=True, description="Track credit spend, or a shared CreditLedger"
+    )
+    credit_budget: Optional[int] = Field(
+        default=None, description="Refuse calls that would spend more than this many credits"
+    )
+    rate_limit_tier: Optional[Literal["free", "pro", "enterprise"]] = Field(
+        default=None, description="Pace requests to this key tier's daily quota"
+    )
+    rate_limiter: Optional[Any] = Field(
+        default=None, exclude=True, description="A RateLimiter to use instead of rate_limit_tier"
+    )
+    api_keys: Optional[list[str]] = Field(
+        default=None, description="Several API keys to route requests across"
+    )
+
+    _session: requests.Session = PrivateAttr()
+    _connection_stats: ConnectionStats = PrivateAttr(default_factory=ConnectionStats)
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        PrivateAttr(default_factory=weakref.WeakKeyDictionary)
+    )
+    _async_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _trust_coalescer: Optional[TrustCoalescer] = PrivateAttr(default=None)
+    _atrust_coalescer: Optional[AsyncTrustCoalescer] = PrivateAttr(default=None)
+    _jwks_cache: Optional[JwksCache] = PrivateAttr(default=None)
+    _attest_cache: Optional[ExpiringLRUCache] = PrivateAttr(default=None)
+    _retry: RetryPolicy = PrivateAttr()
+    _singleflight: SingleFlight = PrivateAttr(default_factory=SingleFlight)
+    _asingleflight: AsyncSingleFlight = PrivateAttr(default_factory=AsyncSingleFlight)
+    _token_registry: Optional[TokenRegistry] = PrivateAttr(default=None)
+    _merchant_directory: Optional[MerchantDirectory] = PrivateAttr(default=None)
+    _registry_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _swr: Optional[StaleWhileRevalidateCache] = PrivateAttr(default=None)
+    _swr_ttls: dict[str, tuple[float, float]] = PrivateAttr(default_factory=dict)
+    _backend: Optional[CacheBackend] = PrivateAttr(default=None)
+    _metrics: Optional[RequestMetrics] = PrivateAttr(default=None)
+    _tracer: Any = PrivateAttr(default=None)
+    _ledger: Optional[CreditLedger] = PrivateAttr(default=None)
+    _limiter: Optional[RateLimiter] = PrivateAttr(default=None)
+    _key_pool: Optional[KeyPool] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.api_keys:
+            self._key_pool = KeyPool(self.api_keys, tier=self.rate_limit_tier)
+            if not self.api_key:
+                self.api_key = self.api_keys[0]
+        elif not self.api_key:
+            raise ValueError("InsumerAPIWrapper needs api_key or api_keys")
+        session = requests.Session()
+        adapter = PooledHTTPAdapter(
+            self._connection_stats,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        self._session = session
+        self._retry = RetryPolicy(self.max_retries, self.retry_backoff, self.retry_backoff_max)
+        if self.trust_coalesce_window_ms:
+            window = self.trust_coalesce_window_ms / 1000
+            self._trust_coalescer = TrustCoalescer(
+                lambda body: self._post("/trust", body),
+                lambda wallets, proof: self.batch_wallet_trust(wallets, proof=proof),
+                window,
+                max_batch=BATCH_TRUST_MAX_WALLETS,
+            )
+            self._atrust_coalescer = AsyncTrustCoalescer(
+                lambda body: self._apost("/trust", body),
+                lambda wallets, proof: self.abatch_wallet_trust(wallets, proof=proof),
+                window,
+                max_batch=BATCH_TRUST_MAX_WALLETS,
+            )
+        if isinstance(self.metrics, RequestMetrics):
+            self._metrics = self.metrics
+        elif self.metrics:
+            self._metrics = RequestMetrics()
+        if self.tracing is True:
+            self._tracer = get_tracer()
+        elif self.tracing:
+            self._tracer = self.tracing
+        if isinstance(self.credit_ledger, CreditLedger):
+            self._ledger = self.credit_ledger
+        elif self.credit_ledger or self.credit_budget is not None:
+            self._ledger = CreditLedger(budget=self.credit_budget)
+        # Pooled keys are limited per key by the KeyPool instead.
+        if self._key_pool is None:
+            if self.rate_limiter is not None:
+                self._limiter = self.rate_limiter
+            elif self.rate_limit_tier is not None:
+                self._limiter = RateLimiter(self.rate_limit_tier)
+        if self.attest_cache_size > 0:
+            self._attest_cache = ExpiringLRUCache(self.attest_cache_size)
+        if self.stale_while_revalidate:
+            self._swr = StaleWhileRevalidateCache()
+            self._swr_ttls = {**SWR_DEFAULT_TTLS, **(self.swr_ttls or {})}
+        if self.jwks_cache:
+            self._jwks_cache = JwksCache(
+                lambda: self._persist_jwks(self._request("GET", "/jwks", with_headers=True)),
+                self._afetch_jwks,
+                default_ttl=self.jwks_cache_ttl,
+            )
+        if isinstance(self.cache_backend, (str, os.PathLike)):
+            self._backend = SQLiteBackend(self.cache_backend)
+        else:
+            self._backend = self.cache_backend
+        if self._backend is not None:
+            self.warm_start()
+
+    def warm_start(self) -> dict:
+        """Load cached state from ``cache_backend`` into the in-memory caches.
+
+        Called on construction when a backend is configured; call it again to
+        pick up what other workers have stored since.
+
+        Returns:
+            Counts of what was loaded: ``jwks`` (0 or 1), ``tokens`` (0 or 1)
+            and ``attestations``.
+        """
+        loaded = {"jwks": 0, "tokens": 0, "attestations": 0}
+        backend = self._backend
+        if backend is None:
+            return loaded
+        stored = backend.get("jwks", "document")
+        if stored is not None and self._jwks_cache is not None:
+            self._jwks_cache.seed(stored["document"], max(stored["expiresAt"] - time.time(), 0.0))
+            loaded["jwks"] = 1
+        if self.token_registry and backend.get("tokens", "all") is not None:
+            self.get_token_registry()
+            loaded["tokens"] = 1
+        if self._attest_cache is not None:
+            prefix = self._attest_namespace_prefix()
+            entries = [e for e in backend.items("attest") if e[0].startswith(prefix)]
+            for key, resp, expires_at in entries[-self.attest_cache_size:]:
+                self._attest_cache.set(key[len(prefix):], resp, expires_at or 0.0)
+                loaded["attestations"] += 1
+        return loaded
+
+    def _persist_jwks(self, fetched: tuple[dict, Any]) -> tuple[dict, Any]:
+        document, headers = fetched
+        ttl = _ttl_from_headers(headers, self.jwks_cache_ttl)
+        if self._backend is not None and ttl > 0:
+            expires_at = time.time() + ttl
+            self._backend.set(
+                "jwks", "document", {"document": document, "expiresAt": expires_at}, expires_at
+            )
+        return fetched
+
+    async def _afetch_jwks(self) -> tuple[dict, Any]:
+        fetched = await self._arequest("GET", "/jwks", with_headers=True)
+        if self._backend is None:
+            return fetched
+        return await asyncio.get_running_loop().run_in_executor(None, self._persist_jwks, fetched)
+
+    def _fetch_tokens(self) -> dict:
+        resp = self._public_get("/tokens", {})
+        self._persist("tokens", "all", resp, PERSISTED_SNAPSHOT_TTL)
+        return resp
+
+    async def _afetch_tokens(self) -> dict:
+        resp = await self._apublic_get("/tokens", {})
+        await self._apersist("tokens", "all", resp, PERSISTED_SNAPSHOT_TTL)
+        return resp
+
+    def _fetch_profile(self, merchant_id: str) -> dict:
+        cached = self._backend.get("merchant", merchant_id) if self._backend else None
+        if cached is not None:
+            return cached
+        resp = self._public_get(f"/merchants/{merchant_id}")
+        self._persist("merchant", merchant_id, resp, self.merchant_directory_refresh)
+        return resp
+
+    async def _afetch_profile(self, merchant_id: str) -> dict:
+        if self._backend is not None:
+            cached = await asyncio.get_running_loop().run_in_executor(
+                None, self._backend.get, "merchant", merchant_id
+            )
+            if cached is not None:
+                return cached
+        resp = await self._apublic_get(f"/merchants/{merchant_id}")
+        await self._apersist("merchant", merchant_id, resp, self.merchant_directory_refresh)
+        return resp
+
+    def _forget_profile(self, merchant_id: str) -> None:
+        if self._backend is not None:
+            self._backend.delete("merchant", merchant_id)
+
+    def _persist(self, namespace: str, key: str, resp: dict, ttl: float) -> None:
+        if self._backend is not None and resp.get("ok", True):
+            self._backend.set(namespace, key, resp, time.time() + ttl)
+
+    async def _apersist(self, namespace: str, key: str, resp: dict, ttl: float) -> None:
+        """:meth:`_persist` on the default executor, keeping backend I/O off the event loop."""
+        if self._backend is not None and resp.get("ok", True):
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._persist, namespace, key, resp, ttl
+            )
+
+    def _attest_namespace_prefix(self) -> str:
+        # Attestations carry per-account meta, so workers using different
+        # API keys on one backend do not share them.
+        return hashlib.sha256(self.api_key.encode()).hexdigest()[:16] + ":"
+
+    def connection_stats(self) -> dict:
+        """Return connection-reuse counters for the pooled session.
+
+        Returns:
+            Dict with ``requests`` sent, ``connections`` opened, and
+            ``reused`` (requests served on an already-open connection).
+        """
+        return self._connection_stats.snapshot()
+
+    def retry_stats(self) -> dict:
+        """Return per-endpoint retry counters.
+
+        Returns:
+            Dict keyed by endpoint (e.g. ``"POST /attest"``), each with
+            ``attempts``, ``retries``, ``recovered``, ``exhausted``,
+            ``budget_denied`` and ``reasons``. See
+            :meth:`langchain_insumer.retry.RetryPolicy.stats`.
+        """
+        return self._retry.stats()
+
+    def singleflight_stats(self) -> dict:
+        """Return per-endpoint in-flight sharing counters.
+
+        Returns:
+            Dict keyed by endpoint, each with ``calls`` made and how many
+            were ``shared`` (served by an identical call already in flight).
+        """
+        merged: dict[str, dict[str, int]] = {}
+        for stats in (self._singleflight.stats(), self._asingleflight.stats()):
+            for endpoint, counts in stats.items():
+                total = merged.setdefault(endpoint, {"calls": 0, "shared": 0})
+                total["calls"] += counts["calls"]
+                total["shared"] += counts["shared"]
+        return merged
+
+    def swr_stats(self) -> dict:
+        """Return stale-while-revalidate cache counters.
+
+        Returns:
+            Dict with ``hits``, ``stale_hits``, ``misses``, ``refreshes``,
+            ``refresh_errors`` and ``size``; empty when the mode is off.
+        """
+        return self._swr.stats() if self._swr is not None else {}
+
+    def credit_stats(self) -> dict:
+        """Return credit spending recorded by the ledger.
+
+        Returns:
+            See :meth:`langchain_insumer.credits.CreditLedger.stats`; empty
+            when ``credit_ledger`` is off.
+        """
+        return self._ledger.stats() if self._ledger is not None else {}
+
+    def rate_limit_stats(self) -> dict:
+        """Return the rate limiter's fill level per endpoint class.
+
+        Returns:
+            See :meth:`langchain_insumer.ratelimit.RateLimiter.stats`; empty
+            when no limiter is configured.
+        """
+        return self._limiter.stats() if self._limiter is not None else {}
+
+    def key_stats(self) -> dict:
+        """Return per-key utilization of the key pool.
+
+        Returns:
+            See :meth:`langchain_insumer.keypool.KeyPool.stats`; empty
+            without ``api_keys``.
+        """
+        return self._key_pool.stats() if self._key_pool is not None else {}
+
+    def request_metrics(self) -> dict:
+        """Return per-endpoint request metrics.
+
+        Returns:
+            Dict keyed by endpoint; see
+            :meth:`langchain_insumer.metrics.RequestMetrics.stats`. Empty
+            when ``metrics`` is off.
+        """
+        return self._metrics.stats() if self._metrics is not None else {}
+
+    def render_prometheus(self, prefix: str = "insumer") -> str:
+        """Return the request metrics in the Prometheus text format.
+
+        Returns an empty string when ``metrics`` is off.
+        """
+        return self._metrics.render_prometheus(prefix) if self._metrics is not None else ""
+
+    def _swr_get(self, path: str, params: Optional[dict] = None) -> dict:
+        ttls = self._swr_ttls.get(endpoint_name("GET", path))
+        if self._swr is None or ttls is None:
+            return self._public_get(path, params)
+        return self._swr.get(
+            cache_key("GET", path, params), lambda: self._public_get(path, params), *ttls
+        )
+
+    async def _aswr_get(self, path: str, params: Optional[dict] = None) -> dict:
+        ttls = self._swr_ttls.get(endpoint_name("GET", path))
+        if self._swr is None or ttls is None:
+            return await self._apublic_get(path, params)
+        return await self._swr.aget(
+            cache_key("GET", path, params), lambda: self._apublic_get(path, params), *ttls
+        )
+
+    def _shares_in_flight(self, method: str, endpoint: str) -> bool:
+        if self.singleflight_endpoints is None:
+            return method == "GET"
+        return endpoint in self.singleflight_endpoints
+
+    def close(self) -> None:
+        """Close all pooled connections and stop background refreshes."""
+        for snapshot in (self._token_registry, self._merchant_directory):
+            if snapshot is not None:
+                snapshot.stop()
+        if self._swr is not None:
+            self._swr.close()
+        if self._backend is not None and self._backend is not self.cache_backend:
+            # Only close a backend this wrapper opened from a path.
+            self._backend.close()
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close the async client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def _async_client(self) -> "httpx.AsyncClient":
+        # httpx clients are bound to the loop they first ran on, so keep one
+        # per loop; a loop's client is dropped along with the loop.
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.async_max_connections,
+                        max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+                    ),
+                    headers=None if self.keep_alive else {"Connection": "close"},
+                )
+                self._async_clients[loop] = client
+        return client
+
+    async def _atrace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._connection_stats.record_connection()
+
+    def _timed_atrace(self, timing: dict[str, float]) -> Callable[[str, dict], Any]:
+        # Per-request trace hook that also times opening the connection; the
+        # TLS handshake, when there is one, completes after the TCP connect.
+        async def trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.started":
+                timing["connecting"] = time.perf_counter()
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                timing["connect"] = time.perf_counter() - timing.get("connecting", time.perf_counter())
+            await self._atrace(event_name, info)
+
+        return trace
 
     def _headers(self) -> dict:
         return {
@@ -31,45 +908,387 @@ class InsumerAPIWrapper(BaseModel):
             "Content-Type": "application/json",
         }
 
-    def _get(self, path: str, params: Optional[dict] = None) -> dict:
-        resp = requests.get(
-            f"{BASE_URL}{path}",
-            headers=self._headers(),
-            params=params,
-            timeout=self.timeout,
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        with_headers: bool = False,
+    ) -> Any:
+        endpoint = endpoint_name(method, path)
+        if not self._shares_in_flight(method, endpoint):
+            return self._send(method, path, endpoint, params, json_body, headers, with_headers)
+        key = cache_key(method, path, params, json_body, with_headers)
+        return self._singleflight.do(
+            key,
+            lambda: self._send(method, path, endpoint, params, json_body, headers, with_headers),
+            group=endpoint,
+        )
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+    ) -> Any:
+        if self._tracer is None:
+            return self._send_budgeted(method, path, endpoint, params, json_body, headers, with_headers)
+        url = f"{self.base_url}{path}"
+        with client_span(self._tracer, method, endpoint, url, json_body) as span:
+            headers = inject_context(headers)
+            return self._send_budgeted(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+
+    def _send_budgeted(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+        span: Any = None,
+    ) -> Any:
+        ledger = self._ledger
+        cost = predict_cost(endpoint, json_body) if ledger is not None else 0
+        if not cost:
+            return self._send_attempts(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+        reservation = ledger.reserve(endpoint, cost, credit_pool(endpoint, json_body))
+        try:
+            result = self._send_attempts(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+        except BaseException as e:
+            ledger.settle_error(reservation, e)
+            raise
+        # Pooled keys each have their own balance; merchant balances are shared.
+        track = self._key_pool is None or reservation.pool != KEY_POOL
+        ledger.settle(reservation, result[0] if with_headers else result, track)
+        return result
+
+    def _send_attempts(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+        span: Any = None,
+    ) -> Any:
+        kwargs: dict[str, Any] = {"headers": headers, "timeout": self.timeout}
+        if params is not None:
+            kwargs["params"] = params
+        if json_body is not None:
+            kwargs["json"] = json_body
+        metrics = self._metrics
+        limit_class = self._limit_class(endpoint, json_body, headers)
+        pool = self._key_pool if _keyed(headers) else None
+        cost = predict_cost(endpoint, json_body)
+        attempt = failovers = 0
+        # Failovers to another key re-send the same attempt, outside the retry budget.
+        self._retry.on_attempt(endpoint, attempt)
+        while True:
+            if pool is not None:
+                key = pool.acquire(endpoint, cost)
+                kwargs["headers"] = {**headers, "X-API-Key": key}
+            elif limit_class is not None:
+                self._limiter.acquire(limit_class, endpoint)
+            if metrics is not None:
+                self._connection_stats.pop_connect_time()
+                started = time.perf_counter()
+            try:
+                resp = self._session.request(method, f"{self.base_url}{path}", **kwargs)
+            except requests.RequestException as e:
+                if metrics is not None:
+                    connect = self._connection_stats.pop_connect_time()
+                    self._observe_error(endpoint, e, started, connect)
+                delay = self._error_delay(endpoint, attempt, method, e)
+                if delay is None:
+                    raise
+            else:
+                status = None if resp.ok else resp.status_code
+                if metrics is not None:
+                    received = time.perf_counter()
+                body = resp.json() if status is None else _error_body(resp)
+                if metrics is not None:
+                    connect = self._connection_stats.pop_connect_time()
+                    self._observe(endpoint, resp, body, started, connect, received, resp.request.body)
+                if span is not None:
+                    record_response(span, resp.status_code, body, len(resp.content), attempt)
+                if pool is not None:
+                    if pool.record(key, status, body, resp.headers) and failovers < pool.size - 1:
+                        failovers += 1
+                        continue
+                elif status == 429 and limit_class is not None:
+                    self._limiter.drain(limit_class)
+                delay = self._response_delay(
+                    endpoint, attempt, status, body, resp.headers, cost
+                )
+                if delay is None:
+                    return _result(endpoint, status, body, resp, with_headers)
+            time.sleep(delay)
+            attempt += 1
+            self._retry.on_attempt(endpoint, attempt)
+
+    def _observe(
+        self,
+        endpoint: str,
+        resp: Any,
+        body: Any,
+        started: float,
+        connect: float,
+        received: float,
+        request_body: Any,
+    ) -> None:
+        self._metrics.observe(
+            endpoint,
+            str(resp.status_code),
+            _error_code(body),
+            connect=connect,
+            server=max(received - started - connect, 0.0),
+            decode=time.perf_counter() - received,
+            request_bytes=len(request_body or b""),
+            response_bytes=len(resp.content),
         )
-        resp.raise_for_status()
-        return resp.json()
+
+    def _observe_error(
+        self, endpoint: str, error: BaseException, started: float, connect: float
+    ) -> None:
+        self._metrics.observe(
+            endpoint,
+            "error",
+            type(error).__name__,
+            connect=connect,
+            server=max(time.perf_counter() - started - connect, 0.0),
+        )
+
+    def _limit_class(
+        self, endpoint: str, json_body: Optional[dict], headers: Optional[dict]
+    ) -> Optional[str]:
+        # Only requests made with the key count against its quota.
+        if self._limiter is None or not _keyed(headers):
+            return None
+        return endpoint_class(endpoint, json_body)
+
+    def _error_delay(
+        self, endpoint: str, attempt: int, method: str, error: BaseException
+    ) -> Optional[float]:
+        if not is_retryable_error(method, error):
+            return None
+        return self._retry.delay(endpoint, attempt, "connection")
+
+    def _response_delay(
+        self,
+        endpoint: str,
+        attempt: int,
+        status: Optional[int],
+        body: Any,
+        headers: Any,
+        cost: int = 0,
+    ) -> Optional[float]:
+        reason = response_retry_reason(status, body, charging=cost > 0)
+        if reason is None:
+            if status is None:
+                self._retry.on_success(endpoint, attempt)
+            return None
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        return self._retry.delay(endpoint, attempt, reason, retry_after)
+
+    def _get(self, path: str, params: Optional[dict] = None) -> dict:
+        return self._request("GET", path, params=params, headers=self._headers())
+
+    def _public_get(self, path: str, params: Optional[dict] = None) -> dict:
+        return self._request("GET", path, params=params)
 
     def _public_post(self, path: str, json_body: Optional[dict] = None) -> dict:
-        resp = requests.post(
-            f"{BASE_URL}{path}",
+        return self._request(
+            "POST",
+            path,
+            json_body=json_body or {},
             headers={"Content-Type": "application/json"},
-            json=json_body or {},
-            timeout=self.timeout,
         )
-        resp.raise_for_status()
-        return resp.json()
 
     def _post(self, path: str, json_body: Optional[dict] = None) -> dict:
-        resp = requests.post(
-            f"{BASE_URL}{path}",
-            headers=self._headers(),
-            json=json_body or {},
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return self._request("POST", path, json_body=json_body or {}, headers=self._headers())
 
     def _put(self, path: str, json_body: Optional[dict] = None) -> dict:
-        resp = requests.put(
-            f"{BASE_URL}{path}",
-            headers=self._headers(),
-            json=json_body or {},
-            timeout=self.timeout,
+        return self._request("PUT", path, json_body=json_body or {}, headers=self._headers())
+
+    async def _arequest(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        with_headers: bool = False,
+    ) -> Any:
+        endpoint = endpoint_name(method, path)
+        if not self._shares_in_flight(method, endpoint):
+            return await self._asend(method, path, endpoint, params, json_body, headers, with_headers)
+        key = cache_key(method, path, params, json_body, with_headers)
+        return await self._asingleflight.do(
+            key,
+            lambda: self._asend(method, path, endpoint, params, json_body, headers, with_headers),
+            group=endpoint,
         )
-        resp.raise_for_status()
-        return resp.json()
+
+    async def _asend(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+    ) -> Any:
+        if self._tracer is None:
+            return await self._asend_budgeted(
+                method, path, endpoint, params, json_body, headers, with_headers
+            )
+        url = f"{self.base_url}{path}"
+        with client_span(self._tracer, method, endpoint, url, json_body) as span:
+            headers = inject_context(headers)
+            return await self._asend_budgeted(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+
+    async def _asend_budgeted(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+        span: Any = None,
+    ) -> Any:
+        ledger = self._ledger
+        cost = predict_cost(endpoint, json_body) if ledger is not None else 0
+        if not cost:
+            return await self._asend_attempts(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+        reservation = await ledger.areserve(endpoint, cost, credit_pool(endpoint, json_body))
+        try:
+            result = await self._asend_attempts(
+                method, path, endpoint, params, json_body, headers, with_headers, span
+            )
+        except BaseException as e:
+            ledger.settle_error(reservation, e)
+            raise
+        # Pooled keys each have their own balance; merchant balances are shared.
+        track = self._key_pool is None or reservation.pool != KEY_POOL
+        ledger.settle(reservation, result[0] if with_headers else result, track)
+        return result
+
+    async def _asend_attempts(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict],
+        json_body: Optional[dict],
+        headers: Optional[dict],
+        with_headers: bool,
+        span: Any = None,
+    ) -> Any:
+        import httpx
+
+        client = self._async_client()
+        metrics = self._metrics
+        trace = self._atrace
+        limit_class = self._limit_class(endpoint, json_body, headers)
+        pool = self._key_pool if _keyed(headers) else None
+        cost = predict_cost(endpoint, json_body)
+        attempt = failovers = 0
+        # Failovers to another key re-send the same attempt, outside the retry budget.
+        self._retry.on_attempt(endpoint, attempt)
+        while True:
+            if pool is not None:
+                key = await pool.aacquire(endpoint, cost)
+                headers = {**headers, "X-API-Key": key}
+            elif limit_class is not None:
+                await self._limiter.aacquire(limit_class, endpoint)
+            self._connection_stats.record_request()
+            if metrics is not None:
+                timing: dict[str, float] = {}
+                trace = self._timed_atrace(timing)
+                started = time.perf_counter()
+            try:
+                resp = await client.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=headers,
+                    params=params,
+                    json=json_body,
+                    timeout=self.timeout,
+                    extensions={"trace": trace},
+                )
+            except httpx.HTTPError as e:
+                if metrics is not None:
+                    self._observe_error(endpoint, e, started, timing.get("connect", 0.0))
+                delay = self._error_delay(endpoint, attempt, method, e)
+                if delay is None:
+                    raise
+            else:
+                status = None if resp.is_success else resp.status_code
+                if metrics is not None:
+                    received = time.perf_counter()
+                body = resp.json() if status is None else _error_body(resp)
+                if metrics is not None:
+                    connect = timing.get("connect", 0.0)
+                    self._observe(endpoint, resp, body, started, connect, received, resp.request.content)
+                if span is not None:
+                    record_response(span, resp.status_code, body, len(resp.content), attempt)
+                if pool is not None:
+                    if pool.record(key, status, body, resp.headers) and failovers < pool.size - 1:
+                        failovers += 1
+                        continue
+                elif status == 429 and limit_class is not None:
+                    self._limiter.drain(limit_class)
+                delay = self._response_delay(
+                    endpoint, attempt, status, body, resp.headers, cost
+                )
+                if delay is None:
+                    return _result(endpoint, status, body, resp, with_headers)
+            await asyncio.sleep(delay)
+            attempt += 1
+            self._retry.on_attempt(endpoint, attempt)
+
+    async def _aget(self, path: str, params: Optional[dict] = None) -> dict:
+        return await self._arequest("GET", path, params=params, headers=self._headers())
+
+    async def _apublic_get(self, path: str, params: Optional[dict] = None) -> dict:
+        return await self._arequest("GET", path, params=params)
+
+    async def _apublic_post(self, path: str, json_body: Optional[dict] = None) -> dict:
+        return await self._arequest(
+            "POST",
+            path,
+            json_body=json_body or {},
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def _apost(self, path: str, json_body: Optional[dict] = None) -> dict:
+        return await self._arequest("POST", path, json_body=json_body or {}, headers=self._headers())
+
+    async def _aput(self, path: str, json_body: Optional[dict] = None) -> dict:
+        return await self._arequest("PUT", path, json_body=json_body or {}, headers=self._headers())
 
     def get_jwks(self) -> dict:
         """Get the JWKS containing InsumerAPI's ECDSA P-256 public signing key.
@@ -77,15 +1296,41 @@ class InsumerAPIWrapper(BaseModel):
         No authentication required. The ``kid`` field matches the ``kid`` in
         attestation responses, enabling automatic key rotation.
 
+        Served from the in-process JWKS cache (see ``jwks_cache``) while the
+        response's ``Cache-Control`` allows.
+
         Returns:
             JWKS document with the public signing key.
         """
-        resp = requests.get(
-            f"{BASE_URL}/jwks",
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        if self._jwks_cache is not None:
+            return self._jwks_cache.get_jwks()
+        return self._public_get("/jwks")
+
+    def get_signing_key(self, kid: str) -> Optional[dict]:
+        """Get the JWK for a signing key id (e.g. ``insumer-attest-v2``).
+
+        Known ``kid`` values are answered from the in-process cache without
+        a request; an unknown ``kid`` triggers one JWKS refetch (shared by
+        all concurrent callers) to pick up a rotated key.
+
+        Args:
+            kid: Key id from the ``kid`` field of a signed response.
+
+        Returns:
+            The JWK dict, or None if no key with that ``kid`` is published.
+        """
+        if self._jwks_cache is not None:
+            return self._jwks_cache.get_key(kid)
+        for jwk in _keys_of(self._public_get("/jwks")):
+            if jwk.get("kid") == kid:
+                return jwk
+        return None
+
+    def jwks_cache_stats(self) -> dict:
+        """Return JWKS cache ``hits``, ``misses``, ``refreshes`` and cached ``kids``."""
+        if self._jwks_cache is None:
+            return {"hits": 0, "misses": 0, "refreshes": 0, "kids": []}
+        return self._jwks_cache.stats()
 
     def get_compliance_templates(self) -> dict:
         """List available compliance templates for EAS attestation verification.
@@ -96,12 +1341,13 @@ class InsumerAPIWrapper(BaseModel):
         Returns:
             Template catalog with provider, description, chainId, and chainName.
         """
-        resp = requests.get(
-            f"{BASE_URL}/compliance/templates",
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return self._swr_get("/compliance/templates")
+
+    def _validated(self, body: dict[str, Any], max_wallets: Optional[int] = None) -> dict[str, Any]:
+        """Return ``body``, after checking it offline when ``validate_inputs`` is set."""
+        if self.validate_inputs:
+            check_request(body, max_wallets=max_wallets)
+        return body
 
     def attest(
         self,
@@ -115,13 +1361,22 @@ class InsumerAPIWrapper(BaseModel):
         sui_wallet: Optional[str] = None,
         proof: Optional[str] = None,
         format: Optional[str] = None,
+        use_cache: bool = True,
     ) -> dict:
         """Create a privacy-preserving on-chain verification.
 
-        Verifies 1-10 conditions (token balances, NFT ownership, EAS
+        Verifies conditions (token balances, NFT ownership, EAS
         attestations) and returns a cryptographically signed true/false result.
         Never exposes actual balances. Costs 1 verification credit (standard)
-        or 2 credits (with proof="merkle").
+        or 2 credits (with proof="merkle") per request.
+
+        The API accepts up to 10 conditions per request. Longer lists are
+        split into 10-condition requests sent concurrently (each charged
+        separately) and merged: ``attestation.results`` covers every
+        condition with ``condition`` indices in the caller's order,
+        ``attestation.pass`` is true only if every part passed, and the
+        signed sub-attestations (each with its own ``id``, ``sig``, ``kid``
+        and ``offset``) are kept under ``data.parts`` for verification.
 
         Args:
             conditions: List of condition dicts, each with:
@@ -176,6 +1431,10 @@ class InsumerAPIWrapper(BaseModel):
             format: Set to "jwt" to include a Wallet Auth by InsumerAPI token
                 (ES256-signed JWT) in the response. Verifiable by any standard
                 JWT library using JWKS at /.well-known/jwks.json. No additional cost.
+            use_cache: When the attestation cache is enabled
+                (``attest_cache_size``), set to False to skip the cache lookup
+                and request a fresh attestation. The fresh response replaces
+                the cached one.
 
         Returns:
             API response with verification results, ECDSA signature (``sig``),
@@ -193,49 +1452,73 @@ class InsumerAPIWrapper(BaseModel):
             accountProof, storageProof, storageHash, blockNumber, and
             mappingSlot fields.
         """
-        # v2 keys require agent-supplied quantities as decimal strings (preserving full
-        # precision, no float in signed bytes); v1 keys accept either. Coerce numbers to
-        # strings so the request works on any key. Other condition fields are untouched.
-        #   token_balance.threshold, ratio_to_amount.multiple/amount, ratio_to_supply.minFraction.
-        # NOTE: str() — NOT the builtin format(), which is shadowed by the `format` parameter.
-        _str_fields = {
-            "token_balance": ("threshold",),
-            "ratio_to_amount": ("multiple", "amount"),
-            "ratio_to_supply": ("minFraction",),
-        }
-        norm_conditions: list[dict[str, Any]] = []
-        for c in conditions:
-            if isinstance(c, dict):
-                fields = _str_fields.get(c.get("type"))
-                if fields:
-                    updates = {
-                        f: str(c[f])
-                        for f in fields
-                        if c.get(f) is not None and not isinstance(c[f], str)
-                    }
-                    if updates:
-                        c = {**c, **updates}
-            norm_conditions.append(c)
-        body: dict[str, Any] = {"conditions": norm_conditions}
-        if wallet:
-            body["wallet"] = wallet
-        if solana_wallet:
-            body["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            body["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            body["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            body["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            body["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            body["suiWallet"] = sui_wallet
+        body: dict[str, Any] = {"conditions": _normalize_conditions(conditions)}
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
         if proof:
             body["proof"] = proof
         if format:
             body["format"] = format
-        return self._post("/attest", body)
+        self._validated(body)
+        if len(body["conditions"]) <= ATTEST_MAX_CONDITIONS:
+            return self._attest_once(body, use_cache)
+        bodies = _split_attest_body(body)
+        workers = min(self.bulk_max_concurrency, len(bodies))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_in_context(lambda b: self._attest_once(b, use_cache)), bodies))
+        return _merge_attestations(parts)
+
+    def _attest_once(self, body: dict, use_cache: bool) -> dict:
+        if self._attest_cache is None:
+            return self._post("/attest", body)
+        key = cache_key(body)
+        if use_cache:
+            cached = self._cached_attestation(key)
+            if cached is not None:
+                return _from_cache(cached)
+        resp = self._post("/attest", body)
+        self._cache_attestation(key, resp)
+        return resp
+
+    def _cached_attestation(self, key: str) -> Optional[dict]:
+        cached = self._attest_cache.get(key) if self._attest_cache is not None else None
+        if cached is None and self._backend is not None:
+            cached = self._stored_attestation(key)
+        return cached
+
+    def _stored_attestation(self, key: str) -> Optional[dict]:
+        cached = self._backend.get("attest", self._attest_namespace_prefix() + key)
+        if cached is not None and self._attest_cache is not None:
+            expires_at = _attestation_expiry(cached)
+            if expires_at is not None:
+                self._attest_cache.set(key, cached, expires_at - self.attest_cache_margin)
+        return cached
+
+    def _cache_attestation(self, key: str, resp: dict, store: bool = True) -> bool:
+        """Keep ``resp`` in memory and, with ``store``, in the backend; False if not cacheable."""
+        expires_at = _attestation_expiry(resp)
+        if expires_at is None or self._attest_cache is None:
+            return False
+        self._attest_cache.set(key, resp, expires_at - self.attest_cache_margin)
+        if store and self._backend is not None:
+            self._store_attestation(key, resp)
+        return True
+
+    def _store_attestation(self, key: str, resp: dict) -> None:
+        self._backend.set(
+            "attest",
+            self._attest_namespace_prefix() + key,
+            resp,
+            _attestation_expiry(resp) - self.attest_cache_margin,
+        )
+
+    def attest_cache_stats(self) -> dict:
+        """Return attestation cache ``hits``, ``misses``, ``evictions`` and ``size``."""
+        if self._attest_cache is None:
+            return {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+        return self._attest_cache.stats()
 
     def wallet_trust(
         self,
@@ -280,22 +1563,25 @@ class InsumerAPIWrapper(BaseModel):
             and key ID (``kid``).
         """
         body: dict[str, Any] = {"wallet": wallet}
-        if solana_wallet:
-            body["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            body["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            body["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            body["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            body["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            body["suiWallet"] = sui_wallet
+        body.update(_wallet_fields(
+            None, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        self._validated(body)
+        if self._trust_coalescer is not None:
+            # The batch is sent for all of its callers; each takes its own share.
+            with unattributed():
+                result = self._trust_coalescer.submit(body, proof)
+            self._attribute_trust(result, proof)
+            return result
         if proof:
             body["proof"] = proof
         return self._post("/trust", body)
 
+    def _attribute_trust(self, result: dict, proof: Optional[str]) -> None:
+        if self._ledger is not None:
+            self._ledger.attribute(result, predict_cost("POST /trust", {"proof": proof}))
+
     def batch_wallet_trust(
         self,
         wallets: list[dict[str, Any]],
@@ -326,7 +1612,57 @@ class InsumerAPIWrapper(BaseModel):
         body: dict[str, Any] = {"wallets": wallets}
         if proof:
             body["proof"] = proof
-        return self._post("/trust/batch", body)
+        return self._post("/trust/batch", self._validated(body, max_wallets=BATCH_TRUST_MAX_WALLETS))
+
+    def bulk_wallet_trust(
+        self,
+        wallets: list[dict[str, Any]],
+        proof: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> dict:
+        """Generate wallet trust fact profiles for any number of wallets.
+
+        Splits ``wallets`` into chunks of 10, sends them to ``/trust/batch``
+        concurrently, and merges the responses into one response with the
+        same shape as ``batch_wallet_trust()``. Results keep the input order.
+        A chunk whose request fails outright, or is refused locally by the
+        credit budget or rate limiter, yields an error entry for each of its
+        wallets instead of failing the whole call.
+
+        Args:
+            wallets: List of wallet dicts, as for ``batch_wallet_trust()``.
+            proof: Set to ``"merkle"`` for EIP-1186 Merkle storage proofs.
+            max_concurrency: Maximum chunks in flight. Defaults to
+                ``bulk_max_concurrency``.
+
+        Returns:
+            Merged response with ``results``, ``summary`` (summed
+            requested/succeeded/failed counts), and ``meta`` (total
+            creditsCharged, lowest creditsRemaining seen).
+        """
+        chunks = [
+            wallets[i:i + BATCH_TRUST_MAX_WALLETS]
+            for i in range(0, len(wallets), BATCH_TRUST_MAX_WALLETS)
+        ]
+        if not chunks:
+            return _merge_batch_trust([], [])
+        self._validated({"wallets": wallets})
+
+        def send(chunk: list[dict[str, Any]]) -> Any:
+            try:
+                return self.batch_wallet_trust(chunk, proof=proof)
+            except (
+                requests.RequestException,
+                InsumerBudgetExceededError,
+                InsumerRateLimitError,
+                ValueError,
+            ) as e:
+                return e
+
+        workers = min(max_concurrency or self.bulk_max_concurrency, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(pool.map(_in_context(send), chunks))
+        return _merge_batch_trust(chunks, responses)
 
     def get_credits(self) -> dict:
         """Check verification credit balance for the API key."""
@@ -340,27 +1676,68 @@ class InsumerAPIWrapper(BaseModel):
         offset: int = 0,
     ) -> dict:
         """List merchants in the public directory. No authentication required."""
-        params: dict[str, Any] = {"limit": limit, "offset": offset}
-        if token:
-            params["token"] = token
-        if verified is not None:
-            params["verified"] = str(verified).lower()
-        resp = requests.get(
-            f"{BASE_URL}/merchants",
-            params=params,
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        if self.merchant_directory:
+            return self.get_merchant_directory().list_merchants(token, verified, limit, offset)
+        return self._swr_get("/merchants", _merchant_params(token, verified, limit, offset))
 
     def get_merchant(self, merchant_id: str) -> dict:
         """Get full public merchant profile with tier structures. No authentication required."""
-        resp = requests.get(
-            f"{BASE_URL}/merchants/{merchant_id}",
-            timeout=self.timeout,
+        if self.merchant_directory:
+            return self.get_merchant_directory().get_merchant(merchant_id)
+        return self._swr_get(f"/merchants/{merchant_id}")
+
+    def iter_merchants(
+        self,
+        token: Optional[str] = None,
+        verified: Optional[bool] = None,
+        page_size: int = MERCHANTS_MAX_PAGE,
+        prefetch: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """Iterate over every merchant in the public directory.
+
+        Pages are fetched ahead of the consumer, ``prefetch`` at a time, so
+        walking the directory costs about one round trip per ``prefetch``
+        pages instead of one per page.
+
+        Args:
+            token: Only merchants accepting this token symbol.
+            verified: Only merchants with this domain verification status.
+            page_size: Merchants per request (max 200).
+            prefetch: Pages in flight. Defaults to ``bulk_max_concurrency``.
+
+        Returns:
+            An iterator of merchant listings in directory order.
+        """
+        return iter_pages(
+            lambda offset: self._public_get(
+                "/merchants", _merchant_params(token, verified, page_size, offset)
+            ),
+            page_size,
+            prefetch or self.bulk_max_concurrency,
         )
-        resp.raise_for_status()
-        return resp.json()
+
+    def get_merchant_directory(self) -> MerchantDirectory:
+        """Return this wrapper's merchant directory snapshot, creating it on first use.
+
+        The snapshot loads the whole directory on its first lookup and then
+        refreshes every ``merchant_directory_refresh`` seconds on a daemon
+        thread, applying only the listings that changed.
+
+        Returns:
+            A :class:`~langchain_insumer.directory.MerchantDirectory`.
+        """
+        with self._registry_lock:
+            if self._merchant_directory is None:
+                self._merchant_directory = MerchantDirectory(
+                    self.iter_merchants,
+                    self._fetch_profile,
+                    self.aiter_merchants,
+                    self._afetch_profile,
+                    refresh_interval=self.merchant_directory_refresh,
+                    on_change=self._forget_profile,
+                )
+                self._merchant_directory.start()
+        return self._merchant_directory
 
     def list_tokens(
         self,
@@ -369,6 +1746,8 @@ class InsumerAPIWrapper(BaseModel):
         asset_type: Optional[str] = None,
     ) -> dict:
         """List registered tokens and NFT collections. No authentication required."""
+        if self.token_registry:
+            return self.get_token_registry().list_tokens(chain, symbol, asset_type)
         params: dict[str, Any] = {}
         if chain is not None:
             params["chain"] = chain
@@ -376,13 +1755,33 @@ class InsumerAPIWrapper(BaseModel):
             params["symbol"] = symbol
         if asset_type:
             params["type"] = asset_type
-        resp = requests.get(
-            f"{BASE_URL}/tokens",
-            params=params,
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return self._swr_get("/tokens", params)
+
+    def get_token_registry(self) -> TokenRegistry:
+        """Return this wrapper's token registry, creating it on first use.
+
+        The registry loads the full ``/tokens`` list on its first lookup and
+        then refreshes every ``token_registry_refresh`` seconds on a daemon
+        thread, so symbol and contract lookups are answered from memory::
+
+            usdc = api.get_token_registry().resolve(1, "USDC")
+            usdc["contractAddress"], usdc["decimals"]
+
+        Returns:
+            A :class:`~langchain_insumer.registry.TokenRegistry`.
+        """
+        with self._registry_lock:
+            if self._token_registry is None:
+                self._token_registry = TokenRegistry(
+                    self._fetch_tokens,
+                    self._afetch_tokens,
+                    refresh_interval=self.token_registry_refresh,
+                )
+                stored = self._backend.get("tokens", "all") if self._backend else None
+                if stored is not None:
+                    self._token_registry.load(stored)
+                self._token_registry.start()
+        return self._token_registry
 
     def check_discount(
         self,
@@ -397,27 +1796,11 @@ class InsumerAPIWrapper(BaseModel):
     ) -> dict:
         """Calculate discount for a wallet at a merchant. No authentication required. Free, no credits consumed."""
         params: dict[str, Any] = {"merchant": merchant_id}
-        if wallet:
-            params["wallet"] = wallet
-        if solana_wallet:
-            params["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            params["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            params["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            params["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            params["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            params["suiWallet"] = sui_wallet
-        resp = requests.get(
-            f"{BASE_URL}/discount/check",
-            params=params,
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        params.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        return self._public_get("/discount/check", self._validated(params))
 
     def verify(
         self,
@@ -432,21 +1815,11 @@ class InsumerAPIWrapper(BaseModel):
     ) -> dict:
         """Create a signed discount code (INSR-XXXXX), valid 30 minutes. Costs 1 credit."""
         body: dict[str, Any] = {"merchantId": merchant_id}
-        if wallet:
-            body["wallet"] = wallet
-        if solana_wallet:
-            body["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            body["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            body["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            body["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            body["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            body["suiWallet"] = sui_wallet
-        return self._post("/verify", body)
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        return self._post("/verify", self._validated(body))
 
     def buy_key(
         self,
@@ -478,7 +1851,11 @@ class InsumerAPIWrapper(BaseModel):
         }
         if update_wallet:
             body["updateWallet"] = True
-        return self._post("/credits/buy", body)
+        result = self._post("/credits/buy", body)
+        if self._key_pool is not None:
+            # Whichever key was topped up can take writes again.
+            self._key_pool.reset_credits()
+        return result
 
     def confirm_payment(
         self,
@@ -612,23 +1989,13 @@ class InsumerAPIWrapper(BaseModel):
             coupon objects, and ECDSA-signed verification block.
         """
         body: dict[str, Any] = {"merchantId": merchant_id}
-        if wallet:
-            body["wallet"] = wallet
-        if solana_wallet:
-            body["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            body["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            body["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            body["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            body["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            body["suiWallet"] = sui_wallet
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
         if items is not None:
             body["items"] = items
-        return self._post("/acp/discount", body)
+        return self._post("/acp/discount", self._validated(body))
 
     def ucp_discount(
         self,
@@ -665,23 +2032,13 @@ class InsumerAPIWrapper(BaseModel):
             and ECDSA-signed verification block.
         """
         body: dict[str, Any] = {"merchantId": merchant_id}
-        if wallet:
-            body["wallet"] = wallet
-        if solana_wallet:
-            body["solanaWallet"] = solana_wallet
-        if xrpl_wallet:
-            body["xrplWallet"] = xrpl_wallet
-        if bitcoin_wallet:
-            body["bitcoinWallet"] = bitcoin_wallet
-        if tron_wallet:
-            body["tronWallet"] = tron_wallet
-        if stellar_wallet:
-            body["stellarWallet"] = stellar_wallet
-        if sui_wallet:
-            body["suiWallet"] = sui_wallet
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
         if items is not None:
             body["items"] = items
-        return self._post("/ucp/discount", body)
+        return self._post("/ucp/discount", self._validated(body))
 
     def request_domain_verification(
         self,
@@ -736,9 +2093,447 @@ class InsumerAPIWrapper(BaseModel):
             Validation result with ``valid`` (bool), ``code``, and either
             merchant/discount details (if valid) or ``reason`` (if invalid).
         """
-        resp = requests.get(
-            f"{BASE_URL}/codes/{code}",
-            timeout=self.timeout,
+        return self._public_get(f"/codes/{code}")
+
+    # -- Async API -----------------------------------------------------------
+    # Coroutine counterparts of the methods above. Same arguments, same
+    # request bodies, same return values; see the sync method for details.
+
+    async def aget_jwks(self) -> dict:
+        """Async version of :meth:`get_jwks`."""
+        if self._jwks_cache is not None:
+            return await self._jwks_cache.aget_jwks()
+        return await self._apublic_get("/jwks")
+
+    async def aget_signing_key(self, kid: str) -> Optional[dict]:
+        """Async version of :meth:`get_signing_key`."""
+        if self._jwks_cache is not None:
+            return await self._jwks_cache.aget_key(kid)
+        for jwk in _keys_of(await self._apublic_get("/jwks")):
+            if jwk.get("kid") == kid:
+                return jwk
+        return None
+
+    async def aget_compliance_templates(self) -> dict:
+        """Async version of :meth:`get_compliance_templates`."""
+        return await self._aswr_get("/compliance/templates")
+
+    async def aattest(
+        self,
+        conditions: list[dict[str, Any]],
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        proof: Optional[str] = None,
+        format: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> dict:
+        """Async version of :meth:`attest`."""
+        body: dict[str, Any] = {"conditions": _normalize_conditions(conditions)}
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        if proof:
+            body["proof"] = proof
+        if format:
+            body["format"] = format
+        self._validated(body)
+        if len(body["conditions"]) <= ATTEST_MAX_CONDITIONS:
+            return await self._aattest_once(body, use_cache)
+        semaphore = asyncio.Semaphore(self.bulk_max_concurrency)
+
+        async def send(sub_body: dict) -> dict:
+            async with semaphore:
+                return await self._aattest_once(sub_body, use_cache)
+
+        parts = await asyncio.gather(*(send(b) for b in _split_attest_body(body)))
+        return _merge_attestations(list(parts))
+
+    async def _aattest_once(self, body: dict, use_cache: bool) -> dict:
+        if self._attest_cache is None:
+            return await self._apost("/attest", body)
+        # Backend reads and writes (SQLite file I/O) run off the event loop.
+        loop = asyncio.get_running_loop()
+        key = cache_key(body)
+        if use_cache:
+            cached = self._attest_cache.get(key)
+            if cached is None and self._backend is not None:
+                cached = await loop.run_in_executor(None, self._stored_attestation, key)
+            if cached is not None:
+                return _from_cache(cached)
+        resp = await self._apost("/attest", body)
+        if self._cache_attestation(key, resp, store=False) and self._backend is not None:
+            await loop.run_in_executor(None, self._store_attestation, key, resp)
+        return resp
+
+    async def awallet_trust(
+        self,
+        wallet: str,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        proof: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`wallet_trust`."""
+        body: dict[str, Any] = {"wallet": wallet}
+        body.update(_wallet_fields(
+            None, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        self._validated(body)
+        if self._atrust_coalescer is not None:
+            with unattributed():
+                result = await self._atrust_coalescer.submit(body, proof)
+            self._attribute_trust(result, proof)
+            return result
+        if proof:
+            body["proof"] = proof
+        return await self._apost("/trust", body)
+
+    async def abatch_wallet_trust(
+        self,
+        wallets: list[dict[str, Any]],
+        proof: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`batch_wallet_trust`."""
+        body: dict[str, Any] = {"wallets": wallets}
+        if proof:
+            body["proof"] = proof
+        return await self._apost(
+            "/trust/batch", self._validated(body, max_wallets=BATCH_TRUST_MAX_WALLETS)
         )
-        resp.raise_for_status()
-        return resp.json()
+
+    async def abulk_wallet_trust(
+        self,
+        wallets: list[dict[str, Any]],
+        proof: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> dict:
+        """Async version of :meth:`bulk_wallet_trust`."""
+        import httpx
+
+        if wallets:
+            self._validated({"wallets": wallets})
+        chunks = [
+            wallets[i:i + BATCH_TRUST_MAX_WALLETS]
+            for i in range(0, len(wallets), BATCH_TRUST_MAX_WALLETS)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency or self.bulk_max_concurrency)
+
+        async def send(chunk: list[dict[str, Any]]) -> Any:
+            async with semaphore:
+                try:
+                    return await self.abatch_wallet_trust(chunk, proof=proof)
+                except (
+                    httpx.HTTPError,
+                    InsumerAPIError,
+                    InsumerBudgetExceededError,
+                    InsumerRateLimitError,
+                    ValueError,
+                ) as e:
+                    return e
+
+        responses = await asyncio.gather(*(send(c) for c in chunks))
+        return _merge_batch_trust(chunks, list(responses))
+
+    async def aget_credits(self) -> dict:
+        """Async version of :meth:`get_credits`."""
+        return await self._aget("/credits")
+
+    async def alist_merchants(
+        self,
+        token: Optional[str] = None,
+        verified: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> dict:
+        """Async version of :meth:`list_merchants`."""
+        if self.merchant_directory:
+            directory = self.get_merchant_directory()
+            await directory._aensure_loaded()
+            return directory.list_merchants(token, verified, limit, offset)
+        params = _merchant_params(token, verified, limit, offset)
+        return await self._aswr_get("/merchants", params)
+
+    async def aget_merchant(self, merchant_id: str) -> dict:
+        """Async version of :meth:`get_merchant`."""
+        if self.merchant_directory:
+            return await self.get_merchant_directory().aget_merchant(merchant_id)
+        return await self._aswr_get(f"/merchants/{merchant_id}")
+
+    def aiter_merchants(
+        self,
+        token: Optional[str] = None,
+        verified: Optional[bool] = None,
+        page_size: int = MERCHANTS_MAX_PAGE,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """Async version of :meth:`iter_merchants`, for use with ``async for``."""
+        return aiter_pages(
+            lambda offset: self._apublic_get(
+                "/merchants", _merchant_params(token, verified, page_size, offset)
+            ),
+            page_size,
+            prefetch or self.bulk_max_concurrency,
+        )
+
+    async def alist_tokens(
+        self,
+        chain: Optional[Any] = None,
+        symbol: Optional[str] = None,
+        asset_type: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`list_tokens`."""
+        if self.token_registry:
+            registry = self.get_token_registry()
+            if not registry.loaded:
+                await registry.aload()
+            return registry.list_tokens(chain, symbol, asset_type)
+        params: dict[str, Any] = {}
+        if chain is not None:
+            params["chain"] = chain
+        if symbol:
+            params["symbol"] = symbol
+        if asset_type:
+            params["type"] = asset_type
+        return await self._aswr_get("/tokens", params)
+
+    async def acheck_discount(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`check_discount`."""
+        params: dict[str, Any] = {"merchant": merchant_id}
+        params.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        return await self._apublic_get("/discount/check", self._validated(params))
+
+    async def averify(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`verify`."""
+        body: dict[str, Any] = {"merchantId": merchant_id}
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        return await self._apost("/verify", self._validated(body))
+
+    async def abuy_key(
+        self,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        app_name: str,
+    ) -> dict:
+        """Async version of :meth:`buy_key`."""
+        return await self._apublic_post("/keys/buy", {
+            "txHash": tx_hash,
+            "chainId": chain_id,
+            "amount": amount,
+            "appName": app_name,
+        })
+
+    async def abuy_credits(
+        self,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        update_wallet: bool = False,
+    ) -> dict:
+        """Async version of :meth:`buy_credits`."""
+        body: dict = {
+            "txHash": tx_hash,
+            "chainId": chain_id,
+            "amount": amount,
+        }
+        if update_wallet:
+            body["updateWallet"] = True
+        result = await self._apost("/credits/buy", body)
+        if self._key_pool is not None:
+            self._key_pool.reset_credits()
+        return result
+
+    async def aconfirm_payment(
+        self,
+        code: str,
+        tx_hash: str,
+        chain_id: Any,
+        amount: Any,
+    ) -> dict:
+        """Async version of :meth:`confirm_payment`."""
+        return await self._apost("/payment/confirm", {
+            "code": code,
+            "txHash": tx_hash,
+            "chainId": chain_id,
+            "amount": amount,
+        })
+
+    async def acreate_merchant(
+        self,
+        company_name: str,
+        company_id: str,
+        location: Optional[str] = None,
+    ) -> dict:
+        """Async version of :meth:`create_merchant`."""
+        body: dict[str, Any] = {
+            "companyName": company_name,
+            "companyId": company_id,
+        }
+        if location:
+            body["location"] = location
+        return await self._apost("/merchants", body)
+
+    async def aget_merchant_status(self, merchant_id: str) -> dict:
+        """Async version of :meth:`get_merchant_status`."""
+        return await self._aget(f"/merchants/{merchant_id}/status")
+
+    async def aconfigure_tokens(
+        self,
+        merchant_id: str,
+        own_token: Optional[dict] = None,
+        partner_tokens: Optional[list] = None,
+    ) -> dict:
+        """Async version of :meth:`configure_tokens`."""
+        body: dict[str, Any] = {}
+        if own_token is not None:
+            body["ownToken"] = own_token
+        if partner_tokens is not None:
+            body["partnerTokens"] = partner_tokens
+        return await self._aput(f"/merchants/{merchant_id}/tokens", body)
+
+    async def aconfigure_nfts(
+        self,
+        merchant_id: str,
+        nft_collections: list,
+    ) -> dict:
+        """Async version of :meth:`configure_nfts`."""
+        return await self._aput(f"/merchants/{merchant_id}/nfts", {
+            "nftCollections": nft_collections,
+        })
+
+    async def aconfigure_settings(
+        self,
+        merchant_id: str,
+        discount_mode: Optional[str] = None,
+        discount_cap: Optional[int] = None,
+        usdc_payment: Optional[dict] = None,
+    ) -> dict:
+        """Async version of :meth:`configure_settings`."""
+        body: dict[str, Any] = {}
+        if discount_mode is not None:
+            body["discountMode"] = discount_mode
+        if discount_cap is not None:
+            body["discountCap"] = discount_cap
+        if usdc_payment is not None:
+            body["usdcPayment"] = usdc_payment
+        return await self._aput(f"/merchants/{merchant_id}/settings", body)
+
+    async def apublish_directory(self, merchant_id: str) -> dict:
+        """Async version of :meth:`publish_directory`."""
+        return await self._apost(f"/merchants/{merchant_id}/directory", {})
+
+    async def abuy_merchant_credits(
+        self,
+        merchant_id: str,
+        tx_hash: str,
+        chain_id: Any,
+        amount: float,
+        update_wallet: bool = False,
+    ) -> dict:
+        """Async version of :meth:`buy_merchant_credits`."""
+        body: dict = {
+            "txHash": tx_hash,
+            "chainId": chain_id,
+            "amount": amount,
+        }
+        if update_wallet:
+            body["updateWallet"] = True
+        return await self._apost(f"/merchants/{merchant_id}/credits", body)
+
+    async def aacp_discount(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        items: Optional[list] = None,
+    ) -> dict:
+        """Async version of :meth:`acp_discount`."""
+        body: dict[str, Any] = {"merchantId": merchant_id}
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        if items is not None:
+            body["items"] = items
+        return await self._apost("/acp/discount", self._validated(body))
+
+    async def aucp_discount(
+        self,
+        merchant_id: str,
+        wallet: Optional[str] = None,
+        solana_wallet: Optional[str] = None,
+        xrpl_wallet: Optional[str] = None,
+        bitcoin_wallet: Optional[str] = None,
+        tron_wallet: Optional[str] = None,
+        stellar_wallet: Optional[str] = None,
+        sui_wallet: Optional[str] = None,
+        items: Optional[list] = None,
+    ) -> dict:
+        """Async version of :meth:`ucp_discount`."""
+        body: dict[str, Any] = {"merchantId": merchant_id}
+        body.update(_wallet_fields(
+            wallet, solana_wallet, xrpl_wallet, bitcoin_wallet,
+            tron_wallet, stellar_wallet, sui_wallet,
+        ))
+        if items is not None:
+            body["items"] = items
+        return await self._apost("/ucp/discount", self._validated(body))
+
+    async def arequest_domain_verification(
+        self,
+        merchant_id: str,
+        domain: str,
+    ) -> dict:
+        """Async version of :meth:`request_domain_verification`."""
+        return await self._apost(f"/merchants/{merchant_id}/domain-verification", {
+            "domain": domain,
+        })
+
+    async def averify_domain(self, merchant_id: str) -> dict:
+        """Async version of :meth:`verify_domain`."""
+        return await self._aput(f"/merchants/{merchant_id}/domain-verification")
+
+    async def avalidate_code(self, code: str) -> dict:
+        """Async version of :meth:`validate_code`."""
+        return await self._apublic_get(f"/codes/{code}")
@@ -0,0 +1,203 @@
+"""Tests for shared cache backends."""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper
+from langchain_insumer.backends import CacheBackend, MemoryBackend, SQLiteBackend
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+CONDITION = {"type": "token_balance", "contractAddress": "0xA0b8", "chainId": 1, "threshold": "100"}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend(max_entries=3)
+    else:
+        backend = SQLiteBackend(tmp_path / "cache.db", max_entries=3, touch_interval=0)
+        yield backend
+        backend.close()
+
+
+def test_get_set_expiry_and_namespaces(backend):
+    backend.set("a", "k", {"v": 1})
+    backend.set("b", "k", [1, 2], expires_at=time.time() + 60)
+    backend.set("b", "old", "x", expires_at=time.time() - 1)
+    assert backend.get("a", "k") == {"v": 1}
+    assert backend.get("b", "k") == [1, 2]
+    assert backend.get("b", "old") is None
+    assert [key for key, _, _ in backend.items("b")] == ["k"]
+    backend.clear("b")
+    assert backend.get("b", "k") is None
+    assert backend.get("a", "k") == {"v": 1}
+
+
+def test_size_bounded_eviction(backend):
+    for i in range(3):
+        backend.set("ns", str(i), i)
+        time.sleep(0.01)
+    backend.get("ns", "0")  # most recently read survives
+    backend.set("ns", "3", 3)
+    assert backend.get("ns", "1") is None
+    assert {key for key, _, _ in backend.items("ns")} == {"0", "2", "3"}
+
+
+def test_sqlite_reads_do_not_write(tmp_path):
+    backend = SQLiteBackend(tmp_path / "cache.db", max_entries=100)
+    for i in range(20):
+        backend.set("ns", str(i), i)
+    conn = backend._conn()
+    changes = conn.total_changes
+    assert [backend.get("ns", str(i)) for i in range(20)] == list(range(20))
+    assert conn.total_changes == changes
+
+    for i in range(20, 120):
+        backend.set("ns", str(i), i)
+    assert len(backend) <= 100
+    backend.close()
+
+
+def test_incomplete_backend_fails_on_construction():
+    class GetOnly(CacheBackend):
+        def get(self, namespace, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_sqlite_shared_across_processes(tmp_path):
+    path = tmp_path / "shared.db"
+    code = (
+        "from langchain_insumer.backends import SQLiteBackend; "
+        f"SQLiteBackend({str(path)!r}).set('jwks', 'document', {{'keys': ['k1']}})"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    backend = SQLiteBackend(path)
+    assert backend.get("jwks", "document") == {"keys": ["k1"]}
+    assert backend._conn().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def _attest_response():
+    expires = datetime.now(timezone.utc) + timedelta(minutes=30)
+    resp = MagicMock()
+    resp.json.return_value = {
+        "ok": True,
+        "data": {
+            "attestation": {"id": "ATST-1", "pass": True, "expiresAt": expires.isoformat()},
+            "sig": "sig",
+            "kid": "insumer-attest-v1",
+        },
+    }
+    return resp
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_workers_share_attestations_and_jwks(mock_request, tmp_path):
+    path = str(tmp_path / "insumer.db")
+    jwks = MagicMock()
+    jwks.json.return_value = {"keys": [{"kid": "insumer-attest-v1"}]}
+    jwks.headers = {"Cache-Control": "max-age=3600"}
+
+    mock_request.side_effect = [_attest_response(), jwks]
+    first = InsumerAPIWrapper(api_key=KEY, attest_cache_size=10, cache_backend=path)
+    first.attest(wallet="0xabc", conditions=[CONDITION])
+    first.get_jwks()
+    first.close()
+
+    # A new worker (or a restarted one) starts warm from the same file.
+    second = InsumerAPIWrapper(api_key=KEY, attest_cache_size=10, cache_backend=path)
+    assert second.warm_start() == {"jwks": 1, "tokens": 0, "attestations": 1}
+    assert second.attest(wallet="0xabc", conditions=[CONDITION])["data"]["attestation"]["id"] == "ATST-1"
+    assert second.get_signing_key("insumer-attest-v1") == {"kid": "insumer-attest-v1"}
+    assert mock_request.call_count == 2
+
+    # Attestations are not shared with a different API key.
+    mock_request.side_effect = [_attest_response()]
+    other = InsumerAPIWrapper(
+        api_key="insr_live_1111111111111111111111111111111111111111",
+        attest_cache_size=10,
+        cache_backend=path,
+    )
+    other.attest(wallet="0xabc", conditions=[CONDITION])
+    assert mock_request.call_count == 3
+    second.close()
+    other.close()
+
+
+class ThreadRecordingBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, namespace, key):
+        self.threads.append(threading.current_thread())
+        return super().get(namespace, key)
+
+    def set(self, namespace, key, value, expires_at=None):
+        self.threads.append(threading.current_thread())
+        super().set(namespace, key, value, expires_at)
+
+
+def test_async_calls_keep_backend_io_off_the_loop():
+    backend = ThreadRecordingBackend()
+    api = InsumerAPIWrapper(api_key=KEY, attest_cache_size=10, cache_backend=backend)
+    resp = MagicMock(is_success=True, status_code=200, headers={})
+    resp.json.return_value = _attest_response().json.return_value
+
+    async def run():
+        backend.threads.clear()  # warm start reads on construction are sync
+        with patch("httpx.AsyncClient.request", return_value=resp):
+            await api.aattest(wallet="0xabc", conditions=[CONDITION])
+        api._attest_cache.clear()
+        cached = await api.aattest(wallet="0xabc", conditions=[CONDITION])
+        await api.aclose()
+        return cached
+
+    cached = asyncio.run(run())
+    assert cached["meta"]["cached"] is True
+    assert len(backend.threads) == 3  # miss, store, hit
+    assert threading.main_thread() not in backend.threads
+
+
+def test_token_registry_and_profiles_warm_start():
+    backend = MemoryBackend()
+    tokens = {"ok": True, "data": [{"symbol": "USDC", "chainId": 1, "contractAddress": "0xa0b8"}]}
+    profile = {"ok": True, "data": {"id": "m_1", "tiers": []}}
+    listing = {"ok": True, "data": [{"id": "m_1", "tokens": ["UNI"]}]}
+
+    def fake_get(path, params=None):
+        return {"/tokens": tokens, "/merchants": listing, "/merchants/m_1": profile}[path]
+
+    first = InsumerAPIWrapper(
+        api_key=KEY, token_registry=True, merchant_directory=True, cache_backend=backend
+    )
+    with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake_get):
+        first.list_tokens(chain=1)
+        first.get_merchant("m_1")
+    first.close()
+
+    second = InsumerAPIWrapper(
+        api_key=KEY, token_registry=True, merchant_directory=True, cache_backend=backend
+    )
+    with patch.object(InsumerAPIWrapper, "_public_get", side_effect=AssertionError("network")):
+        assert second.get_token_registry().resolve(1, "USDC")["contractAddress"] == "0xa0b8"
+        assert second.get_merchant_directory().fetch_profile("m_1") == profile
+    second.close()
+
+    # A changed listing drops the shared profile copy as well.
+    directory = first.get_merchant_directory()
+    changed = {"ok": True, "data": [{"id": "m_1", "tokens": ["PEPE"]}]}
+    with patch.object(InsumerAPIWrapper, "_public_get", return_value=changed):
+        directory.refresh()
+    assert backend.get("merchant", "m_1") is None
+    first.close()
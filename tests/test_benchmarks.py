@@ -0,0 +1,78 @@
+"""Tests for the benchmark suite and its stub server."""
+
+import json
+
+import pytest
+import requests
+
+from benchmarks.run import MODES, compare, main, percentile, run_benchmarks
+from benchmarks.stub import StubServer
+
+
+def test_stub_serves_api_shapes_and_injects_errors():
+    with StubServer(latency=0.0, error_rate=0.5, error_status=429, seed=1) as stub:
+        statuses = [requests.get(f"{stub.base_url}/tokens").status_code for _ in range(20)]
+        stub.error_rate = 0.0
+        body = requests.post(
+            f"{stub.base_url}/trust/batch", json={"wallets": [{"wallet": "0x1"}] * 3}
+        ).json()
+        assert stub.counts() == {"GET /tokens": 20, "POST /trust/batch": 1}
+    assert set(statuses) == {200, 429}
+    assert body["meta"]["creditsCharged"] == 9
+    assert body["data"]["summary"]["succeeded"] == 3
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) is None
+
+
+def test_every_mode_reports_throughput_and_latency():
+    report = run_benchmarks(
+        scenarios=["attest", "tokens"], requests=12, concurrency=4, latency=0.002, jitter=0.001
+    )
+    assert json.loads(json.dumps(report)) == report
+    assert [(r["scenario"], r["mode"]) for r in report["results"]] == [
+        (s, m) for s in ("attest", "tokens") for m in MODES
+    ]
+    for result in report["results"]:
+        assert result["requests"] == 12
+        assert result["errors"] == 0
+        # Singleflight is off, so every call and the warm-up reach the stub.
+        assert result["server_requests"] == 13
+        assert result["throughput"] > 0
+        assert 2 <= result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+
+
+def test_injected_errors_are_counted():
+    report = run_benchmarks(
+        scenarios=["trust"], modes=["threaded"], requests=40, latency=0.0, error_rate=0.5
+    )
+    (result,) = report["results"]
+    assert 0 < result["errors"] < 40
+
+
+def test_compare_flags_regressions(tmp_path, capsys):
+    def report(throughput, p99, scenario="trust", mode="async"):
+        latency = {"mean": 10.0, "p50": 10.0, "p99": p99, "max": p99}
+        result = {"scenario": scenario, "mode": mode, "throughput": throughput, "latency_ms": latency}
+        return {"results": [result]}
+
+    assert compare(report(100.0, 20.0), report(95.0, 21.0)) == []
+    assert compare(report(100.0, 20.0), report(80.0, 30.0)) == [
+        "trust/async: throughput 100.0 -> 80.0/s",
+        "trust/async: p99 20.0 -> 30.0 ms",
+    ]
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report(1e9, 10.0, "templates", "sync")))
+    out = tmp_path / "out.json"
+    args = ["--scenarios", "templates", "--modes", "sync", "--requests", "3", "--latency", "0"]
+    assert main(args + ["--output", str(out), "--baseline", str(baseline)]) == 1
+    assert json.loads(out.read_text())["results"][0]["scenario"] == "templates"
+    assert "REGRESSION templates/sync: throughput" in capsys.readouterr().err
+    with pytest.raises(ValueError):
+        run_benchmarks(scenarios=["nope"])
@@ -0,0 +1,225 @@
+"""Tests for the credit ledger and budget enforcement."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper, InsumerBudgetExceededError, InsumerWalletTrustTool
+from langchain_insumer.credits import CreditLedger, credit_tag, predict_cost
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+WALLET = "0x" + "ab" * 20
+
+
+def _trust_response(charged=3, remaining=None) -> MagicMock:
+    body = {"ok": True, "data": {"trust": {"id": "TRST-1"}}, "meta": {"creditsCharged": charged}}
+    if remaining is not None:
+        body["meta"]["creditsRemaining"] = remaining
+    resp = MagicMock(ok=True, status_code=200)
+    resp.json.return_value = body
+    return resp
+
+
+def test_predict_cost():
+    assert predict_cost("POST /attest", {"conditions": []}) == 1
+    assert predict_cost("POST /attest", {"proof": "merkle"}) == 2
+    assert predict_cost("POST /trust", {"wallet": WALLET}) == 3
+    assert predict_cost("POST /trust", {"wallet": WALLET, "proof": "merkle"}) == 6
+    assert predict_cost("POST /trust/batch", {"wallets": [{}] * 4}) == 12
+    assert predict_cost("POST /trust/batch", {"wallets": [{}] * 4, "proof": "merkle"}) == 24
+    assert predict_cost("POST /verify", {}) == 1
+    assert predict_cost("POST /acp/discount", {}) == 1
+    assert predict_cost("POST /ucp/discount", {}) == 1
+    assert predict_cost("GET /credits", None) == 0
+
+
+def test_reservations_settle_to_what_was_charged():
+    ledger = CreditLedger(budget=5)
+    first = ledger.reserve("POST /trust", 3)
+    with pytest.raises(InsumerBudgetExceededError) as excinfo:
+        ledger.reserve("POST /trust", 3)
+    assert (excinfo.value.cost, excinfo.value.available, excinfo.value.reason) == (3, 2, "budget")
+    # rpc_failure: nothing charged, the reservation is released.
+    ledger.settle(first, {"ok": False, "error": {"code": "rpc_failure"}})
+    second = ledger.reserve("POST /trust", 3)
+    ledger.settle(second, {"ok": True, "meta": {"creditsCharged": 3, "creditsRemaining": 4}})
+    stats = ledger.stats()
+    assert (stats["spent"], stats["reserved"], stats["available"], stats["balance"]) == (3, 0, 2, 4)
+    assert stats["refused"] == 1
+    assert stats["by_endpoint"] == {"POST /trust": {"calls": 2, "credits": 3}}
+
+    # The key's last known balance applies even without a budget.
+    unlimited = CreditLedger()
+    unlimited.settle(unlimited.reserve("POST /attest", 1), {"ok": True, "meta": {"creditsRemaining": 2}})
+    with pytest.raises(InsumerBudgetExceededError, match="balance"):
+        unlimited.reserve("POST /trust", 3)
+
+
+def test_windowed_budget_queues_until_spend_ages_out():
+    ledger = CreditLedger(budget=3, window=0.2, wait=2.0)
+    ledger.settle(ledger.reserve("POST /trust", 3), {"ok": True})
+    start = time.monotonic()
+    ledger.reserve("POST /trust", 3)
+    assert 0.15 < time.monotonic() - start < 1.5
+
+    impatient = CreditLedger(budget=1, wait=0.05)
+    impatient.reserve("POST /verify", 1)
+    with pytest.raises(InsumerBudgetExceededError):
+        impatient.reserve("POST /verify", 1)
+
+
+def test_queued_call_proceeds_when_in_flight_settles_for_less():
+    ledger = CreditLedger(budget=6, wait=2.0)
+    in_flight = ledger.reserve("POST /trust/batch", 6)
+    timer = threading.Timer(0.1, ledger.settle, (in_flight, {"ok": True, "meta": {"creditsCharged": 3}}))
+    timer.start()
+    ledger.reserve("POST /trust", 3)
+    timer.join()
+    assert ledger.stats()["spent"] == 3
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_merchant_credits_are_a_separate_pool(mock_request):
+    discount = MagicMock(ok=True, status_code=200)
+    discount.json.return_value = {"ok": True, "meta": {"creditsCharged": 1, "creditsRemaining": 0}}
+    mock_request.side_effect = [discount, _trust_response(remaining=40)]
+    api = InsumerAPIWrapper(api_key=KEY, credit_ledger=True)
+    api.acp_discount(merchant_id="acme", wallet=WALLET)
+    # The merchant ran dry; the API key's own credits are untouched.
+    api.wallet_trust(wallet=WALLET)
+    with pytest.raises(InsumerBudgetExceededError, match="balance"):
+        api.ucp_discount(merchant_id="acme", wallet=WALLET)
+    assert mock_request.call_count == 2
+    stats = api.credit_stats()
+    assert stats["balance"] == 40
+    assert stats["balances"] == {"merchant:acme": 0, "key": 40}
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_wrapper_refuses_without_sending(mock_request):
+    mock_request.return_value = _trust_response()
+    api = InsumerAPIWrapper(api_key=KEY, credit_budget=7)
+    with credit_tag("user-42"):
+        api.wallet_trust(wallet=WALLET)
+    tool = InsumerWalletTrustTool(api_wrapper=api)
+    tool.invoke({"wallet": WALLET}, config={"metadata": {"credit_tag": "user-7"}})
+    with pytest.raises(InsumerBudgetExceededError):
+        api.wallet_trust(wallet=WALLET)
+    assert mock_request.call_count == 2
+    api.get_credits()  # free endpoints are never refused
+
+    stats = api.credit_stats()
+    assert stats["spent"] == 6
+    assert stats["by_tag"] == {"user-42": {"calls": 1, "credits": 3}, "user-7": {"calls": 1, "credits": 3}}
+    assert stats["by_tool"] == {"insumer_wallet_trust": {"calls": 1, "credits": 3}}
+    assert InsumerAPIWrapper(api_key=KEY).credit_stats() == {}
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_budget_holds_under_concurrency(mock_request):
+    mock_request.side_effect = lambda *a, **kw: (time.sleep(0.01), _trust_response())[1]
+    api = InsumerAPIWrapper(api_key=KEY, credit_budget=30)
+
+    def call(_):
+        try:
+            return api.wallet_trust(wallet=WALLET)
+        except InsumerBudgetExceededError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(call, range(20)))
+    assert sum(r is not None for r in results) == 10
+    assert mock_request.call_count == 10
+    assert api.credit_stats()["spent"] == 30
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_bulk_chunks_keep_the_caller_tag(mock_request):
+    def reply(method, url, **kwargs):
+        wallets = kwargs["json"]["wallets"]
+        resp = MagicMock(ok=True, status_code=200)
+        resp.json.return_value = {
+            "ok": True,
+            "data": {"results": [{"ok": True}] * len(wallets)},
+            "meta": {"creditsCharged": 3 * len(wallets)},
+        }
+        return resp
+
+    mock_request.side_effect = reply
+    api = InsumerAPIWrapper(api_key=KEY, credit_ledger=True)
+    with credit_tag("batch-job"):
+        api.bulk_wallet_trust([{"wallet": WALLET}] * 25)
+    assert api.credit_stats()["by_tag"] == {"batch-job": {"calls": 3, "credits": 75}}
+
+
+def _batch_reply(method, url, **kwargs):
+    wallets = kwargs["json"]["wallets"]
+    resp = MagicMock(ok=True, status_code=200)
+    resp.json.return_value = {
+        "ok": True,
+        "data": {"results": [{"trust": {"wallet": w["wallet"]}} for w in wallets]},
+        "meta": {"creditsCharged": 3 * len(wallets)},
+    }
+    return resp
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request", side_effect=_batch_reply)
+def test_coalesced_calls_bill_each_caller(mock_request):
+    api = InsumerAPIWrapper(api_key=KEY, credit_ledger=True, trust_coalesce_window_ms=100)
+    tags = ["user-1", "user-2", "user-3"]
+
+    def call(tag):
+        with credit_tag(tag):
+            return api.wallet_trust(wallet=WALLET)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(call, tags))
+    assert mock_request.call_count == 1
+    stats = api.credit_stats()
+    assert stats["spent"] == 9
+    assert stats["by_endpoint"] == {"POST /trust/batch": {"calls": 1, "credits": 9}}
+    assert stats["by_tag"] == {tag: {"calls": 1, "credits": 3} for tag in tags}
+
+
+def test_async_coalesced_calls_bill_each_caller():
+    api = InsumerAPIWrapper(api_key=KEY, credit_ledger=True, trust_coalesce_window_ms=50)
+
+    def reply(method, url, **kwargs):
+        sent = _batch_reply(method, url, **kwargs)
+        resp = MagicMock(is_success=True, status_code=200, headers={})
+        resp.json.return_value = sent.json.return_value
+        return resp
+
+    async def call(tag):
+        with credit_tag(tag):
+            return await api.awallet_trust(wallet=WALLET)
+
+    async def run():
+        with patch("httpx.AsyncClient.request", side_effect=reply):
+            await asyncio.gather(call("a"), call("b"))
+        await api.aclose()
+
+    asyncio.run(run())
+    assert api.credit_stats()["by_tag"] == {"a": {"calls": 1, "credits": 3}, "b": {"calls": 1, "credits": 3}}
+
+
+def test_async_refusal():
+    ledger = CreditLedger(budget=3)
+    api = InsumerAPIWrapper(api_key=KEY, credit_ledger=ledger)
+    resp = MagicMock(is_success=True, status_code=200)
+    resp.json.return_value = {"ok": True, "meta": {"creditsCharged": 3}}
+
+    async def run():
+        with patch("httpx.AsyncClient.request", return_value=resp) as request:
+            await api.awallet_trust(wallet=WALLET)
+            with pytest.raises(InsumerBudgetExceededError):
+                await api.awallet_trust(wallet=WALLET)
+        await api.aclose()
+        return request.call_count
+
+    assert asyncio.run(run()) == 1
+    assert ledger.stats()["spent"] == 3
@@ -0,0 +1,231 @@
+"""Tests for merchant directory paging and the local directory snapshot."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper, InsumerGetMerchantTool, InsumerListMerchantsTool
+from langchain_insumer.exceptions import InsumerAPIError
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+
+
+def _merchant(i: int, **overrides) -> dict:
+    merchant = {
+        "id": f"m_{i}",
+        "name": f"Merchant {i}",
+        "tokens": [{"symbol": "UNI" if i % 2 else "SHIB"}],
+        "verified": i % 3 == 0,
+    }
+    merchant.update(overrides)
+    return merchant
+
+
+class FakeDirectory:
+    """Stands in for the API's paged /merchants and /merchants/{id}."""
+
+    def __init__(self, merchants, delay=0.0):
+        self.merchants = merchants
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def get(self, path, params=None):
+        with self.lock:
+            self.calls.append((path, params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if path != "/merchants":
+                mid = path.rsplit("/", 1)[1]
+                return {"ok": True, "data": {"id": mid, "tiers": [{"name": "Gold"}]}}
+            page = self.merchants[params["offset"]:params["offset"] + params["limit"]]
+            return {"ok": True, "data": page}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    async def aget(self, path, params=None):
+        await asyncio.sleep(self.delay)
+        return self.get(path, params)
+
+
+def test_iterator_prefetches_pages_in_order():
+    fake = FakeDirectory([_merchant(i) for i in range(450)], delay=0.05)
+    api = InsumerAPIWrapper(api_key=KEY)
+    with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake.get):
+        ids = [m["id"] for m in api.iter_merchants(page_size=100, prefetch=3)]
+    assert ids == [f"m_{i}" for i in range(450)]
+    assert fake.max_in_flight >= 2
+    assert sorted(p["offset"] for _, p in fake.calls)[:5] == [0, 100, 200, 300, 400]
+
+
+def test_iterator_stops_early_and_raises_on_error():
+    fake = FakeDirectory([_merchant(i) for i in range(50)])
+    api = InsumerAPIWrapper(api_key=KEY)
+    with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake.get):
+        first = next(iter(api.iter_merchants(page_size=10, prefetch=2)))
+    assert first["id"] == "m_0"
+
+    failing = {"ok": False, "error": {"code": "internal"}}
+    with patch.object(InsumerAPIWrapper, "_public_get", return_value=failing):
+        with pytest.raises(InsumerAPIError):
+            list(api.iter_merchants())
+
+
+def test_async_iterator():
+    fake = FakeDirectory([_merchant(i) for i in range(25)], delay=0.01)
+    api = InsumerAPIWrapper(api_key=KEY)
+
+    async def run():
+        with patch.object(InsumerAPIWrapper, "_apublic_get", side_effect=fake.aget):
+            return [m["id"] async for m in api.aiter_merchants(page_size=10, prefetch=2)]
+
+    assert asyncio.run(run()) == [f"m_{i}" for i in range(25)]
+
+
+def test_tools_answer_from_snapshot():
+    fake = FakeDirectory([_merchant(i) for i in range(30)])
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+    list_tool = InsumerListMerchantsTool(api_wrapper=api)
+    get_tool = InsumerGetMerchantTool(api_wrapper=api)
+    try:
+        with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake.get):
+            uni = api.list_merchants(token="uni", limit=5)
+            verified_uni = api.list_merchants(token="UNI", verified=True)
+            list_tool.invoke({"verified": False})
+            get_tool.invoke({"id": "m_3"})
+            profile = api.get_merchant("m_3")
+    finally:
+        api.close()
+    assert [m["id"] for m in uni["data"]] == ["m_1", "m_3", "m_5", "m_7", "m_9"]
+    assert uni["meta"]["total"] == 15
+    assert [m["id"] for m in verified_uni["data"]] == ["m_3", "m_9", "m_15", "m_21", "m_27"]
+    assert profile["data"]["tiers"] == [{"name": "Gold"}]
+    # One page walk (plus the empty page prefetched past the end) and one profile fetch.
+    assert [path for path, _ in fake.calls].count("/merchants/m_3") == 1
+    assert len([c for c in fake.calls if c[0] == "/merchants"]) <= api.bulk_max_concurrency
+
+
+def test_incremental_refresh():
+    merchants = [_merchant(i) for i in range(5)]
+    fake = FakeDirectory(merchants)
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+    directory = api.get_merchant_directory()
+    try:
+        with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake.get):
+            assert directory.load() == {"added": 5, "updated": 0, "removed": 0, "unchanged": 0}
+            directory.get_merchant("m_1")
+            directory.get_merchant("m_2")
+            fake.merchants = [
+                merchants[0],
+                _merchant(1, tokens=[{"symbol": "PEPE"}]),
+                merchants[2],
+                merchants[4],
+                _merchant(9),
+            ]
+            changes = directory.refresh()
+    finally:
+        api.close()
+    assert changes == {"added": 1, "updated": 1, "removed": 1, "unchanged": 3}
+    assert [m["id"] for m in directory.query(token="pepe")] == ["m_1"]
+    assert directory.query(token="UNI") == [fake.merchants[4]]
+    assert directory.get("m_3") is None
+    # Only the changed merchant's cached profile was dropped.
+    assert directory.stats()["profiles"] == 1
+
+
+def test_refresh_drops_profiles_of_unlisted_merchants():
+    fake = FakeDirectory([_merchant(i) for i in range(3)])
+    forgotten = []
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+    directory = api.get_merchant_directory()
+    directory.on_change = forgotten.append
+    try:
+        with patch.object(InsumerAPIWrapper, "_public_get", side_effect=fake.get):
+            directory.load()
+            directory.get_merchant("m_0")
+            directory.get_merchant("m_unlisted")
+            assert directory.stats()["profiles"] == 2
+            directory.refresh()
+    finally:
+        api.close()
+    assert directory.stats()["profiles"] == 1
+    assert forgotten == ["m_unlisted"]
+
+
+def test_concurrent_async_loads_walk_once_at_a_time():
+    fake = FakeDirectory([_merchant(i) for i in range(5)], delay=0.01)
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+    directory = api.get_merchant_directory()
+
+    async def run():
+        with patch.object(InsumerAPIWrapper, "_apublic_get", side_effect=fake.aget):
+            # Cold start: concurrent readers share one walk.
+            await asyncio.gather(*(api.alist_merchants() for _ in range(4)))
+            walks = len([c for c in fake.calls if c[0] == "/merchants"])
+            fake.merchants = fake.merchants[:3]
+            results = await asyncio.gather(directory.aload(), directory.aload())
+        return walks, results
+
+    try:
+        walks, (first, second) = asyncio.run(run())
+    finally:
+        api.close()
+    assert walks <= api.bulk_max_concurrency
+    assert first == {"added": 0, "updated": 0, "removed": 2, "unchanged": 3}
+    assert second == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+    assert len(directory) == 3
+
+
+def test_async_load_waits_for_a_running_sync_load():
+    fake = FakeDirectory([_merchant(i) for i in range(3)])
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+    directory = api.get_merchant_directory()
+    changed = []
+    # on_change may do backend I/O, so readers must not be locked out meanwhile.
+    directory.on_change = lambda mid: changed.append((mid, directory._lock.locked()))
+
+    async def run():
+        with patch.object(InsumerAPIWrapper, "_apublic_get", side_effect=fake.aget):
+            with directory._load_lock:
+                task = asyncio.ensure_future(directory.aload())
+                await asyncio.sleep(0.05)
+                applied = directory.loaded
+            first = await task
+            fake.merchants = [_merchant(0, name="Renamed")]
+            return applied, first, await directory.aload()
+
+    try:
+        applied, first, second = asyncio.run(run())
+    finally:
+        api.close()
+    assert applied is False
+    assert first["added"] == 3
+    assert second == {"added": 0, "updated": 1, "removed": 2, "unchanged": 0}
+    assert changed == [("m_0", False), ("m_1", False), ("m_2", False)]
+
+
+def test_async_tools_answer_from_snapshot():
+    fake = FakeDirectory([_merchant(i) for i in range(12)])
+    api = InsumerAPIWrapper(api_key=KEY, merchant_directory=True)
+
+    async def run():
+        with patch.object(InsumerAPIWrapper, "_apublic_get", side_effect=fake.aget):
+            listing = await api.alist_merchants(verified=True)
+            profile = await api.aget_merchant("m_6")
+            again = await api.aget_merchant("m_6")
+        return listing, profile, again
+
+    try:
+        listing, profile, again = asyncio.run(run())
+    finally:
+        api.close()
+    assert [m["id"] for m in listing["data"]] == ["m_0", "m_3", "m_6", "m_9"]
+    assert again is profile
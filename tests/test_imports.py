@@ -0,0 +1,52 @@
+"""Tests for lazy loading of the public API."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import langchain_insumer
+import langchain_insumer.tools
+
+# Seconds ``import langchain_insumer`` may take in a fresh interpreter. Loading
+# every tool eagerly takes about a second; the lazy package takes a few ms.
+IMPORT_BUDGET = 0.25
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import langchain_insumer
+elapsed = time.perf_counter() - start
+loaded = sorted(m for m in sys.modules if m.startswith(("langchain_insumer.", "langchain_core", "requests", "httpx")))
+from langchain_insumer import InsumerCreditsTool
+tools = sorted(m for m in sys.modules if m.startswith("langchain_insumer.tools."))
+print(json.dumps({"elapsed": elapsed, "loaded": loaded, "tools": tools}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_import_stays_under_budget():
+    # Best of three, so one slow interpreter start does not fail the run.
+    runs = [_probe() for _ in range(3)]
+    assert min(r["elapsed"] for r in runs) < IMPORT_BUDGET
+    assert runs[0]["loaded"] == ["langchain_insumer.tools"]
+    assert "langchain_insumer.tools.credits" in runs[0]["tools"]
+    assert "langchain_insumer.tools.attest" not in runs[0]["tools"]
+
+
+def test_public_names_resolve():
+    for name in langchain_insumer.__all__:
+        assert getattr(langchain_insumer, name).__name__ == name
+    assert set(langchain_insumer.tools.__all__) <= set(langchain_insumer.__all__)
+    assert langchain_insumer.InsumerAttestTool is langchain_insumer.tools.InsumerAttestTool
+    assert "InsumerAPIWrapper" in dir(langchain_insumer)
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError, match="InsumerNoSuchTool"):
+        langchain_insumer.InsumerNoSuchTool
@@ -0,0 +1,155 @@
+"""Tests for routing requests across several API keys."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIError, InsumerAPIWrapper, InsumerBudgetExceededError
+from langchain_insumer.keypool import KeyPool, mask_key
+
+KEY_A = "insr_live_" + "a" * 40
+KEY_B = "insr_live_" + "b" * 40
+WALLET = "0x" + "ab" * 20
+
+
+def _response(status: int, body: dict, headers: dict = None) -> MagicMock:
+    resp = MagicMock(ok=status < 400, status_code=status, headers=headers or {})
+    resp.json.return_value = body
+    return resp
+
+
+def _trusted(remaining: int) -> MagicMock:
+    meta = {"creditsCharged": 3, "creditsRemaining": remaining}
+    return _response(200, {"ok": True, "data": {}, "meta": meta})
+
+
+def _sent_keys(mock_request) -> list:
+    return [c.kwargs["headers"]["X-API-Key"] for c in mock_request.call_args_list]
+
+
+def test_writes_go_to_the_key_with_most_credits():
+    pool = KeyPool([KEY_A, KEY_B])
+    pool.record(KEY_A, None, {"meta": {"creditsRemaining": 5}}, {})
+    pool.record(KEY_B, None, {"meta": {"creditsRemaining": 50}}, {})
+    assert pool.acquire("POST /trust", 3) == KEY_B
+    # Reads spread by request count when no tier is set.
+    assert pool.acquire("GET /credits") == KEY_A
+
+    pool.record(KEY_B, None, {"meta": {"creditsRemaining": 2}}, {})
+    pool.record(KEY_A, None, {"meta": {"creditsRemaining": 1}}, {})
+    with pytest.raises(InsumerBudgetExceededError) as exc:
+        pool.acquire("POST /trust", 3)
+    assert exc.value.available == 2
+
+
+def test_reads_go_to_the_key_with_most_quota():
+    pool = KeyPool([KEY_A, KEY_B], tier="free")
+    for _ in range(3):
+        pool.acquire("GET /credits")
+    stats = pool.stats()
+    assert [s["requests"] for s in stats.values()] == [2, 1]
+    assert stats[mask_key(KEY_A)]["read_fill"] == pytest.approx(0.8, abs=0.01)
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_rate_limited_key_fails_over(mock_request):
+    mock_request.side_effect = [
+        _response(429, {"ok": False, "error": {"code": "rate_limited"}}, {"Retry-After": "120"}),
+        _trusted(40),
+        _trusted(37),
+    ]
+    api = InsumerAPIWrapper(api_keys=[KEY_A, KEY_B])
+    api.wallet_trust(wallet=WALLET)
+    api.wallet_trust(wallet=WALLET)
+
+    assert _sent_keys(mock_request) == [KEY_A, KEY_B, KEY_B]
+    stats = api.key_stats()
+    assert stats[mask_key(KEY_A)]["rate_limited"] == 1
+    assert stats[mask_key(KEY_A)]["resting"] > 100
+    assert stats[mask_key(KEY_B)]["credits_remaining"] == 37
+    assert stats[mask_key(KEY_B)]["credits_spent"] == 6
+    # The failover re-sent the first attempt; it is not a retry.
+    assert api.retry_stats()["POST /trust"]["attempts"] == 2
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_out_of_credits_key_fails_over(mock_request):
+    mock_request.side_effect = [
+        _response(402, {"ok": False, "error": {"code": "insufficient_credits"}}),
+        _trusted(10),
+    ]
+    api = InsumerAPIWrapper(api_keys=[KEY_A, KEY_B], credit_ledger=True)
+    api.wallet_trust(wallet=WALLET)
+
+    assert _sent_keys(mock_request) == [KEY_A, KEY_B]
+    stats = api.key_stats()
+    assert stats[mask_key(KEY_A)]["out_of_credits"] == 1
+    assert stats[mask_key(KEY_A)]["credits_remaining"] == 0
+    assert stats[mask_key(KEY_A)]["share"] == 0.5
+    # Balances are per key, so the shared ledger does not track one.
+    assert api.credit_stats()["balance"] is None
+    assert api.credit_stats()["spent"] == 3
+
+
+def test_out_of_credits_key_is_rechecked():
+    pool = KeyPool([KEY_A, KEY_B], recheck=0.05)
+    pool.record(KEY_A, 402, {"ok": False, "error": {"code": "insufficient_credits"}}, {})
+    pool.record(KEY_B, None, {"meta": {"creditsRemaining": 1}}, {})
+    with pytest.raises(InsumerBudgetExceededError):
+        pool.acquire("POST /trust", 3)
+    time.sleep(0.06)
+    assert pool.acquire("POST /trust", 3) == KEY_A
+
+    pool.record(KEY_A, 402, {"ok": False}, {})
+    pool.reset_credits(KEY_A)
+    assert pool.stats()[mask_key(KEY_A)]["credits_remaining"] is None
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_buying_credits_resets_drained_keys(mock_request):
+    mock_request.side_effect = [
+        _response(402, {"ok": False, "error": {"code": "insufficient_credits"}}),
+        _trusted(2),
+        _response(200, {"ok": True, "data": {"creditsAdded": 125}}),
+        _trusted(120),
+    ]
+    api = InsumerAPIWrapper(api_keys=[KEY_A, KEY_B])
+    api.wallet_trust(wallet=WALLET)
+    api.buy_credits(tx_hash="0x" + "1" * 64, chain_id=8453, amount=5)
+    api.wallet_trust(wallet=WALLET)
+    assert _sent_keys(mock_request)[-1] == KEY_A
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_every_key_exhausted_raises(mock_request):
+    mock_request.return_value = _response(429, {"ok": False}, {"Retry-After": "120"})
+    api = InsumerAPIWrapper(api_keys=[KEY_A, KEY_B], max_retries=0)
+    with pytest.raises(InsumerAPIError):
+        api.get_credits()
+    assert mock_request.call_count == 2
+
+
+def test_api_key_or_keys_required():
+    with pytest.raises(ValueError):
+        InsumerAPIWrapper()
+    assert InsumerAPIWrapper(api_keys=[KEY_A, KEY_B]).api_key == KEY_A
+    assert InsumerAPIWrapper(api_key=KEY_A).key_stats() == {}
+
+
+def test_async_failover():
+    api = InsumerAPIWrapper(api_keys=[KEY_A, KEY_B])
+    rejected = MagicMock(is_success=False, status_code=429, headers={"Retry-After": "120"})
+    rejected.json.return_value = {"ok": False}
+    ok = MagicMock(is_success=True, status_code=200, headers={})
+    ok.json.return_value = {"ok": True, "data": {}, "meta": {"creditsRemaining": 9}}
+
+    async def run():
+        with patch("httpx.AsyncClient.request", side_effect=[rejected, ok]) as request:
+            await api.aget_credits()
+        await api.aclose()
+        return [c.kwargs["headers"]["X-API-Key"] for c in request.call_args_list]
+
+    assert asyncio.run(run()) == [KEY_A, KEY_B]
+    assert api.key_stats()[mask_key(KEY_B)]["credits_remaining"] == 9
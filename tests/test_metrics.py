@@ -0,0 +1,157 @@
+"""Tests for request metrics and the Prometheus exporter."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from langchain_insumer import InsumerAPIError, InsumerAPIWrapper
+from langchain_insumer.metrics import Histogram, RequestMetrics, serve_prometheus
+from langchain_insumer.retry import RETRY_BUDGET
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+RPC_FAILURE = {"ok": False, "error": {"code": "rpc_failure", "message": "Upstream unavailable"}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path.startswith("/v1/merchants/missing"):
+            status, body = 404, {"ok": False, "error": {"code": "not_found", "message": "No merchant"}}
+        else:
+            status, body = 200, {"ok": True, "data": {"path": self.path}}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_histogram_quantiles():
+    hist = Histogram([0.1, 1.0])
+    assert hist.quantile(0.5) is None
+    for value in (0.05, 0.05, 0.5, 5.0):
+        hist.observe(value)
+    assert hist.counts == [2, 1, 1]
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.99) == float("inf")
+
+
+def test_render_prometheus():
+    metrics = RequestMetrics(latency_buckets=[0.1, 1.0], size_buckets=[100])
+    metrics.observe(
+        "POST /attest",
+        "200",
+        "rpc_failure",
+        connect=0.02,
+        server=0.4,
+        decode=0.001,
+        request_bytes=80,
+        response_bytes=150,
+    )
+    metrics.observe("POST /attest", "error", "ConnectTimeout", connect=0.0, server=1.5)
+    text = metrics.render_prometheus()
+    assert 'insumer_requests_total{endpoint="POST /attest",status="200",code="rpc_failure"} 1' in text
+    assert 'insumer_requests_total{endpoint="POST /attest",status="error",code="ConnectTimeout"} 1' in text
+    assert '# TYPE insumer_request_phase_seconds histogram' in text
+    assert 'insumer_request_phase_seconds_bucket{endpoint="POST /attest",phase="server",le="1"} 1' in text
+    assert 'insumer_request_phase_seconds_bucket{endpoint="POST /attest",phase="server",le="+Inf"} 2' in text
+    assert 'insumer_request_phase_seconds_count{endpoint="POST /attest",phase="decode"} 1' in text
+    assert 'insumer_payload_bytes_bucket{endpoint="POST /attest",direction="response",le="100"} 0' in text
+    assert 'insumer_payload_bytes_sum{endpoint="POST /attest",direction="request"} 80' in text
+    assert text.endswith("\n")
+
+
+@patch("langchain_insumer.wrapper.time.sleep")
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_wrapper_records_every_attempt(mock_request, sleep):
+    RETRY_BUDGET.reset()
+    failed, ok = MagicMock(ok=True, status_code=200, content=b"x" * 90), MagicMock(
+        ok=True, status_code=200, content=b"y" * 30
+    )
+    failed.json.return_value = RPC_FAILURE
+    ok.json.return_value = {"ok": True, "data": {}}
+    failed.request.body = ok.request.body = b"z" * 12
+    mock_request.side_effect = [failed, ok] + [requests.ConnectTimeout("slow")] * 2
+    api = InsumerAPIWrapper(api_key=KEY, metrics=True, max_retries=1)
+
+    api.get_credits()
+    with pytest.raises(requests.ConnectTimeout):
+        api.get_credits()
+    stats = api.request_metrics()["GET /credits"]
+    assert stats["requests"] == 4
+    assert stats["statuses"] == {"200": 2, "error": 2}
+    assert stats["errors"] == {"rpc_failure": 1, "ConnectTimeout": 2}
+    assert stats["decode"]["count"] == 2
+    assert stats["request_bytes"] == 24
+    assert stats["response_bytes"] == 120
+    RETRY_BUDGET.reset()
+
+
+def test_disabled_by_default():
+    api = InsumerAPIWrapper(api_key=KEY)
+    assert api.request_metrics() == {}
+    assert api.render_prometheus() == ""
+
+
+def test_live_sync_and_async_share_metrics(server):
+    shared = RequestMetrics()
+    api = InsumerAPIWrapper(api_key=KEY, base_url=server, metrics=shared, max_retries=0)
+    other = InsumerAPIWrapper(api_key=KEY, base_url=server, metrics=shared)
+    api.list_tokens(chain=1)
+    api.list_tokens(chain=1)
+    with pytest.raises(InsumerAPIError):
+        other.get_merchant("missing")
+
+    async def run():
+        await api.alist_tokens(chain=1)
+        await api.aclose()
+
+    asyncio.run(run())
+
+    stats = shared.stats()
+    tokens = stats["GET /tokens"]
+    assert tokens["requests"] == 3
+    # The session and the async client each opened a connection.
+    assert tokens["connect"]["count"] == 3
+    assert tokens["connect"]["mean"] > 0
+    assert tokens["response_bytes"] > 0
+    assert stats["GET /merchants/{id}"]["errors"] == {"not_found": 1}
+    assert stats["GET /merchants/{id}"]["statuses"] == {"404": 1}
+    api.close()
+    other.close()
+
+    exporter = serve_prometheus(shared, port=0)
+    try:
+        host, port = exporter.server_address[:2]
+        resp = requests.get(f"http://{host}:{port}/metrics", timeout=5)
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'insumer_requests_total{endpoint="GET /tokens",status="200",code=""} 3' in resp.text
+        assert requests.get(f"http://{host}:{port}/other", timeout=5).status_code == 404
+    finally:
+        exporter.shutdown()
+        exporter.server_close()
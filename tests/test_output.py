@@ -0,0 +1,154 @@
+"""Tests for compact and summary tool output."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from langchain_insumer import (
+    InsumerAPIWrapper,
+    InsumerAttestTool,
+    InsumerBatchWalletTrustTool,
+    InsumerJwksTool,
+    InsumerWalletTrustTool,
+)
+from langchain_insumer.output import compact, render, summarize
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+
+ATTESTATION = {
+    "ok": True,
+    "data": {
+        "attestation": {
+            "id": "ATST-1",
+            "pass": False,
+            "results": [
+                {
+                    "condition": 0,
+                    "met": True,
+                    "label": "USDC >= 1000 on Ethereum",
+                    "evaluatedCondition": {"chainId": 1, "threshold": "1000"},
+                    "conditionHash": "0x" + "ab" * 32,
+                    "blockNumber": "0x129e3f7",
+                    "proof": {"available": True, "accountProof": ["0x" + "cd" * 500] * 8},
+                },
+                {"condition": 1, "met": False, "label": "BAYC on Ethereum"},
+            ],
+            "passCount": 1,
+            "failCount": 1,
+            "expiresAt": "2026-02-28T13:04:57.000Z",
+        },
+        "sig": "A" * 88,
+        "kid": "insumer-attest-v2",
+    },
+    "meta": {"version": "1.0", "creditsRemaining": 97, "creditsCharged": 2},
+}
+
+TRUST = {
+    "ok": True,
+    "data": {
+        "trust": {
+            "id": "TRST-1",
+            "wallet": "0xabc",
+            "dimensions": {
+                "stablecoins": {
+                    "checks": [{"label": "USDC on Ethereum", "met": True, "conditionHash": "0x00"}] * 20,
+                    "passCount": 20,
+                    "failCount": 0,
+                    "total": 20,
+                },
+            },
+            "summary": {"totalChecks": 20, "totalPassed": 20},
+            "expiresAt": "2026-02-28T13:04:57.000Z",
+        },
+        "sig": "B" * 88,
+    },
+    "meta": {"creditsCharged": 3},
+}
+
+
+def test_compact_drops_evidence_but_keeps_results():
+    out = compact(ATTESTATION)
+    result = out["data"]["attestation"]["results"][0]
+    assert result == {"condition": 0, "met": True, "label": "USDC >= 1000 on Ethereum"}
+    assert "sig" not in out["data"]
+    assert "kid" not in out["data"]
+    assert out["meta"] == {"creditsRemaining": 97, "creditsCharged": 2}
+    assert "conditionHash" in ATTESTATION["data"]["attestation"]["results"][0]
+
+
+def test_summary_keeps_only_the_verdict():
+    att = summarize(ATTESTATION)["data"]["attestation"]
+    assert att == {
+        "id": "ATST-1",
+        "pass": False,
+        "passCount": 1,
+        "failCount": 1,
+        "expiresAt": "2026-02-28T13:04:57.000Z",
+        "failed": ["BAYC on Ethereum"],
+    }
+    trust = summarize(TRUST)["data"]["trust"]
+    assert trust["dimensions"] == {"stablecoins": {"passCount": 20, "failCount": 0, "total": 20}}
+    assert trust["summary"] == {"totalChecks": 20, "totalPassed": 20}
+
+    batch = {"ok": True, "data": {"results": [TRUST["data"], {"wallet": "0xdef", "error": "bad"}], "summary": {"failed": 1}}}
+    assert summarize(batch)["data"] == {
+        "results": [summarize(TRUST)["data"]["trust"], {"wallet": "0xdef", "error": "bad"}],
+        "summary": {"failed": 1},
+    }
+
+
+def test_errors_and_sizes():
+    error = {"ok": False, "error": {"code": "rpc_failure", "message": "upstream", "failedSources": [1]}}
+    assert summarize(error) == {"ok": False, "error": {"code": "rpc_failure", "message": "upstream"}}
+
+    full, small, tiny = (len(render(ATTESTATION, m)) for m in ("full", "compact", "summary"))
+    assert tiny < small < full / 10
+    assert "\n" not in render(ATTESTATION, "compact")
+    with pytest.raises(ValueError):
+        render(ATTESTATION, "tiny")
+
+
+def test_tools_return_raw_response_as_artifact():
+    api = InsumerAPIWrapper(api_key=KEY)
+    full = InsumerWalletTrustTool(api_wrapper=api)
+    compact_tool = InsumerWalletTrustTool(api_wrapper=api, output_mode="compact")
+    summary_tool = InsumerBatchWalletTrustTool(api_wrapper=api, output_mode="summary")
+    assert full.output_mode == "full"
+
+    with patch.object(InsumerAPIWrapper, "wallet_trust", return_value=TRUST):
+        assert json.loads(full.invoke({"wallet": "0xabc"})) == TRUST
+        message = compact_tool.invoke(
+            {"type": "tool_call", "id": "call-1", "name": compact_tool.name, "args": {"wallet": "0xabc"}}
+        )
+    assert message.artifact is TRUST
+    assert json.loads(message.content)["data"]["trust"]["id"] == "TRST-1"
+
+    batch = {"ok": True, "data": {"results": [TRUST["data"]]}}
+    with patch.object(InsumerAPIWrapper, "abatch_wallet_trust", return_value=batch):
+        content, artifact = asyncio.run(summary_tool._arun(wallets=json.dumps([{"wallet": "0xabc"}])))
+    assert artifact is batch
+    assert "checks" not in content
+
+
+def test_attest_tool_summary():
+    tool = InsumerAttestTool(api_wrapper=InsumerAPIWrapper(api_key=KEY), output_mode="summary")
+    with patch.object(InsumerAPIWrapper, "attest", return_value=ATTESTATION):
+        content, artifact = tool._run(conditions="[]", wallet="0xabc")
+    assert json.loads(content)["data"]["attestation"]["failed"] == ["BAYC on Ethereum"]
+    assert artifact["data"]["sig"] == "A" * 88
+
+
+def test_compact_jwks_keeps_key_ids():
+    jwks = {
+        "keys": [
+            {"kty": "EC", "crv": "P-256", "x": "AA", "y": "BB", "kid": "insumer-attest-v1"},
+            {"kty": "EC", "crv": "P-256", "x": "CC", "y": "DD", "kid": "insumer-attest-v2"},
+        ]
+    }
+    tool = InsumerJwksTool(api_wrapper=InsumerAPIWrapper(api_key=KEY), output_mode="compact")
+    with patch.object(InsumerAPIWrapper, "get_jwks", return_value=jwks):
+        content, _ = tool._run()
+    keys = json.loads(content)["keys"]
+    assert [k["kid"] for k in keys] == ["insumer-attest-v1", "insumer-attest-v2"]
@@ -0,0 +1,116 @@
+"""Tests for the client-side rate limiter."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIError, InsumerAPIWrapper, InsumerRateLimitError
+from langchain_insumer.ratelimit import RateLimiter, TokenBucket, endpoint_class
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+
+
+def _ok() -> MagicMock:
+    resp = MagicMock(ok=True, status_code=200)
+    resp.json.return_value = {"ok": True, "data": {}}
+    return resp
+
+
+def test_token_bucket_queues_in_order():
+    bucket = TokenBucket(capacity=2, rate=10.0)
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1.0) == pytest.approx(0.2, abs=0.01)
+    assert bucket.reserve(0.25) is None
+    assert bucket.level() == pytest.approx(-2, abs=0.1)
+    bucket.drain()
+    assert bucket.level() < 0
+
+
+def test_tiers_and_classes():
+    assert endpoint_class("GET /credits", None) == "read"
+    assert endpoint_class("POST /trust", {"wallet": "0x"}) == "write"
+    assert endpoint_class("POST /merchants", {}) == "read"
+    assert endpoint_class("PUT /merchants/m_1/settings", {}) == "write"
+
+    # Buckets hold a minute of quota, at least 10 tokens.
+    stats = RateLimiter("enterprise").stats()
+    assert {cls: s["capacity"] for cls, s in stats.items()} == {"read": 70, "write": 70}
+    assert stats["write"]["daily_limit"] == 100_000
+    assert stats["read"]["fill"] == 1.0
+    assert RateLimiter("free").stats()["read"]["capacity"] == 10
+    assert list(RateLimiter("pro", daily_limits={"write": None}).stats()) == ["read"]
+
+    limiter = RateLimiter("free", daily_limits={"write": 50}, burst=20)
+    assert {cls: s["capacity"] for cls, s in limiter.stats().items()} == {"read": 20, "write": 20}
+    with pytest.raises(ValueError):
+        RateLimiter("gold")
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_wrapper_refuses_past_the_deadline(mock_request):
+    mock_request.return_value = _ok()
+    api = InsumerAPIWrapper(api_key=KEY, rate_limiter=RateLimiter("free", burst=2, wait=0.0))
+    api.get_credits()
+    api.get_credits()
+    with pytest.raises(InsumerRateLimitError) as excinfo:
+        api.get_credits()
+    assert excinfo.value.endpoint_class == "read"
+    assert excinfo.value.retry_after > 800  # 100 a day is one every 864 s
+    assert mock_request.call_count == 2
+
+    # Public endpoints are not limited; writes have their own bucket.
+    api.list_tokens(chain=1)
+    api.wallet_trust(wallet="0x" + "ab" * 20)
+    api.wallet_trust(wallet="0x" + "cd" * 20)
+    with pytest.raises(InsumerRateLimitError) as excinfo:
+        api.configure_settings("m_1", discount_cap=20)
+    assert excinfo.value.endpoint_class == "write"
+    assert mock_request.call_count == 5
+    stats = api.rate_limit_stats()["read"]
+    assert (stats["requests"], stats["rejected"]) == (2, 1)
+    assert stats["fill"] < 0.001
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_bursts_are_smoothed(mock_request):
+    mock_request.return_value = _ok()
+    # 20 reads a second, one at a time.
+    limiter = RateLimiter("enterprise", daily_limits={"read": 20 * 86400}, burst=1, wait=1.0)
+    api = InsumerAPIWrapper(api_key=KEY, rate_limiter=limiter)
+    with patch("langchain_insumer.ratelimit.time.sleep") as sleep:
+        for _ in range(4):
+            api.get_credits()
+    waits = [c.args[0] for c in sleep.call_args_list]
+    assert waits == pytest.approx([0.05, 0.1, 0.15], abs=0.02)
+    assert api.rate_limit_stats()["read"]["queued"] == 3
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_server_rejection_drains_the_bucket(mock_request):
+    rejected = MagicMock(ok=False, status_code=429, headers={})
+    rejected.json.return_value = {"ok": False, "error": {"code": "rate_limited"}}
+    mock_request.return_value = rejected
+    api = InsumerAPIWrapper(api_key=KEY, rate_limit_tier="pro", max_retries=0)
+    with pytest.raises(InsumerAPIError):
+        api.get_credits()
+    assert api.rate_limit_stats()["read"]["level"] < 0.01
+
+
+def test_async_acquire():
+    limiter = RateLimiter("free", burst=1, wait=0.0)
+    api = InsumerAPIWrapper(api_key=KEY, rate_limiter=limiter)
+    resp = MagicMock(is_success=True, status_code=200)
+    resp.json.return_value = {"ok": True}
+
+    async def run():
+        with patch("httpx.AsyncClient.request", return_value=resp) as request:
+            await api.aget_credits()
+            with pytest.raises(InsumerRateLimitError):
+                await api.aget_credits()
+        await api.aclose()
+        return request.call_count
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,122 @@
+"""Tests for the in-memory token registry."""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper, InsumerListTokensTool
+from langchain_insumer.registry import BackgroundRefresh, TokenRegistry
+
+TOKENS = {
+    "ok": True,
+    "data": [
+        {
+            "symbol": "USDC",
+            "chainId": 1,
+            "contractAddress": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+            "decimals": 6,
+            "type": "token",
+        },
+        {
+            "symbol": "USDC",
+            "chainId": 8453,
+            "contractAddress": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+            "decimals": 6,
+            "type": "token",
+        },
+        {
+            "symbol": "USDC",
+            "chainId": "solana",
+            "contractAddress": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+            "decimals": 6,
+            "type": "token",
+        },
+        {
+            "symbol": "BAYC",
+            "chainId": 1,
+            "contractAddress": "0xBC4CA0EdA7647A8aB7C2061c2E118A18a936f13D",
+            "type": "nft",
+        },
+    ],
+}
+
+
+@pytest.fixture
+def registry():
+    fetch = MagicMock(return_value=TOKENS)
+    return TokenRegistry(fetch)
+
+
+def test_loaded_once_and_indexed(registry):
+    usdc = registry.resolve("1", "usdc")
+    assert usdc["decimals"] == 6
+    assert registry.lookup(8453, "USDC")[0]["contractAddress"].startswith("0x8335")
+    assert registry.resolve("Solana", "USDC")["chainId"] == "solana"
+    assert registry.by_contract("0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48") == [usdc]
+    assert registry.by_contract("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", chain=8453) == []
+    assert [t["symbol"] for t in registry.by_type("NFT")] == ["BAYC"]
+    assert registry.fetch.call_count == 1
+    assert len(registry) == 4
+
+
+def test_query_matches_api_filters(registry):
+    assert len(registry.query(symbol="usdc")) == 3
+    assert [t["symbol"] for t in registry.query(chain=1)] == ["USDC", "BAYC"]
+    assert [t["symbol"] for t in registry.query(chain=1, asset_type="nft")] == ["BAYC"]
+    assert registry.list_tokens(chain=8453) == {"ok": True, "data": [TOKENS["data"][1]]}
+
+
+def test_failed_refresh_keeps_snapshot(registry):
+    registry.load()
+    registry.fetch.return_value = {"ok": False, "error": {"code": "rpc_failure"}}
+    registry._try_refresh()
+    assert registry.resolve(1, "USDC") is not None
+    assert registry.stats()["refresh_errors"] == 1
+    assert registry.stats()["tokens"] == 4
+
+
+def test_envelope_with_token_list():
+    registry = TokenRegistry(lambda: {"ok": True, "data": {"tokens": TOKENS["data"], "count": 4}})
+    assert registry.list_tokens(symbol="BAYC")["data"]["count"] == 1
+
+
+def test_refresh_base_requires_load():
+    with pytest.raises(TypeError):
+        BackgroundRefresh(60.0)
+
+
+def test_background_refresh():
+    fetch = MagicMock(return_value=TOKENS)
+    registry = TokenRegistry(fetch, refresh_interval=0.01)
+    registry.start()
+    try:
+        for _ in range(200):
+            if fetch.call_count >= 2:
+                break
+            time.sleep(0.01)
+    finally:
+        registry.stop()
+    assert fetch.call_count >= 2
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_tool_served_from_registry(mock_request):
+    mock_request.return_value.json.return_value = TOKENS
+    api = InsumerAPIWrapper(
+        api_key="insr_live_0000000000000000000000000000000000000000", token_registry=True
+    )
+    tool = InsumerListTokensTool(api_wrapper=api)
+    try:
+        first = json.loads(tool.invoke({"chain": 1, "symbol": "USDC"}))
+        second = json.loads(tool.invoke({"asset_type": "nft"}))
+        third = asyncio.run(api.alist_tokens(chain="solana"))
+    finally:
+        api.close()
+    assert mock_request.call_count == 1
+    assert mock_request.call_args.kwargs["params"] == {}
+    assert first["data"][0]["decimals"] == 6
+    assert second["data"][0]["symbol"] == "BAYC"
+    assert third["data"][0]["contractAddress"].startswith("EPj")
@@ -0,0 +1,208 @@
+"""Tests for transient-failure retries."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from langchain_insumer import InsumerAPIWrapper
+from langchain_insumer.exceptions import InsumerAPIError
+from langchain_insumer.retry import RETRY_BUDGET, RetryBudget, parse_retry_after
+from langchain_insumer.transport import endpoint_name
+
+RPC_FAILURE = {"ok": False, "error": {"code": "rpc_failure", "message": "Upstream unavailable"}}
+OK = {"ok": True, "data": {"pass": True}}
+
+
+def _response(status: int = 200, body=None, headers=None) -> MagicMock:
+    resp = MagicMock()
+    resp.ok = status < 400
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.json.return_value = OK if body is None else body
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def fresh_budget():
+    RETRY_BUDGET.reset()
+    yield
+    RETRY_BUDGET.reset()
+
+
+@pytest.fixture
+def api():
+    return InsumerAPIWrapper(api_key="insr_live_0000000000000000000000000000000000000000")
+
+
+@pytest.fixture
+def sleep():
+    with patch("langchain_insumer.wrapper.time.sleep") as mock:
+        yield mock
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_rpc_failure_retried_after_two_seconds(mock_request, api, sleep):
+    mock_request.side_effect = [_response(body=RPC_FAILURE), _response()]
+    assert api.attest(wallet="0xabc", conditions=[]) == OK
+    assert mock_request.call_count == 2
+    assert sleep.call_args.args[0] >= 2.0
+    stats = api.retry_stats()["POST /attest"]
+    assert stats["attempts"] == 2
+    assert stats["retries"] == 1
+    assert stats["recovered"] == 1
+    assert stats["reasons"] == {"rpc_failure": 1}
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_rate_limit_honors_retry_after(mock_request, api, sleep):
+    mock_request.side_effect = [_response(429, {"ok": False}, {"Retry-After": "3"}), _response()]
+    assert api.get_credits() == OK
+    assert sleep.call_args.args[0] >= 3.0
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_client_error_keeps_body(mock_request, api, sleep):
+    body = {"ok": False, "error": {"code": "invalid_wallet", "message": "Bad address"}}
+    mock_request.return_value = _response(400, body)
+    with pytest.raises(InsumerAPIError) as info:
+        api.attest(wallet="nope", conditions=[])
+    assert isinstance(info.value, requests.HTTPError)
+    assert info.value.status_code == 400
+    assert info.value.code == "invalid_wallet"
+    assert info.value.body == body
+    assert "Bad address" in str(info.value)
+    assert mock_request.call_count == 1
+    sleep.assert_not_called()
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_exhausted_retries_raise(mock_request, sleep):
+    api = InsumerAPIWrapper(
+        api_key="insr_live_0000000000000000000000000000000000000000", max_retries=2
+    )
+    mock_request.return_value = _response(503, {"ok": False})
+    with pytest.raises(InsumerAPIError) as info:
+        api.list_merchants()
+    assert info.value.status_code == 503
+    assert mock_request.call_count == 3
+    assert api.retry_stats()["GET /merchants"]["exhausted"] == 1
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_exhausted_rpc_failure_returned(mock_request, api, sleep):
+    mock_request.return_value = _response(body=RPC_FAILURE)
+    assert api.wallet_trust(wallet="0xabc") == RPC_FAILURE
+    assert mock_request.call_count == 4
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_charging_server_error_not_retried(mock_request, api, sleep):
+    mock_request.side_effect = [_response(502, {"ok": False}), _response()]
+    with pytest.raises(InsumerAPIError) as info:
+        api.wallet_trust(wallet="0xabc")
+    assert info.value.status_code == 502
+    assert mock_request.call_count == 1
+
+    # Retried when the API says nothing was charged.
+    uncharged = {"ok": False, "meta": {"creditsCharged": 0}}
+    mock_request.side_effect = [_response(503, uncharged), _response()]
+    assert api.attest(wallet="0xabc", conditions=[]) == OK
+    assert mock_request.call_count == 3
+    assert api.retry_stats()["POST /attest"]["reasons"] == {"server_error": 1}
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_retry_after_beyond_cap_not_waited(mock_request, api, sleep):
+    mock_request.return_value = _response(429, {"ok": False}, {"Retry-After": "3600"})
+    with pytest.raises(InsumerAPIError):
+        api.get_credits()
+    assert mock_request.call_count == 1
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_budget_shared_across_wrappers(mock_request, sleep):
+    RETRY_BUDGET.min_per_second = 0.1  # one retry per 10 s window
+    try:
+        first, second = (
+            InsumerAPIWrapper(api_key="insr_live_0000000000000000000000000000000000000000")
+            for _ in range(2)
+        )
+        mock_request.side_effect = [_response(503, {}), _response()]
+        first.get_credits()
+        mock_request.side_effect = [_response(503, {})]
+        with pytest.raises(InsumerAPIError):
+            second.get_credits()
+        assert second.retry_stats()["GET /credits"]["budget_denied"] == 1
+    finally:
+        RETRY_BUDGET.min_per_second = 1.0
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_connection_errors(mock_request, api, sleep):
+    refused = requests.ConnectionError(MagicMock(reason=NewConnectionError(None, "refused")))
+    mock_request.side_effect = [refused, _response()]
+    assert api.attest(wallet="0xabc", conditions=[]) == OK
+
+    # A POST that may have reached the server is not resent...
+    mock_request.side_effect = [requests.ConnectionError("reset"), _response()]
+    with pytest.raises(requests.ConnectionError):
+        api.attest(wallet="0xabc", conditions=[])
+    # ...but an idempotent GET is.
+    mock_request.side_effect = [requests.ReadTimeout("slow"), _response()]
+    assert api.get_credits() == OK
+
+
+def test_async_retry(api):
+    responses = [httpx.Response(502, text="Bad gateway"), httpx.Response(200, json=OK)]
+
+    async def run():
+        with patch("httpx.AsyncClient.request", AsyncMock(side_effect=responses)), patch(
+            "langchain_insumer.wrapper.asyncio.sleep", AsyncMock()
+        ) as sleep:
+            result = await api.aget_credits()
+        return result, sleep
+
+    result, sleep = asyncio.run(run())
+    assert result == OK
+    sleep.assert_awaited_once()
+    assert api.retry_stats()["GET /credits"]["reasons"] == {"server_error": 1}
+
+
+def test_async_error_keeps_text_body(api):
+    async def run():
+        response = httpx.Response(404, text="Not found")
+        with patch("httpx.AsyncClient.request", AsyncMock(return_value=response)):
+            await api.aget_merchant("m_1")
+
+    with pytest.raises(InsumerAPIError) as info:
+        asyncio.run(run())
+    assert info.value.body == "Not found"
+    assert info.value.endpoint == "GET /merchants/{id}"
+
+
+def test_retry_budget_ratio():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, window=10)
+    for _ in range(4):
+        budget.deposit()
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+    assert budget.available() == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(later) <= 30
+
+
+def test_endpoint_name():
+    assert endpoint_name("PUT", "/merchants/m_1/tokens") == "PUT /merchants/{id}/tokens"
+    assert endpoint_name("GET", "/codes/INSR-ABCDE") == "GET /codes/{code}"
+    assert endpoint_name("POST", "/trust/batch") == "POST /trust/batch"
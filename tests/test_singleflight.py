@@ -0,0 +1,123 @@
+"""Tests for sharing in-flight requests between identical concurrent calls."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from langchain_insumer import InsumerAPIWrapper
+from langchain_insumer.singleflight import AsyncSingleFlight, SingleFlight
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+
+
+def _slow_response(*args, **kwargs):
+    time.sleep(0.2)
+    resp = MagicMock()
+    resp.json.return_value = {"ok": True, "data": {"url": args[1], "params": kwargs.get("params")}}
+    return resp
+
+
+def _concurrently(fn, n=8):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(fn) for _ in range(n)]]
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request", side_effect=_slow_response)
+def test_identical_reads_share_one_request(mock_request):
+    api = InsumerAPIWrapper(api_key=KEY)
+    results = _concurrently(lambda: api.get_merchant("acme"))
+    assert mock_request.call_count == 1
+    assert all(r is results[0] for r in results)
+    assert api.singleflight_stats()["GET /merchants/{id}"] == {"calls": 8, "shared": 7}
+
+    # Different parameters are different questions; completed calls are not reused.
+    _concurrently(lambda: api.list_tokens(chain=1), n=2)
+    _concurrently(lambda: api.list_tokens(chain=137), n=2)
+    api.get_merchant("acme")
+    assert mock_request.call_count == 4
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request", side_effect=_slow_response)
+def test_credit_charging_posts_opt_in(mock_request):
+    api = InsumerAPIWrapper(api_key=KEY)
+    _concurrently(lambda: api.attest(wallet="0xabc", conditions=[]), n=4)
+    assert mock_request.call_count == 4
+
+    opted_in = InsumerAPIWrapper(api_key=KEY, singleflight_endpoints=["POST /attest"])
+    mock_request.reset_mock()
+    _concurrently(lambda: opted_in.attest(wallet="0xabc", conditions=[]), n=4)
+    _concurrently(lambda: opted_in.list_merchants(), n=4)
+    assert mock_request.call_count == 1 + 4
+
+
+def test_disabled():
+    api = InsumerAPIWrapper(api_key=KEY, singleflight_endpoints=[])
+    with patch("langchain_insumer.wrapper.requests.Session.request", side_effect=_slow_response) as m:
+        _concurrently(lambda: api.get_merchant("acme"), n=3)
+    assert m.call_count == 3
+
+
+def test_error_shared_by_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise requests.ConnectionError("down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "k", fail)
+        started.wait()
+        followers = [pool.submit(flight.do, "k", fail) for _ in range(2)]
+        for f in [leader, *followers]:
+            with pytest.raises(requests.ConnectionError):
+                f.result()
+    assert flight.stats()[""] == {"calls": 3, "shared": 2}
+
+
+def test_async_identical_reads_share_one_request():
+    api = InsumerAPIWrapper(api_key=KEY)
+    calls = []
+
+    async def fake_send(*args):
+        calls.append(args)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    async def run():
+        with patch.object(api, "_asend", side_effect=fake_send):
+            return await asyncio.gather(*(api.aget_merchant("acme") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [{"ok": True}] * 5
+
+
+def test_async_cancelled_leader_does_not_fail_waiters():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    # The follower runs the call again in place of the cancelled leader.
+    assert asyncio.run(run()) == 2
+    assert flight.stats()[""] == {"calls": 2, "shared": 1}
@@ -0,0 +1,60 @@
+"""Tests for InsumerToolkit."""
+
+import pytest
+
+import langchain_insumer
+from langchain_insumer import InsumerAPIWrapper, InsumerToolkit
+from langchain_insumer.toolkit import TOOL_SUBSETS
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+
+
+@pytest.fixture
+def api():
+    return InsumerAPIWrapper(api_key=KEY)
+
+
+def test_subsets_cover_every_tool_once():
+    names = [n for subset in TOOL_SUBSETS.values() for n in subset]
+    assert sorted(names) == sorted(n for n in langchain_insumer.__all__ if n.endswith("Tool"))
+
+
+def test_default_is_every_tool_sharing_one_wrapper(api):
+    tools = InsumerToolkit(api_wrapper=api).get_tools()
+    assert len(tools) == 26
+    assert all(t.api_wrapper is api for t in tools)
+    assert len({t.name for t in tools}) == 26
+    assert {t.output_mode for t in tools} == {"compact"}
+
+
+def test_subset_selection(api):
+    toolkit = InsumerToolkit(api_wrapper=api, subsets=["verification", "commerce"], output_mode="summary")
+    names = [t.name for t in toolkit.get_tools()]
+    assert names[:3] == ["insumer_attest", "insumer_compliance_templates", "insumer_wallet_trust"]
+    assert names[-1] == "insumer_validate_code"
+    assert len(names) == 10
+    assert {t.output_mode for t in toolkit.get_tools()} == {"summary"}
+
+    discovery = toolkit.get_tools(["discovery"])
+    assert [t.name for t in discovery] == [
+        "insumer_list_merchants",
+        "insumer_get_merchant",
+        "insumer_list_tokens",
+        "insumer_check_discount",
+    ]
+
+
+def test_tools_are_built_once(api):
+    toolkit = InsumerToolkit(api_wrapper=api, subsets=["discovery"])
+    first = toolkit.get_tools()
+    assert toolkit.get_tools() == first
+    assert toolkit.get_tool("insumer_get_merchant") is first[1]
+    assert toolkit.get_tool("InsumerGetMerchantTool") is first[1]
+    assert toolkit.get_tool("insumer_attest").name == "insumer_attest"
+
+
+def test_unknown_names_raise(api):
+    with pytest.raises(ValueError, match="merchant_admin"):
+        InsumerToolkit(api_wrapper=api, subsets=["merchant_admin"])
+    with pytest.raises(ValueError):
+        InsumerToolkit(api_wrapper=api).get_tool("insumer_nope")
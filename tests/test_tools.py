@@ -1,10 +1,17 @@
 """Tests for langchain-insumer tools."""
 
+import asyncio
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
+import langchain_insumer
 from langchain_insumer import (
     InsumerAPIWrapper,
     InsumerAttestTool,
@@ -12,8 +19,10 @@ from langchain_insumer import (
     InsumerCreditsTool,
     InsumerListMerchantsTool,
     InsumerListTokensTool,
+    InsumerRateLimitError,
     InsumerVerifyTool,
 )
+from langchain_insumer.batching import AsyncTrustCoalescer, _split_batch_response
 
 
 @pytest.fixture
@@ -21,6 +30,46 @@ def api():
     return InsumerAPIWrapper(api_key="insr_live_0000000000000000000000000000000000000000")
 
 
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"ok": True, "data": {"path": self.path}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+@pytest.fixture
+def local_api():
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api = InsumerAPIWrapper(
+        api_key="insr_live_0000000000000000000000000000000000000000",
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+    )
+    yield api
+    api.close()
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def mock_response():
     mock = MagicMock()
@@ -40,7 +89,7 @@ class TestInsumerAPIWrapper:
         assert headers["X-API-Key"] == "insr_live_0000000000000000000000000000000000000000"
         assert headers["Content-Type"] == "application/json"
 
-    @patch("langchain_insumer.wrapper.requests.post")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_attest(self, mock_post, api, mock_response):
         mock_response.json.return_value = {
             "ok": True,
@@ -76,7 +125,7 @@ class TestInsumerAPIWrapper:
         assert result["data"]["attestation"]["pass"] is True
         mock_post.assert_called_once()
 
-    @patch("langchain_insumer.wrapper.requests.post")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_attest_without_format(self, mock_post, api, mock_response):
         """attest without format — response unchanged, no jwt field."""
         mock_response.json.return_value = {
@@ -108,7 +157,7 @@ class TestInsumerAPIWrapper:
         sent_body = call_kwargs.kwargs.get("json", {})
         assert "format" not in sent_body
 
-    @patch("langchain_insumer.wrapper.requests.post")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_attest_with_jwt_format(self, mock_post, api, mock_response):
         """attest with format='jwt' — jwt field present in response."""
         mock_response.json.return_value = {
@@ -147,7 +196,7 @@ class TestInsumerAPIWrapper:
         sent_body = call_kwargs.kwargs.get("json", {})
         assert sent_body.get("format") == "jwt"
 
-    @patch("langchain_insumer.wrapper.requests.get")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_get_credits(self, mock_get, api, mock_response):
         mock_response.json.return_value = {
             "ok": True,
@@ -158,7 +207,7 @@ class TestInsumerAPIWrapper:
         result = api.get_credits()
         assert result["data"]["apiKeyCredits"] == 42
 
-    @patch("langchain_insumer.wrapper.requests.get")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_list_merchants(self, mock_get, api, mock_response):
         mock_response.json.return_value = {
             "ok": True,
@@ -170,7 +219,7 @@ class TestInsumerAPIWrapper:
         result = api.list_merchants(token="UNI", limit=10)
         assert len(result["data"]) == 1
 
-    @patch("langchain_insumer.wrapper.requests.get")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_check_discount(self, mock_get, api, mock_response):
         mock_response.json.return_value = {
             "ok": True,
@@ -185,8 +234,547 @@ class TestInsumerAPIWrapper:
         assert result["data"]["totalDiscount"] == 15
 
 
+class TestConnectionPool:
+    def test_connections_reused(self, local_api):
+        for _ in range(5):
+            local_api.get_credits()
+        stats = local_api.connection_stats()
+        assert stats["requests"] == 5
+        assert stats["connections"] == 1
+        assert stats["reused"] == 4
+
+    def test_pool_shared_across_threads(self, local_api):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda i: local_api.list_tokens(chain=i), range(40)))
+        assert all(r["ok"] for r in results)
+        stats = local_api.connection_stats()
+        assert stats["requests"] == 40
+        assert stats["connections"] <= local_api.pool_maxsize
+
+    def test_keep_alive_disabled(self):
+        api = InsumerAPIWrapper(
+            api_key="insr_live_0000000000000000000000000000000000000000",
+            keep_alive=False,
+        )
+        assert api._session.headers["Connection"] == "close"
+
+
+def _fake_batch(wallets, proof=None):
+    if wallets[0]["wallet"] == "0x10":
+        raise requests.ConnectionError("connection reset")
+    return {
+        "ok": True,
+        "data": {
+            "results": [{"wallet": w["wallet"], "trust": {"id": "TRST-" + w["wallet"]}} for w in wallets],
+            "summary": {"requested": len(wallets), "succeeded": len(wallets), "failed": 0},
+        },
+        "meta": {"creditsCharged": 3 * len(wallets), "creditsRemaining": 100 - 3 * len(wallets)},
+    }
+
+
+class TestBulkWalletTrust:
+    def test_chunks_and_merges(self, api):
+        wallets = [{"wallet": f"0x{i}"} for i in range(25)]
+        with patch.object(InsumerAPIWrapper, "batch_wallet_trust", side_effect=_fake_batch) as mock_batch:
+            result = api.bulk_wallet_trust(wallets, max_concurrency=2)
+        assert [len(c.args[0]) for c in mock_batch.call_args_list] == [10, 10, 5]
+        data = result["data"]
+        assert [r["wallet"] for r in data["results"]] == [w["wallet"] for w in wallets]
+        # The second chunk (0x10..0x19) failed as a whole.
+        assert all("error" in r for r in data["results"][10:20])
+        assert data["results"][10]["error"]["code"] == "request_failed"
+        assert data["summary"] == {"requested": 25, "succeeded": 15, "failed": 10}
+        assert result["meta"]["creditsCharged"] == 45
+        assert result["ok"] is True
+
+    def test_async_chunks_and_merges(self, api):
+        async def fake_abatch(wallets, proof=None):
+            return _fake_batch(wallets, proof)
+
+        wallets = [{"wallet": f"0x{i}"} for i in range(30, 53)]
+        with patch.object(InsumerAPIWrapper, "abatch_wallet_trust", side_effect=fake_abatch):
+            result = asyncio.run(api.abulk_wallet_trust(wallets, proof="merkle"))
+        assert result["data"]["summary"] == {"requested": 23, "succeeded": 23, "failed": 0}
+        assert result["meta"]["creditsRemaining"] == 70
+
+    def test_budget_refusal_is_a_chunk_error(self):
+        api = InsumerAPIWrapper(api_key="insr_live_" + "0" * 40, credit_budget=30)
+        wallets = [{"wallet": f"0x{i}"} for i in range(25)]
+        ok = MagicMock(ok=True, status_code=200, headers={})
+        ok.json.return_value = _fake_batch(wallets[:10])
+        with patch("langchain_insumer.wrapper.requests.Session.request", return_value=ok) as request:
+            result = api.bulk_wallet_trust(wallets, max_concurrency=1)
+        assert request.call_count == 1
+        assert result["data"]["summary"] == {"requested": 25, "succeeded": 10, "failed": 15}
+        assert result["data"]["results"][10]["error"]["code"] == "budget_exceeded"
+
+    def test_async_rate_limit_refusal_is_a_chunk_error(self, api):
+        async def fake_abatch(wallets, proof=None):
+            if wallets[0]["wallet"] == "0x10":
+                raise InsumerRateLimitError("POST /trust/batch", "write", 2.5)
+            return _fake_batch(wallets, proof)
+
+        wallets = [{"wallet": f"0x{i}"} for i in range(25)]
+        with patch.object(InsumerAPIWrapper, "abatch_wallet_trust", side_effect=fake_abatch):
+            result = asyncio.run(api.abulk_wallet_trust(wallets))
+        error = result["data"]["results"][10]["error"]
+        assert (error["code"], error["retryAfter"]) == ("rate_limited", 2.5)
+        assert result["data"]["summary"]["failed"] == 10
+
+
+def _fake_trust_post(path, body=None):
+    if path == "/trust/batch":
+        return {
+            "ok": True,
+            "data": {
+                "results": [{"trust": {"wallet": w["wallet"]}, "sig": "s", "kid": "k"} for w in body["wallets"]],
+                "summary": {"requested": len(body["wallets"]), "succeeded": len(body["wallets"]), "failed": 0},
+            },
+            "meta": {"creditsCharged": 3 * len(body["wallets"]), "creditsRemaining": 50},
+        }
+    return {"ok": True, "data": {"trust": {"wallet": body["wallet"]}}, "meta": {"creditsCharged": 3}}
+
+
+class TestTrustCoalescing:
+    @pytest.fixture
+    def coalescing_api(self):
+        return InsumerAPIWrapper(
+            api_key="insr_live_0000000000000000000000000000000000000000",
+            trust_coalesce_window_ms=50,
+        )
+
+    def test_concurrent_calls_share_one_batch(self, coalescing_api):
+        wallets = [f"0x{i:040x}" for i in range(6)]
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=_fake_trust_post) as mock_post:
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                results = list(pool.map(lambda w: coalescing_api.wallet_trust(wallet=w), wallets))
+        assert [c.args[0] for c in mock_post.call_args_list] == ["/trust/batch"]
+        assert [r["data"]["trust"]["wallet"] for r in results] == wallets
+        assert results[0]["meta"]["creditsCharged"] == 3
+
+    def test_proof_settings_batched_separately(self, coalescing_api):
+        calls = [("0x01", None), ("0x02", "merkle"), ("0x03", None), ("0x04", "merkle")]
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=_fake_trust_post) as mock_post:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda c: coalescing_api.wallet_trust(wallet=c[0], proof=c[1]), calls))
+        proofs = sorted(str(c.args[1].get("proof")) for c in mock_post.call_args_list)
+        assert proofs == ["None", "merkle"]
+
+    def test_lone_call_goes_to_trust(self, coalescing_api):
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=_fake_trust_post) as mock_post:
+            result = coalescing_api.wallet_trust(wallet="0x01", proof="merkle")
+        mock_post.assert_called_once_with("/trust", {"wallet": "0x01", "proof": "merkle"})
+        assert result["data"]["trust"]["wallet"] == "0x01"
+
+    def test_async_calls_share_one_batch(self, coalescing_api):
+        async def fake_apost(path, body=None):
+            return _fake_trust_post(path, body)
+
+        async def main():
+            return await asyncio.gather(*(coalescing_api.awallet_trust(wallet=f"0x{i}") for i in range(4)))
+
+        with patch.object(InsumerAPIWrapper, "_apost", side_effect=fake_apost) as mock_apost:
+            results = asyncio.run(main())
+        assert mock_apost.call_count == 1
+        assert [r["data"]["trust"]["wallet"] for r in results] == ["0x0", "0x1", "0x2", "0x3"]
+
+    def test_split_credits_add_up(self):
+        batch = {
+            "ok": True,
+            "data": {"results": [{"trust": {}}, {"error": {"code": "rpc_failure"}}, {"trust": {}}]},
+            "meta": {"creditsCharged": 7, "creditsRemaining": 40},
+        }
+        split = _split_batch_response(batch, 3)
+        charged = [r["meta"]["creditsCharged"] for r in split]
+        assert charged == [4, 0, 3]
+        assert all(isinstance(c, int) for c in charged)
+        assert sum(charged) == batch["meta"]["creditsCharged"]
+        assert split[1]["meta"]["creditsRemaining"] == 40
+
+    def test_cancelled_leader_does_not_strand_followers(self):
+        async def fake_apost(path, body=None):
+            return _fake_trust_post(path, body)
+
+        coalescer = AsyncTrustCoalescer(
+            lambda body: fake_apost("/trust", body),
+            lambda wallets, proof: fake_apost("/trust/batch", {"wallets": wallets}),
+            window=0.05,
+        )
+
+        async def main():
+            leader = asyncio.ensure_future(coalescer.submit({"wallet": "0x1"}))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(coalescer.submit({"wallet": f"0x{i}"})) for i in (2, 3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.wait_for(asyncio.gather(*followers), 1)
+            later = await asyncio.wait_for(coalescer.submit({"wallet": "0x4"}), 1)
+            return leader, results, later
+
+        leader, results, later = asyncio.run(main())
+        assert leader.cancelled()
+        assert [r["data"]["trust"]["wallet"] for r in results] == ["0x2", "0x3"]
+        assert later["data"]["trust"]["wallet"] == "0x4"
+
+
+def _jwks_response(kids, cache_control="public, max-age=3600"):
+    mock = MagicMock()
+    mock.json.return_value = {"keys": [{"kty": "EC", "crv": "P-256", "kid": kid} for kid in kids]}
+    mock.headers = {"Cache-Control": cache_control}
+    return mock
+
+
+class TestJwksCache:
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_document_cached_per_cache_control(self, mock_request, api):
+        mock_request.return_value = _jwks_response(["insumer-attest-v1"])
+        assert api.get_jwks()["keys"][0]["kid"] == "insumer-attest-v1"
+        api.get_jwks()
+        assert mock_request.call_count == 1
+        assert api.jwks_cache_stats()["hits"] == 1
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_no_store_refetches(self, mock_request, api):
+        mock_request.return_value = _jwks_response(["insumer-attest-v1"], "no-store")
+        api.get_jwks()
+        api.get_jwks()
+        assert mock_request.call_count == 2
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_unknown_kid_refetches_once(self, mock_request, api):
+        mock_request.return_value = _jwks_response(["insumer-attest-v1"])
+        assert api.get_signing_key("insumer-attest-v1")["kid"] == "insumer-attest-v1"
+        assert api.get_signing_key("insumer-attest-v1") is not None
+        assert mock_request.call_count == 1
+
+        # Key rotation: v2 appears; concurrent lookups share one refetch.
+        api._jwks_cache.min_refresh_interval = 0
+        mock_request.return_value = _jwks_response(["insumer-attest-v1", "insumer-attest-v2"])
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            keys = list(pool.map(lambda _: api.get_signing_key("insumer-attest-v2"), range(8)))
+        assert all(k["kid"] == "insumer-attest-v2" for k in keys)
+        assert mock_request.call_count == 2
+        stats = api.jwks_cache_stats()
+        assert stats["refreshes"] == 2
+        assert stats["kids"] == ["insumer-attest-v1", "insumer-attest-v2"]
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_refetch_drops_withdrawn_kids(self, mock_request, api):
+        mock_request.return_value = _jwks_response(["insumer-attest-v1", "insumer-attest-v2"])
+        api.get_jwks()
+        api._jwks_cache.min_refresh_interval = 0
+        mock_request.return_value = _jwks_response(["insumer-attest-v2"])
+        assert api.get_signing_key("insumer-attest-v3") is None
+        assert api.jwks_cache_stats()["kids"] == ["insumer-attest-v2"]
+        assert api.get_signing_key("insumer-attest-v1") is None
+
+    def test_cancelled_fetch_does_not_strand_waiters(self):
+        from langchain_insumer.jwks_cache import JwksCache
+
+        calls = []
+
+        async def afetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"keys": [{"kid": "insumer-attest-v2"}]}, {}
+
+        cache = JwksCache(fetch=MagicMock(), afetch=afetch)
+
+        async def main():
+            leader = asyncio.ensure_future(cache.aget_key("insumer-attest-v2"))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(cache.aget_key("insumer-attest-v2"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return leader, await asyncio.wait_for(waiter, 1)
+
+        leader, key = asyncio.run(main())
+        assert leader.cancelled()
+        assert key == {"kid": "insumer-attest-v2"}
+        assert len(calls) == 2
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_unknown_kid_rate_limited(self, mock_request, api):
+        mock_request.return_value = _jwks_response(["insumer-attest-v1"])
+        api.get_jwks()
+        assert api.get_signing_key("bogus") is None
+        assert mock_request.call_count == 1
+
+    def test_cache_disabled(self):
+        api = InsumerAPIWrapper(
+            api_key="insr_live_0000000000000000000000000000000000000000",
+            jwks_cache=False,
+        )
+        with patch("langchain_insumer.wrapper.requests.Session.request") as mock_request:
+            mock_request.return_value = _jwks_response(["insumer-attest-v1"])
+            api.get_jwks()
+            api.get_jwks()
+        assert mock_request.call_count == 2
+
+
+def _attest_response(expires_in: timedelta) -> MagicMock:
+    expires_at = datetime.now(timezone.utc) + expires_in
+    mock = MagicMock()
+    mock.json.return_value = {
+        "ok": True,
+        "data": {
+            "attestation": {"id": "ATST-1", "pass": True, "expiresAt": expires_at.isoformat().replace("+00:00", "Z")},
+            "sig": "sig",
+            "kid": "insumer-attest-v1",
+        },
+    }
+    return mock
+
+
+class TestAttestCache:
+    CONDITION = {"type": "token_balance", "contractAddress": "0xA0b8", "chainId": 1, "threshold": 100}
+
+    @pytest.fixture
+    def cached_api(self):
+        return InsumerAPIWrapper(
+            api_key="insr_live_0000000000000000000000000000000000000000",
+            attest_cache_size=2,
+            max_retries=0,
+        )
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_repeat_question_served_from_cache(self, mock_request, cached_api):
+        mock_request.return_value = _attest_response(timedelta(minutes=30))
+        first = cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        # Same question with the threshold as a string normalizes to the same key.
+        second = cached_api.attest(wallet="0xabc", conditions=[{**self.CONDITION, "threshold": "100"}])
+        assert second["data"] is first["data"]
+        # A cache hit charged nothing.
+        assert second["meta"] == {"creditsCharged": 0, "cached": True}
+        assert mock_request.call_count == 1
+        assert cached_api.attest_cache_stats()["hits"] == 1
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_bypass_and_distinct_keys(self, mock_request, cached_api):
+        mock_request.return_value = _attest_response(timedelta(minutes=30))
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION], use_cache=False)
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION], proof="merkle")
+        cached_api.attest(wallet="0xdef", conditions=[self.CONDITION])
+        assert mock_request.call_count == 4
+        assert cached_api.attest_cache_stats()["evictions"] == 1
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_not_served_near_expiry(self, mock_request, cached_api):
+        mock_request.return_value = _attest_response(timedelta(seconds=30))
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        assert mock_request.call_count == 2
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_failures_not_cached(self, mock_request, cached_api):
+        mock_request.return_value.json.return_value = {"ok": False, "error": {"code": "rpc_failure"}}
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        cached_api.attest(wallet="0xabc", conditions=[self.CONDITION])
+        assert mock_request.call_count == 2
+
+
+def _fake_attest_post(path, body=None):
+    # Each condition passes iff its threshold is even; ids name the first threshold.
+    conditions = body["conditions"]
+    results = [
+        {"condition": i, "met": int(c["threshold"]) % 2 == 0} for i, c in enumerate(conditions)
+    ]
+    return {
+        "ok": True,
+        "data": {
+            "attestation": {
+                "id": f"ATST-{conditions[0]['threshold']}",
+                "pass": all(r["met"] for r in results),
+                "results": results,
+                "passCount": sum(r["met"] for r in results),
+                "failCount": sum(not r["met"] for r in results),
+                "attestedAt": "2026-02-28T12:34:57.000Z",
+                "expiresAt": f"2026-02-28T13:0{len(conditions) % 10}:00.000Z",
+            },
+            "sig": "sig",
+            "kid": "insumer-attest-v1",
+        },
+        "meta": {"creditsCharged": 1, "creditsRemaining": 100 - int(conditions[0]["threshold"])},
+    }
+
+
+class TestStaleWhileRevalidate:
+    @pytest.fixture
+    def swr_api(self):
+        api = InsumerAPIWrapper(
+            api_key="insr_live_0000000000000000000000000000000000000000",
+            stale_while_revalidate=True,
+            swr_ttls={"GET /tokens": (10.0, 100.0)},
+        )
+        yield api
+        api.close()
+
+    @staticmethod
+    def _versions():
+        versions = iter(range(1, 100))
+        return lambda path, params=None: {"ok": True, "data": {"version": next(versions)}}
+
+    def test_soft_and_hard_ttl(self, swr_api):
+        clock = [1000.0]
+        with patch("langchain_insumer.cache.time.monotonic", lambda: clock[0]), patch.object(
+            InsumerAPIWrapper, "_public_get", side_effect=self._versions()
+        ) as get:
+            assert swr_api.list_tokens(chain=1)["data"]["version"] == 1
+            clock[0] += 5
+            assert swr_api.list_tokens(chain=1)["data"]["version"] == 1
+            assert get.call_count == 1
+
+            # Past the soft TTL: the stale value is returned and refreshed behind it.
+            clock[0] += 10
+            assert swr_api.list_tokens(chain=1)["data"]["version"] == 1
+            swr_api._swr._executor.shutdown(wait=True)
+            assert swr_api.list_tokens(chain=1)["data"]["version"] == 2
+
+            # Past the hard TTL the caller waits for a fresh response.
+            clock[0] += 500
+            assert swr_api.list_tokens(chain=1)["data"]["version"] == 3
+            # Other parameters and endpoints are cached separately, with their own TTLs.
+            assert swr_api.list_tokens(chain=137)["data"]["version"] == 4
+            assert swr_api.get_compliance_templates()["data"]["version"] == 5
+        stats = swr_api.swr_stats()
+        assert stats["stale_hits"] == 1
+        assert stats["refreshes"] == 1
+
+    def test_failures_not_cached_and_refresh_errors_keep_stale(self, swr_api):
+        clock = [1000.0]
+        failing = {"ok": False, "error": {"code": "internal"}}
+        with patch("langchain_insumer.cache.time.monotonic", lambda: clock[0]):
+            with patch.object(InsumerAPIWrapper, "_public_get", return_value=failing) as get:
+                swr_api.get_merchant("m_1")
+                swr_api.get_merchant("m_1")
+            assert get.call_count == 2
+            with patch.object(InsumerAPIWrapper, "_public_get", side_effect=self._versions()):
+                swr_api.get_merchant("m_1")
+            clock[0] += 61
+            with patch.object(InsumerAPIWrapper, "_public_get", side_effect=requests.ConnectionError):
+                assert swr_api.get_merchant("m_1")["data"]["version"] == 1
+                swr_api._swr._executor.shutdown(wait=True)
+        assert swr_api.swr_stats()["refresh_errors"] == 1
+
+    def test_async_revalidates_in_task(self, swr_api):
+        clock = [1000.0]
+        versions = self._versions()
+
+        async def fetch(path, params=None):
+            return versions(path, params)
+
+        async def run():
+            first = await swr_api.alist_merchants()
+            clock[0] += 61
+            stale = await swr_api.alist_merchants()
+            await asyncio.gather(*swr_api._swr._tasks)
+            fresh = await swr_api.alist_merchants()
+            return first, stale, fresh
+
+        with patch("langchain_insumer.cache.time.monotonic", lambda: clock[0]), patch.object(
+            InsumerAPIWrapper, "_apublic_get", side_effect=fetch
+        ):
+            first, stale, fresh = asyncio.run(run())
+        assert [r["data"]["version"] for r in (first, stale, fresh)] == [1, 1, 2]
+
+    def test_off_by_default(self, api):
+        with patch.object(InsumerAPIWrapper, "_public_get", side_effect=self._versions()) as get:
+            api.list_tokens()
+            api.list_tokens()
+        assert get.call_count == 2
+        assert api.swr_stats() == {}
+
+
+class TestAttestSplit:
+    CONDITIONS = [
+        {"type": "token_balance", "contractAddress": "0xA0b8", "chainId": 1, "threshold": str(2 * i)}
+        for i in range(23)
+    ]
+
+    def test_split_and_merged_in_order(self, api):
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=_fake_attest_post) as post:
+            resp = api.attest(wallet="0xabc", conditions=self.CONDITIONS)
+        sizes = sorted(len(c.args[1]["conditions"]) for c in post.call_args_list)
+        assert sizes == [3, 10, 10]
+        att = resp["data"]["attestation"]
+        assert [r["condition"] for r in att["results"]] == list(range(23))
+        assert att["pass"] is True and att["passCount"] == 23
+        assert att["ids"] == ["ATST-0", "ATST-20", "ATST-40"]
+        assert att["expiresAt"] == "2026-02-28T13:00:00.000Z"
+        assert [p["offset"] for p in resp["data"]["parts"]] == [0, 10, 20]
+        assert all(p["sig"] == "sig" for p in resp["data"]["parts"])
+        # Parts keep their signed, un-remapped results.
+        assert resp["data"]["parts"][1]["attestation"]["results"][0]["condition"] == 0
+        assert resp["meta"] == {"creditsCharged": 3, "creditsRemaining": 60}
+
+    def test_aggregate_fail_and_part_error(self, api):
+        conditions = [dict(c) for c in self.CONDITIONS[:12]]
+        conditions[11]["threshold"] = "3"
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=_fake_attest_post):
+            resp = api.attest(wallet="0xabc", conditions=conditions)
+        assert resp["data"]["attestation"]["pass"] is False
+
+        def failing(path, body=None):
+            if body["conditions"][0]["threshold"] == "20":
+                return {"ok": False, "error": {"code": "rpc_failure"}, "meta": {"creditsCharged": 0}}
+            return _fake_attest_post(path, body)
+
+        with patch.object(InsumerAPIWrapper, "_post", side_effect=failing):
+            resp = api.attest(wallet="0xabc", conditions=self.CONDITIONS[:12])
+        assert resp["ok"] is False
+        assert resp["error"]["code"] == "rpc_failure"
+
+    def test_async_split(self, api):
+        async def fake(path, body=None):
+            return _fake_attest_post(path, body)
+
+        with patch.object(InsumerAPIWrapper, "_apost", side_effect=fake) as post:
+            resp = asyncio.run(api.aattest(wallet="0xabc", conditions=self.CONDITIONS))
+        assert post.call_count == 3
+        assert [r["condition"] for r in resp["data"]["attestation"]["results"]] == list(range(23))
+
+
+class TestAsync:
+    def test_async_methods_share_one_loop(self, local_api):
+        async def main():
+            results = await asyncio.gather(
+                *(local_api.awallet_trust(wallet=f"0x{i:040x}") for i in range(50))
+            )
+            await local_api.aclose()
+            return results
+
+        results = asyncio.run(main())
+        assert len(results) == 50
+        assert all(r["data"]["path"] == "/v1/trust" for r in results)
+        stats = local_api.connection_stats()
+        assert stats["requests"] == 50
+        assert stats["connections"] <= local_api.async_max_connections
+
+    def test_aattest_normalizes_conditions(self, api):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"ok": True}
+
+        async def main():
+            with patch("httpx.AsyncClient.request", return_value=mock_resp) as mock_request:
+                await api.aattest(
+                    wallet="0x1234567890abcdef1234567890abcdef12345678",
+                    conditions=[{"type": "token_balance", "threshold": 100}],
+                )
+            return mock_request.call_args.kwargs["json"]
+
+        sent_body = asyncio.run(main())
+        assert sent_body["conditions"][0]["threshold"] == "100"
+        assert sent_body["wallet"] == "0x1234567890abcdef1234567890abcdef12345678"
+
+    def test_tool_ainvoke_uses_async_client(self, local_api):
+        tool = InsumerListTokensTool(api_wrapper=local_api)
+        result = asyncio.run(tool.ainvoke({"chain": 1}))
+        assert json.loads(result)["data"]["path"] == "/v1/tokens?chain=1"
+
+
 class TestTools:
-    @patch("langchain_insumer.wrapper.requests.post")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_attest_tool(self, mock_post, api, mock_response):
         mock_response.json.return_value = {
             "ok": True,
@@ -197,14 +785,16 @@ class TestTools:
         tool = InsumerAttestTool(api_wrapper=api)
         assert tool.name == "insumer_attest"
 
-        result = tool._run(
+        content, artifact = tool._run(
             conditions=json.dumps([{"type": "token_balance", "contractAddress": "0x...", "chainId": 1, "threshold": 100}]),
             wallet="0x1234567890abcdef1234567890abcdef12345678",
         )
-        parsed = json.loads(result)
+        parsed = json.loads(content)
         assert parsed["ok"] is True
+        assert content == json.dumps(mock_response.json.return_value, indent=2)
+        assert artifact is mock_response.json.return_value
 
-    @patch("langchain_insumer.wrapper.requests.post")
+    @patch("langchain_insumer.wrapper.requests.Session.request")
     def test_attest_tool_with_jwt_format(self, mock_post, api, mock_response):
         """InsumerAttestTool passes format parameter through."""
         mock_response.json.return_value = {
@@ -217,14 +807,15 @@ class TestTools:
         mock_post.return_value = mock_response
 
         tool = InsumerAttestTool(api_wrapper=api)
-        result = tool._run(
+        content, artifact = tool._run(
             conditions=json.dumps([{"type": "token_balance", "contractAddress": "0x...", "chainId": 1, "threshold": 100}]),
             wallet="0x1234567890abcdef1234567890abcdef12345678",
             format="jwt",
         )
-        parsed = json.loads(result)
+        parsed = json.loads(content)
         assert parsed["ok"] is True
         assert "jwt" in parsed["data"]
+        assert parsed == artifact
 
     def test_credits_tool_name(self, api):
         tool = InsumerCreditsTool(api_wrapper=api)
@@ -245,3 +836,20 @@ class TestTools:
     def test_verify_tool_name(self, api):
         tool = InsumerVerifyTool(api_wrapper=api)
         assert tool.name == "insumer_verify"
+
+    def test_every_tool_returns_content_and_artifact(self, api):
+        tools = [getattr(langchain_insumer, n)(api_wrapper=api) for n in langchain_insumer.__all__ if n.endswith("Tool")]
+        assert len(tools) == 26
+        assert {t.response_format for t in tools} == {"content_and_artifact"}
+
+    @patch("langchain_insumer.wrapper.requests.Session.request")
+    def test_tool_call_message_carries_response(self, mock_request, api, mock_response):
+        body = {"ok": True, "data": {"credits": 100}}
+        mock_response.json.return_value = body
+        mock_request.return_value = mock_response
+        tool = InsumerCreditsTool(api_wrapper=api)
+        message = tool.invoke({"type": "tool_call", "id": "call-1", "name": tool.name, "args": {}})
+        assert message.artifact is body
+        assert message.content == json.dumps(body, indent=2)
+        compact = InsumerCreditsTool(api_wrapper=api, output_mode="compact")
+        assert compact.invoke({}) == '{"ok":true,"data":{"credits":100}}'
@@ -0,0 +1,143 @@
+"""Tests for OpenTelemetry tracing spans."""
+
+import asyncio
+import contextlib
+import importlib.util
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper, InsumerAttestTool
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+ATTEST_OK = {
+    "ok": True,
+    "data": {"attestation": {"id": "ATST-1", "pass": True, "passCount": 2, "failCount": 0}},
+    "meta": {"creditsCharged": 1, "creditsRemaining": 99},
+}
+CONDITIONS = [
+    {"type": "token_balance", "contractAddress": "native", "chainId": 1, "threshold": "1"},
+    {"type": "token_balance", "contractAddress": "native", "chainId": 8453, "threshold": "1"},
+]
+HAS_OTEL = importlib.util.find_spec("opentelemetry") is not None
+
+
+class _Span:
+    def __init__(self, name: str, attributes: dict, parent: "_Span") -> None:
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent.name if parent is not None else None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class _RecordingTracer:
+    """Just enough of the ``opentelemetry.trace.Tracer`` interface."""
+
+    def __init__(self) -> None:
+        self.spans: list[_Span] = []
+        self._stack: list[_Span] = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        span = _Span(name, dict(attributes or {}), self._stack[-1] if self._stack else None)
+        self.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield span
+        finally:
+            self._stack.pop()
+
+    def named(self, name: str) -> _Span:
+        return next(s for s in self.spans if s.name == name)
+
+
+def _response(body) -> MagicMock:
+    resp = MagicMock(ok=True, status_code=200, content=json.dumps(body).encode())
+    resp.json.return_value = body
+    return resp
+
+
+@pytest.mark.skipif(HAS_OTEL, reason="opentelemetry is installed")
+def test_tracing_needs_opentelemetry():
+    with pytest.raises(ImportError, match=r"langchain-insumer\[otel\]"):
+        InsumerAPIWrapper(api_key=KEY, tracing=True)
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_http_span_attributes(mock_request):
+    mock_request.return_value = _response(ATTEST_OK)
+    tracer = _RecordingTracer()
+    api = InsumerAPIWrapper(api_key=KEY, tracing=tracer)
+    api.attest(wallet="0x" + "ab" * 20, conditions=CONDITIONS)
+
+    (span,) = tracer.spans
+    assert span.name == "POST /attest"
+    assert span.attributes["http.request.method"] == "POST"
+    assert span.attributes["url.template"] == "/attest"
+    assert span.attributes["insumer.condition_count"] == 2
+    assert span.attributes["insumer.chain_ids"] == ["1", "8453"]
+    assert span.attributes["insumer.credits_charged"] == 1
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.attributes["http.response.body.size"] == len(mock_request.return_value.content)
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_tool_spans_nest(mock_request):
+    mock_request.return_value = _response(ATTEST_OK)
+    tracer = _RecordingTracer()
+    tool = InsumerAttestTool(api_wrapper=InsumerAPIWrapper(api_key=KEY, tracing=tracer))
+    tool.invoke({"wallet": "0x" + "ab" * 20, "conditions": json.dumps(CONDITIONS)})
+
+    assert [(s.name, s.parent) for s in tracer.spans] == [
+        ("execute_tool insumer_attest", None),
+        ("insumer_attest._run", "execute_tool insumer_attest"),
+        ("POST /attest", "insumer_attest._run"),
+        ("insumer.render", "insumer_attest._run"),
+    ]
+    run = tracer.named("insumer_attest._run")
+    assert run.attributes["gen_ai.tool.name"] == "insumer_attest"
+    assert run.attributes["insumer.credits_charged"] == 1
+    assert run.attributes["insumer.content_size"] > 0
+
+
+def test_async_tool_spans():
+    tracer = _RecordingTracer()
+    api = InsumerAPIWrapper(api_key=KEY, tracing=tracer)
+    tool = InsumerAttestTool(api_wrapper=api)
+    resp = MagicMock(is_success=True, status_code=200, content=b"{}")
+    resp.json.return_value = ATTEST_OK
+
+    async def run():
+        with patch("httpx.AsyncClient.request", return_value=resp):
+            await tool.ainvoke({"wallet": "0x" + "ab" * 20, "conditions": json.dumps(CONDITIONS)})
+
+    asyncio.run(run())
+    assert [s.name for s in tracer.spans][:3] == [
+        "execute_tool insumer_attest",
+        "insumer_attest._arun",
+        "POST /attest",
+    ]
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_untraced_by_default(mock_request):
+    mock_request.return_value = _response(ATTEST_OK)
+    tool = InsumerAttestTool(api_wrapper=InsumerAPIWrapper(api_key=KEY))
+    tool.invoke({"wallet": "0x" + "ab" * 20, "conditions": json.dumps(CONDITIONS)})
+    assert "traceparent" not in mock_request.call_args.kwargs["headers"]
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_trace_context_propagates(mock_request):
+    trace = pytest.importorskip("opentelemetry.trace")
+    TracerProvider = pytest.importorskip("opentelemetry.sdk.trace").TracerProvider
+
+    mock_request.return_value = _response(ATTEST_OK)
+    api = InsumerAPIWrapper(api_key=KEY, tracing=TracerProvider().get_tracer("test"))
+    api.attest(wallet="0x" + "ab" * 20, conditions=CONDITIONS)
+    traceparent = mock_request.call_args.kwargs["headers"]["traceparent"]
+    assert traceparent.startswith("00-")
+    assert trace.get_current_span() is trace.INVALID_SPAN
@@ -0,0 +1,151 @@
+"""Tests for offline address and condition validation."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from langchain_insumer import InsumerAPIWrapper, InsumerValidationError
+from langchain_insumer.validation import (
+    condition_errors,
+    is_bitcoin_address,
+    is_evm_address,
+    is_solana_address,
+    is_stellar_address,
+    is_sui_address,
+    is_tron_address,
+    is_valid_address,
+    is_xrpl_address,
+    keccak256,
+    request_errors,
+    to_checksum_address,
+    validate_addresses,
+)
+
+KEY = "insr_live_0000000000000000000000000000000000000000"
+VITALIK = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+
+def test_keccak256():
+    assert keccak256(b"").hex() == "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+    # Spans two 136-byte blocks.
+    assert keccak256(b"a" * 200).hex() == "96ea54061def936c4be90b518992fdc6f12f535068a256229aca54267b4d084d"
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+        "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+        "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+        "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+    ],
+)
+def test_eip55(address):
+    assert to_checksum_address(address.lower()) == address
+    assert is_evm_address(address)
+    assert is_evm_address(address.lower())
+    assert not is_evm_address(address.swapcase().replace("0X", "0x"))
+    assert is_evm_address(address.swapcase().replace("0X", "0x"), checksum=False)
+
+
+def test_address_formats():
+    assert not is_evm_address(VITALIK[:-1])
+    assert not is_evm_address("d8da6bf26964af9d7eed9e03e53415d37aa96045")
+
+    assert is_solana_address("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")
+    assert not is_solana_address("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1vz")
+    assert not is_solana_address("0OIl" * 10)
+
+    assert is_xrpl_address("rG1QQv2nh2gr7RCZ1P8YYcBUKCCN633jCn")
+    assert not is_xrpl_address("rG1QQv2nh2gr7RCZ1P8YYcBUKCCN633jCm")
+
+    for address in (
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+        "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy",
+        "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq",
+        "BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4",
+        "bc1p5d7rjq7g6rdk2yhzks9smlaqtedr4dekq08ge8ztwac72sfr9rusxg3297",
+    ):
+        assert is_bitcoin_address(address), address
+    for address in (
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNb",
+        "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdr",
+        "bc1Qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq",
+        "tb1qw508d6qejxtdg4y5r3zarvary0c5xw7kxpjzsx",
+        # Taproot checksummed with bech32 instead of bech32m.
+        "bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7k7grplx",
+    ):
+        assert not is_bitcoin_address(address), address
+
+    assert is_tron_address("TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t")
+    assert not is_tron_address("TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6u")
+
+    assert is_stellar_address("GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVN")
+    assert not is_stellar_address("GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVM")
+
+    assert is_sui_address("0x" + "ab" * 32)
+    assert not is_sui_address("0x" + "ab" * 20)
+
+
+def test_bulk_and_dispatch():
+    assert validate_addresses(1, [VITALIK, VITALIK.lower(), "0x1"]) == [True, True, False]
+    assert is_valid_address("XRPL", "rG1QQv2nh2gr7RCZ1P8YYcBUKCCN633jCn")
+    with pytest.raises(ValueError):
+        is_valid_address("cosmos", "cosmos1abc")
+
+
+def test_condition_shape():
+    good = {"type": "token_balance", "contractAddress": USDC, "chainId": 1, "threshold": "1000"}
+    assert condition_errors(good) == []
+    assert condition_errors({**good, "threshold": 1000}) == [
+        'threshold must be a decimal string like "1000" or "0.5", got 1000'
+    ]
+    assert condition_errors({**good, "threshold": "1e-05"})
+    assert condition_errors({"type": "token_balance", "chainId": 1}) == [
+        "contractAddress is required for token_balance",
+        "threshold is required for token_balance",
+    ]
+    assert condition_errors({"type": "eas_attestation"}) == ["eas_attestation needs a template or schemaId"]
+    assert condition_errors({"type": "nft_balance"})[0].startswith("unknown type")
+    assert condition_errors({**good, "chainId": "cosmos"}) == ["unsupported chainId 'cosmos'"]
+    assert condition_errors(
+        {"type": "ratio_to_supply", "contractAddress": "native", "chainId": 1, "minFraction": "1.5"}
+    ) == ["minFraction must be in (0, 1]", "contractAddress: ratio_to_supply needs a token contract, not native"]
+    xrp = {"type": "token_balance", "contractAddress": "native", "chainId": "xrpl", "threshold": "100"}
+    assert condition_errors(xrp, {"wallet": VITALIK}) == ["chainId 'xrpl' needs xrplWallet"]
+
+
+def test_request_errors():
+    conditions = [{"type": "farcaster_id"}] * 11
+    assert request_errors({"wallet": VITALIK, "conditions": conditions}, max_conditions=10) == [
+        "conditions: at most 10 per request, got 11"
+    ]
+    errors = request_errors({"wallets": [{"wallet": VITALIK}, {"wallet": VITALIK, "tronWallet": "T1"}, {}]})
+    assert errors == ["wallets[1].tronWallet: not a valid Tron T-address", "wallets[2]: wallet is required"]
+
+
+@patch("langchain_insumer.wrapper.requests.Session.request")
+def test_wrapper_rejects_before_sending(mock_request):
+    api = InsumerAPIWrapper(api_key=KEY, validate_inputs=True)
+    with pytest.raises(InsumerValidationError) as excinfo:
+        api.attest(
+            wallet=VITALIK.lower()[:-1],
+            conditions=[{"type": "token_balance", "contractAddress": USDC, "chainId": 1, "threshold": 0.00001}],
+        )
+    assert excinfo.value.errors == [
+        "wallet: not a valid EVM address (0x + 40 hex, EIP-55 checksum if mixed-case)",
+        'conditions[0]: threshold must be a decimal string like "1000" or "0.5", got \'1e-05\'',
+    ]
+    with pytest.raises(InsumerValidationError):
+        api.verify(merchant_id="acme", solana_wallet="not-base58!")
+    with pytest.raises(InsumerValidationError):
+        api.bulk_wallet_trust([{"wallet": VITALIK}] * 30 + [{"wallet": "0x0"}])
+    with pytest.raises(InsumerValidationError):
+        asyncio.run(api.awallet_trust(wallet=VITALIK, xrpl_wallet="rNope"))
+    mock_request.assert_not_called()
+
+    # Off by default: the server is the judge.
+    InsumerAPIWrapper(api_key=KEY).verify(merchant_id="acme", solana_wallet="not-base58!")
+    assert mock_request.call_count == 1
@@ -0,0 +1,214 @@
+"""Tests for local attestation signature verification."""
+
+import base64
+import copy
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from langchain_insumer import verify
+from langchain_insumer.verify import condition_hash, load_jwks, verify_many, verify_response
+
+FIXTURES = Path(__file__).parent / "fixtures"
+VECTORS = json.loads((FIXTURES / "attestation_vectors.json").read_text())["vectors"]
+PRIVATE_KEY = 0xC9AFA9D845BA75166B5C215767B1D6934E50C3DB36E89B127B8A622B120F6721
+NOW = datetime(2026, 2, 28, 12, 40, tzinfo=timezone.utc)
+
+
+def _b64url(n: int) -> str:
+    return base64.urlsafe_b64encode(n.to_bytes(32, "big")).rstrip(b"=").decode()
+
+
+def _v1_preimage(attestation: dict) -> bytes:
+    # insumer-attest-v1 signs JSON.stringify({id, pass, results, attestedAt}).
+    signed = {k: attestation[k] for k in ("id", "pass", "results", "attestedAt")}
+    return json.dumps(signed, separators=(",", ":")).encode()
+
+
+def _sign(payload: bytes, d: int = PRIVATE_KEY, k: int = 0x1234567) -> str:
+    z = int.from_bytes(hashlib.sha256(payload).digest(), "big")
+    r = verify._point_mul(k, verify._G)[0] % verify._N
+    s = pow(k, -1, verify._N) * (z + r * d) % verify._N
+    return base64.b64encode(r.to_bytes(32, "big") + s.to_bytes(32, "big")).decode()
+
+
+@pytest.fixture
+def jwks():
+    x, y = verify._point_mul(PRIVATE_KEY, verify._G)
+    return {
+        "keys": [
+            {"kty": "EC", "crv": "P-256", "x": _b64url(x), "y": _b64url(y), "kid": "insumer-attest-v1"},
+        ]
+    }
+
+
+@pytest.fixture
+def response():
+    evaluated = {
+        "chainId": 1,
+        "contractAddress": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        "decimals": 6,
+        "operator": "gte",
+        "threshold": 1000,
+        "type": "token_balance",
+    }
+    attestation = {
+        "id": "ATST-A7C3E1B2D4F56789",
+        "pass": True,
+        "results": [
+            {
+                "condition": 0,
+                "met": True,
+                "evaluatedCondition": evaluated,
+                "conditionHash": condition_hash(evaluated),
+                "blockTimestamp": "2026-02-28T12:34:56.000Z",
+            }
+        ],
+        "passCount": 1,
+        "failCount": 0,
+        "attestedAt": "2026-02-28T12:34:57.000Z",
+        "expiresAt": "2026-02-28T13:04:57.000Z",
+    }
+    return {
+        "ok": True,
+        "data": {
+            "attestation": attestation,
+            "sig": _sign(_v1_preimage(attestation)),
+            "kid": "insumer-attest-v1",
+        },
+        "meta": {"creditsCharged": 1},
+    }
+
+
+def test_valid_response(response, jwks):
+    result = verify_response(response, jwks, now=NOW)
+    assert result.valid, result.errors
+    assert result.id == "ATST-A7C3E1B2D4F56789"
+    assert result.checks == {"signature": True, "conditionHashes": True, "expiry": True}
+
+
+def test_accepts_data_object_and_key_map(response, jwks):
+    result = verify_response(response["data"], load_jwks(jwks), now=NOW)
+    assert result.valid
+
+
+def test_tampered_result_fails_signature(response, jwks):
+    tampered = copy.deepcopy(response)
+    tampered["data"]["attestation"]["pass"] = False
+    result = verify_response(tampered, jwks, now=NOW)
+    assert not result.valid
+    assert result.checks["signature"] is False
+
+
+def test_condition_hash_mismatch(response, jwks):
+    tampered = copy.deepcopy(response)
+    tampered["data"]["attestation"]["results"][0]["conditionHash"] = "0x" + "00" * 32
+    result = verify_response(tampered, jwks, now=NOW)
+    assert result.checks["conditionHashes"] is False
+    assert not result.valid
+
+
+def test_expired_and_stale(response, jwks):
+    later = datetime(2026, 2, 28, 14, 0, tzinfo=timezone.utc)
+    result = verify_response(response, jwks, max_age=120, now=later)
+    assert result.checks["expiry"] is False
+    assert result.checks["freshness"] is False
+
+
+def test_unknown_kid(response, jwks):
+    response["data"]["kid"] = "insumer-attest-v9"
+    result = verify_response(response, jwks, now=NOW)
+    assert not result.checks["signature"]
+    assert "Unknown signing key" in result.errors[0]
+
+
+def test_verify_many_process_pool(response, jwks):
+    bad = copy.deepcopy(response)
+    bad["data"]["attestation"]["id"] = "ATST-FORGED"
+    results = verify_many([response, bad] * 4, jwks, now=NOW, max_workers=2, chunksize=2)
+    assert [r.valid for r in results] == [True, False] * 4
+
+
+def _signed_attestation(attestation):
+    return {"attestation": attestation, "sig": _sign(_v1_preimage(attestation)), "kid": "insumer-attest-v1"}
+
+
+def test_merged_split_attestation(response, jwks):
+    from langchain_insumer.wrapper import _merge_attestations
+
+    first = response
+    second_att = copy.deepcopy(response["data"]["attestation"])
+    second_att["id"] = "ATST-SECOND"
+    second = {"ok": True, "data": _signed_attestation(second_att), "meta": {"creditsCharged": 1}}
+    merged = _merge_attestations([first, second])
+    result = verify_response(merged, jwks, now=NOW)
+    assert result.valid, result.errors
+    assert result.checks["merge"] is True
+
+    tampered = copy.deepcopy(merged)
+    tampered["data"]["attestation"]["results"][1]["met"] = False
+    assert verify_response(tampered, jwks, now=NOW).checks["merge"] is False
+    tampered = copy.deepcopy(merged)
+    tampered["data"]["parts"][1]["attestation"]["pass"] = False
+    assert verify_response(tampered, jwks, now=NOW).checks["signature"] is False
+
+
+def test_rfc6979_vector():
+    # RFC 6979 A.2.5, P-256 / SHA-256, message "sample".
+    public_key = verify._point_mul(PRIVATE_KEY, verify._G)
+    r = 0xEFD48B2AACB6A8FD1140DD9CD45E81D69D2C877B56AAF991C34D0EA84EAF3716
+    s = 0xF7CB1C942D657C41D436C7A1B6E29F65F3E900DBB9AFF4064DC4AB2F843ACDA8
+    assert verify._verify_digest(public_key, hashlib.sha256(b"sample").digest(), r, s)
+    assert not verify._verify_digest(public_key, hashlib.sha256(b"other").digest(), r, s)
+
+
+@pytest.fixture
+def published_jwks():
+    return json.loads((FIXTURES / "jwks.json").read_text())
+
+
+@pytest.mark.parametrize("name", sorted(VECTORS))
+def test_published_vectors(name, published_jwks):
+    # Issuer-signed responses from the insumer-verify conformance vectors.
+    vector = VECTORS[name]
+    result = verify_response(vector["response"], published_jwks)
+    for check, expected in vector["expected"]["checks"].items():
+        assert result.checks[check] is expected, (check, result.errors)
+
+
+@pytest.mark.parametrize("name", sorted(VECTORS))
+def test_published_condition_hashes(name):
+    kid = VECTORS[name]["response"]["data"].get("kid")
+    for entry in VECTORS[name]["recompute"]:
+        condition = json.loads(entry["canonicalEvaluatedCondition"])
+        assert (condition_hash(condition, kid) == entry["conditionHash"]) is entry["reproduces"]
+
+
+def test_trust_profile_under_attestation_kid(published_jwks):
+    response = copy.deepcopy(VECTORS["18-trust-profile-not-evaluated"]["response"])
+    response["data"]["kid"] = "insumer-attest-v2"
+    result = verify_response(response, published_jwks)
+    assert result.checks["signature"] is False
+    assert "does not sign trust profiles" in result.errors[0]
+
+
+def test_readme_sample_hash():
+    evaluated = {
+        "type": "token_balance",
+        "chainId": 1,
+        "contractAddress": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        "operator": "gte",
+        "threshold": "1",
+    }
+    expected = "0x7461826638a23862059da9474fa12054829f694020701491d660395b87df6132"
+    assert condition_hash(evaluated, "insumer-attest-v2") == expected
+    assert condition_hash(evaluated) == expected  # flat conditions hash alike under v1
+
+
+def test_js_number_formatting():
+    cases = {1e21: "1e+21", 1e-7: "1e-7", 0.000001: "0.000001", 2**60: "1152921504606847000", -0.0: "0"}
+    for value, text in cases.items():
+        assert verify._js_number(value) == text